@@ -73,6 +73,81 @@ FORWARD_MARKET_MAX_DURATION_YEARS = 6
 
 SCM_CN_DAYS_OF_DELAY = 3
 
+# Controls whether the PAY_AS_BID / PAY_AS_CLEAR matching (selected by the BID_OFFER_MATCH_TYPE
+# setting) is performed in-process on arrays of the market orders, instead of exchanging
+# serialized recommendations with the gsy-framework matching algorithms.
+VECTORIZED_MATCHING_ALGORITHMS = False
+
+# Number of worker processes that clear the spot / settlement / future markets of all areas
+# concurrently, once per tick after all areas have posted their orders. Only applies to the
+# vectorized matching algorithms; 0 disables the parallel clearing.
+PARALLEL_CLEARING_WORKERS = 0
+
+# Controls whether the SCM results of all homes are calculated with NumPy operations by the
+# VectorizedSCMManager, instead of one home at a time by the SCMManager.
+VECTORIZED_SCM_MANAGER = False
+
+# Maximal number of results reports that wait to be published to the message broker by a
+# background thread, while the simulation continues. 0 publishes the results synchronously.
+RESULTS_PUBLISH_QUEUE_SIZE = 0
+
+# Controls whether the trades, bids, offers and area / asset statistics are exported as one
+# compressed columnar dataset per record type, instead of one CSV file per area and record type.
+# The per-area CSV files can still be derived from the datasets at the end of the simulation.
+COLUMNAR_RESULTS_EXPORT = False
+COLUMNAR_EXPORT_BATCH_ROWS = 100000
+DERIVE_CSV_FILES_FROM_COLUMNAR_EXPORT = False
+
+# Number of worker processes that render the result plots to HTML files, while the figures of
+# the next plots are generated. 0 renders the plots in the exporting process.
+PLOT_RENDERING_WORKERS = 0
+# Controls whether the figures of the result plots are only serialized during the export, in
+# order to be rendered on demand with the render-plots CLI command.
+DEFER_PLOT_RENDERING = False
+
+# Controls whether the expanded profiles of the assets are interned in a content-addressed
+# ProfileStore, so that assets with the same input profile share one read-only array.
+SHARED_PROFILE_STORE = False
+
+# Controls whether the next chunk of the profiles of the profile DB is read by a background
+# thread, while the simulation runs on the current chunk.
+PREFETCH_PROFILE_DB_BUFFER = False
+
+# Directory of the incremental checkpoints of the simulation state, written after every market
+# slot. None disables the checkpoints. A full snapshot is written every
+# CHECKPOINT_SNAPSHOT_INTERVAL_SLOTS slots, the other checkpoints only contain the changed areas.
+CHECKPOINT_DIRECTORY = None
+CHECKPOINT_SNAPSHOT_INTERVAL_SLOTS = 96
+# Controls whether the simulation is resumed from the latest checkpoint in CHECKPOINT_DIRECTORY.
+RESTORE_FROM_CHECKPOINT = False
+
+# Controls whether the phases of the tick loop are timed by the TickProfiler. The durations are
+# aggregated per market slot and added to the results.
+TICK_PROFILING = False
+# File to which the profile of the tick loop is written in the collapsed stack format of flame
+# graph tools, at the end of the simulation. None skips the export.
+TICK_PROFILE_FOLDED_STACKS_FILE = None
+
+# Controls whether the template strategies update the prices of their orders in place, with the
+# ORDER_AMENDED event, instead of deleting the orders and posting new ones. The market agents
+# amend the forwarded copies of the amended orders accordingly.
+AMEND_ORDERS_IN_PLACE = False
+
+# Controls whether the price updates of the template strategies in the spot and settlement
+# markets are scheduled by the PriceScheduleEngine, which advances the schedules of all
+# strategies at once on every tick.
+VECTORIZED_PRICE_SCHEDULES = False
+
+# Controls whether the grid tree statistics that are sent to the aggregators are only recomputed
+# for the areas that changed since the last time that they were read, instead of for the whole
+# grid tree on every trade and external tick.
+LAZY_EXTERNAL_GLOBAL_STATS = False
+
+# Wire format of the redis channels between the processes of the simulation, e.g. when the events
+# are dispatched via redis. One of "json", "msgpack" and "msgpack+zlib". The aggregators and the
+# external matching engine clients request their own wire format, JSON by default.
+REDIS_WIRE_FORMAT = "json"
+
 
 class SettlementTemplateStrategiesConstants:
     """Constants related to the configuration of settlement template strategies"""
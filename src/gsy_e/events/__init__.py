@@ -16,6 +16,9 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 from typing import Union, List  # noqa
+
+from gsy_framework.data_classes import Bid, Offer
+
 from gsy_e.events.event_structures import MarketEvent, AreaEvent
 
 
@@ -55,6 +58,8 @@ class EventMixin:
             return self.event_balancing_offer_deleted
         if event == MarketEvent.BALANCING_TRADE:
             return self.event_balancing_trade
+        if event == MarketEvent.ORDER_AMENDED:
+            return self.event_order_amended
         assert False, f"No event {event}."
 
     def event_listener(self, event_type: Union[AreaEvent, MarketEvent], **kwargs):
@@ -113,3 +118,13 @@ class EventMixin:
 
     def event_balancing_trade(self, *, market_id, trade):
         """Event emitted when a balancing trade is created."""
+
+    def event_order_amended(self, *, market_id, order: Union[Offer, Bid],
+                            original_order: Union[Offer, Bid]):
+        """Event emitted when the price of an open offer or bid is amended in place.
+
+        By default the amended order is handled like a newly posted order."""
+        if isinstance(order, Bid):
+            self.event_bid(market_id=market_id, bid=order)
+        else:
+            self.event_offer(market_id=market_id, offer=order)
@@ -0,0 +1,118 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Tuple
+
+if TYPE_CHECKING:
+    from gsy_e.models.area.area_base import AreaBase
+
+
+class AreaRegistry:
+    """Index of the areas of the simulated grid tree by uuid.
+
+    The registry is built once for the root area of the simulation and afterwards kept up to date
+    by the live events that create and delete areas, so that areas can be looked up without
+    walking the grid tree. The revision is increased whenever the areas or their strategies
+    change, in order to invalidate values that are derived from the areas. The positions of the
+    areas in the grid tree are calculated on demand, and again only after areas were added or
+    removed.
+    """
+
+    def __init__(self):
+        self.root_area: Optional["AreaBase"] = None
+        self.revision = 0
+        self._areas: Dict[str, "AreaBase"] = {}
+        self._parents: Dict[str, Optional["AreaBase"]] = {}
+        # None if the tree positions have to be calculated again
+        self._tree_positions: Optional[Dict[str, Tuple[int, ...]]] = None
+
+    def build(self, root_area: "AreaBase") -> None:
+        """Index all areas of the grid tree of the root area."""
+        self.root_area = root_area
+        self._areas = {}
+        self._parents = {}
+        self.register(root_area, None)
+
+    def is_built_for(self, root_area: "AreaBase") -> bool:
+        """Return True if the registry indexes the grid tree of the root area."""
+        return self.root_area is not None and self.root_area is root_area
+
+    def register(self, area: "AreaBase", parent: Optional["AreaBase"]) -> None:
+        """Index the area and its descendants, in pre-order."""
+        stack = [(area, parent)]
+        while stack:
+            area, parent = stack.pop()
+            self._areas[area.uuid] = area
+            self._parents[area.uuid] = parent
+            stack.extend((child, area) for child in reversed(area.children))
+        self.revision += 1
+        self._tree_positions = None
+
+    def unregister(self, area_uuid: str) -> None:
+        """Remove the area and its descendants from the index."""
+        area = self._areas.get(area_uuid)
+        if area is None:
+            return
+        stack = [area]
+        while stack:
+            area = stack.pop()
+            self._areas.pop(area.uuid, None)
+            self._parents.pop(area.uuid, None)
+            stack.extend(area.children)
+        self.revision += 1
+        self._tree_positions = None
+
+    def _calculate_tree_positions(self) -> None:
+        """Calculate the tree positions of all areas in a single traversal of the grid tree."""
+        self._tree_positions = {}
+        stack = [(self.root_area, ())]
+        while stack:
+            area, tree_position = stack.pop()
+            self._tree_positions[area.uuid] = tree_position
+            stack.extend((child, (*tree_position, index))
+                         for index, child in enumerate(area.children))
+
+    def invalidate(self) -> None:
+        """Signal that the configuration of the registered areas changed."""
+        self.revision += 1
+
+    def get_area(self, area_uuid: str) -> Optional["AreaBase"]:
+        """Return the area with the uuid, or None if it is not registered."""
+        return self._areas.get(area_uuid)
+
+    def get_parent(self, area_uuid: str) -> Optional["AreaBase"]:
+        """Return the parent of the area with the uuid, or None for the root area and areas that
+        are not registered."""
+        return self._parents.get(area_uuid)
+
+    def get_tree_position(self, area: "AreaBase") -> Tuple[int, ...]:
+        """Return the position of the area in the grid tree, calculating it if the area is not
+        registered."""
+        if self.root_area is None or area.uuid not in self._areas:
+            return area.tree_position
+        if self._tree_positions is None:
+            self._calculate_tree_positions()
+        return self._tree_positions[area.uuid]
+
+    def __iter__(self) -> Iterator["AreaBase"]:
+        return iter(self._areas.values())
+
+    def __len__(self) -> int:
+        return len(self._areas)
+
+    def __contains__(self, area_uuid: str) -> bool:
+        return area_uuid in self._areas
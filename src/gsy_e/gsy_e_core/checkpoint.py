@@ -0,0 +1,166 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import zlib
+from logging import getLogger
+from typing import Dict, List, Optional, Tuple
+
+log = getLogger(__name__)
+
+CHECKPOINT_MAGIC = b"GSYCKPT1"
+_PREAMBLE = struct.Struct("<8sI")
+SNAPSHOT_SUFFIX = "-snapshot.ckpt"
+DELTA_SUFFIX = "-delta.ckpt"
+
+
+def _encode_area_state(area_state: dict) -> bytes:
+    return json.dumps(area_state, separators=(",", ":"), sort_keys=True,
+                      default=str).encode("utf-8")
+
+
+def _list_checkpoint_files(directory: str) -> List[Tuple[int, str]]:
+    """Return the sequence numbers and the paths of the checkpoint files, in sequence order."""
+    if not os.path.isdir(directory):
+        return []
+    checkpoint_files = []
+    for file_name in os.listdir(directory):
+        if not file_name.endswith((SNAPSHOT_SUFFIX, DELTA_SUFFIX)):
+            continue
+        sequence_number = file_name.split("-", 1)[0]
+        if sequence_number.isdigit():
+            checkpoint_files.append((int(sequence_number), os.path.join(directory, file_name)))
+    return sorted(checkpoint_files)
+
+
+def _write_checkpoint_file(path: str, header: dict, blobs: List[bytes]) -> None:
+    """Write the header and the area blobs to the checkpoint file, atomically."""
+    encoded_header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as outfile:
+        outfile.write(_PREAMBLE.pack(CHECKPOINT_MAGIC, len(encoded_header)))
+        outfile.write(encoded_header)
+        for blob in blobs:
+            outfile.write(blob)
+    os.replace(tmp_path, path)
+
+
+def _read_checkpoint_file(path: str) -> Tuple[dict, Dict[str, dict]]:
+    """Return the header and the area states of the checkpoint file.
+
+    The file is memory-mapped, so that only the area blobs are copied out of the page cache."""
+    with open(path, "rb") as infile, \
+            mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        magic, header_length = _PREAMBLE.unpack_from(buffer, 0)
+        if magic != CHECKPOINT_MAGIC:
+            raise ValueError(f"{path} is not a simulation checkpoint.")
+        blobs_offset = _PREAMBLE.size + header_length
+        header = json.loads(buffer[_PREAMBLE.size:blobs_offset])
+        area_states = {
+            area_uuid: json.loads(zlib.decompress(
+                buffer[blobs_offset + offset:blobs_offset + offset + length]))
+            for area_uuid, (offset, length) in header.pop("index").items()}
+    return header, area_states
+
+
+class SimulationCheckpointer:
+    """Write incremental checkpoints of the simulation state to a directory.
+
+    A checkpoint consists of the general state of the simulation and the states of the areas, the
+    same as the saved simulation state that is used to resume simulations. Every
+    snapshot_interval saves a full snapshot is written, the other saves only write the states of
+    the areas that changed since the previous save, which are detected by a hash of their encoded
+    state. Writing a snapshot removes the older checkpoint files.
+    """
+
+    def __init__(self, directory: str, snapshot_interval: int):
+        self._directory = directory
+        self._snapshot_interval = max(snapshot_interval, 1)
+        self._area_hashes: Dict[str, bytes] = {}
+        self._saves_since_snapshot = 0
+        os.makedirs(directory, exist_ok=True)
+        checkpoint_files = _list_checkpoint_files(directory)
+        self._sequence_number = checkpoint_files[-1][0] + 1 if checkpoint_files else 0
+
+    def save(self, slot_number: int, general_state: dict, area_states: Dict[str, dict]) -> str:
+        """Write the checkpoint of the simulation state and return the path of the file."""
+        is_snapshot = (not self._area_hashes or
+                       self._saves_since_snapshot >= self._snapshot_interval)
+        area_hashes = {}
+        index = {}
+        blobs = []
+        offset = 0
+        for area_uuid, area_state in area_states.items():
+            encoded_state = _encode_area_state(area_state)
+            area_hashes[area_uuid] = hashlib.blake2b(encoded_state, digest_size=16).digest()
+            if not is_snapshot and self._area_hashes.get(area_uuid) == area_hashes[area_uuid]:
+                continue
+            blob = zlib.compress(encoded_state, 1)
+            index[area_uuid] = [offset, len(blob)]
+            blobs.append(blob)
+            offset += len(blob)
+
+        header = {
+            "slot_number": slot_number,
+            "general": general_state,
+            "deleted": ([] if is_snapshot else
+                        [area_uuid for area_uuid in self._area_hashes
+                         if area_uuid not in area_hashes]),
+            "index": index}
+        suffix = SNAPSHOT_SUFFIX if is_snapshot else DELTA_SUFFIX
+        path = os.path.join(self._directory, f"{self._sequence_number:08d}{suffix}")
+        _write_checkpoint_file(path, header, blobs)
+
+        if is_snapshot:
+            for _, old_path in _list_checkpoint_files(self._directory):
+                if old_path != path:
+                    os.remove(old_path)
+            self._saves_since_snapshot = 0
+        self._saves_since_snapshot += 1
+        self._sequence_number += 1
+        self._area_hashes = area_hashes
+        log.debug("Saved checkpoint of slot %s to %s (%s of %s areas).",
+                  slot_number, path, len(index), len(area_states))
+        return path
+
+
+def read_checkpoint(directory: str) -> Optional[dict]:
+    """Return the simulation state of the latest checkpoint in the directory.
+
+    The latest snapshot is read and the deltas that were written after it are applied in order.
+    The returned dict has the same format as the saved simulation state. Returns None if there
+    is no snapshot in the directory.
+    """
+    checkpoint_files = _list_checkpoint_files(directory)
+    snapshot_indices = [index for index, (_, path) in enumerate(checkpoint_files)
+                        if path.endswith(SNAPSHOT_SUFFIX)]
+    if not snapshot_indices:
+        return None
+
+    header, area_states = _read_checkpoint_file(checkpoint_files[snapshot_indices[-1]][1])
+    general_state = header["general"]
+    for _, path in checkpoint_files[snapshot_indices[-1] + 1:]:
+        header, changed_area_states = _read_checkpoint_file(path)
+        for area_uuid in header["deleted"]:
+            area_states.pop(area_uuid, None)
+        area_states.update(changed_area_states)
+        general_state = header["general"]
+    return {"general": general_state, "areas": area_states}
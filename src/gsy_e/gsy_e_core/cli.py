@@ -29,6 +29,7 @@ from gsy_framework.settings_validators import validate_global_settings
 from pendulum import today
 
 import gsy_e.constants
+from gsy_e.gsy_e_core.sim_results.plot_renderer import render_deferred_plots
 from gsy_e.gsy_e_core.simulation import run_simulation
 from gsy_e.gsy_e_core.util import (
     DateType, IntervalType, available_simulation_scenarios, convert_str_to_pause_after_interval,
@@ -92,6 +93,19 @@ _setup_modules = available_simulation_scenarios
 @click.option("--no-export", is_flag=True, default=False, help="Skip export of simulation data")
 @click.option("--export-path",  type=str, default=None, show_default=False,
               help="Specify a path for the csv export files (default: ~/gsy-e-simulation)")
+@click.option("--plot-workers", type=int, default=gsy_e.constants.PLOT_RENDERING_WORKERS,
+              show_default=True, help="Number of processes that render the result plots")
+@click.option("--defer-plots", is_flag=True, default=False,
+              help="Skip the rendering of the result plots, render them with render-plots")
+@click.option("--checkpoint-dir", type=str, default=None,
+              help="Write incremental checkpoints of the simulation state to this directory")
+@click.option("--restore-checkpoint", is_flag=True, default=False,
+              help="Resume the simulation from the latest checkpoint in --checkpoint-dir")
+@click.option("--profile-ticks", is_flag=True, default=False,
+              help="Time the phases of the tick loop and log their durations")
+@click.option("--profile-output", type=click.Path(dir_okay=False), default=None,
+              help="Write the tick loop profile to this file, in the collapsed stack format of "
+                   "flame graph tools (implies --profile-ticks)")
 @click.option("--enable-bc", is_flag=True, default=False, help="Run simulation on Blockchain")
 @click.option("--enable-external-connection", is_flag=True, default=False,
               help="External Agents interaction to simulation during runtime")
@@ -111,12 +125,20 @@ _setup_modules = available_simulation_scenarios
 def run(setup_module_name, settings_file, duration, slot_length, tick_length,
         cloud_coverage, enable_external_connection, start_date,
         pause_at, incremental, slot_length_realtime, enable_dof: bool,
-        market_type: int, **kwargs):
+        market_type: int, plot_workers: int, defer_plots: bool, checkpoint_dir: str,
+        restore_checkpoint: bool, profile_ticks: bool, profile_output: str, **kwargs):
     """Configure settings and run a simulation."""
     # Force the multiprocessing start method to be 'fork' on macOS.
     if platform.system() == "Darwin":
         multiprocessing.set_start_method("fork")
 
+    gsy_e.constants.PLOT_RENDERING_WORKERS = plot_workers
+    gsy_e.constants.DEFER_PLOT_RENDERING = defer_plots
+    gsy_e.constants.CHECKPOINT_DIRECTORY = checkpoint_dir
+    gsy_e.constants.RESTORE_FROM_CHECKPOINT = restore_checkpoint
+    gsy_e.constants.TICK_PROFILING = profile_ticks or profile_output is not None
+    gsy_e.constants.TICK_PROFILE_FOLDED_STACKS_FILE = profile_output
+
     try:
         if settings_file is not None:
             simulation_settings, advanced_settings = read_settings_from_file(settings_file)
@@ -150,3 +172,16 @@ def run(setup_module_name, settings_file, duration, slot_length, tick_length,
     except GSyException as ex:
         log.exception(ex)
         raise click.ClickException(ex.args[0])
+
+
+@main.command(name="render-plots")
+@click.argument("plot_dir", type=click.Path(exists=True, file_okay=False))
+@click.option("-w", "--workers", type=int, default=0, show_default=True,
+              help="Number of processes that render the plots")
+def render_plots(plot_dir, workers):
+    """Render the result plots that were deferred during the export of a simulation."""
+    try:
+        plot_count = render_deferred_plots(plot_dir, workers)
+    except FileNotFoundError as ex:
+        raise click.ClickException(f"No deferred plots were found in {plot_dir}.") from ex
+    log.info("Rendered %s plots in %s.", plot_count, plot_dir)
@@ -25,6 +25,8 @@ from redis import Redis
 from rq import Connection, Worker, get_current_job
 from rq.decorators import job
 
+from gsy_e.gsy_e_core.util import memory_usage_percent
+
 logger = logging.getLogger()
 
 
@@ -39,14 +41,50 @@ def start(payload):
     launch_simulation_from_rq_job(**payload, job_id=current_job.id)
 
 
+def _create_worker() -> Worker:
+    return Worker(
+        [QueueNames().gsy_e_queue_name],
+        name=f"simulation.{getpid()}.{now().timestamp()}", log_job_description=False
+    )
+
+
+def _redis_connection() -> Redis:
+    return Redis.from_url(environ.get("REDIS_URL", "redis://localhost"), retry_on_timeout=True)
+
+
+def preload_simulation_modules():
+    """Import the modules that are needed in order to run a simulation job.
+
+    Worker processes that are forked after calling this function start executing their jobs
+    without importing the simulation stack again."""
+    # pylint: disable-next=import-outside-toplevel,unused-import
+    import gsy_e.gsy_e_core.rq_job_handler  # noqa: F401
+
+
+def run_pool_worker(max_memory_usage_percent: float):
+    """Execute simulation jobs one after the other, until the memory usage exceeds the limit.
+
+    Meant to be run in a process that was forked from a parent that already called
+    preload_simulation_modules. Each job is still executed in a process that is forked from this
+    worker (the rq work horse), therefore the global state of a simulation does not leak to the
+    next jobs."""
+    with Connection(_redis_connection()):
+        while memory_usage_percent() <= max_memory_usage_percent:
+            worker = _create_worker()
+            try:
+                # Block until a job is available, and return as soon as it is finished
+                worker.work(max_jobs=1, logging_level="ERROR")
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.exception(ex)
+                worker.kill_horse()
+                worker.wait_for_horse()
+                return
+
+
 def main():
     """Main entrypoint for running the exchange jobs."""
-    with Connection(
-            Redis.from_url(environ.get("REDIS_URL", "redis://localhost"), retry_on_timeout=True)):
-        worker = Worker(
-            [QueueNames().gsy_e_queue_name],
-            name=f"simulation.{getpid()}.{now().timestamp()}", log_job_description=False
-        )
+    with Connection(_redis_connection()):
+        worker = _create_worker()
         try:
             worker.work(max_jobs=1, burst=True, logging_level="ERROR")
         except Exception as ex:  # pylint: disable=broad-except
@@ -20,8 +20,7 @@ import json
 import logging
 import os
 import pathlib
-import shutil
-from typing import TYPE_CHECKING, Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Sequence, Tuple
 
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.data_classes import (BalancingOffer, BalancingTrade, Bid, MarketClearingState,
@@ -34,7 +33,10 @@ import gsy_e.constants
 from gsy_e.gsy_e_core.area_serializer import area_to_string
 from gsy_e.gsy_e_core.enums import PAST_MARKET_TYPE_FILE_SUFFIX_MAPPING
 from gsy_e.gsy_e_core.matching_engine_singleton import bid_offer_matcher
+from gsy_e.gsy_e_core.sim_results.columnar_export import (ColumnarResultsExporter,
+                                                          write_area_csv_files)
 from gsy_e.gsy_e_core.sim_results.file_export_endpoints import file_export_endpoints_factory
+from gsy_e.gsy_e_core.sim_results.plot_renderer import PlotRenderer, plot_rendering
 from gsy_e.gsy_e_core.sim_results.results_plots import (PlotAverageTradePrice, PlotDeviceStats,
                                                         PlotEnergyProfile,
                                                         PlotEnergyTradeProfileHR,
@@ -69,6 +71,7 @@ results_field_to_json_filename_mapping = {
     "random_seed": "random_seed",
     "simulation_state": "simulation_state",
     "status": "status",
+    "tick_profile": "tick_profile",
     "trade_profile": "trade_profile"
 }
 
@@ -84,6 +87,7 @@ class ExportAndPlot:
         self.endpoint_buffer = endpoint_buffer
         self.file_stats_endpoint = file_export_endpoints_factory()
         self.raw_data_subdir = None
+        self._columnar_exporter = None
         try:
             if path is not None:
                 path = os.path.abspath(path)
@@ -96,6 +100,10 @@ class ExportAndPlot:
                 self.raw_data_subdir = pathlib.Path(self.directory, "raw_data")
                 if not self.raw_data_subdir.exists():
                     self.raw_data_subdir.mkdir(exist_ok=True, parents=True)
+            if gsy_e.constants.COLUMNAR_RESULTS_EXPORT:
+                self._columnar_exporter = ColumnarResultsExporter(
+                    pathlib.Path(self.directory, "columnar"),
+                    gsy_e.constants.COLUMNAR_EXPORT_BATCH_ROWS)
         except OSError as ex:
             _log.error("Could not open directory for csv exports: %s", str(ex))
             return
@@ -138,30 +146,61 @@ class ExportAndPlot:
 
         self._export_json_data()
         self._export_setup_json()
-
-        PlotEnergyProfile(self.endpoint_buffer, self.plot_dir).plot(self.area)
-        PlotUnmatchedLoads(self.area, self.file_stats_endpoint, self.plot_dir).plot()
-        PlotAverageTradePrice(
-            self.file_stats_endpoint, self.plot_dir).plot(self.area, self.plot_dir)
-        PlotESSSOCHistory(
-            self.file_stats_endpoint, self.plot_dir).plot(self.area, self.plot_dir)
-        PlotESSEnergyTrace(self.plot_dir).plot(self.area, self.plot_dir)
-        if ConstSettings.GeneralSettings.EXPORT_OFFER_BID_TRADE_HR:
-            PlotOrderInfo(self.endpoint_buffer).plot_per_area_per_market_slot(
-                self.area, self.plot_dir)
-        if ConstSettings.GeneralSettings.EXPORT_DEVICE_PLOTS:
-            PlotDeviceStats(self.endpoint_buffer, self.plot_dir).plot(self.area, [])
-        if ConstSettings.GeneralSettings.EXPORT_ENERGY_TRADE_PROFILE_HR:
-            PlotEnergyTradeProfileHR(
-                self.endpoint_buffer, self.plot_dir).plot(self.area, self.plot_dir)
-        if (ConstSettings.MASettings.MARKET_TYPE == SpotMarketTypeEnum.TWO_SIDED.value and
-                ConstSettings.MASettings.BID_OFFER_MATCH_TYPE ==
-                BidOfferMatchAlgoEnum.PAY_AS_CLEAR.value and
-                ConstSettings.GeneralSettings.EXPORT_SUPPLY_DEMAND_PLOTS is True):
-            PlotSupplyDemandCurve(
+        self._export_columnar_datasets()
+
+        with plot_rendering(PlotRenderer(self.plot_dir, self.area.slug,
+                                         gsy_e.constants.PLOT_RENDERING_WORKERS,
+                                         gsy_e.constants.DEFER_PLOT_RENDERING)):
+            PlotEnergyProfile(self.endpoint_buffer, self.plot_dir).plot(self.area)
+            PlotUnmatchedLoads(self.area, self.file_stats_endpoint, self.plot_dir).plot()
+            PlotAverageTradePrice(
                 self.file_stats_endpoint, self.plot_dir).plot(self.area, self.plot_dir)
-
-        self.move_root_plot_folder()
+            PlotESSSOCHistory(
+                self.file_stats_endpoint, self.plot_dir).plot(self.area, self.plot_dir)
+            PlotESSEnergyTrace(self.plot_dir).plot(self.area, self.plot_dir)
+            if ConstSettings.GeneralSettings.EXPORT_OFFER_BID_TRADE_HR:
+                PlotOrderInfo(self.endpoint_buffer).plot_per_area_per_market_slot(
+                    self.area, self.plot_dir)
+            if ConstSettings.GeneralSettings.EXPORT_DEVICE_PLOTS:
+                PlotDeviceStats(self.endpoint_buffer, self.plot_dir).plot(self.area, [])
+            if ConstSettings.GeneralSettings.EXPORT_ENERGY_TRADE_PROFILE_HR:
+                PlotEnergyTradeProfileHR(
+                    self.endpoint_buffer, self.plot_dir).plot(self.area, self.plot_dir)
+            if (ConstSettings.MASettings.MARKET_TYPE == SpotMarketTypeEnum.TWO_SIDED.value and
+                    ConstSettings.MASettings.BID_OFFER_MATCH_TYPE ==
+                    BidOfferMatchAlgoEnum.PAY_AS_CLEAR.value and
+                    ConstSettings.GeneralSettings.EXPORT_SUPPLY_DEMAND_PLOTS is True):
+                PlotSupplyDemandCurve(
+                    self.file_stats_endpoint, self.plot_dir).plot(self.area, self.plot_dir)
+
+    def _export_columnar_datasets(self) -> None:
+        """Write the buffered rows of the columnar datasets and optionally derive the CSV files."""
+        if self._columnar_exporter is None:
+            return
+        try:
+            self._columnar_exporter.flush()
+            if gsy_e.constants.DERIVE_CSV_FILES_FROM_COLUMNAR_EXPORT:
+                write_area_csv_files(str(self._columnar_exporter.directory), str(self.directory))
+        except OSError:
+            _log.exception("Could not export columnar datasets")
+
+    def _write_rows(self, area: Area, record_type: str, file_path: str, labels: Sequence,
+                    rows: Iterable[Sequence], is_first: bool) -> None:
+        """Write the rows of the area to its CSV file, or to the columnar dataset of the record
+        type if the columnar export is enabled."""
+        if self._columnar_exporter is not None:
+            self._columnar_exporter.append_rows(
+                record_type, area.uuid, os.path.relpath(file_path, self.directory), labels,
+                rows)
+            return
+        try:
+            with open(file_path, "a", encoding="utf-8") as csv_file:
+                writer = csv.writer(csv_file)
+                if is_first:
+                    writer.writerow(labels)
+                writer.writerows(rows)
+        except OSError:
+            _log.exception("Could not export %s of area %s", record_type, area.name)
 
     def data_to_csv(self, area: Area, is_first: bool) -> None:
         """Wrapper for recursive function self._export_area_with_children."""
@@ -179,20 +218,6 @@ class ExportAndPlot:
         with open(json_file, "w", encoding="utf-8") as outfile:
             json.dump(data, outfile, indent=2)
 
-    def move_root_plot_folder(self) -> None:
-        """
-        Removes "grid" folder in self.plot_dir
-        """
-        old_dir = os.path.join(self.plot_dir, self.area.slug)
-        if not os.path.isdir(old_dir):
-            _log.error("PLOT ERROR: No plots were generated for %s "
-                       "under %s", self.area.slug, self.plot_dir)
-            return
-        source = os.listdir(old_dir)
-        for si in source:
-            shutil.move(os.path.join(old_dir, si), self.plot_dir)
-        shutil.rmtree(old_dir)
-
     def _export_spot_markets_stats(self, area: Area, directory: dir, is_first: bool) -> None:
         """Export bids, offers, trades, statistics csv-files for all spot markets."""
         self._export_area_stats_csv_file(area, directory, AvailableMarketTypes.SPOT,
@@ -202,6 +227,8 @@ class ExportAndPlot:
         self._export_offers_bids_trades_to_csv_files(
             past_markets=area.past_markets,
             market_member="trades",
+            area=area,
+            record_type="trades",
             file_path=self._file_path(directory, f"{area.slug}-trades"),
             labels=("slot",) + Trade.csv_fields(),
             is_first=is_first)
@@ -209,6 +236,8 @@ class ExportAndPlot:
         self._export_offers_bids_trades_to_csv_files(
             past_markets=area.past_markets,
             market_member="offer_history",
+            area=area,
+            record_type="offers",
             file_path=self._file_path(directory, f"{area.slug}-offers"),
             labels=("slot",) + Offer.csv_fields(),
             is_first=is_first)
@@ -216,6 +245,8 @@ class ExportAndPlot:
         self._export_offers_bids_trades_to_csv_files(
             past_markets=area.past_markets,
             market_member="bid_history",
+            area=area,
+            record_type="bids",
             file_path=self._file_path(directory, f"{area.slug}-bids"),
             labels=("slot",) + Bid.csv_fields(),
             is_first=is_first)
@@ -231,18 +262,24 @@ class ExportAndPlot:
         self._export_offers_bids_trades_to_csv_files(
             past_markets=area.past_settlement_markets.values(),
             market_member="trades",
+            area=area,
+            record_type="settlement-trades",
             file_path=self._file_path(directory, f"{area.slug}-settlement-trades"),
             labels=("slot",) + Trade.csv_fields(),
             is_first=is_first)
         self._export_offers_bids_trades_to_csv_files(
             past_markets=area.past_settlement_markets.values(),
             market_member="offer_history",
+            area=area,
+            record_type="settlement-offers",
             file_path=self._file_path(directory, f"{area.slug}-settlement-offers"),
             labels=("slot",) + Offer.csv_fields(),
             is_first=is_first)
         self._export_offers_bids_trades_to_csv_files(
             past_markets=area.past_settlement_markets.values(),
             market_member="bid_history",
+            area=area,
+            record_type="settlement-bids",
             file_path=self._file_path(directory, f"{area.slug}-settlement-bids"),
             labels=("slot",) + Bid.csv_fields(),
             is_first=is_first)
@@ -260,18 +297,24 @@ class ExportAndPlot:
         self._export_future_offers_bid_trades_to_csv_files(
             future_markets=area.future_markets,
             market_member="trades",
+            area=area,
+            record_type="future-trades",
             file_path=self._file_path(directory, f"{area.slug}-future-trades"),
             labels=("slot",) + Trade.csv_fields(),
             is_first=is_first)
         self._export_future_offers_bid_trades_to_csv_files(
             future_markets=area.future_markets,
             market_member="offer_history",
+            area=area,
+            record_type="future-offers",
             file_path=self._file_path(directory, f"{area.slug}-future-offers"),
             labels=("slot",) + Offer.csv_fields(),
             is_first=is_first)
         self._export_future_offers_bid_trades_to_csv_files(
             future_markets=area.future_markets,
             market_member="bid_history",
+            area=area,
+            record_type="future-bids",
             file_path=self._file_path(directory, f"{area.slug}-future-bids"),
             labels=("slot",) + Bid.csv_fields(),
             is_first=is_first)
@@ -287,6 +330,8 @@ class ExportAndPlot:
         self._export_offers_bids_trades_to_csv_files(
             past_markets=area.past_balancing_markets,
             market_member="trades",
+            area=area,
+            record_type="balancing-trades",
             file_path=self._file_path(directory, f"{area.slug}-balancing-trades"),
             labels=("slot",) + BalancingTrade.csv_fields(),
             is_first=is_first)
@@ -294,6 +339,8 @@ class ExportAndPlot:
         self._export_offers_bids_trades_to_csv_files(
             past_markets=area.past_balancing_markets,
             market_member="offer_history",
+            area=area,
+            record_type="balancing-offers",
             file_path=self._file_path(directory, f"{area.slug}-balancing-offers"),
             labels=("slot",) + BalancingOffer.csv_fields(),
             is_first=is_first)
@@ -344,63 +391,52 @@ class ExportAndPlot:
             _log.exception("Could not export area market_clearing_rate")
 
     @staticmethod
+    def _future_offers_bids_trades_rows(
+            future_markets: "FutureMarkets", market_member: str) -> Iterator[Tuple]:
+        if not future_markets.market_time_slots:
+            return
+        time_slot = future_markets.market_time_slots[0]
+        for offer_or_bid in getattr(future_markets, market_member):
+            if offer_or_bid.time_slot == time_slot:
+                yield (time_slot,) + offer_or_bid.csv_values()
+
     def _export_future_offers_bid_trades_to_csv_files(
-            future_markets: "FutureMarkets", market_member: str, file_path: dir,
-            labels: Tuple, is_first: bool = False) -> None:
+            self, area: Area, record_type: str, future_markets: "FutureMarkets",
+            market_member: str, file_path: dir, labels: Tuple, is_first: bool = False) -> None:
         """
         Export files containing individual future offers, bids (*-bids*/*-offers*.csv files).
         """
-        try:
-            with open(file_path, "a", encoding="utf-8") as csv_file:
-                writer = csv.writer(csv_file)
-                if is_first:
-                    writer.writerow(labels)
-                if not future_markets.market_time_slots:
-                    return
-                time_slot = future_markets.market_time_slots[0]
-                for offer_or_bid in getattr(future_markets, market_member):
-                    if offer_or_bid.time_slot == time_slot:
-                        row = (time_slot,) + offer_or_bid.csv_values()
-                        writer.writerow(row)
-        except OSError:
-            _log.exception("Could not export offers, bids, trades")
+        self._write_rows(area, record_type, file_path, labels,
+                         self._future_offers_bids_trades_rows(future_markets, market_member),
+                         is_first)
 
     @staticmethod
-    def _export_offers_bids_trades_to_csv_files(past_markets: List, market_member: str,
+    def _offers_bids_trades_rows(past_markets: List, market_member: str) -> Iterator[Tuple]:
+        for market in past_markets:
+            for offer_or_bid in getattr(market, market_member):
+                yield (market.time_slot,) + offer_or_bid.csv_values()
+
+    def _export_offers_bids_trades_to_csv_files(self, area: Area, record_type: str,
+                                                past_markets: List, market_member: str,
                                                 file_path: dir, labels: Tuple,
                                                 is_first: bool = False) -> None:
         """ Export files containing individual offers, bids (*-bids*/*-offers*.csv files)."""
-        try:
-            with open(file_path, "a", encoding="utf-8") as csv_file:
-                writer = csv.writer(csv_file)
-                if is_first:
-                    writer.writerow(labels)
-                for market in past_markets:
-                    for offer_or_bid in getattr(market, market_member):
-                        row = (market.time_slot,) + offer_or_bid.csv_values()
-                        writer.writerow(row)
-        except OSError:
-            _log.exception("Could not export offers, bids, trades")
+        self._write_rows(area, record_type, file_path, labels,
+                         self._offers_bids_trades_rows(past_markets, market_member), is_first)
 
     def _export_area_stats_csv_file(self, area: Area, directory: dir,
                                     past_market_type: AvailableMarketTypes,
                                     is_first: bool) -> None:
         """Export trade statistics in *.csv files."""
-        file_name = f"{area.slug}{PAST_MARKET_TYPE_FILE_SUFFIX_MAPPING[past_market_type]}"
+        file_suffix = PAST_MARKET_TYPE_FILE_SUFFIX_MAPPING[past_market_type]
         data = self.file_stats_endpoint.export_data_factory(area, past_market_type)
         rows = data.rows
         if not rows and not is_first:
             return
 
-        try:
-            with open(self._file_path(directory, file_name), "a", encoding="utf-8") as csv_file:
-                writer = csv.writer(csv_file)
-                if is_first:
-                    writer.writerow(data.labels)
-                for row in rows:
-                    writer.writerow(row)
-        except OSError:
-            _log.exception("Could not export area data.")
+        record_type = f"{'area' if area.children else 'device'}-stats{file_suffix}"
+        file_path = self._file_path(directory, f"{area.slug}{file_suffix}")
+        self._write_rows(area, record_type, file_path, data.labels, rows, is_first)
 
 
 # pylint: disable=missing-class-docstring,arguments-differ,attribute-defined-outside-init
@@ -427,7 +463,8 @@ class CoefficientExportAndPlot(ExportAndPlot):
                 self._export_area_with_children(child, subdirectory, is_first)
 
             self._export_scm_trades_to_csv_files(
-                area_uuid=area.uuid,
+                area=area,
+                record_type="trades",
                 file_path=self._file_path(directory, f"{area.slug}-trades"),
                 labels=("slot",) + Trade.csv_fields(),
                 is_first=is_first)
@@ -435,22 +472,18 @@ class CoefficientExportAndPlot(ExportAndPlot):
         self._export_area_stats_csv_file(area, directory, AvailableMarketTypes.SPOT,
                                          is_first)
 
+    def _scm_trades_rows(self, area_uuid: str) -> Iterator[Tuple]:
+        if not self._scm_manager:
+            return
+        after_meter_data = self._scm_manager.get_after_meter_data(area_uuid)
+        if not after_meter_data:
+            return
+        for trade in after_meter_data.trades:
+            yield (self._time_slot,) + trade.csv_values()
+
     def _export_scm_trades_to_csv_files(
-            self, area_uuid: str, file_path: dir, labels: Tuple, is_first: bool = False) -> None:
+            self, area: "Area", record_type: str, file_path: dir, labels: Tuple,
+            is_first: bool = False) -> None:
         """ Export files containing individual SCM trades."""
-        try:
-            with open(file_path, "a", encoding="utf-8") as csv_file:
-                writer = csv.writer(csv_file)
-                if is_first:
-                    writer.writerow(labels)
-                if not self._scm_manager:
-                    return
-                after_meter_data = self._scm_manager.get_after_meter_data(area_uuid)
-                if not after_meter_data:
-                    return
-
-                for trade in after_meter_data.trades:
-                    row = (self._time_slot,) + trade.csv_values()
-                    writer.writerow(row)
-        except OSError:
-            _log.exception("Could not export offers, bids, trades")
+        self._write_rows(area, record_type, file_path, labels,
+                         self._scm_trades_rows(area.uuid), is_first)
@@ -15,6 +15,7 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+from gsy_e.gsy_e_core.area_registry import AreaRegistry
 from gsy_e.gsy_e_core.user_profile_handler import ProfilesHandler
 from gsy_e.gsy_e_core.global_stats import (
     ExternalConnectionGlobalStatistics, SCMExternalConnectionGlobalStatistics)
@@ -23,8 +24,9 @@ from gsy_e.gsy_e_core.global_stats import (
 class GlobalObjects:
     """Collection of global singletons"""
 
-    profiles_handler = ProfilesHandler()
-    external_global_stats = ExternalConnectionGlobalStatistics()
+    area_registry = AreaRegistry()
+    profiles_handler = ProfilesHandler(area_registry)
+    external_global_stats = ExternalConnectionGlobalStatistics(area_registry)
     scm_external_global_stats = SCMExternalConnectionGlobalStatistics()
 
 
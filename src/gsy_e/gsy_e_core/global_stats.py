@@ -15,27 +15,47 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 
 import gsy_e.constants
 from gsy_e.gsy_e_core.market_counters import ExternalTickCounter
 from gsy_e.gsy_e_core.util import (find_object_of_same_weekday_and_time,
                                    get_market_maker_rate_from_config)
 
+if TYPE_CHECKING:
+    from gsy_e.gsy_e_core.area_registry import AreaRegistry
+    from gsy_e.models.area import Area
+
 
 class ExternalConnectionGlobalStatistics:
     """
-    Aggregate global statistics that should be reported via the external connection
+    Aggregate global statistics that should be reported via the external connection.
+
+    If LAZY_EXTERNAL_GLOBAL_STATS is enabled, update() and the trades of the assets only mark the
+    areas whose statistics changed as dirty, and the entries of the dirty areas are recomputed
+    when area_stats_tree_dict is read. The whole tree is only rebuilt after the market cycle and
+    after the areas of the area registry changed.
     """
-    def __init__(self):
-        self.area_stats_tree_dict = {}
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, area_registry: Optional["AreaRegistry"] = None):
+        self._area_stats_tree_dict = {}
         self.root_area = None
         self.external_tick_counter = None
         self.current_feed_in_tariff = None
         self.current_market_maker_rate = None
+        self._area_registry = area_registry
+        # Area and parent dict of every entry of the tree, in order to recompute single entries
+        self._tree_entries: Dict[str, Tuple["Area", Dict]] = {}
+        self._external_asset_uuids: List[str] = []
+        self._registry_revision: Optional[int] = None
+        # Areas whose entries have to be recomputed, None if the whole tree has to be rebuilt
+        self._dirty_area_uuids: Optional[Set[str]] = set()
 
     def __call__(self, root_area, ticks_per_slot):
         self.root_area = root_area
+        self._tree_entries = {}
+        self._external_asset_uuids = []
+        self._dirty_area_uuids = set()
         self.external_tick_counter = ExternalTickCounter(
             ticks_per_slot, gsy_e.constants.DISPATCH_EVENT_TICK_FREQUENCY_PERCENT)
 
@@ -59,42 +79,105 @@ class ExternalConnectionGlobalStatistics:
             self.current_market_maker_rate = get_market_maker_rate_from_config(
                                                       self.root_area.current_market)
 
+    @property
+    def area_stats_tree_dict(self) -> Dict:
+        """Statistics of the grid tree, keyed by the area uuids."""
+        if gsy_e.constants.LAZY_EXTERNAL_GLOBAL_STATS:
+            self._refresh_grid_tree_dict()
+        return self._area_stats_tree_dict
+
     def update(self, market_cycle: bool = False) -> None:
         """Update the global statistics"""
         if self.root_area.current_market is None:
             return
-        self._create_grid_tree_dict(self.root_area, self.area_stats_tree_dict)
+        if not gsy_e.constants.LAZY_EXTERNAL_GLOBAL_STATS:
+            self._create_grid_tree_dict(self.root_area, self._area_stats_tree_dict)
+        elif market_cycle or not self._tree_entries:
+            self._dirty_area_uuids = None
+        else:
+            # The statistics of the market areas only change during the market cycle, whereas
+            # the asset info of the external assets changes during the market slot
+            for area_uuid in self._external_asset_uuids:
+                self.mark_area_dirty(area_uuid)
         if market_cycle:
             self._buffer_feed_in_tariff(self.root_area, self.root_area.current_market.time_slot)
             self._buffer_market_maker_rate()
 
+    def update_area(self, area_uuid: str) -> None:
+        """Update the global statistics after the statistics of one area changed, e.g. after the
+        trades of an asset."""
+        if gsy_e.constants.LAZY_EXTERNAL_GLOBAL_STATS and self._tree_entries:
+            self.mark_area_dirty(area_uuid)
+        else:
+            self.update()
+
+    def mark_area_dirty(self, area_uuid: str) -> None:
+        """Recompute the entry of the area the next time that the grid tree is read."""
+        if (gsy_e.constants.LAZY_EXTERNAL_GLOBAL_STATS and self._dirty_area_uuids is not None
+                and area_uuid in self._tree_entries):
+            self._dirty_area_uuids.add(area_uuid)
+
+    def _get_registry_revision(self) -> Optional[int]:
+        if self._area_registry is None or not self._area_registry.is_built_for(self.root_area):
+            return None
+        return self._area_registry.revision
+
+    def _refresh_grid_tree_dict(self) -> None:
+        if self.root_area is None or self.root_area.current_market is None:
+            return
+        if self._get_registry_revision() != self._registry_revision:
+            # Areas were added or removed, or their configuration changed
+            self._dirty_area_uuids = None
+        if self._dirty_area_uuids is None:
+            self._create_grid_tree_dict(self.root_area, self._area_stats_tree_dict)
+            self._dirty_area_uuids = set()
+            return
+        for area_uuid in self._dirty_area_uuids:
+            area, outdict = self._tree_entries[area_uuid]
+            area_dict = self._get_area_stats_dict(area)
+            if "children" in outdict[area_uuid]:
+                area_dict["children"] = outdict[area_uuid]["children"]
+            outdict[area_uuid] = area_dict
+        self._dirty_area_uuids.clear()
+
     def is_it_time_for_external_tick(self, current_tick_in_slot: int) -> bool:
         """Returns true if it is time for broadcasting event_tick to external strategies"""
         return self.external_tick_counter.is_it_time_for_external_tick(current_tick_in_slot)
 
     def _create_grid_tree_dict(self, area, outdict):
+        if area is self.root_area:
+            self._tree_entries = {}
+            self._external_asset_uuids = []
+            self._registry_revision = self._get_registry_revision()
+        self._tree_entries[area.uuid] = (area, outdict)
+        outdict[area.uuid] = self._get_area_stats_dict(area)
+        if self._is_external_asset(area):
+            self._external_asset_uuids.append(area.uuid)
+        if area.children:
+            outdict[area.uuid]["children"] = {}
+            for child in area.children:
+                self._create_grid_tree_dict(child, outdict[area.uuid]["children"])
+
+    @staticmethod
+    def _is_external_asset(area) -> bool:
         # the lazy import is needed in order to avoid circular imports
         # pylint: disable=import-outside-toplevel
         from gsy_e.models.strategy.external_strategies import ExternalMixin
-        outdict[area.uuid] = {}
+        return not area.children and isinstance(area.strategy, ExternalMixin)
+
+    def _get_area_stats_dict(self, area) -> Dict:
+        """Return the entry of the area in the grid tree, without the entries of its children."""
         if area.children:
             if area.current_market:
-                area_dict = {"last_market_bill": area.stats.get_last_market_bills(),
-                             "last_market_stats": area.stats.get_price_stats_current_market(),
-                             "last_market_fee": area.current_market.fee_class.grid_fee_rate,
-                             "current_market_fee": area.get_grid_fee(),
-                             "area_name": area.name,
-                             "children": {}}
-            else:
-                area_dict = {"children": {},
-                             "area_name": area.name}
-            outdict[area.uuid].update(area_dict)
-            for child in area.children:
-                self._create_grid_tree_dict(child, outdict[area.uuid]["children"])
-        else:
-            outdict[area.uuid] = area.strategy.market_info_dict \
-                if isinstance(area.strategy, ExternalMixin) else {}
-            outdict[area.uuid].update({"area_name": area.name})
+                return {"last_market_bill": area.stats.get_last_market_bills(),
+                        "last_market_stats": area.stats.get_price_stats_current_market(),
+                        "last_market_fee": area.current_market.fee_class.grid_fee_rate,
+                        "current_market_fee": area.get_grid_fee(),
+                        "area_name": area.name}
+            return {"area_name": area.name}
+        area_dict = area.strategy.market_info_dict if self._is_external_asset(area) else {}
+        area_dict["area_name"] = area.name
+        return area_dict
 
 
 class SCMExternalConnectionGlobalStatistics:
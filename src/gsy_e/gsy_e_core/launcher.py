@@ -15,6 +15,7 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+import multiprocessing
 import os
 import platform
 import sys
@@ -28,16 +29,18 @@ from gsy_framework.utils import check_redis_health
 from redis import Redis
 from rq import Queue
 
+from gsy_e.gsy_e_core.exchange_jobs import preload_simulation_modules, run_pool_worker
 from gsy_e.gsy_e_core.util import memory_usage_percent
 
 REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost")
 MAX_JOBS = os.environ.get("D3A_MAX_JOBS_PER_POD", 2)
 MAX_LIMIT_MEMORY_USAGE_PERCENT = os.environ.get("D3A_MAX_MEM_USAGE_PERCENT", 90)
+WORKER_POOL_ENABLED = os.environ.get("D3A_LAUNCHER_WORKER_POOL", "false").lower() == "true"
 
 
 class Launcher:
     """Launch new simulation jobs after reading from the job queue."""
-    def __init__(self, max_jobs=None, max_delay_seconds=2):
+    def __init__(self, max_jobs=None, max_delay_seconds=2, worker_pool=WORKER_POOL_ENABLED):
         self.redis_connection = Redis.from_url(REDIS_URL, retry_on_timeout=True)
         self.queue = Queue(QueueNames().gsy_e_queue_name, connection=self.redis_connection)
         self.max_jobs = max_jobs if max_jobs is not None else int(MAX_JOBS)
@@ -47,12 +50,16 @@ class Launcher:
             else "pypy3"
         self.command = [python_executable, "src/gsy_e/gsy_e_core/exchange_jobs.py"]
         self.job_array = []
+        self.worker_pool = worker_pool
 
     def run(self):
         """
         Run an endless loop that waits for new jobs to appear in the queue, and starts workers
         in order to execute them.
         """
+        if self.worker_pool:
+            self._run_worker_pool()
+            return
         self.job_array.append(self._start_worker())
         while True:
             sleep(1)
@@ -63,6 +70,26 @@ class Launcher:
 
             self.job_array = [j for j in self.job_array if j.poll() is None]
 
+    def _run_worker_pool(self):
+        """
+        Keep max_jobs workers waiting for jobs. The workers are forked from this process after
+        the simulation modules have been imported, therefore they start executing jobs without
+        any initialization delay. A worker keeps executing jobs until the memory usage exceeds
+        the limit, and is replaced as soon as the memory usage allows it.
+        """
+        preload_simulation_modules()
+        context = multiprocessing.get_context("fork")
+        while True:
+            self.job_array = [worker for worker in self.job_array if worker.is_alive()]
+            if (len(self.job_array) < self.max_jobs and
+                    memory_usage_percent() <= MAX_LIMIT_MEMORY_USAGE_PERCENT):
+                worker = context.Process(
+                    target=run_pool_worker, args=(float(MAX_LIMIT_MEMORY_USAGE_PERCENT),))
+                worker.start()
+                self.job_array.append(worker)
+                continue
+            sleep(1)
+
     def _is_queue_crowded(self):
         check_redis_health(redis_db=self.redis_connection)
         enqueued = self.queue.jobs
@@ -79,9 +106,12 @@ class Launcher:
 
 
 @click.command()
-def main():
+@click.option("--worker-pool/--no-worker-pool", default=WORKER_POOL_ENABLED,
+              help="Execute the jobs in warm worker processes, instead of starting a new "
+                   "process for each job.")
+def main(worker_pool):
     """Entry point of the simulation launch."""
-    Launcher().run()
+    Launcher(worker_pool=worker_pool).run()
 
 
 if __name__ == "__main__":
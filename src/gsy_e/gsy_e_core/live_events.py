@@ -5,6 +5,7 @@ from threading import Lock
 from gsy_framework.constants_limits import ConstSettings, SpotMarketTypeEnum
 from gsy_framework.live_events.b2b import B2BLiveEvents
 
+from gsy_e.gsy_e_core.area_registry import AreaRegistry
 from gsy_e.gsy_e_core.area_serializer import area_from_dict
 from gsy_e.gsy_e_core.exceptions import LiveEventException
 from gsy_e.gsy_e_core.global_objects_singleton import global_objects
@@ -41,6 +42,14 @@ class CreateAreaEvent:
             raise LiveEventException(ex) from ex
         return True
 
+    def get_target_area(self, area_registry: AreaRegistry):
+        """Return the area that the event applies to."""
+        return area_registry.get_area(self.parent_uuid)
+
+    def update_area_registry(self, area_registry: AreaRegistry) -> None:
+        """Register the created area."""
+        area_registry.register(self.created_area, self.created_area.parent)
+
     def __repr__(self):
         return f"<CreateAreaEvent - parent UUID({self.parent_uuid} - " \
                f"params({self.area_representation}))>"
@@ -109,6 +118,15 @@ class UpdateAreaEvent:
         self.area_params.pop("name", None)
         self.area_params.pop("uuid", None)
 
+    def get_target_area(self, area_registry: AreaRegistry):
+        """Return the area that the event applies to."""
+        return area_registry.get_area(self.area_uuid)
+
+    @staticmethod
+    def update_area_registry(area_registry: AreaRegistry) -> None:
+        """Invalidate the values that are derived from the areas, since the strategy changed."""
+        area_registry.invalidate()
+
     def __repr__(self):
         return f"<UpdateAreaEvent - area UUID({self.area_uuid}) - params({self.area_params})>"
 
@@ -147,6 +165,14 @@ class DeleteAreaEvent:
             area.dispatcher = DispatcherFactory(area)()
         return True
 
+    def get_target_area(self, area_registry: AreaRegistry):
+        """Return the parent of the deleted area, which the event applies to."""
+        return area_registry.get_parent(self.area_uuid)
+
+    def update_area_registry(self, area_registry: AreaRegistry) -> None:
+        """Unregister the deleted area."""
+        area_registry.unregister(self.area_uuid)
+
     def __repr__(self):
         return f"<DeleteAreaEvent - area UUID({self.area_uuid})>"
 
@@ -165,6 +191,13 @@ class ForwardMarketsEvent:
         area.strategy.apply_live_event(self._event_params)
         return True
 
+    def get_target_area(self, area_registry: AreaRegistry):
+        """Return the parent of the area, which the event applies to."""
+        return area_registry.get_parent(self._area_uuid)
+
+    def update_area_registry(self, area_registry: AreaRegistry) -> None:
+        """The event does not change the areas."""
+
     def __repr__(self):
         return f"<ForwardMarketsEvent - area UUID({self._area_uuid})>"
 
@@ -217,14 +250,19 @@ class LiveEvents:
                     self._event_buffer = []
                 raise LiveEventException(ex) from ex
 
-    def _handle_event(self, area, event):
+    @staticmethod
+    def _apply_event(area, event):
         try:
-            if event.apply(area) is True:
-                return True
+            return event.apply(area) is True
         except LiveEventException as ex:
             logging.error("Event %s failed to apply on area %s. Exception: %s. Traceback: %s",
                           event, area.name, ex, traceback.format_exc())
-            return False
+            return None
+
+    def _handle_event(self, area, event):
+        applied = self._apply_event(area, event)
+        if applied is not False:
+            return applied is True
         if not area.children:
             return False
         for child in area.children:
@@ -232,10 +270,23 @@ class LiveEvents:
                 return True
         return False
 
+    def _handle_registered_event(self, event, area_registry: AreaRegistry):
+        """Apply the event to its target area, which is looked up in the area registry."""
+        target_area = event.get_target_area(area_registry)
+        if target_area is None or not self._apply_event(target_area, event):
+            return False
+        event.update_area_registry(area_registry)
+        return True
+
     def _handle_events(self, root_area, event_buffer):
+        area_registry = global_objects.area_registry
         with self._lock:
             for event in event_buffer:
-                if self._handle_event(root_area, event) is False:
+                if area_registry.is_built_for(root_area):
+                    applied = self._handle_registered_event(event, area_registry)
+                else:
+                    applied = self._handle_event(root_area, event)
+                if applied is False:
                     logging.warning("Event %s not applied.", event)
             event_buffer.clear()
 
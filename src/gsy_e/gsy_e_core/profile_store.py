@@ -0,0 +1,156 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import hashlib
+from collections.abc import Mapping
+from typing import Dict, Hashable, Iterator, Optional, Tuple
+from weakref import WeakValueDictionary
+
+import numpy as np
+from gsy_framework.read_user_profile import InputProfileTypes, read_arbitrary_profile
+from pendulum import DateTime
+
+
+class SlotProfile(Mapping):
+    """Read-only profile with one value per time slot, backed by a NumPy array.
+
+    The value of a time slot is looked up by its offset from the first time slot, therefore the
+    profile can be shared by all assets that were configured with the same input profile.
+    """
+
+    def __init__(self, time_slots: Tuple[DateTime, ...], values: np.ndarray,
+                 content_key: Hashable):
+        self._time_slots = time_slots
+        self._start_timestamp = int(time_slots[0].timestamp())
+        self._step_seconds = (int(time_slots[1].timestamp()) - self._start_timestamp
+                              if len(time_slots) > 1 else 1)
+        values.setflags(write=False)
+        self.values = values
+        # Key of the input profile that the profile was expanded from, also after rotations
+        self.content_key = content_key
+
+    @classmethod
+    def from_profile(cls, profile: Dict[DateTime, float],
+                     content_key: Hashable) -> Optional["SlotProfile"]:
+        """Create the slot profile from an expanded profile, if its time slots are equidistant
+        and its values are numbers."""
+        if not profile:
+            return None
+        time_slots = tuple(sorted(profile))
+        try:
+            timestamps = np.array([time_slot.timestamp() for time_slot in time_slots])
+            values = np.array([profile[time_slot] for time_slot in time_slots], dtype=np.float64)
+        except (AttributeError, TypeError, ValueError):
+            return None
+        steps = np.diff(timestamps)
+        if values.ndim != 1 or (len(steps) > 0 and (steps[0] <= 0 or np.any(steps != steps[0]))):
+            return None
+        return cls(time_slots, values, content_key)
+
+    @property
+    def start_time(self) -> DateTime:
+        """First time slot of the profile."""
+        return self._time_slots[0]
+
+    def _offset(self, time_slot) -> Optional[int]:
+        if not isinstance(time_slot, DateTime):
+            return None
+        offset, remainder = divmod(
+            int(time_slot.timestamp()) - self._start_timestamp, self._step_seconds)
+        if remainder != 0 or not 0 <= offset < len(self._time_slots):
+            return None
+        return offset
+
+    def __getitem__(self, time_slot: DateTime) -> float:
+        offset = self._offset(time_slot)
+        if offset is None:
+            raise KeyError(time_slot)
+        return float(self.values[offset])
+
+    def __contains__(self, time_slot) -> bool:
+        return self._offset(time_slot) is not None
+
+    def __iter__(self) -> Iterator[DateTime]:
+        return iter(self._time_slots)
+
+    def __len__(self) -> int:
+        return len(self._time_slots)
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}({self.start_time} - {self._time_slots[-1]}, "
+                f"{len(self)} slots)")
+
+
+class ProfileStore:
+    """Content-addressed cache of the expanded profiles of the assets.
+
+    Assets that are configured with the same input profile (the same CSV file, daily profile or
+    constant value) get the same SlotProfile instead of expanding their own copy. The profiles
+    are kept as long as an asset references them. A profile is only expanded again once the
+    current time stamp is outside of the expanded window, which happens once per distinct input
+    instead of once per asset.
+    """
+
+    def __init__(self):
+        self._profiles: "WeakValueDictionary[Hashable, SlotProfile]" = WeakValueDictionary()
+        # id of the input profile -> (input profile, content key), in order to hash each input
+        # profile only once. The input profile is referenced so that its id is not reused.
+        self._input_content_keys: Dict[int, Tuple[object, Hashable]] = {}
+
+    def _get_content_key(self, profile) -> Optional[Hashable]:
+        if isinstance(profile, (bool, int, float, str)):
+            return type(profile).__name__, profile
+        if not isinstance(profile, dict):
+            return None
+        cached = self._input_content_keys.get(id(profile))
+        if cached is not None and cached[0] is profile:
+            return cached[1]
+        digest = hashlib.sha1(repr(sorted(
+            (str(key), value) for key, value in profile.items())).encode()).hexdigest()
+        content_key = ("dict", digest)
+        self._input_content_keys[id(profile)] = (profile, content_key)
+        return content_key
+
+    def get_profile(self, profile_type: InputProfileTypes, profile,
+                    current_timestamp: DateTime):
+        """Return the expanded profile for the input profile, shared with the other assets.
+
+        If the input profile is a SlotProfile that does not contain the current time stamp, it
+        is rotated, the same way as read_arbitrary_profile rotates an expanded profile."""
+        if isinstance(profile, SlotProfile):
+            # The rotated profile depends on the window of the profile that it is rotated from
+            content_key = profile.content_key
+            cache_key = (profile_type, content_key, profile.start_time)
+        else:
+            content_key = self._get_content_key(profile)
+            cache_key = (profile_type, content_key)
+        if content_key is None:
+            return read_arbitrary_profile(profile_type, profile,
+                                          current_timestamp=current_timestamp)
+
+        shared_profile = self._profiles.get(cache_key)
+        if shared_profile is not None and current_timestamp in shared_profile:
+            return shared_profile
+
+        expanded_profile = read_arbitrary_profile(
+            profile_type, dict(profile) if isinstance(profile, SlotProfile) else profile,
+            current_timestamp=current_timestamp)
+        shared_profile = SlotProfile.from_profile(expanded_profile, content_key)
+        if shared_profile is None:
+            return expanded_profile
+        self._profiles[cache_key] = shared_profile
+        return shared_profile
@@ -2,6 +2,7 @@ import json
 import logging
 from copy import deepcopy
 from threading import Lock
+from typing import Callable, Dict, List, Tuple
 
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.enums import SpotMarketTypeEnum
@@ -11,6 +12,47 @@ from redis import Redis
 
 import gsy_e.constants
 from gsy_e.gsy_e_core.global_objects_singleton import global_objects
+from gsy_e.gsy_e_core.redis_connections.wire_format import (
+    JSON_WIRE_CODEC, WireCodec, decode_payload, get_wire_codec)
+
+
+class AggregatorCommandRouter:
+    """Index of the approved batch commands of the aggregators by area uuid.
+
+    The commands of all transactions are indexed once when they are approved, so that every area
+    only looks up its own commands instead of iterating over all transactions.
+    """
+
+    def __init__(self):
+        # Area uuid -> list of (transaction id, aggregator uuid, commands), in transaction order
+        self._area_commands: Dict[str, List[Tuple[str, str, List[Dict]]]] = {}
+
+    def route(self, batch_commands: Dict) -> None:
+        """Index the commands of the transactions by area uuid."""
+        area_commands = {}
+        for transaction_id, command_to_process in batch_commands.items():
+            if "aggregator_uuid" not in command_to_process:
+                logging.error("Aggregator uuid parameter missing from transaction with "
+                              "id %s. Full command %s.", transaction_id, command_to_process)
+                continue
+            aggregator_uuid = command_to_process["aggregator_uuid"]
+            for area_uuid, commands in command_to_process["batch_commands"].items():
+                if area_uuid not in area_commands:
+                    area_commands[area_uuid] = []
+                area_commands[area_uuid].append((transaction_id, aggregator_uuid, commands))
+        self._area_commands = area_commands
+
+    def pop_area_commands(self, area_uuid: str) -> List[Tuple[str, str, List[Dict]]]:
+        """Remove and return the commands of the area."""
+        return self._area_commands.pop(area_uuid, [])
+
+    def clear(self) -> None:
+        """Discard the commands that were not consumed."""
+        self._area_commands = {}
+
+    def __len__(self) -> int:
+        """Number of areas that have commands."""
+        return len(self._area_commands)
 
 
 class AggregatorHandler:
@@ -22,7 +64,7 @@ class AggregatorHandler:
         self.redis_db = redis_db
         self.pubsub = self.redis_db.pubsub()
         self.pending_batch_commands = {}
-        self.processing_batch_commands = {}
+        self.command_router = AggregatorCommandRouter()
         self.responses_batch_commands = {}
         self.batch_market_cycle_events = {}
         self.batch_tick_events = {}
@@ -30,6 +72,8 @@ class AggregatorHandler:
         self.batch_finished_events = {}
         self.aggregator_device_mapping = {}
         self.device_aggregator_mapping = {}
+        # Wire format that every aggregator requested for its events and command responses
+        self.aggregator_codecs: Dict[str, WireCodec] = {}
         self.lock = Lock()
         self.grid_buffer = {}
 
@@ -43,6 +87,16 @@ class AggregatorHandler:
             for dev in devices
         }
 
+    def get_aggregator_codec(self, aggregator_uuid: str) -> WireCodec:
+        """Return the codec of the wire format of the aggregator."""
+        return self.aggregator_codecs.get(aggregator_uuid, JSON_WIRE_CODEC)
+
+    def _negotiate_wire_format(self, aggregator_uuid: str, message: Dict) -> str:
+        """Select the wire format that the aggregator requested, if any, and return its name."""
+        if message.get("wire_format"):
+            self.aggregator_codecs[aggregator_uuid] = get_wire_codec(message["wire_format"])
+        return self.get_aggregator_codec(aggregator_uuid).name
+
     def is_controlling_device(self, device_uuid):
         """Return if the aggregator is controlling the device with specified uuid."""
         return device_uuid in self.device_aggregator_mapping
@@ -110,7 +164,7 @@ class AggregatorHandler:
 
     def aggregator_callback(self, payload):
         """Entrypoint for aggregator related commands"""
-        message = json.loads(payload["data"])
+        message = decode_payload(payload["data"])
         if gsy_e.constants.EXTERNAL_CONNECTION_WEB is True and \
                 message["config_uuid"] != gsy_e.constants.CONFIGURATION_ID:
             return
@@ -132,7 +186,8 @@ class AggregatorHandler:
             response_message = {
                 "status": "SELECTED", "aggregator_uuid": message["aggregator_uuid"],
                 "device_uuid": message["device_uuid"],
-                "transaction_id": message["transaction_id"]}
+                "transaction_id": message["transaction_id"],
+                "wire_format": self._negotiate_wire_format(message["aggregator_uuid"], message)}
         elif message["device_uuid"] in self.device_aggregator_mapping:
             msg = f"Device already have selected " \
                   f"{self.device_aggregator_mapping[message['device_uuid']]}"
@@ -149,7 +204,8 @@ class AggregatorHandler:
             response_message = {
                 "status": "SELECTED", "aggregator_uuid": message["aggregator_uuid"],
                 "device_uuid": message["device_uuid"],
-                "transaction_id": message["transaction_id"]}
+                "transaction_id": message["transaction_id"],
+                "wire_format": self._negotiate_wire_format(message["aggregator_uuid"], message)}
         self.redis_db.publish(
             AggregatorChannels().response, json.dumps(response_message)
         )
@@ -186,7 +242,8 @@ class AggregatorHandler:
                 self.aggregator_device_mapping[message["transaction_id"]] = []
             success_response_message = {
                 "status": "ready", "name": message["name"],
-                "transaction_id": message["transaction_id"]}
+                "transaction_id": message["transaction_id"],
+                "wire_format": self._negotiate_wire_format(message["transaction_id"], message)}
             self.redis_db.publish(
                 AggregatorChannels().response, json.dumps(success_response_message)
             )
@@ -202,6 +259,7 @@ class AggregatorHandler:
     def _delete_aggregator(self, message):
         if message["aggregator_uuid"] in self.aggregator_device_mapping:
             del self.aggregator_device_mapping[message["aggregator_uuid"]]
+            self.aggregator_codecs.pop(message["aggregator_uuid"], None)
             success_response_message = {
                 "status": "deleted", "aggregator_uuid": message["aggregator_uuid"],
                 "transaction_id": message["transaction_id"]}
@@ -218,7 +276,7 @@ class AggregatorHandler:
 
     def receive_batch_commands_callback(self, payload):
         """Buffer the received batch commands."""
-        batch_command_message = json.loads(payload["data"])
+        batch_command_message = decode_payload(payload["data"])
         transaction_id = batch_command_message["transaction_id"]
         with self.lock:
             self.pending_batch_commands[transaction_id] = {
@@ -230,33 +288,31 @@ class AggregatorHandler:
         """Moves all batch commands over from the pending buffer to be processed in
         consume_all_area_commands"""
         with self.lock:
-            self.processing_batch_commands = self.pending_batch_commands
+            batch_commands = self.pending_batch_commands
             self.pending_batch_commands = {}
+        self.command_router.route(batch_commands)
 
-    def consume_all_area_commands(self, area_uuid: str, strategy_method):
-        """Processing all batch commands and collecting and sending responses."""
-        for transaction_id, command_to_process in self.processing_batch_commands.items():
-            if "aggregator_uuid" not in command_to_process:
-                logging.error("Aggregator uuid parameter missing from transaction with "
-                              "id %s. Full command %s.", transaction_id, command_to_process)
-                continue
-            aggregator_uuid = command_to_process["aggregator_uuid"]
-            area_commands = command_to_process["batch_commands"].pop(area_uuid, None)
-            if area_commands is None:
-                continue
-
+    def consume_all_area_commands(self, area_uuid: str, strategy_method: Callable):
+        """Processing all batch commands of the area and collecting the responses."""
+        area_commands = self.command_router.pop_area_commands(area_uuid)
+        if not area_commands:
+            return
+        for transaction_id, aggregator_uuid, commands in area_commands:
             response = [strategy_method({**command, "transaction_id": transaction_id})
-                        for command in area_commands]
+                        for command in commands]
             if transaction_id not in self.responses_batch_commands:
-                self.responses_batch_commands[transaction_id] = {aggregator_uuid: {}}
-            if area_uuid not in self.responses_batch_commands[transaction_id][aggregator_uuid]:
-                self.responses_batch_commands[transaction_id][aggregator_uuid] \
-                    .update({area_uuid: []})
-            self.responses_batch_commands[transaction_id][aggregator_uuid][area_uuid] \
-                .extend(response)
-
-    @staticmethod
-    def _publish_all_events_from_one_type(redis, event_dict: dict, event_type: str):
+                self.responses_batch_commands[transaction_id] = {}
+            aggregator_responses = self.responses_batch_commands[transaction_id]
+            if aggregator_uuid not in aggregator_responses:
+                aggregator_responses[aggregator_uuid] = {}
+            if area_uuid not in aggregator_responses[aggregator_uuid]:
+                aggregator_responses[aggregator_uuid][area_uuid] = response
+            else:
+                aggregator_responses[aggregator_uuid][area_uuid].extend(response)
+        # The commands can change the orders, the energy forecasts or the grid fees
+        global_objects.external_global_stats.mark_area_dirty(area_uuid)
+
+    def _publish_all_events_from_one_type(self, redis, event_dict: dict, event_type: str):
         """Reading from the event buffers and publishing all events of one type to the clients
         Args:
             redis: ExternalConnectionCommunicator
@@ -277,7 +333,7 @@ class AggregatorHandler:
                         100 / gsy_e.constants.DISPATCH_EVENT_TICK_FREQUENCY_PERCENT)
             redis.publish_json(
                 AggregatorChannels(gsy_e.constants.CONFIGURATION_ID, aggregator_uuid).events,
-                publish_event_dict)
+                publish_event_dict, self.get_aggregator_codec(aggregator_uuid))
 
         event_dict.clear()
 
@@ -307,8 +363,9 @@ class AggregatorHandler:
                         "transaction_id": transaction_id,
                         "aggregator_uuid": aggregator_uuid,
                         "responses": response_body
-                     }
+                     },
+                    self.get_aggregator_codec(aggregator_uuid)
                 )
 
         self.responses_batch_commands = {}
-        self.processing_batch_commands = {}
+        self.command_router.clear()
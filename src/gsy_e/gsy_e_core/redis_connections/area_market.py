@@ -15,12 +15,11 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-import json
 import logging
 from collections.abc import Callable
 from threading import Event, Lock, Thread
 from time import time
-from typing import Dict
+from typing import Dict, Optional, Union
 
 from gsy_framework.redis_channels import QueueNames, AggregatorChannels
 from redis import Redis
@@ -30,6 +29,7 @@ import gsy_e.constants
 from gsy_e.constants import REDIS_PUBLISH_RESPONSE_TIMEOUT
 from gsy_e.gsy_e_core.redis_connections.aggregator import AggregatorHandler
 from gsy_e.gsy_e_core.redis_connections.simulation import REDIS_URL
+from gsy_e.gsy_e_core.redis_connections.wire_format import JSON_WIRE_CODEC, WireCodec
 
 log = logging.getLogger(__name__)
 REDIS_THREAD_JOIN_TIMEOUT = 2
@@ -44,11 +44,18 @@ class RedisCommunicator:
         self.pubsub = self.redis_db.pubsub()
         self.pubsub_response = self.redis_db.pubsub()
         self.event = Event()
+        # Wire format of the published messages, that can be negotiated with the client
+        self.codec: WireCodec = JSON_WIRE_CODEC
 
-    def publish(self, channel: str, data: str):
+    def publish(self, channel: str, data: Union[str, bytes]):
         """Publish message on redis channel."""
         self.redis_db.publish(channel, data)
 
+    def publish_json(self, channel: str, data: Dict, codec: Optional[WireCodec] = None):
+        """Publish json serializable dict to redis channel, encoded in the wire format of the
+        codec, or else of the communicator."""
+        self.publish(channel, (codec or self.codec).encode(data))
+
     def wait(self):
         """Wait for thread event to be performed."""
         self.event.wait()
@@ -131,18 +138,14 @@ class ResettableCommunicator(RedisCommunicator):
         thread = super().sub_to_response(channel, callback)
         self.thread = thread
 
-    def publish_json(self, channel: str, data: Dict):
-        """Publish json serializable dict to redis channel."""
-        self.publish(channel, json.dumps(data))
-
 
 class RQResettableCommunicator(ResettableCommunicator):
     """Communicator for sending messages using redis queue."""
 
-    def publish_json(self, channel: str, data: Dict) -> None:
+    def publish_json(self, channel: str, data: Dict, codec: Optional[WireCodec] = None) -> None:
         """Publish json serializable dict to redis queue."""
         queue = Queue(QueueNames().sdk_communication, connection=self.redis_db)
-        queue.enqueue(channel, json.dumps(data))
+        queue.enqueue(channel, (codec or self.codec).encode(data))
 
 
 class ExternalConnectionCommunicator(ResettableCommunicator):
@@ -32,6 +32,7 @@ from rq import get_current_job
 from rq.exceptions import NoSuchJobError
 
 from gsy_e.gsy_e_core.exceptions import LiveEventException
+from gsy_e.gsy_e_core.global_objects_singleton import global_objects
 
 log = getLogger(__name__)
 
@@ -107,7 +108,10 @@ class RedisSimulationCommunication:
     def _area_map_callback(self, _) -> None:
         """Trigger the calculation of area uuid and name mapping and publish it
         back to a redis response channel"""
-        area_mapping = self._area_uuid_name_map_wrapper(self._area)
+        if global_objects.area_registry.is_built_for(self._area):
+            area_mapping = {area.uuid: area.name for area in global_objects.area_registry}
+        else:
+            area_mapping = self._area_uuid_name_map_wrapper(self._area)
         response_dict = {"area_mapping": area_mapping}
         self._publish_json(self.channel_names.response_channel("area-map"), response_dict)
 
@@ -0,0 +1,103 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import json
+import logging
+import zlib
+from typing import Any, Dict, Optional, Union
+
+import msgpack
+
+import gsy_e.constants
+
+log = logging.getLogger(__name__)
+
+# First byte of the binary frames. 0xc1 is never used by msgpack and is not a valid first byte of
+# UTF-8 encoded JSON, therefore binary and JSON payloads can be told apart by their first byte.
+BINARY_FRAME_MARKER = 0xc1
+_ZLIB_COMPRESSED_FLAG = 0x01
+# Smaller payloads are not compressed, because zlib does not pay off for them
+MIN_COMPRESSED_PAYLOAD_SIZE = 1024
+
+
+class JSONWireCodec:
+    """Default wire format, that encodes the payloads as JSON text."""
+
+    name = "json"
+
+    @staticmethod
+    def encode(data: Any) -> str:
+        """Encode the payload."""
+        return json.dumps(data)
+
+
+class MsgpackWireCodec:
+    """Compact binary wire format.
+
+    Every frame consists of the marker byte, a flags byte and the msgpack encoded payload, which
+    is compressed with zlib if compression is enabled and the payload is large enough.
+    """
+
+    def __init__(self, compress: bool):
+        self.compress = compress
+        self.name = "msgpack+zlib" if compress else "msgpack"
+
+    def encode(self, data: Any) -> bytes:
+        """Encode the payload."""
+        payload = msgpack.packb(data, use_bin_type=True)
+        flags = 0
+        if self.compress and len(payload) >= MIN_COMPRESSED_PAYLOAD_SIZE:
+            payload = zlib.compress(payload, 1)
+            flags |= _ZLIB_COMPRESSED_FLAG
+        return bytes((BINARY_FRAME_MARKER, flags)) + payload
+
+
+WireCodec = Union[JSONWireCodec, MsgpackWireCodec]
+
+JSON_WIRE_CODEC = JSONWireCodec()
+
+WIRE_CODECS: Dict[str, WireCodec] = {
+    codec.name: codec
+    for codec in (JSON_WIRE_CODEC, MsgpackWireCodec(compress=False),
+                  MsgpackWireCodec(compress=True))}
+
+
+def get_wire_codec(wire_format: Optional[str]) -> WireCodec:
+    """Return the codec of the wire format that a client requested, JSON if none or an
+    unsupported one was requested."""
+    if not wire_format:
+        return JSON_WIRE_CODEC
+    if wire_format not in WIRE_CODECS:
+        log.warning("Wire format %s is not supported, falling back to %s.",
+                    wire_format, JSON_WIRE_CODEC.name)
+        return JSON_WIRE_CODEC
+    return WIRE_CODECS[wire_format]
+
+
+def get_internal_wire_codec() -> WireCodec:
+    """Return the codec of the channels between the processes of the simulation."""
+    return get_wire_codec(gsy_e.constants.REDIS_WIRE_FORMAT)
+
+
+def decode_payload(data: Union[str, bytes]) -> Any:
+    """Decode a payload that was encoded with any of the wire formats."""
+    if isinstance(data, (bytes, bytearray)) and data[:1] == bytes((BINARY_FRAME_MARKER,)):
+        payload = memoryview(data)[2:]
+        if data[1] & _ZLIB_COMPRESSED_FLAG:
+            payload = zlib.decompress(payload)
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    return json.loads(data)
@@ -235,13 +235,21 @@ def _handle_scm_past_slots_simulation_run(
     config.sim_duration = config.end_date - config.start_date
     GlobalConfig.sim_duration = config.sim_duration
     gsy_e.constants.RUN_IN_REALTIME = False
-    simulation_state = run_simulation(
-        setup_module_name=scenario_name,
-        simulation_config=config,
-        simulation_events=events,
-        redis_job_id=job_id,
-        saved_sim_state=saved_state,
-        slot_length_realtime=slot_length_realtime,
-        kwargs=kwargs)
+    # The past slots are replayed as fast as possible, therefore the SCM results of all homes are
+    # calculated by the VectorizedSCMManager. The slots are still calculated one at a time,
+    # because the profiles and the dynamic coefficients are updated on every market cycle.
+    vectorized_scm_manager = gsy_e.constants.VECTORIZED_SCM_MANAGER
+    gsy_e.constants.VECTORIZED_SCM_MANAGER = True
+    try:
+        simulation_state = run_simulation(
+            setup_module_name=scenario_name,
+            simulation_config=config,
+            simulation_events=events,
+            redis_job_id=job_id,
+            saved_sim_state=saved_state,
+            slot_length_realtime=slot_length_realtime,
+            kwargs=kwargs)
+    finally:
+        gsy_e.constants.VECTORIZED_SCM_MANAGER = vectorized_scm_manager
     gsy_e.constants.RUN_IN_REALTIME = True
     return simulation_state
@@ -0,0 +1,179 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import csv
+import json
+import os
+import pathlib
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+METADATA_FILE_NAME = "metadata.json"
+
+
+def _to_column_array(values: List) -> np.ndarray:
+    """Convert the values of a column to an integer, float or string array."""
+    if all(isinstance(value, int) and not isinstance(value, bool) for value in values):
+        return np.array(values, dtype=np.int64)
+    if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+        return np.array(values, dtype=np.float64)
+    return np.array(["" if value is None else str(value) for value in values], dtype=str)
+
+
+def _concatenate_columns(arrays: List[np.ndarray]) -> np.ndarray:
+    """Concatenate the arrays of a column.
+
+    If the partitions have different kinds, the column is concatenated as strings if any of them
+    holds strings, otherwise as Python objects, so that the values of the integer partitions are
+    not converted to floats (e.g. 0 is still written as "0" instead of "0.0" to the CSV files).
+    """
+    kinds = {array.dtype.kind for array in arrays}
+    if len(kinds) > 1:
+        dtype = str if "U" in kinds else object
+        arrays = [array.astype(dtype) for array in arrays]
+    return np.concatenate(arrays)
+
+
+class _ColumnBuffer:
+    """Rows of one record type with the same labels, buffered per column."""
+
+    def __init__(self, labels: Sequence[str]):
+        self.labels = list(labels)
+        self.area_uuids: List[str] = []
+        self.columns: List[List] = [[] for _ in self.labels]
+        self.partition_count = 0
+
+    def __len__(self) -> int:
+        return len(self.area_uuids)
+
+    def append_rows(self, area_uuid: str, rows: Iterable[Sequence]) -> None:
+        """Append the values of the rows to the columns."""
+        for row in rows:
+            self.area_uuids.append(area_uuid)
+            for column, value in zip(self.columns, row):
+                column.append(value)
+
+    def write_partition(self, file_path: pathlib.Path) -> None:
+        """Write the buffered rows to a compressed partition file and clear the buffer."""
+        np.savez_compressed(
+            file_path, area_uuid=np.array(self.area_uuids, dtype=str),
+            **{f"column_{index}": _to_column_array(column)
+               for index, column in enumerate(self.columns)})
+        self.partition_count += 1
+        self.area_uuids = []
+        self.columns = [[] for _ in self.labels]
+
+
+class ColumnarResultsExporter:
+    """Export the results rows as one columnar dataset per record type.
+
+    The rows are buffered per column and written in compressed partitions of up to batch_rows
+    rows, therefore the number of files depends on the number of rows instead of the number of
+    areas. Each row is keyed by the uuid of its area, and the first column is the slot. The
+    datasets also keep the path of the CSV file of each area, so that the per-area CSV files can
+    be derived from them.
+    """
+
+    def __init__(self, directory: pathlib.Path, batch_rows: int):
+        self.directory = pathlib.Path(directory)
+        self.batch_rows = max(batch_rows, 1)
+        self._buffers: Dict[str, List[_ColumnBuffer]] = {}
+        # Record type -> area uuid -> path of the CSV file of the area, relative to the export
+        # directory, and the index of the labels of its rows
+        self._csv_files: Dict[str, Dict[str, Tuple[str, int]]] = {}
+
+    def _get_buffer(self, record_type: str, labels: Sequence[str]) -> Tuple[int, _ColumnBuffer]:
+        buffers = self._buffers.setdefault(record_type, [])
+        for index, buffer in enumerate(buffers):
+            if buffer.labels == list(labels):
+                return index, buffer
+        buffers.append(_ColumnBuffer(labels))
+        return len(buffers) - 1, buffers[-1]
+
+    def append_rows(self, record_type: str, area_uuid: str, csv_path: str,
+                    labels: Sequence[str], rows: Iterable[Sequence]) -> None:
+        """Append the rows of the area to the dataset of the record type."""
+        index, buffer = self._get_buffer(record_type, labels)
+        self._csv_files.setdefault(record_type, {})[area_uuid] = (csv_path, index)
+        buffer.append_rows(area_uuid, rows)
+        if len(buffer) >= self.batch_rows:
+            self._write_partition(record_type, index, buffer)
+
+    def _write_partition(self, record_type: str, index: int, buffer: _ColumnBuffer) -> None:
+        record_directory = pathlib.Path(self.directory, record_type)
+        record_directory.mkdir(exist_ok=True, parents=True)
+        buffer.write_partition(pathlib.Path(
+            record_directory, f"part-{index:03d}-{buffer.partition_count:05d}.npz"))
+
+    def flush(self) -> None:
+        """Write all buffered rows and the metadata of the datasets."""
+        self.directory.mkdir(exist_ok=True, parents=True)
+        for record_type, buffers in self._buffers.items():
+            for index, buffer in enumerate(buffers):
+                if len(buffer) > 0:
+                    self._write_partition(record_type, index, buffer)
+        metadata = {
+            record_type: {
+                "schemas": [buffer.labels for buffer in buffers],
+                "csv_files": self._csv_files.get(record_type, {})}
+            for record_type, buffers in self._buffers.items()}
+        with open(pathlib.Path(self.directory, METADATA_FILE_NAME), "w",
+                  encoding="utf-8") as metadata_file:
+            json.dump(metadata, metadata_file, indent=2)
+
+
+def read_columnar_dataset(directory: str, record_type: str) -> List[Dict[str, np.ndarray]]:
+    """Read the dataset of the record type, as one dict of columns per set of labels.
+
+    Each dict contains the area_uuid column, followed by the columns of the labels."""
+    with open(os.path.join(directory, METADATA_FILE_NAME), encoding="utf-8") as metadata_file:
+        schemas = json.load(metadata_file)[record_type]["schemas"]
+    record_directory = pathlib.Path(directory, record_type)
+    tables = []
+    for index, labels in enumerate(schemas):
+        partitions = []
+        for file_path in sorted(record_directory.glob(f"part-{index:03d}-*.npz")):
+            with np.load(file_path) as partition:
+                partitions.append([partition["area_uuid"]] + [
+                    partition[f"column_{column}"] for column in range(len(labels))])
+        tables.append({
+            name: (_concatenate_columns([partition[column] for partition in partitions])
+                   if partitions else np.array([], dtype=str))
+            for column, name in enumerate(["area_uuid"] + labels)})
+    return tables
+
+
+def write_area_csv_files(directory: str, csv_directory: str) -> None:
+    """Derive the per-area CSV files from the columnar datasets."""
+    with open(os.path.join(directory, METADATA_FILE_NAME), encoding="utf-8") as metadata_file:
+        metadata = json.load(metadata_file)
+    for record_type, record_metadata in metadata.items():
+        tables = read_columnar_dataset(directory, record_type)
+        rows_per_area: Dict[Tuple[str, int], List[List]] = {}
+        for index, table in enumerate(tables):
+            columns = [table[label].tolist() for label in record_metadata["schemas"][index]]
+            for row_index, area_uuid in enumerate(table["area_uuid"].tolist()):
+                rows_per_area.setdefault((area_uuid, index), []).append(
+                    [column[row_index] for column in columns])
+        for area_uuid, (csv_path, index) in record_metadata["csv_files"].items():
+            file_path = pathlib.Path(csv_directory, csv_path)
+            file_path.parent.mkdir(exist_ok=True, parents=True)
+            with open(file_path, "w", encoding="utf-8") as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(record_metadata["schemas"][index])
+                writer.writerows(rows_per_area.get((area_uuid, index), []))
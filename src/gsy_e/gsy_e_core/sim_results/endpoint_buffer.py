@@ -17,6 +17,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import logging
 from collections import defaultdict
+from copy import copy
 from typing import TYPE_CHECKING, Dict, Iterable, List
 
 from gsy_framework.constants_limits import (
@@ -28,6 +29,7 @@ from gsy_framework.utils import get_json_dict_memory_allocation_size
 from pendulum import DateTime
 
 from gsy_e.gsy_e_core.sim_results.offer_bids_trades_hr_stats import OfferBidTradeGraphStats
+from gsy_e.gsy_e_core.tick_profiler import tick_profiler
 from gsy_e.gsy_e_core.util import (get_feed_in_tariff_rate_from_config,
                                    get_market_maker_rate_from_config)
 from gsy_e.models.strategy.commercial_producer import CommercialStrategy
@@ -46,6 +48,17 @@ _NO_VALUE = {
 }
 
 
+def is_results_size_valid(result_report: Dict) -> bool:
+    """Check that the serialised result report is small enough to be published."""
+    message_size = get_json_dict_memory_allocation_size(result_report)
+    if message_size > 64000:
+        logging.error("Do not publish message bigger than 64 MB, "
+                      "current message size %s MB.", (message_size / 1000.0))
+        return False
+    logging.debug("Publishing %s KB of data via Redis.", message_size)
+    return True
+
+
 class SimulationResultValidator:
     """Validator class to be used by SimulationEndpointBuffer and CoefficientEndpointBuffer."""
     def __init__(self, is_scm: bool):
@@ -109,18 +122,25 @@ class SimulationEndpointBuffer:
     def prepare_results_for_publish(self) -> Dict:
         """Validate, serialise and check size of the results before sending to gsy-web."""
         result_report = self._generate_result_report()
-
-        message_size = get_json_dict_memory_allocation_size(result_report)
-        if message_size > 64000:
-            logging.error("Do not publish message bigger than 64 MB, "
-                          "current message size %s MB.", (message_size / 1000.0))
+        if not is_results_size_valid(result_report):
             return {}
-        logging.debug("Publishing %s KB of data via Redis.", message_size)
+        return result_report
+
+    def generate_result_report_snapshot(self) -> Dict:
+        """Create the result report for gsy-web, without checking its size.
+
+        The containers that the next update modifies in place are copied, so that the report can
+        be published from another thread while the simulation continues."""
+        result_report = self._generate_result_report()
+        result_report["simulation_state"] = {
+            "general": self.simulation_state["general"],
+            "areas": copy(self.simulation_state["areas"])}
+        result_report["simulation_raw_data"] = copy(self.flattened_area_core_stats_dict)
         return result_report
 
     def generate_json_report(self) -> Dict:
         """Create dict that contains all locally exported statistics (for JSON files)."""
-        return {
+        json_report = {
             "job_id": self.job_id,
             "random_seed": self.random_seed,
             "status": self.status,
@@ -128,6 +148,9 @@ class SimulationEndpointBuffer:
             "simulation_state": self.simulation_state,
             **self.results_handler.all_raw_results
         }
+        if tick_profiler.enabled:
+            json_report["tick_profile"] = tick_profiler.slot_summaries
+        return json_report
 
     def update_stats(self, area: "AreaBase", simulation_status: str,
                      progress_info: "SimulationProgressInfo", sim_state: Dict,
@@ -175,7 +198,7 @@ class SimulationEndpointBuffer:
 
     def _generate_result_report(self) -> Dict:
         """Create dict that contains all statistics that are sent to the gsy-web."""
-        return {
+        result_report = {
             "job_id": self.job_id,
             "current_market": self.spot_market_time_slot_str,
             "current_market_ui_time_slot_str": self.spot_market_ui_time_slot_str,
@@ -187,6 +210,10 @@ class SimulationEndpointBuffer:
             "simulation_raw_data": self.flattened_area_core_stats_dict,
             "configuration_tree": self.area_result_dict
         }
+        if tick_profiler.enabled:
+            # Durations of the phases of the tick loop during the last completed market slot
+            result_report["tick_profile"] = tick_profiler.last_slot_summary
+        return result_report
 
     @staticmethod
     def _structure_results_from_area_object(target_area: "AreaBase") -> Dict:
@@ -25,6 +25,7 @@ from gsy_framework.enums import AvailableMarketTypes, BidOfferMatchAlgoEnum, Spo
 from gsy_e.constants import ROUND_TOLERANCE
 from gsy_e.gsy_e_core.matching_engine_singleton import bid_offer_matcher
 from gsy_e.models.area import Area
+from gsy_e.models.market.trade_ledger import get_trade_ledger
 from gsy_e.models.strategy.load_hours import LoadHoursStrategy
 from gsy_e.models.strategy.pv import PVStrategy
 from gsy_e.models.strategy.scm.load import SCMLoadHoursStrategy, SCMLoadProfileStrategy
@@ -75,13 +76,14 @@ class UpperLevelDataExporter(BaseDataExporter):
 
     @staticmethod
     def _row(slot, market):
+        trade_ledger = get_trade_ledger(market)
         return [slot,
                 market.avg_trade_price,
                 market.min_trade_price,
                 market.max_trade_price,
-                len(market.trades),
-                sum(trade.traded_energy for trade in market.trades),
-                sum(trade.trade_price for trade in market.trades)]
+                trade_ledger.trade_count,
+                trade_ledger.total_traded_energy_kWh,
+                trade_ledger.total_trade_price]
 
 
 class FutureMarketsDataExporter(BaseDataExporter):
@@ -0,0 +1,181 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import json
+import logging
+import os
+import shutil
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+import plotly as py
+import plotly.graph_objs as go
+import plotly.io as pio
+
+_log = logging.getLogger(__name__)
+
+DEFERRED_PLOTS_DIRECTORY = "deferred_plots"
+DEFERRED_PLOTS_MANIFEST = "manifest.json"
+
+_active_renderer: Optional["PlotRenderer"] = None
+
+
+def render_figure_json(figure_json: str, output_file: str) -> None:
+    """Render the plotly figure that was serialized to JSON to an HTML file."""
+    py.offline.plot(pio.from_json(figure_json), filename=output_file, auto_open=False)
+
+
+def write_figure(figure: go.Figure, output_file: str) -> None:
+    """Render the figure to an HTML file, with the active plot renderer if there is one."""
+    if _active_renderer is None:
+        py.offline.plot(figure, filename=output_file, auto_open=False)
+    else:
+        _active_renderer.add(figure, output_file)
+
+
+def move_root_plot_folder(plot_dir: str, root_slug: str) -> None:
+    """Move the plots of the root area to the plot directory."""
+    old_dir = os.path.join(plot_dir, root_slug)
+    if not os.path.isdir(old_dir):
+        _log.error("PLOT ERROR: No plots were generated for %s "
+                   "under %s", root_slug, plot_dir)
+        return
+    source = os.listdir(old_dir)
+    for si in source:
+        shutil.move(os.path.join(old_dir, si), plot_dir)
+    shutil.rmtree(old_dir)
+
+
+class PlotRenderer:
+    """Render the figures of the results plots to HTML files, as a separate stage.
+
+    The figures are serialized to JSON and either rendered by a pool of worker processes, or
+    written to the deferred plots directory in order to be rendered on demand by
+    render_deferred_plots. Without workers and deferral, the figures are rendered immediately.
+    """
+
+    def __init__(self, plot_dir: str, root_slug: str, workers: int = 0, defer: bool = False):
+        self._plot_dir = plot_dir
+        self._root_slug = root_slug
+        self._defer = defer
+        self._executor = (ProcessPoolExecutor(max_workers=workers)
+                          if workers > 0 and not defer else None)
+        self._max_pending_renders = 2 * workers
+        self._pending_renders: List[Future] = []
+        self._deferred_plots: List[dict] = []
+        self._deferred_dir = os.path.join(plot_dir, DEFERRED_PLOTS_DIRECTORY)
+
+    def add(self, figure: go.Figure, output_file: str) -> None:
+        """Render the figure to the output file, or defer its rendering."""
+        if self._defer:
+            os.makedirs(self._deferred_dir, exist_ok=True)
+            figure_file = f"{len(self._deferred_plots):06d}.json"
+            with open(os.path.join(self._deferred_dir, figure_file), "w",
+                      encoding="utf-8") as outfile:
+                outfile.write(figure.to_json())
+            self._deferred_plots.append({
+                "figure_file": figure_file,
+                "output_file": os.path.relpath(output_file, self._plot_dir)})
+        elif self._executor is not None:
+            if len(self._pending_renders) >= self._max_pending_renders:
+                # Limit the number of serialized figures that wait for a worker
+                done, pending = wait(self._pending_renders, return_when=FIRST_COMPLETED)
+                self._check_renders(done)
+                self._pending_renders = list(pending)
+            self._pending_renders.append(self._executor.submit(
+                render_figure_json, figure.to_json(), output_file))
+        else:
+            py.offline.plot(figure, filename=output_file, auto_open=False)
+
+    @staticmethod
+    def _check_renders(renders: Iterator[Future]) -> None:
+        for render in renders:
+            if render.exception() is not None:
+                _log.error("Could not render plot: %s", render.exception())
+
+    def close(self) -> None:
+        """Wait for the rendering of the figures, then move the plots of the root area to the
+        plot directory. The deferred plots are moved once they are rendered."""
+        if self._executor is not None:
+            self._check_renders(wait(self._pending_renders).done)
+            self._pending_renders = []
+            self._executor.shutdown()
+        if self._defer:
+            os.makedirs(self._deferred_dir, exist_ok=True)
+            with open(os.path.join(self._deferred_dir, DEFERRED_PLOTS_MANIFEST), "w",
+                      encoding="utf-8") as outfile:
+                json.dump({"root_slug": self._root_slug, "plots": self._deferred_plots},
+                          outfile, indent=2)
+            _log.info("Plot rendering was deferred, render the plots with "
+                      "'gsy-e render-plots %s'.", self._plot_dir)
+        else:
+            move_root_plot_folder(self._plot_dir, self._root_slug)
+
+    def abort(self) -> None:
+        """Cancel the figures that wait to be rendered and stop the worker processes."""
+        if self._executor is not None:
+            for render in self._pending_renders:
+                render.cancel()
+            self._pending_renders = []
+            self._executor.shutdown()
+
+
+@contextmanager
+def plot_rendering(renderer: PlotRenderer) -> Iterator[PlotRenderer]:
+    """Render the figures that are written inside the context with the renderer."""
+    global _active_renderer  # pylint: disable=global-statement
+    previous_renderer, _active_renderer = _active_renderer, renderer
+    try:
+        yield renderer
+    except BaseException:
+        renderer.abort()
+        raise
+    else:
+        renderer.close()
+    finally:
+        _active_renderer = previous_renderer
+
+
+def _render_figure_file(figure_file: str, output_file: str) -> None:
+    with open(figure_file, encoding="utf-8") as infile:
+        render_figure_json(infile.read(), output_file)
+
+
+def render_deferred_plots(plot_dir: str, workers: int = 0) -> int:
+    """Render the plots that were deferred in the plot directory and return their count."""
+    deferred_dir = os.path.join(plot_dir, DEFERRED_PLOTS_DIRECTORY)
+    with open(os.path.join(deferred_dir, DEFERRED_PLOTS_MANIFEST), encoding="utf-8") as infile:
+        manifest = json.load(infile)
+
+    figure_files, output_files = [], []
+    for plot in manifest["plots"]:
+        figure_files.append(os.path.join(deferred_dir, plot["figure_file"]))
+        output_files.append(os.path.join(plot_dir, plot["output_file"]))
+        os.makedirs(os.path.dirname(output_files[-1]), exist_ok=True)
+
+    if workers > 0:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for _ in executor.map(_render_figure_file, figure_files, output_files):
+                pass
+    else:
+        for figure_file, output_file in zip(figure_files, output_files):
+            _render_figure_file(figure_file, output_file)
+
+    move_root_plot_folder(plot_dir, manifest["root_slug"])
+    shutil.rmtree(deferred_dir)
+    return len(figure_files)
@@ -18,12 +18,12 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import os
 
 import pendulum
-import plotly as py
 import plotly.graph_objs as go
 
 from gsy_framework.utils import limit_float_precision
 from gsy_e.constants import TIME_ZONE
 from gsy_e.data_classes import PlotDescription
+from gsy_e.gsy_e_core.sim_results.plot_renderer import write_figure
 from gsy_e.models.strategy.commercial_producer import CommercialStrategy
 from gsy_e.models.strategy.finite_power_plant import FinitePowerPlant
 from gsy_e.models.strategy.infinite_bus import InfiniteBusStrategy
@@ -184,7 +184,7 @@ class PlotlyGraph:
                           yaxis=dict(title=ytitle), xaxis=dict(title=xtitle),
                           font=dict(size=16), showlegend=False, sliders=sliders)
 
-        py.offline.plot(fig, filename=output_file, auto_open=False)
+        write_figure(fig, output_file)
 
     @classmethod
     def plot_bar_graph(cls, plot_desc: PlotDescription, iname: str,
@@ -201,7 +201,7 @@ class PlotlyGraph:
             plot_desc, time_range, showlegend, hovermode=hovermode
         )
         fig = go.Figure(data=data, layout=layout)
-        py.offline.plot(fig, filename=iname, auto_open=False)
+        write_figure(fig, iname)
 
     @classmethod
     def plot_line_graph(cls, plot_desc: PlotDescription, iname: str, xmax: int):
@@ -209,7 +209,7 @@ class PlotlyGraph:
         layout = cls._common_layout(plot_desc, [0, xmax])
 
         fig = go.Figure(data=plot_desc.data, layout=layout)
-        py.offline.plot(fig, filename=iname, auto_open=False)
+        write_figure(fig, iname)
 
     @classmethod
     def _plot_line_time_series(cls, device_dict, var_name):
@@ -586,7 +586,7 @@ class PlotlyGraph:
             return
 
         fig = go.Figure(data=data, layout=layout)
-        py.offline.plot(fig, filename=output_file, auto_open=False)
+        write_figure(fig, output_file)
 
     @staticmethod
     def _device_plot_layout(barmode, title, xaxis_caption, yaxis_caption_list):
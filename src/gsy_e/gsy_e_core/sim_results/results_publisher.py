@@ -0,0 +1,71 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import logging
+from queue import Queue
+from threading import Thread
+from typing import Dict, Optional
+
+from gsy_e.gsy_e_core.sim_results.endpoint_buffer import is_results_size_valid
+
+log = logging.getLogger(__name__)
+
+
+class ResultsPublisher:
+    """Publish the results reports to the message broker from a background thread.
+
+    The reports are handed over through a bounded queue: if the broker falls behind, the
+    simulation blocks until a report was published, instead of accumulating reports in memory.
+    With a queue size of 0, the reports are published by the calling thread.
+    """
+
+    def __init__(self, kafka_connection, queue_size: int):
+        self.kafka_connection = kafka_connection
+        self._queue: Optional[Queue] = None
+        self._thread: Optional[Thread] = None
+        if queue_size > 0:
+            self._queue = Queue(maxsize=queue_size)
+            self._thread = Thread(target=self._publish_queued_results, daemon=True,
+                                  name="results-publisher")
+            self._thread.start()
+
+    def publish(self, results: Dict, simulation_id: str) -> None:
+        """Publish the results report, or queue it if publishing in the background."""
+        if self._queue is None:
+            self._publish(results, simulation_id)
+        else:
+            self._queue.put((results, simulation_id))
+
+    def flush(self) -> None:
+        """Wait until all queued results reports were published."""
+        if self._queue is not None:
+            self._queue.join()
+
+    def _publish_queued_results(self) -> None:
+        while True:
+            results, simulation_id = self._queue.get()
+            try:
+                self._publish(results, simulation_id)
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Failed to publish the results of simulation %s.", simulation_id)
+            finally:
+                self._queue.task_done()
+
+    def _publish(self, results: Dict, simulation_id: str) -> None:
+        if not is_results_size_valid(results):
+            results = {}
+        self.kafka_connection.publish(results, simulation_id)
@@ -29,6 +29,7 @@ from gsy_e.constants import DATE_TIME_FORMAT, TIME_ZONE
 from gsy_e.gsy_e_core.export import CoefficientExportAndPlot, ExportAndPlot
 from gsy_e.gsy_e_core.sim_results.endpoint_buffer import (
     CoefficientEndpointBuffer, SimulationEndpointBuffer)
+from gsy_e.gsy_e_core.sim_results.results_publisher import ResultsPublisher
 from gsy_e.models.area.scm_manager import SCMManager
 
 if TYPE_CHECKING:
@@ -38,6 +39,9 @@ if TYPE_CHECKING:
 
 log = getLogger(__name__)
 
+# Statuses after which the simulation does not publish any more results
+TERMINAL_SIMULATION_STATUSES = ("finished", "stopped", "timed-out")
+
 
 class SimulationResultsManager:
     # pylint: disable=too-many-instance-attributes
@@ -56,6 +60,7 @@ class SimulationResultsManager:
         self._endpoint_buffer = None
         self._export = None
         self._scm_manager = None
+        self._results_publisher = None
 
     def init_results(self, redis_job_id: str, area: "AreaBase",
                      config_params: "SimulationSetup") -> None:
@@ -74,6 +79,24 @@ class SimulationResultsManager:
         """Flag that decides whether to send results to the gsy-web"""
         return not self.started_from_cli and self.kafka_connection.is_enabled()
 
+    def _publish_results(self, simulation_id: str, simulation_status: str) -> None:
+        """Publish the results of the endpoint buffer to the message broker."""
+        if gsy_e.constants.RESULTS_PUBLISH_QUEUE_SIZE <= 0:
+            results = self._endpoint_buffer.prepare_results_for_publish()
+            if results is None:
+                return
+            self.kafka_connection.publish(results, simulation_id)
+            return
+
+        if self._results_publisher is None:
+            self._results_publisher = ResultsPublisher(
+                self.kafka_connection, gsy_e.constants.RESULTS_PUBLISH_QUEUE_SIZE)
+        self._results_publisher.publish(
+            self._endpoint_buffer.generate_result_report_snapshot(), simulation_id)
+        if simulation_status in TERMINAL_SIMULATION_STATUSES:
+            # The process might exit or run another simulation after publishing the last results
+            self._results_publisher.flush()
+
     def update_and_send_results(self, simulation: "Simulation"):
         """Update the simulation results.
 
@@ -90,10 +113,7 @@ class SimulationResultsManager:
                 progress_info,
                 current_state,
                 calculate_results=False)
-            results = self._endpoint_buffer.prepare_results_for_publish()
-            if results is None:
-                return
-            self.kafka_connection.publish(results, current_state["simulation_id"])
+            self._publish_results(current_state["simulation_id"], simulation.status.status)
 
         elif (gsy_e.constants.RETAIN_PAST_MARKET_STRATEGIES_STATE or
                 self.export_results_on_finish):
@@ -192,10 +212,7 @@ class CoefficientSimulationResultsManager(SimulationResultsManager):
                 area, simulation_status, progress_info, current_state,
                 False, self._scm_manager)
             self._endpoint_buffer.simulation_progress["scm_past_slots"] = scm_past_slots
-            results = self._endpoint_buffer.prepare_results_for_publish()
-            if results is None:
-                return
-            self.kafka_connection.publish(results, current_state["simulation_id"])
+            self._publish_results(current_state["simulation_id"], simulation_status)
 
         elif (gsy_e.constants.RETAIN_PAST_MARKET_STRATEGIES_STATE or
               self.export_results_on_finish):
@@ -29,6 +29,7 @@ from gsy_framework.utils import format_datetime, str_to_pendulum_datetime
 from pendulum import DateTime, Duration, duration
 
 import gsy_e.constants
+from gsy_e.gsy_e_core.checkpoint import SimulationCheckpointer, read_checkpoint
 from gsy_e.gsy_e_core.exceptions import SimulationException
 from gsy_e.gsy_e_core.global_objects_singleton import global_objects
 from gsy_e.gsy_e_core.matching_engine_singleton import bid_offer_matcher
@@ -40,10 +41,13 @@ from gsy_e.gsy_e_core.simulation.setup import SimulationSetup
 from gsy_e.gsy_e_core.simulation.status_manager import SimulationStatusManager
 from gsy_e.gsy_e_core.simulation.time_manager import (
     simulation_time_manager_factory)
-from gsy_e.gsy_e_core.util import NonBlockingConsole
+from gsy_e.gsy_e_core.tick_profiler import tick_profiler
+from gsy_e.gsy_e_core.util import NonBlockingConsole, is_parallel_clearing_enabled
 from gsy_e.models.area.event_deserializer import deserialize_events_to_areas
 from gsy_e.models.area.scm_manager import SCMManager
+from gsy_e.models.area.vectorized_scm_manager import VectorizedSCMManager
 from gsy_e.models.config import SimulationConfig
+from gsy_e.models.strategy.price_schedule import price_schedule_engine
 
 if TYPE_CHECKING:
     from gsy_e.models.area import Area, AreaBase, CoefficientArea
@@ -92,6 +96,12 @@ class Simulation:
         self.area = None
         self.progress_info = SimulationProgressInfo()
         self.simulation_id = redis_job_id
+        self._checkpointer = (
+            SimulationCheckpointer(gsy_e.constants.CHECKPOINT_DIRECTORY,
+                                   gsy_e.constants.CHECKPOINT_SNAPSHOT_INTERVAL_SLOTS)
+            if gsy_e.constants.CHECKPOINT_DIRECTORY else None)
+        tick_profiler.reset(enabled=gsy_e.constants.TICK_PROFILING)
+        price_schedule_engine.reset(enabled=gsy_e.constants.VECTORIZED_PRICE_SCHEDULES)
 
         # order matters here: self.area has to be not-None before _external_events are initiated
         self._init()
@@ -104,6 +114,7 @@ class Simulation:
         global_objects.profiles_handler.activate()
 
         self.area = self._setup.load_setup_module()
+        global_objects.area_registry.build(self.area)
 
         # has to be called after areas are initiated in order to retrieve the profile uuids
         global_objects.profiles_handler.update_time_and_buffer_profiles(
@@ -175,10 +186,12 @@ class Simulation:
     def _cycle_markets(self, slot_no: int) -> None:
         # order matters here;
         # update of ProfilesHandler has to be called before cycle_markets
-        global_objects.profiles_handler.update_time_and_buffer_profiles(
-            self._get_current_market_time_slot(slot_no), area=self.area)
+        with tick_profiler.phase("profile_rotation"):
+            global_objects.profiles_handler.update_time_and_buffer_profiles(
+                self._get_current_market_time_slot(slot_no), area=self.area)
 
-        self.area.cycle_markets()
+        with tick_profiler.phase("cycle_markets"):
+            self.area.cycle_markets()
 
     def _execute_simulation(
             self, slot_resume: int, tick_resume: int, console: NonBlockingConsole = None) -> None:
@@ -204,7 +217,8 @@ class Simulation:
 
             self._external_events.update(self.area)
 
-            self._compute_memory_info()
+            with tick_profiler.phase("memory_info"):
+                self._compute_memory_info()
 
             for tick_no in range(tick_resume, self.config.ticks_per_slot):
                 self._handle_paused(console)
@@ -215,7 +229,8 @@ class Simulation:
                           self.config.ticks_per_slot,
                           slot_no + 1, (tick_no + 1) / self.config.ticks_per_slot * 100)
 
-                self.config.external_redis_communicator.approve_aggregator_commands()
+                with tick_profiler.phase("aggregator_commands"):
+                    self.config.external_redis_communicator.approve_aggregator_commands()
 
                 current_tick_in_slot = tick_no % self.config.ticks_per_slot
                 if (self.config.external_connection_enabled and
@@ -223,14 +238,27 @@ class Simulation:
                             current_tick_in_slot)):
                     global_objects.external_global_stats.update()
 
-                self.area.tick_and_dispatch()
+                if price_schedule_engine.enabled:
+                    with tick_profiler.phase("price_schedules"):
+                        price_schedule_engine.advance(
+                            self.area.current_tick,
+                            self.area.current_tick_in_slot * self.config.tick_length.seconds)
+
+                with tick_profiler.phase("tick_and_dispatch"):
+                    self.area.tick_and_dispatch()
+                if is_parallel_clearing_enabled():
+                    # All areas have placed their orders, clear their markets at once
+                    with tick_profiler.phase("matching"):
+                        bid_offer_matcher.match_recommendations()
                 self.area.execute_actions_after_tick_event()
-                bid_offer_matcher.event_tick(
-                    current_tick_in_slot=current_tick_in_slot,
-                    slot_completion=f"{int((tick_no / self.config.ticks_per_slot) * 100)}%",
-                    market_slot=self.progress_info.next_slot_str)
-                self.config.external_redis_communicator.\
-                    publish_aggregator_commands_responses_events()
+                with tick_profiler.phase("matching"):
+                    bid_offer_matcher.event_tick(
+                        current_tick_in_slot=current_tick_in_slot,
+                        slot_completion=f"{int((tick_no / self.config.ticks_per_slot) * 100)}%",
+                        market_slot=self.progress_info.next_slot_str)
+                with tick_profiler.phase("aggregator_commands"):
+                    self.config.external_redis_communicator.\
+                        publish_aggregator_commands_responses_events()
 
                 self._time.handle_slowdown_and_realtime(tick_no, self.config, self.status)
 
@@ -243,9 +271,13 @@ class Simulation:
 
                 self._external_events.tick_update(self.area)
 
-            self._results.update_csv_on_market_cycle(slot_no, self.area)
+            with tick_profiler.phase("csv_export"):
+                self._results.update_csv_on_market_cycle(slot_no, self.area)
             self.status.handle_incremental_mode()
-            self._results.update_and_send_results(simulation=self)
+            with tick_profiler.phase("results_update"):
+                self._results.update_and_send_results(simulation=self)
+            self._save_checkpoint(slot_no)
+            tick_profiler.end_slot(slot_no)
 
         self._simulation_stopped_finish_actions(slot_count)
 
@@ -261,6 +293,14 @@ class Simulation:
             self.progress_info.log_simulation_finished(paused_duration, self.config)
         self._results.update_and_send_results(simulation=self)
         self._results.save_csv_results(self.area)
+        self._finish_tick_profiling()
+
+    def _finish_tick_profiling(self) -> None:
+        if not tick_profiler.enabled:
+            return
+        tick_profiler.log_summary()
+        if gsy_e.constants.TICK_PROFILE_FOLDED_STACKS_FILE:
+            tick_profiler.export_folded_stacks(gsy_e.constants.TICK_PROFILE_FOLDED_STACKS_FILE)
 
     def _handle_input(self, console: NonBlockingConsole, sleep_period: float = 0) -> None:
         timeout = 0
@@ -359,18 +399,35 @@ class Simulation:
             if self._time.slot_length_realtime else 0
         }
 
+    def _save_checkpoint(self, slot_no: int) -> None:
+        """Write the checkpoint of the simulation state after the market slot was executed."""
+        if self._checkpointer is None:
+            return
+        # The simulation is resumed from the slot after the executed one
+        general_state = {**self.current_state, "slot_number": slot_no + 1}
+        self._checkpointer.save(
+            slot_no + 1, general_state,
+            {area.uuid: area.get_state() for area in global_objects.area_registry})
+
     def _restore_area_state(self, area: "Area", saved_area_state: dict) -> None:
         if area.uuid not in saved_area_state:
             log.warning("Area %s is not part of the saved state. State not restored. "
                         "Simulation id: %s", area.uuid, self.simulation_id)
         else:
             area.restore_state(saved_area_state[area.uuid])
+
+    def _restore_area_tree_state(self, area: "Area", saved_area_state: dict) -> None:
+        self._restore_area_state(area, saved_area_state)
         for child in area.children:
-            self._restore_area_state(child, saved_area_state)
+            self._restore_area_tree_state(child, saved_area_state)
 
     def restore_area_state_all_areas(self, saved_area_state: dict) -> None:
         """Restore state of all areas."""
-        self._restore_area_state(self.area, saved_area_state)
+        if global_objects.area_registry.is_built_for(self.area):
+            for area in global_objects.area_registry:
+                self._restore_area_state(area, saved_area_state)
+        else:
+            self._restore_area_tree_state(self.area, saved_area_state)
 
     def restore_global_state(self, saved_state: dict) -> None:
         """Restore global state of simulation."""
@@ -405,6 +462,7 @@ class CoefficientSimulation(Simulation):
         global_objects.profiles_handler.activate()
 
         self.area = self._setup.load_setup_module()
+        global_objects.area_registry.build(self.area)
 
         # has to be called after areas are initiated in order to retrieve the profile uuids
         global_objects.profiles_handler.update_time_and_buffer_profiles(
@@ -454,10 +512,12 @@ class CoefficientSimulation(Simulation):
     def _cycle_markets(self, slot_no: int) -> None:
         # order matters here;
         # update of ProfilesHandler has to be called before cycle_coefficients_trading
-        global_objects.profiles_handler.update_time_and_buffer_profiles(
-            self._get_current_market_time_slot(slot_no), area=self.area)
+        with tick_profiler.phase("profile_rotation"):
+            global_objects.profiles_handler.update_time_and_buffer_profiles(
+                self._get_current_market_time_slot(slot_no), area=self.area)
 
-        self.area.cycle_coefficients_trading(self.progress_info.current_slot_time)
+        with tick_profiler.phase("cycle_markets"):
+            self.area.cycle_coefficients_trading(self.progress_info.current_slot_time)
 
     def _execute_simulation(
             self, slot_resume: int, _tick_resume: int, console: NonBlockingConsole = None) -> None:
@@ -469,6 +529,10 @@ class CoefficientSimulation(Simulation):
 
         self._time.reset(not_restored_from_state=(slot_resume == 0))
 
+        vectorized_scm_manager = (
+            VectorizedSCMManager(self.area, global_objects.area_registry)
+            if gsy_e.constants.VECTORIZED_SCM_MANAGER else None)
+
         for slot_no in range(slot_resume, slot_count):
             self._handle_paused(console)
 
@@ -476,16 +540,16 @@ class CoefficientSimulation(Simulation):
 
             self._cycle_markets(slot_no)
 
-            self._handle_external_communication()
-
-            scm_manager = SCMManager(self.area, self._get_current_market_time_slot(slot_no))
-
-            self.area.calculate_home_after_meter_data(
-                self.progress_info.current_slot_time, scm_manager)
+            with tick_profiler.phase("aggregator_commands"):
+                self._handle_external_communication()
 
-            scm_manager.calculate_community_after_meter_data()
-            self.area.trigger_energy_trades(scm_manager)
-            scm_manager.accumulate_community_trades()
+            with tick_profiler.phase("scm_calculation"):
+                if vectorized_scm_manager is not None:
+                    scm_manager = vectorized_scm_manager.calculate_time_slot(
+                        self._get_current_market_time_slot(slot_no),
+                        self.progress_info.current_slot_time)
+                else:
+                    scm_manager = self._calculate_scm_manager(slot_no)
 
             if ConstSettings.SCMSettings.MARKET_ALGORITHM == CoefficientAlgorithm.DYNAMIC.value:
                 self.area.change_home_coefficient_percentage(scm_manager)
@@ -493,7 +557,9 @@ class CoefficientSimulation(Simulation):
             # important: SCM manager has to be updated before sending the results
             self._results.update_scm_manager(scm_manager)
 
-            self._results.update_and_send_results(self)
+            with tick_profiler.phase("results_update"):
+                self._results.update_and_send_results(self)
+            self._save_checkpoint(slot_no)
 
             self._external_events.update(self.area)
 
@@ -509,12 +575,25 @@ class CoefficientSimulation(Simulation):
                 self._simulation_stopped_finish_actions(slot_count, status="stopped")
                 return
 
-            self._results.update_csv_files(slot_no, self.progress_info.current_slot_time,
-                                           self.area, scm_manager)
+            with tick_profiler.phase("csv_export"):
+                self._results.update_csv_files(slot_no, self.progress_info.current_slot_time,
+                                               self.area, scm_manager)
             self.status.handle_incremental_mode()
+            tick_profiler.end_slot(slot_no)
 
         self._simulation_stopped_finish_actions(slot_count)
 
+    def _calculate_scm_manager(self, slot_no: int) -> SCMManager:
+        scm_manager = SCMManager(self.area, self._get_current_market_time_slot(slot_no))
+
+        self.area.calculate_home_after_meter_data(
+            self.progress_info.current_slot_time, scm_manager)
+
+        scm_manager.calculate_community_after_meter_data()
+        self.area.trigger_energy_trades(scm_manager)
+        scm_manager.accumulate_community_trades()
+        return scm_manager
+
     def _simulation_stopped_finish_actions(self, slot_count: int, status="finished") -> None:
         self.status.sim_status = status
         self._deactivate_areas(self.area)
@@ -527,6 +606,7 @@ class CoefficientSimulation(Simulation):
         self._results.update_and_send_results(self)
 
         self._results.save_csv_results(self.area)
+        self._finish_tick_profiling()
 
 
 def simulation_class_factory():
@@ -546,6 +626,12 @@ def run_simulation(
         slot_length_realtime: Duration = None, kwargs: dict = None) -> Dict:
     """Initiate simulation class and start simulation."""
     # pylint: disable=too-many-arguments,protected-access
+    if (saved_sim_state is None and gsy_e.constants.RESTORE_FROM_CHECKPOINT and
+            gsy_e.constants.CHECKPOINT_DIRECTORY):
+        saved_sim_state = read_checkpoint(gsy_e.constants.CHECKPOINT_DIRECTORY)
+        if saved_sim_state is None:
+            log.warning("No checkpoint found in %s, the simulation starts from the beginning.",
+                        gsy_e.constants.CHECKPOINT_DIRECTORY)
     try:
         redis_job_id = (
             redis_job_id if not saved_sim_state
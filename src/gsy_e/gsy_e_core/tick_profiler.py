@@ -0,0 +1,181 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from contextlib import nullcontext
+from logging import getLogger
+from time import perf_counter
+from typing import Dict, List, Optional
+
+log = getLogger(__name__)
+
+# Upper bound of the last duration bucket of the histograms, 2 ** 32 us (~72 minutes)
+_MAX_HISTOGRAM_BUCKET = 32
+
+_NULL_PHASE = nullcontext()
+
+
+class PhaseStatistics:
+    """Duration statistics of one phase of the tick loop during one market slot.
+
+    The histogram counts the durations per power-of-two bucket of microseconds."""
+
+    __slots__ = ("count", "total_s", "max_s", "histogram")
+
+    def __init__(self):
+        self.count = 0
+        self.total_s = 0.
+        self.max_s = 0.
+        self.histogram: Dict[int, int] = {}
+
+    def add(self, duration_s: float) -> None:
+        """Add the duration of one execution of the phase."""
+        self.count += 1
+        self.total_s += duration_s
+        self.max_s = max(duration_s, self.max_s)
+        bucket = min(int(duration_s * 1e6).bit_length(), _MAX_HISTOGRAM_BUCKET)
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def serializable_dict(self) -> Dict:
+        """Return the statistics, with the histogram keyed by the bucket upper bound in us."""
+        return {
+            "count": self.count,
+            "total_s": round(self.total_s, 6),
+            "mean_s": round(self.total_s / self.count, 6) if self.count else 0.,
+            "max_s": round(self.max_s, 6),
+            "histogram_us": {f"<{2 ** bucket}": count
+                             for bucket, count in sorted(self.histogram.items())}}
+
+
+class _Phase:
+    __slots__ = ("_profiler", "_name")
+
+    def __init__(self, profiler: "TickProfiler", name: str):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._profiler.start_phase(self._name)
+        return self
+
+    def __exit__(self, *_exc_info):
+        self._profiler.end_phase()
+
+
+class TickProfiler:
+    """Opt-in timers around the phases of the tick loop of the simulation.
+
+    Phases are nested, e.g. the strategies are timed inside of tick_and_dispatch. The inclusive
+    durations of the phases are aggregated per market slot, and the exclusive durations of the
+    stacks of phases are accumulated for the whole simulation, in the collapsed stack format of
+    flame graph tools. When the profiler is disabled, phase() returns a shared no-op context.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.slot_summaries: List[Dict] = []
+        # Stack of the active phases: [name, start time, duration of the child phases]
+        self._stack: List[list] = []
+        self._active_phase_counts: Dict[str, int] = {}
+        self._slot_phases: Dict[str, PhaseStatistics] = {}
+        self._folded_stacks: Dict[str, float] = {}
+
+    def reset(self, enabled: bool) -> None:
+        """Discard the recorded durations and enable or disable the profiler."""
+        self.enabled = enabled
+        self.slot_summaries = []
+        self._stack = []
+        self._active_phase_counts = {}
+        self._slot_phases = {}
+        self._folded_stacks = {}
+
+    def phase(self, name: str, detail: Optional[str] = None):
+        """Return a context manager that times the phase.
+
+        The detail (e.g. the strategy class) is appended to the name of the phase, only if the
+        profiler is enabled."""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, f"{name}:{detail}" if detail else name)
+
+    def start_phase(self, name: str) -> None:
+        """Start the timer of the phase."""
+        self._stack.append([name, perf_counter(), 0.])
+        self._active_phase_counts[name] = self._active_phase_counts.get(name, 0) + 1
+
+    def end_phase(self) -> None:
+        """Stop the timer of the innermost active phase and record its duration."""
+        end_time = perf_counter()
+        name, start_time, children_duration = self._stack[-1]
+        duration_s = end_time - start_time
+        stack_key = ";".join(phase[0] for phase in self._stack)
+        self._folded_stacks[stack_key] = (
+            self._folded_stacks.get(stack_key, 0.) + duration_s - children_duration)
+        self._stack.pop()
+        if self._stack:
+            self._stack[-1][2] += duration_s
+
+        self._active_phase_counts[name] -= 1
+        if self._active_phase_counts[name] == 0:
+            # Only the outermost execution of recursive phases is counted, e.g. of strategies
+            # whose orders trigger the events of other strategies
+            if name not in self._slot_phases:
+                self._slot_phases[name] = PhaseStatistics()
+            self._slot_phases[name].add(duration_s)
+
+    def end_slot(self, slot_number: int) -> Optional[Dict]:
+        """Aggregate the durations of the phases of the market slot and return the summary."""
+        if not self.enabled:
+            return None
+        summary = {
+            "slot_number": slot_number,
+            "phases": {name: statistics.serializable_dict()
+                       for name, statistics in sorted(self._slot_phases.items())}}
+        self.slot_summaries.append(summary)
+        self._slot_phases = {}
+        return summary
+
+    @property
+    def last_slot_summary(self) -> Optional[Dict]:
+        """Summary of the durations of the phases of the last completed market slot."""
+        return self.slot_summaries[-1] if self.slot_summaries else None
+
+    def get_total_durations(self) -> Dict[str, float]:
+        """Return the total inclusive duration of every phase over all completed slots."""
+        total_durations = {}
+        for summary in self.slot_summaries:
+            for name, statistics in summary["phases"].items():
+                total_durations[name] = total_durations.get(name, 0.) + statistics["total_s"]
+        return total_durations
+
+    def log_summary(self) -> None:
+        """Log the total duration of the phases, the most expensive first."""
+        total_durations = self.get_total_durations()
+        if not total_durations:
+            return
+        log.info("Tick loop profile of %s slots:\n%s", len(self.slot_summaries), "\n".join(
+            f"  {name}: {duration_s:.3f}s" for name, duration_s in sorted(
+                total_durations.items(), key=lambda item: item[1], reverse=True)))
+
+    def export_folded_stacks(self, path: str) -> None:
+        """Write the exclusive durations of the stacks of phases in microseconds, in the
+        collapsed stack format that flame graph tools (e.g. flamegraph.pl, speedscope) read."""
+        with open(path, "w", encoding="utf-8") as outfile:
+            for stack_key, duration_s in sorted(self._folded_stacks.items()):
+                outfile.write(f"{stack_key} {round(duration_s * 1e6)}\n")
+
+
+tick_profiler = TickProfiler()
@@ -18,21 +18,26 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import logging
 import os
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, TYPE_CHECKING, List, Optional
+from typing import Dict, TYPE_CHECKING, Iterable, List, Optional, Sequence, Set, Tuple
 
+import numpy as np
 import pytz
 from gsy_framework.constants_limits import GlobalConfig
 from gsy_framework.read_user_profile import read_arbitrary_profile, InputProfileTypes
 from gsy_framework.utils import generate_market_slot_list
 from pendulum import DateTime, instance, duration
+from pendulum import datetime as pendulum_datetime
 from pony.orm import Database, Required, db_session, select
 from pony.orm.core import Query
 
 import gsy_e.constants
+from gsy_e.gsy_e_core.profile_store import ProfileStore, SlotProfile
 from gsy_e.gsy_e_core.util import should_read_profile_from_db
 
 if TYPE_CHECKING:
+    from gsy_e.gsy_e_core.area_registry import AreaRegistry
     from gsy_e.models.area import Area
 
 log = logging.getLogger(__name__)
@@ -54,6 +59,40 @@ PROFILE_UUID_NAMES = [
 ]
 
 
+_EPOCH = pendulum_datetime(1970, 1, 1, tz="UTC")
+
+
+def _to_utc_microseconds(times: Sequence[datetime]) -> np.ndarray:
+    """Convert the time stamps of the DB (in UTC if they are naive) to microseconds since epoch."""
+    return np.array(
+        [time if time.tzinfo is None else time.astimezone(pytz.UTC).replace(tzinfo=None)
+         for time in times], dtype="datetime64[us]").astype(np.int64)
+
+
+def group_profile_datapoints(
+        datapoints: Iterable[Tuple[uuid.UUID, datetime, float]]
+) -> Dict[uuid.UUID, Dict[DateTime, float]]:
+    """Group the (profile uuid, time, value) rows of the profile DB by profile in a single pass.
+
+    The time stamps of all rows are converted at once, and each distinct time stamp is only
+    converted to a pendulum DateTime once, since the profiles of a simulation mostly share their
+    time stamps.
+    """
+    profile_uuids, times, values = [], [], []
+    for profile_uuid, time, value in datapoints:
+        profile_uuids.append(profile_uuid)
+        times.append(time)
+        values.append(value)
+    if not times:
+        return {}
+    unique_times, time_indices = np.unique(_to_utc_microseconds(times), return_inverse=True)
+    time_stamps = [_EPOCH.add(microseconds=int(time)) for time in unique_times]
+    profiles = {}
+    for profile_uuid, time_index, value in zip(profile_uuids, time_indices.tolist(), values):
+        profiles.setdefault(profile_uuid, {})[time_stamps[time_index]] = value
+    return profiles
+
+
 class ProfileDBConnectionHandler:
     """
     Handles connection and interaction with the user-profiles postgres DB via pony ORM
@@ -80,8 +119,11 @@ class ProfileDBConnectionHandler:
     def __init__(self):
         self._user_profiles: Dict[uuid.UUID, Dict[DateTime, float]] = {}
         self._profile_types: Dict[uuid.UUID, InputProfileTypes] = {}
-        self._buffered_times: List[DateTime] = []
+        self._buffered_times: Set[DateTime] = set()
         self._profile_uuids: Optional[List[uuid.UUID]] = []
+        self._prefetch_executor: Optional[ThreadPoolExecutor] = None
+        # Time stamp and profile uuids of the prefetched buffer, and the future of its profiles
+        self._prefetched_profiles: Optional[Tuple[DateTime, List[uuid.UUID], Future]] = None
 
     @staticmethod
     def _convert_pendulum_to_datetime(time_stamp):
@@ -94,12 +136,19 @@ class ProfileDBConnectionHandler:
 
     def connect(self):
         """ Establishes a connection to the gsy_e-profiles DB
-        Requires a postgres DB server running
+        Requires a postgres DB server running, or a SQLite DB file if the PROFILE_DB_PROVIDER
+        environment variable is set to sqlite
 
         """
         if self._db.provider is not None:
             # DB already connected.
             return
+        if os.environ.get("PROFILE_DB_PROVIDER", "postgres") == "sqlite":
+            self._db.bind(provider="sqlite",
+                          filename=os.environ.get("PROFILE_DB_NAME", ":memory:"),
+                          create_db=True)
+            self._db.generate_mapping(create_tables=True)
+            return
         self._db.bind(provider="postgres",
                       user=os.environ.get("PROFILE_DB_USER", "d3a_web"),
                       password=os.environ.get("PROFILE_DB_PASSWORD", "d3a_web"),
@@ -153,20 +202,56 @@ class ProfileDBConnectionHandler:
         }
 
     @db_session
-    def _get_profiles_from_db(self, start_time: datetime, end_time: datetime) -> Query:
+    def _get_first_weeks_from_profiles(
+            self, profile_uuids: List[uuid.UUID],
+            current_timestamp: DateTime) -> Dict[uuid.UUID, Dict[DateTime, float]]:
+        """ Same as get_first_week_from_profile, for multiple profiles. The first week of all
+        profiles that start at the same time is read with one query.
+        """
+        first_datapoint_times = dict(select(
+            (datapoint.profile_uuid, min(datapoint.time))
+            for datapoint in self.Profile_Database_ProfileTimeSeries
+            if datapoint.profile_uuid in profile_uuids))
+        profile_uuids_per_first_time: Dict[datetime, List[uuid.UUID]] = {}
+        for profile_uuid in profile_uuids:
+            if profile_uuid not in first_datapoint_times:
+                raise ProfileDBConnectionException(
+                    f"Profile in DB is empty for profile with uuid {profile_uuid}")
+            profile_uuids_per_first_time.setdefault(
+                first_datapoint_times[profile_uuid], []).append(profile_uuid)
+
+        first_weeks = {}
+        for first_datapoint_time, uuids in profile_uuids_per_first_time.items():
+            diff_current_to_db_time = (
+                current_timestamp -
+                self._strip_timezone_and_create_pendulum_instance_from_datetime(
+                    first_datapoint_time))
+            profiles = group_profile_datapoints(self._get_profiles_from_db(
+                uuids, first_datapoint_time, first_datapoint_time + duration(days=7)))
+            for profile_uuid in uuids:
+                first_weeks[profile_uuid] = {
+                    time + diff_current_to_db_time: value
+                    for time, value in profiles.get(profile_uuid, {}).items()}
+        return first_weeks
+
+    @db_session
+    def _get_profiles_from_db(self, profile_uuids: List[uuid.UUID],
+                              start_time: datetime, end_time: datetime) -> Query:
         """ Performs query to database and get chunks of profiles for all profiles that correspond
-        to this simulation (that are buffered in self._profile_uuid_type_mapping)
+        to this simulation (that are buffered in self._profile_uuids)
 
         Args:
+            profile_uuids (list): uuids of the queried profiles
             start_time (datetime): first timestamp of the queried profile chunks (TZ unaware)
             end_time (datetime): last timestamp of the queried profile chunks (TZ unaware)
 
-        Returns: A pony orm selection of the queried data
+        Returns: A pony orm selection of the (profile uuid, time, value) rows of the queried data
 
         """
         selection = select(
-            datapoint for datapoint in self.Profile_Database_ProfileTimeSeries
-            if datapoint.profile_uuid in self._profile_uuids
+            (datapoint.profile_uuid, datapoint.time, datapoint.value)
+            for datapoint in self.Profile_Database_ProfileTimeSeries
+            if datapoint.profile_uuid in profile_uuids
             and datapoint.time >= start_time and datapoint.time <= end_time
         )
         return selection
@@ -200,29 +285,72 @@ class ProfileDBConnectionHandler:
             datapoint = self.Profile_Database_ProfileInformation.get(profile_uuid=profile_uuid)
             self._profile_types[profile_uuid] = InputProfileTypes(datapoint.profile_type)
 
+    @db_session
+    def _read_profiles(self, profile_uuids: List[uuid.UUID],
+                       current_timestamp: DateTime) -> Dict[uuid.UUID, Dict[DateTime, float]]:
+        """ Reads the chunk of data of the profiles that starts at current_timestamp from the DB
+        with one query.
+        """
+        start_time, end_time = self._get_start_end_time(current_timestamp)
+        return group_profile_datapoints(self._get_profiles_from_db(
+            profile_uuids, self._convert_pendulum_to_datetime(start_time),
+            self._convert_pendulum_to_datetime(end_time)))
+
+    def _pop_prefetched_profiles(
+            self, current_timestamp: DateTime) -> Optional[Dict[uuid.UUID, Dict]]:
+        """Return the prefetched profiles, if they were prefetched for the current buffer."""
+        if self._prefetched_profiles is None:
+            return None
+        timestamp, profile_uuids, future = self._prefetched_profiles
+        self._prefetched_profiles = None
+        if timestamp != current_timestamp or profile_uuids != self._profile_uuids:
+            future.cancel()
+            return None
+        try:
+            return future.result()
+        except Exception:  # pylint: disable=broad-except
+            log.exception("Failed to prefetch the profiles for %s.", current_timestamp)
+            return None
+
+    def _prefetch_profiles(self, current_timestamp: DateTime) -> None:
+        """Read the chunk of data that follows the current buffer in a background thread."""
+        _, end_time = self._get_start_end_time(current_timestamp)
+        next_timestamp = end_time + GlobalConfig.slot_length
+        if (not GlobalConfig.is_canary_network() and
+                next_timestamp >= GlobalConfig.start_date + GlobalConfig.sim_duration):
+            return
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="profile-prefetch")
+        profile_uuids = list(self._profile_uuids)
+        self._prefetched_profiles = (
+            next_timestamp, profile_uuids,
+            self._prefetch_executor.submit(self._read_profiles, profile_uuids, next_timestamp))
+
     @db_session
     def _buffer_all_profiles(self, current_timestamp: DateTime):
-        """ Loops over all profile uuids used in the setup and
-        reads a new chunk of data from the DB
+        """ Reads a new chunk of data of all profile uuids used in the setup from the DB,
+        or takes it from the prefetched chunk
 
         Args:
             current_timestamp (Datetime): Current pendulum time stamp
         """
-        start_time, end_time = self._get_start_end_time(current_timestamp)
-        query_ret_val = self._get_profiles_from_db(self._convert_pendulum_to_datetime(start_time),
-                                                   self._convert_pendulum_to_datetime(end_time))
+        profiles = self._pop_prefetched_profiles(current_timestamp)
+        if profiles is None:
+            profiles = self._read_profiles(self._profile_uuids, current_timestamp)
 
         for profile_uuid in self._profile_uuids:
-            self._user_profiles[profile_uuid] = {
-                self._strip_timezone_and_create_pendulum_instance_from_datetime(
-                    data_point.time): data_point.value
-                for data_point in query_ret_val if data_point.profile_uuid == profile_uuid
-            }
+            self._user_profiles[profile_uuid] = profiles.get(profile_uuid, {})
 
-        for profile_uuid, profile_timeseries in self._user_profiles.items():
-            if not profile_timeseries:
-                self._user_profiles[profile_uuid] = self.get_first_week_from_profile(
-                    profile_uuid, current_timestamp)
+        empty_profile_uuids = [profile_uuid
+                               for profile_uuid, profile_timeseries in self._user_profiles.items()
+                               if not profile_timeseries]
+        if empty_profile_uuids:
+            self._user_profiles.update(self._get_first_weeks_from_profiles(
+                empty_profile_uuids, current_timestamp))
+
+        if gsy_e.constants.PREFETCH_PROFILE_DB_BUFFER:
+            self._prefetch_profiles(current_timestamp)
 
     def _buffer_time_slots(self):
         """ Buffers a list of time_slots that are currently buffered in the user profiles.
@@ -231,9 +359,9 @@ class ProfileDBConnectionHandler:
         """
         if len(self._profile_uuids) > 0:
             time_stamps = self._user_profiles[self._profile_uuids[0]].keys()
-            self._buffered_times = list(time_stamps)
+            self._buffered_times = set(time_stamps)
         else:
-            self._buffered_times = []
+            self._buffered_times = set()
 
     @staticmethod
     def _get_start_end_time(current_timestamp: DateTime) -> (DateTime, DateTime):
@@ -290,8 +418,12 @@ class ProfilesHandler:
     """
     Handles profiles rotation of all profiles (stored in DB and in memory)
     """
-    def __init__(self):
+    def __init__(self, area_registry: Optional["AreaRegistry"] = None):
         self.db = None
+        self._area_registry = area_registry
+        # Registry revision and profile uuids of the registered areas
+        self._setup_profile_uuids: Optional[Tuple[int, List[uuid.UUID]]] = None
+        self.profile_store: Optional[ProfileStore] = None
         self._current_timestamp = GlobalConfig.start_date
         self._start_date = GlobalConfig.start_date
         self._duration = GlobalConfig.sim_duration
@@ -299,6 +431,7 @@ class ProfilesHandler:
     def activate(self):
         """Connect to DB, update current timestamp and get the first chunk of data from the DB"""
         self._connect_to_db()
+        self.profile_store = ProfileStore() if gsy_e.constants.SHARED_PROFILE_STORE else None
         self._update_current_time(GlobalConfig.start_date)
         if self.db:
             self.db.buffer_profile_types()
@@ -333,6 +466,11 @@ class ProfilesHandler:
             return read_arbitrary_profile(profile_type,
                                           db_profile,
                                           current_timestamp=self.current_timestamp)
+        return self._read_profile(profile_type, profile)
+
+    def _read_profile(self, profile_type: InputProfileTypes, profile):
+        if self.profile_store is not None:
+            return self.profile_store.get_profile(profile_type, profile, self.current_timestamp)
         return read_arbitrary_profile(profile_type,
                                       profile,
                                       current_timestamp=self.current_timestamp)
@@ -354,8 +492,7 @@ class ProfilesHandler:
 
         """
         if profile_uuid is None and self.should_create_profile(profile):
-            return read_arbitrary_profile(profile_type,
-                                          profile, current_timestamp=self.current_timestamp)
+            return self._read_profile(profile_type, profile)
         if self.time_to_rotate_profile(profile):
             return self._read_new_datapoints_from_buffer_or_rotate_profile(
                 profile, profile_uuid, profile_type)
@@ -371,18 +508,33 @@ class ProfilesHandler:
          or if it is an input value (str, int, dict)
         """
         return (profile is not None and
-                (not isinstance(profile, dict) or self.current_timestamp not in profile.keys()))
+                (not isinstance(profile, (dict, SlotProfile)) or
+                 self.current_timestamp not in profile.keys()))
 
     def get_profile_type(self, profile_uuid: str) -> InputProfileTypes:
         """Read the profile type from a profile with the specified UUID."""
         return self.db.get_profile_type_from_db_buffer(profile_uuid)
 
-    def _get_profile_uuids_from_setup(self, area: "Area") -> List:
+    @staticmethod
+    def _get_profile_uuids_of_area(area: "Area") -> List:
         profile_uuids = []
         for profile_uuid_name in PROFILE_UUID_NAMES:
             profile_uuid = getattr(area.strategy, profile_uuid_name, None)
             if profile_uuid:
                 profile_uuids.append(uuid.UUID(profile_uuid))
+        return profile_uuids
+
+    def _get_profile_uuids_from_setup(self, area: "Area") -> List:
+        if self._area_registry is not None and self._area_registry.is_built_for(area):
+            # Collect the profile uuids only if the registered areas changed
+            if (self._setup_profile_uuids is None or
+                    self._setup_profile_uuids[0] != self._area_registry.revision):
+                self._setup_profile_uuids = (self._area_registry.revision, [
+                    profile_uuid for registered_area in self._area_registry
+                    for profile_uuid in self._get_profile_uuids_of_area(registered_area)])
+            return list(self._setup_profile_uuids[1])
+
+        profile_uuids = self._get_profile_uuids_of_area(area)
 
         if area.children:
             for child in area.children:
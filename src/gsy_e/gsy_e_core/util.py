@@ -476,16 +476,28 @@ def is_external_matching_enabled():
             BidOfferMatchAlgoEnum.EXTERNAL.value)
 
 
+def is_parallel_clearing_enabled():
+    """Checks if the markets of all areas are cleared at once at the end of each tick, instead
+    of during the tick of each area."""
+    return (gsy_e.constants.PARALLEL_CLEARING_WORKERS > 0 and
+            not is_external_matching_enabled())
+
+
 class StrategyProfileConfigurationException(Exception):
     """Exception raised when neither a profile nor a profile_uuid are provided for a strategy."""
 
 
+def get_oldest_time_slot_not_in_past_markets(current_time_slot: DateTime) -> DateTime:
+    """Return the oldest time slot that should not be in the area.past_markets."""
+    if ConstSettings.SettlementMarketSettings.ENABLE_SETTLEMENT_MARKETS:
+        return current_time_slot.subtract(
+            hours=ConstSettings.SettlementMarketSettings.MAX_AGE_SETTLEMENT_MARKET_HOURS)
+    return current_time_slot
+
+
 def is_time_slot_in_past_markets(time_slot: DateTime, current_time_slot: DateTime):
     """Checks if the time_slot should be in the area.past_markets."""
-    if ConstSettings.SettlementMarketSettings.ENABLE_SETTLEMENT_MARKETS:
-        return (time_slot < current_time_slot.subtract(
-            hours=ConstSettings.SettlementMarketSettings.MAX_AGE_SETTLEMENT_MARKET_HOURS))
-    return time_slot < current_time_slot
+    return time_slot < get_oldest_time_slot_not_in_past_markets(current_time_slot)
 
 
 def memory_usage_percent():
@@ -29,8 +29,9 @@ import gsy_e.constants
 from gsy_e.gsy_e_core.blockchain_interface import blockchain_interface_factory
 from gsy_e.gsy_e_core.device_registry import DeviceRegistry
 from gsy_e.gsy_e_core.exceptions import AreaException
+from gsy_e.gsy_e_core.global_objects_singleton import global_objects
 from gsy_e.gsy_e_core.matching_engine_singleton import bid_offer_matcher
-from gsy_e.gsy_e_core.util import is_external_matching_enabled
+from gsy_e.gsy_e_core.util import is_external_matching_enabled, is_parallel_clearing_enabled
 from gsy_e.models.area.area_base import AreaBase
 from gsy_e.models.area.event_dispatcher import DispatcherFactory
 from gsy_e.models.area.events import Events
@@ -324,7 +325,9 @@ class Area(AreaBase):
             else:
                 # If internal matching is enabled, place orders before clearing
                 self._update_matching_engine_matcher()
-                bid_offer_matcher.match_recommendations()
+                if not is_parallel_clearing_enabled():
+                    # Otherwise the markets of all areas are cleared at the end of the tick
+                    bid_offer_matcher.match_recommendations()
 
         self.events.update_events(self.now)
 
@@ -335,6 +338,9 @@ class Area(AreaBase):
             AvailableMarketTypes.SPOT: [self.spot_market],
             AvailableMarketTypes.SETTLEMENT: list(self.settlement_markets.values()),
             AvailableMarketTypes.FUTURE: self.future_markets}
+        if is_parallel_clearing_enabled():
+            markets_mapping["tree_position"] = global_objects.area_registry.get_tree_position(
+                self)
 
         bid_offer_matcher.update_area_uuid_spot_markets_mapping(
             area_uuid_markets_mapping={self.uuid: markets_mapping})
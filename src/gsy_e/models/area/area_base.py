@@ -16,7 +16,7 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 from logging import getLogger
-from typing import TYPE_CHECKING, List, Union, Optional
+from typing import TYPE_CHECKING, List, Optional, Tuple, Union
 from uuid import uuid4
 
 from gsy_framework.area_validator import validate_area
@@ -155,6 +155,18 @@ class AreaBase:
 
         self.__name = new_name
 
+    @property
+    def tree_position(self) -> Tuple[int, ...]:
+        """Return the indices of the area and its ancestors in their parents' children lists.
+
+        Sorting areas by their tree position results in a pre-order traversal of the grid tree.
+        The position is calculated on every access, AreaRegistry.get_tree_position returns the
+        positions of the registered areas without walking the tree.
+        """
+        if self.parent is None:
+            return ()
+        return (*self.parent.tree_position, self.parent.children.index(self))
+
     def get_path_to_root_fees(self) -> float:
         """Return the cumulative fees value from the current area to its root."""
         if self.parent is not None:
@@ -167,6 +167,13 @@ class CoefficientArea(AreaBase):
         for child in sorted(self.children, key=lambda _: random()):
             child.calculate_home_after_meter_data(current_time_slot, scm_manager)
 
+    def get_home_areas(self) -> List["CoefficientArea"]:
+        """Return all home areas of the subtree (including self), in tree order."""
+        home_areas = [self] if self._is_home_area() else []
+        for child in self.children:
+            home_areas.extend(child.get_home_areas())
+        return home_areas
+
     def trigger_energy_trades(self, scm_manager: "SCMManager") -> None:
         """Recursive function that triggers energy trading on all children of the root area."""
         if self._is_home_area():
@@ -179,6 +186,31 @@ class CoefficientArea(AreaBase):
         """Get the market maker rate."""
         return self._market_maker_rate
 
+    @property
+    def feed_in_tariff(self) -> float:
+        """Get the feed in tariff."""
+        return self._feed_in_tariff
+
+    @property
+    def taxes_surcharges(self) -> float:
+        """Get the taxes and surcharges rate."""
+        return self._taxes_surcharges
+
+    @property
+    def fixed_monthly_fee(self) -> float:
+        """Get the fixed monthly fee."""
+        return self._fixed_monthly_fee
+
+    @property
+    def marketplace_monthly_fee(self) -> float:
+        """Get the marketplace monthly fee."""
+        return self._marketplace_monthly_fee
+
+    @property
+    def assistance_monthly_fee(self) -> float:
+        """Get the assistance monthly fee."""
+        return self._assistance_monthly_fee
+
     def _change_home_coefficient_percentage(self, scm_manager: "SCMManager") -> None:
         community_total_energy_need = scm_manager.community_data.energy_need_kWh
         home_energy_need = scm_manager.get_home_energy_need(self.uuid)
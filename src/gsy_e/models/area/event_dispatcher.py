@@ -16,7 +16,7 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 from logging import getLogger
-from typing import Union, Dict, TYPE_CHECKING, Optional
+from typing import Union, Dict, List, TYPE_CHECKING, Optional
 
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.enums import AvailableMarketTypes
@@ -28,6 +28,9 @@ from gsy_e.events.event_structures import MarketEvent, AreaEvent
 from gsy_e.gsy_e_core.enums import FORWARD_MARKET_TYPES
 from gsy_e.gsy_e_core.exceptions import WrongMarketTypeException
 from gsy_e.gsy_e_core.redis_connections.area_market import RedisCommunicator
+from gsy_e.gsy_e_core.tick_profiler import tick_profiler
+from gsy_e.models.area.event_subscriptions import (
+    MarketEventSubscriptions, get_strategy_market_event_subscriptions)
 from gsy_e.models.area.redis_dispatcher.area_event_dispatcher import RedisAreaEventDispatcher
 from gsy_e.models.area.redis_dispatcher.area_to_market_publisher import AreaToMarketEventPublisher
 from gsy_e.models.area.redis_dispatcher.market_event_dispatcher import (
@@ -63,6 +66,11 @@ class AreaDispatcher:
         self._future_agent: Optional[FutureAgent] = None
         self._forward_agents: Optional[Dict[AvailableMarketTypes, FutureAgent]] = {}
         self.area = area
+        # Children in random order, shuffled once per area event (e.g. tick) to ensure fairness
+        self._shuffled_children: List["Area"] = []
+        self._shuffled_children_with_agents: List["Area"] = []
+        self._children_subscriptions = MarketEventSubscriptions()
+        self._subscribed_children_state = None
 
     @property
     def spot_agents(self) -> Dict[DateTime, OneSidedAgent]:
@@ -140,21 +148,57 @@ class AreaDispatcher:
         if not self.area.events.is_connected:
             return
 
-        for child in sorted(self.area.children, key=lambda _: random()):
-            if not child.children:
-                continue
+        for child in self._shuffled_children_with_agents:
             self._broadcast_notification_to_single_agent(
                 child, market_type, event_type, **kwargs)
 
         self._broadcast_notification_to_single_agent(
             self.area, market_type, event_type, **kwargs)
 
+    @property
+    def _children_state(self):
+        children = self.area.children
+        return id(children), len(children)
+
+    def _update_children_subscriptions(self) -> None:
+        """
+        Shuffle the children of the area and subscribe their strategies to the market events
+        that they react to. Called once per area event (tick, market cycle, activate), so that
+        the market events that happen in between are only dispatched to the interested children,
+        in the same random order.
+        """
+        self._shuffled_children = sorted(self.area.children, key=lambda _: random())
+        self._shuffled_children_with_agents = [
+            child for child in self._shuffled_children if child.children]
+        self._children_subscriptions.clear()
+        for child in self._shuffled_children:
+            if not child.strategy:
+                continue
+            for event_type, own_orders_only in get_strategy_market_event_subscriptions(
+                    child.strategy).items():
+                self._children_subscriptions.subscribe(
+                    child.dispatcher.event_listener, event_type,
+                    trader=child.name if own_orders_only else None)
+        self._subscribed_children_state = self._children_state
+
+    def _get_children_listeners(self, event_type: Union[MarketEvent, AreaEvent],
+                                **kwargs) -> List:
+        if isinstance(event_type, AreaEvent):
+            self._update_children_subscriptions()
+            return [child.dispatcher.event_listener for child in self._shuffled_children]
+        if self._subscribed_children_state != self._children_state:
+            self._update_children_subscriptions()
+        return self._children_subscriptions.get_listeners(
+            event_type, kwargs.get("market_id"), kwargs)
+
     def broadcast_notification(
             self, event_type: Union[MarketEvent, AreaEvent], **kwargs) -> None:
         """
         Broadcast all market and area events to the event_listener methods of the
         child dispatcher classes first (in order to propagate the event to the children of the
         area) and then to the Inter Area Agents of the children and this dispatcher's area.
+        Area events are sent to all children, whereas market events are only sent to the
+        children whose strategies subscribed to them (see MarketEventSubscriptions).
         Strategy event methods (e.g. event_offer) should have precedence over MA's event methods.
         Reason for that is that the MA offer / bid  forwarding with MIN_BID/OFFER_AGE=0 setting
         enabled is expected to forward the offer / bid on the same tick that the offer is posted.
@@ -175,8 +219,8 @@ class AreaDispatcher:
             return
 
         # Broadcast to children in random order to ensure fairness
-        for child in sorted(self.area.children, key=lambda _: random()):
-            child.dispatcher.event_listener(event_type, **kwargs)
+        for listener in self._get_children_listeners(event_type, **kwargs):
+            listener(event_type, **kwargs)
 
         # TODO: Enable the following block once GSYE-340 is implemented
         # if ConstSettings.ForwardMarketSettings.ENABLE_FORWARD_MARKETS:
@@ -228,7 +272,8 @@ class AreaDispatcher:
             self.area.activate(**kwargs)
         if self._should_dispatch_to_strategies(event_type):
             if self.area.strategy:
-                self.area.strategy.event_listener(event_type, **kwargs)
+                with tick_profiler.phase("strategy", type(self.area.strategy).__name__):
+                    self.area.strategy.event_listener(event_type, **kwargs)
         elif ((not self.area.events.is_enabled or not self.area.events.is_connected)
               and event_type == AreaEvent.MARKET_CYCLE and self.area.strategy is not None):
             self.area.strategy.event_on_disabled_area()
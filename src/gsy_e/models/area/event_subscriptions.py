@@ -0,0 +1,119 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+
+from gsy_e.events import EventMixin
+from gsy_e.events.event_structures import MarketEvent
+from gsy_e.models.strategy import BaseStrategy, BidEnabledStrategy
+
+# Subscription key: (market_id, trader name). None matches all markets / all traders.
+SubscriptionKey = Tuple[Optional[str], Optional[str]]
+
+# Extract the name of the trader whose order / trade the market event is about.
+EVENT_TRADER_GETTERS: Dict[MarketEvent, Callable[[Dict], str]] = {
+    MarketEvent.OFFER_SPLIT: lambda kwargs: kwargs["original_offer"].seller.name,
+    MarketEvent.OFFER_TRADED: lambda kwargs: kwargs["trade"].seller.name,
+    MarketEvent.BID_SPLIT: lambda kwargs: kwargs["original_bid"].buyer.name,
+    MarketEvent.BID_TRADED: lambda kwargs: kwargs["bid_trade"].buyer.name,
+    MarketEvent.BID_DELETED: lambda kwargs: kwargs["bid"].buyer.name,
+}
+
+# Default strategy event handlers that ignore all events that do not concern the orders of the
+# strategy itself.
+OWN_ORDERS_EVENT_HANDLERS = {
+    MarketEvent.OFFER_SPLIT: BaseStrategy.event_offer_split,
+    MarketEvent.OFFER_TRADED: BaseStrategy.event_offer_traded,
+    MarketEvent.BID_SPLIT: BidEnabledStrategy.event_bid_split,
+    MarketEvent.BID_TRADED: BidEnabledStrategy.event_bid_traded,
+    MarketEvent.BID_DELETED: BidEnabledStrategy.event_bid_deleted,
+}
+
+
+def get_strategy_market_event_subscriptions(strategy) -> Dict[MarketEvent, bool]:
+    """Return the market events that the strategy reacts to.
+
+    Events whose handler is not overridden by the strategy class are omitted, since the default
+    EventMixin handlers do nothing. The value is True if the strategy only reacts to events about
+    its own orders, False if it needs to receive the events of all traders.
+    """
+    if not isinstance(strategy, EventMixin):
+        return {event_type: False for event_type in MarketEvent}
+    subscriptions = {}
+    for event_type in MarketEvent:
+        # pylint: disable=protected-access
+        handler = strategy._event_mapping(event_type)
+        handler_function = getattr(handler, "__func__", handler)
+        handler_name = getattr(handler, "__name__", None)
+        if handler_name and handler_function is getattr(EventMixin, handler_name, None):
+            continue
+        subscriptions[event_type] = (
+            handler_function is OWN_ORDERS_EVENT_HANDLERS.get(event_type))
+    if MarketEvent.ORDER_AMENDED not in subscriptions and (
+            MarketEvent.OFFER in subscriptions or MarketEvent.BID in subscriptions):
+        # The default handler forwards the amended orders to event_offer / event_bid
+        subscriptions[MarketEvent.ORDER_AMENDED] = False
+    return subscriptions
+
+
+class MarketEventSubscriptions:
+    """
+    Registry of the listeners of the market events of an area. Listeners subscribe to a market
+    event type, optionally restricted to the events of one market (market_id) and / or to the
+    events that concern the orders of one trader. The listeners are returned in the order of
+    their subscription, therefore the registry should be rebuilt in a random order on each tick
+    in order to ensure fairness.
+    """
+
+    def __init__(self):
+        self._subscriptions: Dict[MarketEvent, Dict[SubscriptionKey, List[Callable]]] = {}
+        self._listener_rank: Dict[Callable, int] = {}
+
+    def clear(self) -> None:
+        """Remove all subscriptions."""
+        self._subscriptions = {}
+        self._listener_rank = {}
+
+    def subscribe(self, listener: Callable, event_type: MarketEvent,
+                  market_id: Optional[str] = None, trader: Optional[str] = None) -> None:
+        """Subscribe the listener to the event type of the market (all markets if None)."""
+        self._listener_rank.setdefault(listener, len(self._listener_rank))
+        self._subscriptions.setdefault(event_type, {}).setdefault(
+            (market_id, trader), []).append(listener)
+
+    def unsubscribe(self, listener: Callable) -> None:
+        """Remove all subscriptions of the listener."""
+        for subscriptions in self._subscriptions.values():
+            for listeners in subscriptions.values():
+                if listener in listeners:
+                    listeners.remove(listener)
+        self._listener_rank.pop(listener, None)
+
+    def get_listeners(self, event_type: MarketEvent, market_id: Optional[str],
+                      event_kwargs: Dict) -> List[Callable]:
+        """Return the listeners that should receive the event, in subscription order."""
+        subscriptions = self._subscriptions.get(event_type)
+        if not subscriptions:
+            return []
+        trader = (EVENT_TRADER_GETTERS[event_type](event_kwargs)
+                  if event_type in EVENT_TRADER_GETTERS else None)
+        keys = {(None, None), (market_id, None), (None, trader), (market_id, trader)}
+        listener_lists = [subscriptions[key] for key in keys if key in subscriptions]
+        if len(listener_lists) == 1:
+            return list(listener_lists[0])
+        return sorted({listener for listeners in listener_lists for listener in listeners},
+                      key=self._listener_rank.get)
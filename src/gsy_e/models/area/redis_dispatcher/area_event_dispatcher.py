@@ -1,7 +1,7 @@
-import json
 from random import random
 from gsy_e.events import AreaEvent
 from gsy_e.gsy_e_core.exceptions import D3ARedisException
+from gsy_e.gsy_e_core.redis_connections.wire_format import decode_payload, get_internal_wire_codec
 from gsy_e.models.area.redis_dispatcher import RedisEventDispatcherBase
 
 
@@ -17,7 +17,7 @@ class RedisAreaEventDispatcher(RedisEventDispatcherBase):
         return f"{self.area.uuid}/area_event_response"
 
     def response_callback(self, payload):
-        data = json.loads(payload["data"])
+        data = decode_payload(payload["data"])
         if "response" in data:
             event_type = data["response"]
             if event_type in self.str_area_events:
@@ -28,7 +28,7 @@ class RedisAreaEventDispatcher(RedisEventDispatcherBase):
     def publish_area_event(self, area_uuid, event_type: AreaEvent, **kwargs):
         send_data = {"event_type": event_type.value, "kwargs": kwargs}
         dispatch_chanel = f"{area_uuid}/area_event"
-        self.redis.publish(dispatch_chanel, json.dumps(send_data))
+        self.redis.publish(dispatch_chanel, get_internal_wire_codec().encode(send_data))
 
     def broadcast_event_redis(self, event_type: AreaEvent, **kwargs):
         for child in sorted(self.area.children, key=lambda _: random()):
@@ -49,11 +49,11 @@ class RedisAreaEventDispatcher(RedisEventDispatcherBase):
                 self.root_dispatcher.market_notify_event_dispatcher.wait_for_futures()
 
     def event_listener_redis(self, payload):
-        data = json.loads(payload["data"])
+        data = decode_payload(payload["data"])
         kwargs = data["kwargs"]
         event_type = AreaEvent(data["event_type"])
         response_channel = f"{self.area.parent.uuid}/area_event_response"
-        response_data = json.dumps({"response": event_type.name.lower()})
+        response_data = get_internal_wire_codec().encode({"response": event_type.name.lower()})
 
         self.root_dispatcher.event_listener(event_type=event_type, **kwargs)
         self.redis.publish(response_channel, response_data)
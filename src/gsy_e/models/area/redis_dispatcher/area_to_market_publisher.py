@@ -1,9 +1,9 @@
 from uuid import uuid4
-import json
 from gsy_e.gsy_e_core.exceptions import D3ARedisException
 from gsy_framework.constants_limits import ConstSettings
 from gsy_e.constants import REDIS_PUBLISH_RESPONSE_TIMEOUT
 from gsy_e.gsy_e_core.redis_connections.area_market import BlockingCommunicator
+from gsy_e.gsy_e_core.redis_connections.wire_format import decode_payload, get_internal_wire_codec
 from gsy_framework.enums import SpotMarketTypeEnum
 
 
@@ -14,7 +14,7 @@ class AreaToMarketEventPublisher:
         self.event_response_uuids = []
 
     def response_callback(self, payload):
-        response = json.loads(payload["data"])
+        response = decode_payload(payload["data"])
         if response["status"] != "ready":
             raise D3ARedisException(
                 f"{self.area.name} received an incorrect response from Redis: {response}"
@@ -34,7 +34,7 @@ class AreaToMarketEventPublisher:
 
             data = {"transaction_uuid": str(uuid4())}
             self.redis.sub_to_channel(response_channel, self.response_callback)
-            self.redis.publish(market_channel, json.dumps(data))
+            self.redis.publish(market_channel, get_internal_wire_codec().encode(data))
 
             def event_response_was_received_callback():
                 return data["transaction_uuid"] in self.event_response_uuids
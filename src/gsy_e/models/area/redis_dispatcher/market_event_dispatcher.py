@@ -1,10 +1,10 @@
-import json
 import logging
 from random import random
 from threading import Event
 from concurrent.futures import TimeoutError, ThreadPoolExecutor
 from gsy_e.events import MarketEvent
 from gsy_e.gsy_e_core.exceptions import D3ARedisException
+from gsy_e.gsy_e_core.redis_connections.wire_format import decode_payload, get_internal_wire_codec
 from gsy_e.constants import MAX_WORKER_THREADS
 from gsy_e.models.area.redis_dispatcher import RedisEventDispatcherBase
 from gsy_e.models.market.market_structures import parse_event_and_parameters_from_json_string
@@ -43,7 +43,7 @@ class AreaRedisMarketEventDispatcher(RedisEventDispatcherBase):
         self.futures.append(self.executor.submit(executor_func))
 
     def response_callback(self, payload):
-        data = json.loads(payload["data"])
+        data = decode_payload(payload["data"])
 
         if "response" in data:
             event_type = data["response"]
@@ -61,7 +61,7 @@ class AreaRedisMarketEventDispatcher(RedisEventDispatcherBase):
             if key in kwargs:
                 kwargs[key] = kwargs[key].to_json_string()
         send_data = {"event_type": event_type.value, "kwargs": kwargs}
-        self.redis.publish(dispatch_channel, json.dumps(send_data))
+        self.redis.publish(dispatch_channel, get_internal_wire_codec().encode(send_data))
 
     def broadcast_event_redis(self, event_type: MarketEvent, **kwargs):
         for child in sorted(self.area.children, key=lambda _: random()):
@@ -81,8 +81,8 @@ class AreaRedisMarketEventDispatcher(RedisEventDispatcherBase):
 
     def publish_response(self, event_type):
         response_channel = f"{self.area.parent.uuid}/market_event_response"
-        response_data = json.dumps({"response": event_type.name.lower(),
-                                    "event_type": event_type.value})
+        response_data = get_internal_wire_codec().encode({"response": event_type.name.lower(),
+                                                          "event_type": event_type.value})
         self.redis.publish(response_channel, response_data)
 
     def parse_market_event_from_event_payload(self, payload):
@@ -1,9 +1,9 @@
-import json
 import logging
 from concurrent.futures import ThreadPoolExecutor
 from gsy_e.constants import MAX_WORKER_THREADS
 from gsy_e.models.market.market_structures import parse_event_and_parameters_from_json_string
 from gsy_e.gsy_e_core.redis_connections.area_market import ResettableCommunicator
+from gsy_e.gsy_e_core.redis_connections.wire_format import decode_payload, get_internal_wire_codec
 
 
 class MarketNotifyEventSubscriber:
@@ -20,9 +20,9 @@ class MarketNotifyEventSubscriber:
 
     def publish_notify_event_response(self, market_id, event_type, transaction_uuid):
         response_channel = f"market/{market_id}/notify_event/response"
-        response_data = json.dumps({"response": event_type.name.lower(),
-                                    "event_type_id": event_type.value,
-                                    "transaction_uuid": transaction_uuid})
+        response_data = get_internal_wire_codec().encode({"response": event_type.name.lower(),
+                                                          "event_type_id": event_type.value,
+                                                          "transaction_uuid": transaction_uuid})
         self.redis.publish(response_channel, response_data)
 
     def wait_for_futures(self):
@@ -45,7 +45,7 @@ class MarketNotifyEventSubscriber:
 
         def generate_notify_callback(payload):
             event_type, kwargs = self.parse_market_event_from_event_payload(payload)
-            data = json.loads(payload["data"])
+            data = decode_payload(payload["data"])
             kwargs["market_id"] = market.id
 
             def executor_func():
@@ -368,8 +368,9 @@ class AreaEnergyBills:  # pylint: disable=too-many-instance-attributes
 
 class SCMManager:
     """Handle the community manager coefficient trade."""
-    def __init__(self, area: "CoefficientArea", time_slot: DateTime):
-        SCMCommunityValidator.validate(community=area)
+    def __init__(self, area: "CoefficientArea", time_slot: DateTime, validate: bool = True):
+        if validate:
+            SCMCommunityValidator.validate(community=area)
 
         self._home_data: Dict[str, HomeAfterMeterData] = {}
 
@@ -420,6 +421,13 @@ class SCMManager:
             consumption_kWh=consumption_kWh,
             asset_energy_requirements_kWh=asset_energy_requirements_kWh)
 
+    def add_calculated_home_results(
+            self, home_data: HomeAfterMeterData, home_bill: AreaEnergyBills) -> None:
+        """Import the after meter data and the energy bills of one home, that were already
+        calculated (e.g. by the VectorizedSCMManager)."""
+        self._home_data[home_data.home_uuid] = home_data
+        self._bills[home_data.home_uuid] = home_bill
+
     def calculate_community_after_meter_data(self):
         """Calculate community data by aggregating all single home data."""
 
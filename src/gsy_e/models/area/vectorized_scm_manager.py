@@ -0,0 +1,354 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from calendar import monthrange
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+import numpy as np
+from gsy_framework.constants_limits import (
+    ConstSettings, GlobalConfig, is_no_community_self_consumption)
+from pendulum import DateTime, duration
+
+from gsy_e.constants import (DEFAULT_SCM_COMMUNITY_NAME, DEFAULT_SCM_GRID_NAME,
+                             FLOATING_POINT_TOLERANCE)
+from gsy_e.models.area.scm_manager import (
+    AreaEnergyBills, CommunityData, HomeAfterMeterData, SCMCommunityValidator, SCMManager)
+
+if TYPE_CHECKING:
+    from gsy_e.gsy_e_core.area_registry import AreaRegistry
+    from gsy_e.models.area import CoefficientArea
+
+
+def _sequential_sum(values: np.ndarray) -> np.ndarray:
+    """Sum the rows of the matrix one after the other, the same way as the builtin sum."""
+    if not len(values):
+        return np.zeros(values.shape[1:])
+    return np.cumsum(values, axis=0)[-1]
+
+
+class VectorizedSCMManager:
+    # pylint: disable=too-many-instance-attributes
+    """Calculate the SCM results of all homes of a community for multiple time slots at once.
+
+    The energy of the assets is provided as (assets x time slots) matrices, and the after meter
+    data, the community energy allocation and the energy bills of all homes are calculated with
+    NumPy operations on (homes x time slots) matrices, instead of one home and one time slot at a
+    time. The results of each time slot are provided as an SCMManager, therefore they are
+    consumed by the results and the exports the same way as the results of the SCMManager.
+
+    Contrary to the SCMManager, the energy surplus of the homes is assigned to the community in
+    the tree order of the homes instead of a random order.
+
+    The homes and assets are indexed again after the areas of the area registry changed, e.g. by
+    live events that create or delete areas.
+    """
+
+    def __init__(self, area: "CoefficientArea", area_registry: Optional["AreaRegistry"] = None):
+        SCMCommunityValidator.validate(community=area)
+        self._area = area
+        self._area_registry = area_registry
+        self._registry_revision: Optional[int] = None
+        self._home_areas: List["CoefficientArea"] = []
+        self._asset_areas: List["CoefficientArea"] = []
+        self._home_asset_counts = np.zeros(0, dtype=int)
+        self._home_asset_offsets = np.zeros(0, dtype=int)
+        self._validated_home_settings: Optional[List[Tuple]] = None
+        self._index_areas()
+
+        self._time_slots: List[DateTime] = []
+        self._asset_production_kWh = np.zeros((len(self._asset_areas), 0))
+        self._asset_consumption_kWh = np.zeros((len(self._asset_areas), 0))
+        self._home_settings = np.zeros((0, 0))
+        self._community_surplus_kWh = np.zeros(0)
+        self._results = {}
+
+    def _get_registry_revision(self) -> Optional[int]:
+        if self._area_registry is None or not self._area_registry.is_built_for(self._area):
+            return None
+        return self._area_registry.revision
+
+    def _index_areas(self) -> None:
+        """Index the homes of the community and their assets, in the tree order of the homes."""
+        self._registry_revision = self._get_registry_revision()
+        self._home_areas = self._area.get_home_areas()
+        self._asset_areas = [asset for home in self._home_areas for asset in home.children]
+        # Number of assets of each home, and position of its first asset in the asset matrices
+        self._home_asset_counts = np.array(
+            [len(home.children) for home in self._home_areas], dtype=int)
+        self._home_asset_offsets = np.cumsum(self._home_asset_counts) - self._home_asset_counts
+
+    def _read_home_settings(self) -> np.ndarray:
+        """Return the settings of the homes as a (homes x 8) matrix.
+
+        The settings are read on every calculation in order to apply the live events, and the
+        community is validated again only if they were changed."""
+        home_settings = [
+            (home.coefficient_percentage,
+             home.grid_fee_constant if home.grid_fee_constant is not None else 0.,
+             home.taxes_surcharges, home.fixed_monthly_fee, home.marketplace_monthly_fee,
+             home.assistance_monthly_fee, home.market_maker_rate, home.feed_in_tariff)
+            for home in self._home_areas]
+        if home_settings != self._validated_home_settings:
+            SCMCommunityValidator.validate(community=self._area)
+            self._validated_home_settings = home_settings
+        return np.array(home_settings, dtype=float).reshape(len(self._home_areas), 8)
+
+    def get_asset_energies_kWh(self, time_slot: DateTime) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the (production, consumption) of all assets of the homes for the time slot."""
+        production_kWh = np.array(
+            [asset.strategy.get_energy_to_sell_kWh(time_slot) for asset in self._asset_areas],
+            dtype=float)
+        consumption_kWh = np.array(
+            [asset.strategy.get_energy_to_buy_kWh(time_slot) for asset in self._asset_areas],
+            dtype=float)
+        return production_kWh, consumption_kWh
+
+    def calculate_time_slot(self, time_slot: DateTime,
+                            energy_time_slot: Optional[DateTime] = None) -> SCMManager:
+        """Calculate the results of one time slot from the current energy of the assets.
+
+        The energy of the assets is read for energy_time_slot, if it differs from time_slot."""
+        if self._get_registry_revision() != self._registry_revision:
+            self._index_areas()
+        production_kWh, consumption_kWh = self.get_asset_energies_kWh(
+            energy_time_slot or time_slot)
+        self.calculate([time_slot], production_kWh[:, np.newaxis], consumption_kWh[:, np.newaxis])
+        return self.get_scm_manager(0)
+
+    def calculate(self, time_slots: Sequence[DateTime], asset_production_kWh: np.ndarray,
+                  asset_consumption_kWh: np.ndarray) -> None:
+        # pylint: disable=too-many-locals
+        """Calculate the results of all homes for the time slots.
+
+        The rows of the energy matrices follow the order of the assets of the homes in the tree
+        order of the homes, and their columns the order of the time slots."""
+        self._time_slots = list(time_slots)
+        self._asset_production_kWh = asset_production_kWh
+        self._asset_consumption_kWh = asset_consumption_kWh
+        self._home_settings = self._read_home_settings()
+        (coefficient, grid_fees, taxes_surcharges, fixed_monthly_fee, marketplace_monthly_fee,
+         assistance_monthly_fee, market_maker_rate, feed_in_tariff) = (
+            setting[:, np.newaxis] for setting in self._home_settings.T)
+
+        production_kWh = self._sum_assets_per_home(asset_production_kWh)
+        consumption_kWh = self._sum_assets_per_home(asset_consumption_kWh)
+        self_consumed_energy_kWh = np.minimum(consumption_kWh, production_kWh)
+        energy_surplus_kWh = production_kWh - self_consumed_energy_kWh
+        energy_need_kWh = consumption_kWh - self_consumed_energy_kWh
+
+        # Community allocation. The sums over the homes are sequential (cumsum instead of sum),
+        # in order to produce exactly the same values as the SCMManager.
+        community_surplus_kWh = _sequential_sum(energy_surplus_kWh)
+        allocated_community_energy_kWh = community_surplus_kWh * coefficient
+        energy_bought_from_community_kWh = np.minimum(
+            allocated_community_energy_kWh, energy_need_kWh)
+        production_for_community_kWh = np.zeros_like(energy_surplus_kWh)
+        if not is_no_community_self_consumption():
+            # Each home assigns its surplus to the community, until the energy bought from the
+            # community by all homes is covered.
+            unassigned_energy_kWh = _sequential_sum(energy_bought_from_community_kWh)
+            for home_index, home_surplus_kWh in enumerate(energy_surplus_kWh):
+                production_for_community_kWh[home_index] = np.minimum(
+                    home_surplus_kWh, unassigned_energy_kWh)
+                unassigned_energy_kWh = (
+                    unassigned_energy_kWh - production_for_community_kWh[home_index])
+        production_for_grid_kWh = energy_surplus_kWh - production_for_community_kWh
+
+        # Energy bills
+        slots_per_day = duration(days=1) / GlobalConfig.slot_length
+        slots_per_month = np.array(
+            [slots_per_day * monthrange(time_slot.year, time_slot.month)[1]
+             for time_slot in self._time_slots], dtype=float)
+        marketplace_fee = marketplace_monthly_fee / slots_per_month
+        assistance_fee = assistance_monthly_fee / slots_per_month
+        fixed_fee = fixed_monthly_fee / slots_per_month
+
+        grid_fees_reduction = ConstSettings.SCMSettings.GRID_FEES_REDUCTION
+        intracommunity_base_rate_eur = (
+            market_maker_rate
+            if ConstSettings.SCMSettings.INTRACOMMUNITY_BASE_RATE_EUR is None
+            else ConstSettings.SCMSettings.INTRACOMMUNITY_BASE_RATE_EUR)
+        market_maker_rate_decreased_fees = (
+            intracommunity_base_rate_eur + grid_fees * (1.0 - grid_fees_reduction) +
+            taxes_surcharges)
+        market_maker_rate_normal_fees = market_maker_rate + grid_fees + taxes_surcharges
+
+        if is_no_community_self_consumption():
+            base_energy_bill_excl_revenue = consumption_kWh * market_maker_rate_normal_fees
+            base_energy_bill_revenue = production_kWh * feed_in_tariff
+            base_energy_bill = base_energy_bill_excl_revenue - base_energy_bill_revenue
+        else:
+            base_energy_bill_revenue = energy_surplus_kWh * feed_in_tariff
+            base_energy_bill_excl_revenue = (
+                energy_need_kWh * market_maker_rate_normal_fees +
+                marketplace_fee + fixed_fee + assistance_fee)
+            base_energy_bill = (
+                energy_need_kWh * market_maker_rate_normal_fees +
+                marketplace_fee + fixed_fee + assistance_fee - base_energy_bill_revenue)
+
+        # The allocated community energy covers the energy need of the home, otherwise the
+        # deficit is bought from the grid.
+        is_need_covered = allocated_community_energy_kWh > energy_need_kWh
+        bought_from_community = np.where(
+            is_need_covered,
+            np.where(energy_need_kWh > FLOATING_POINT_TOLERANCE, energy_need_kWh, 0.),
+            allocated_community_energy_kWh)
+        bought_from_grid = np.where(
+            is_need_covered, 0., energy_need_kWh - allocated_community_energy_kWh)
+        earned_from_community = production_for_community_kWh * market_maker_rate_decreased_fees
+        earned_from_grid = production_for_grid_kWh * feed_in_tariff
+        spent_to_community = bought_from_community * market_maker_rate_decreased_fees
+        spent_to_grid = bought_from_grid * market_maker_rate_normal_fees
+
+        self._community_surplus_kWh = community_surplus_kWh
+        # (homes x time slots) matrices
+        self._results = {
+            "production_kWh": production_kWh,
+            "consumption_kWh": consumption_kWh,
+            "energy_bought_from_community_kWh": energy_bought_from_community_kWh,
+            "production_for_community_kWh": production_for_community_kWh,
+            "production_for_grid_kWh": production_for_grid_kWh,
+            "is_need_covered": is_need_covered,
+            "market_maker_rate_decreased_fees": np.broadcast_to(
+                market_maker_rate_decreased_fees, production_kWh.shape),
+            "market_maker_rate_normal_fees": np.broadcast_to(
+                market_maker_rate_normal_fees, production_kWh.shape),
+            "bills": {
+                "base_energy_bill": base_energy_bill,
+                "base_energy_bill_excl_revenue": base_energy_bill_excl_revenue,
+                "base_energy_bill_revenue": base_energy_bill_revenue,
+                "gsy_energy_bill": (
+                    marketplace_fee + fixed_fee + assistance_fee - earned_from_community -
+                    earned_from_grid + spent_to_community + spent_to_grid),
+                "grid_fees": (bought_from_community * (grid_fees * (1.0 - grid_fees_reduction)) +
+                              bought_from_grid * grid_fees),
+                "tax_surcharges": (bought_from_community * taxes_surcharges +
+                                   bought_from_grid * taxes_surcharges),
+                "bought_from_community": bought_from_community,
+                "spent_to_community": spent_to_community,
+                "sold_to_community": production_for_community_kWh,
+                "earned_from_community": earned_from_community,
+                "bought_from_grid": bought_from_grid,
+                "spent_to_grid": spent_to_grid,
+                "sold_to_grid": production_for_grid_kWh,
+                "earned_from_grid": earned_from_grid,
+                "marketplace_fee": marketplace_fee,
+                "assistance_fee": assistance_fee,
+                "fixed_fee": fixed_fee,
+                "self_consumed_savings": self_consumed_energy_kWh * market_maker_rate,
+            }
+        }
+
+    def _sum_assets_per_home(self, asset_energy_kWh: np.ndarray) -> np.ndarray:
+        """Sum the energy of the assets of each home, one asset after the other."""
+        home_energy_kWh = np.zeros((len(self._home_areas), asset_energy_kWh.shape[1]))
+        for asset_index in range(int(self._home_asset_counts.max(initial=0))):
+            has_asset = self._home_asset_counts > asset_index
+            home_energy_kWh[has_asset] += asset_energy_kWh[
+                self._home_asset_offsets[has_asset] + asset_index]
+        return home_energy_kWh
+
+    def get_scm_manager(self, time_slot_index: int) -> SCMManager:
+        """Return an SCMManager with the calculated results of one of the time slots."""
+        time_slot = self._time_slots[time_slot_index]
+        scm_manager = SCMManager(self._area, time_slot, validate=False)
+        community_data = CommunityData(scm_manager.community_data.community_uuid)
+        results = {
+            name: values[:, time_slot_index].tolist()
+            for name, values in self._results.items() if name != "bills"}
+        bills = {name: np.broadcast_to(values, self._results["production_kWh"].shape)[
+                     :, time_slot_index].tolist()
+                 for name, values in self._results["bills"].items()}
+        asset_requirements_kWh = (
+            self._asset_consumption_kWh[:, time_slot_index] -
+            self._asset_production_kWh[:, time_slot_index]).tolist()
+        community_surplus_kWh = float(self._community_surplus_kWh[time_slot_index])
+        home_settings = self._home_settings.tolist()
+
+        for home_index, home in enumerate(self._home_areas):
+            asset_offset = int(self._home_asset_offsets[home_index])
+            home_data = HomeAfterMeterData(
+                home.uuid, home.name,
+                sharing_coefficient_percent=home_settings[home_index][0],
+                grid_fees=home_settings[home_index][1],
+                taxes_surcharges=home_settings[home_index][2],
+                fixed_monthly_fee=home_settings[home_index][3],
+                marketplace_monthly_fee=home_settings[home_index][4],
+                assistance_monthly_fee=home_settings[home_index][5],
+                market_maker_rate=home_settings[home_index][6],
+                feed_in_tariff=home_settings[home_index][7],
+                production_kWh=results["production_kWh"][home_index],
+                consumption_kWh=results["consumption_kWh"][home_index],
+                community_total_production_kWh=community_surplus_kWh,
+                _self_production_for_community_kWh=(
+                    results["production_for_community_kWh"][home_index]),
+                asset_energy_requirements_kWh={
+                    asset.uuid: asset_requirements_kWh[asset_offset + asset_index]
+                    for asset_index, asset in enumerate(home.children)})
+            self._create_home_trades(time_slot, home_data, home_index, results)
+            scm_manager.add_calculated_home_results(
+                home_data, AreaEnergyBills(**{
+                    name: values[home_index] for name, values in bills.items()}))
+
+            community_data.production_kWh += home_data.production_kWh
+            community_data.consumption_kWh += home_data.consumption_kWh
+            community_data.self_consumed_energy_kWh += (
+                home_data.self_consumed_energy_kWh +
+                home_data.self_production_for_community_kWh)
+            community_data.energy_surplus_kWh += home_data.energy_surplus_kWh
+            community_data.energy_need_kWh += home_data.energy_need_kWh
+            community_data.energy_bought_from_community_kWh += (
+                results["energy_bought_from_community_kWh"][home_index])
+            community_data.energy_sold_to_grid_kWh += home_data.self_production_for_grid_kWh
+            community_data.trades.extend(home_data.trades)
+
+        scm_manager.community_data = community_data
+        return scm_manager
+
+    @staticmethod
+    def _create_home_trades(time_slot: DateTime, home_data: HomeAfterMeterData,
+                            home_index: int, results: dict) -> None:
+        """Create the trades of the home, in the same order as SCMManager."""
+        rate_decreased_fees = results["market_maker_rate_decreased_fees"][home_index]
+        rate_normal_fees = results["market_maker_rate_normal_fees"][home_index]
+        production_for_community_kWh = results["production_for_community_kWh"][home_index]
+        production_for_grid_kWh = results["production_for_grid_kWh"][home_index]
+        if production_for_community_kWh > FLOATING_POINT_TOLERANCE:
+            home_data.create_sell_trade(
+                time_slot, DEFAULT_SCM_COMMUNITY_NAME, production_for_community_kWh,
+                production_for_community_kWh * rate_decreased_fees)
+        if production_for_grid_kWh > FLOATING_POINT_TOLERANCE:
+            home_data.create_sell_trade(
+                time_slot, DEFAULT_SCM_GRID_NAME, production_for_grid_kWh,
+                production_for_grid_kWh * home_data.feed_in_tariff)
+
+        if results["is_need_covered"][home_index]:
+            if home_data.energy_need_kWh > FLOATING_POINT_TOLERANCE:
+                home_data.create_buy_trade(
+                    time_slot, DEFAULT_SCM_COMMUNITY_NAME, home_data.energy_need_kWh,
+                    home_data.energy_need_kWh * rate_decreased_fees)
+            return
+        allocated_community_energy_kWh = home_data.allocated_community_energy_kWh
+        if allocated_community_energy_kWh > 0.:
+            home_data.create_buy_trade(
+                time_slot, DEFAULT_SCM_COMMUNITY_NAME, allocated_community_energy_kWh,
+                allocated_community_energy_kWh * rate_decreased_fees)
+        energy_from_grid_kWh = home_data.energy_need_kWh - allocated_community_energy_kWh
+        if energy_from_grid_kWh > 0.:
+            home_data.create_buy_trade(
+                time_slot, DEFAULT_SCM_GRID_NAME, energy_from_grid_kWh,
+                energy_from_grid_kWh * rate_normal_fees)
@@ -21,7 +21,7 @@ from dataclasses import dataclass
 from functools import wraps
 from logging import getLogger
 from threading import RLock
-from typing import Dict, List, Union, Optional, Callable, TYPE_CHECKING
+from typing import Dict, Iterable, List, Union, Optional, Callable, TYPE_CHECKING
 
 from gsy_framework.constants_limits import ConstSettings, GlobalConfig
 from gsy_framework.data_classes import Offer, Trade, Bid
@@ -29,7 +29,7 @@ from gsy_framework.enums import SpotMarketTypeEnum
 from numpy.random import random
 from pendulum import DateTime, duration
 
-from gsy_e.constants import FLOATING_POINT_TOLERANCE, DATE_TIME_FORMAT
+from gsy_e.constants import DATE_TIME_FORMAT, FLOATING_POINT_TOLERANCE
 from gsy_e.gsy_e_core.device_registry import DeviceRegistry
 from gsy_e.gsy_e_core.util import add_or_create_key, subtract_or_create_key
 from gsy_e.models.market.grid_fees.base_model import GridFees
@@ -37,6 +37,8 @@ from gsy_e.models.market.grid_fees.constant_grid_fees import ConstantGridFees
 from gsy_e.models.market.market_redis_connection import (
     MarketRedisEventSubscriber, MarketRedisEventPublisher,
     TwoSidedMarketRedisEventSubscriber)
+from gsy_e.models.market.order_book import OrderBook
+from gsy_e.models.market.trade_ledger import TradeLedger, get_trade_ledger
 
 if TYPE_CHECKING:
     from gsy_e.models.config import SimulationConfig
@@ -97,12 +99,16 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
         self.time_slot = time_slot
         self.readonly = readonly
         # offer-id -> Offer
-        self.offers: Dict[str, Offer] = {}
+        self.offers = OrderBook()
         self.offer_history: List[Offer] = []
         self.notification_listeners: List[Callable] = []
-        self.bids: Dict[str, Bid] = {}
+        # Callables that are invoked with (market, order) whenever an order is posted
+        self.new_order_listeners: List[Callable] = []
+        self.bids = OrderBook()
         self.bid_history: List[Bid] = []
         self.trades: List[Trade] = []
+        # Aggregated statistics of the trades, updated on every trade
+        self.trade_ledger = TradeLedger()
         self.const_fee_rate: Optional[float] = None
         self.now: DateTime = time_slot
 
@@ -163,18 +169,49 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
         return self._avg_trade_price
 
     @property
-    def sorted_offers(self):
-        """Sort the offers using the self.sorting method."""
+    def offers(self) -> OrderBook:
+        """Return the {offer_id: offer} mapping."""
+        return self._offers
 
-        return self.sorting(self.offers)
+    @offers.setter
+    def offers(self, orders: Dict[str, Offer]) -> None:
+        """Wrap the setter of _offers in order to build an OrderBook object."""
+        self._offers = OrderBook(orders)
 
     @property
-    def most_affordable_offers(self):
+    def bids(self) -> OrderBook:
+        """Return the {bid_id: bid} mapping."""
+        return self._bids
+
+    @bids.setter
+    def bids(self, orders: Dict[str, Bid]) -> None:
+        """Wrap the setter of _bids in order to build an OrderBook object."""
+        self._bids = OrderBook(orders)
+
+    @property
+    def sorted_offers(self) -> List[Offer]:
+        """Return the offers sorted by ascending energy_rate."""
+        return self.offers.sorted_orders()
+
+    @property
+    def sorted_bids(self) -> List[Bid]:
+        """Return the bids sorted by descending energy_rate."""
+        return self.bids.sorted_orders(reverse_order=True)
+
+    def cheapest_offers(self, count: int) -> List[Offer]:
+        """Return the <count> offers with the lowest energy_rate."""
+        return self.offers.top(count)
+
+    def most_expensive_bids(self, count: int) -> List[Bid]:
+        """Return the <count> bids with the highest energy_rate."""
+        return self.bids.top(count, reverse_order=True)
+
+    @property
+    def most_affordable_offers(self) -> List[Offer]:
         """Return the offers with the least energy_rate value."""
-        cheapest_offer = self.sorted_offers[0]
-        rate = cheapest_offer.energy_rate
-        return [o for o in self.sorted_offers if
-                abs(o.energy_rate - rate) < FLOATING_POINT_TOLERANCE]
+        if not self.offers:
+            raise IndexError("There are no offers in the market.")
+        return self.offers.orders_at_best_rate()
 
     def _create_fee_handler(self, grid_fee_type: int, grid_fees: GridFee) -> None:
         if not grid_fees:
@@ -196,8 +233,12 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
         """Return True if this market adopts the constant grid fees model."""
         return isinstance(self.fee_class, ConstantGridFees)
 
-    def orders_per_slot(self) -> Dict[str, Dict]:
-        """Return all orders in the market per time slot."""
+    def orders_per_slot(self, time_slots: Optional[Iterable[DateTime]] = None
+                        ) -> Dict[str, Dict]:
+        """Return all orders in the market per time slot.
+
+        The market has only one time slot, therefore the time_slots filter is ignored."""
+        # pylint: disable=unused-argument
         bids = [bid.serializable_dict() for bid in self.bids.values()]
         offers = [offer.serializable_dict() for offer in self.offers.values()]
         return {self.time_slot_str: {"bids": bids, "offers": offers}}
@@ -206,6 +247,24 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
         """Append a callable function to the notification_listeners list."""
         self.notification_listeners.append(listener)
 
+    def _notify_new_order(self, order: Union[Offer, Bid]) -> None:
+        """Flag the market as having new orders and inform the new order listeners."""
+        self.no_new_order = False
+        for listener in self.new_order_listeners:
+            listener(self, order)
+
+    def has_crossing_orders(self, time_slot: Optional[DateTime] = None) -> bool:
+        """Check whether the best bid and the best offer of the market can be matched.
+
+        The best rates are read from the price index of the order books, without sorting or
+        serializing the orders."""
+        # pylint: disable=unused-argument
+        best_bid_rate = self.bids.best_rate(reverse_order=True)
+        best_offer_rate = self.offers.best_rate()
+        if best_bid_rate is None or best_offer_rate is None:
+            return False
+        return best_offer_rate - best_bid_rate <= FLOATING_POINT_TOLERANCE
+
     def _notify_listeners(self, event, **kwargs):
         """Invoke the notification_listeners to dispatch the passed event argument."""
 
@@ -220,6 +279,7 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
             self, trade: Trade, order: Union[Offer, Bid]) -> None:
         """Update the instance state in response to an occurring trade."""
         self.trades.append(trade)
+        self.trade_ledger.sync(self.trades)
         self.market_fee += trade.fee_price
         self._update_accumulated_trade_price_energy(trade)
         self.traded_energy = add_or_create_key(
@@ -272,22 +332,19 @@ class MarketBase:  # pylint: disable=too-many-instance-attributes
 
     def bought_energy(self, buyer: str) -> float:
         """Return the aggregated bought energy value by the passed-in buyer."""
-
-        return sum(trade.traded_energy for trade in self.trades if trade.buyer.name == buyer)
+        return get_trade_ledger(self).bought_energy(buyer)
 
     def sold_energy(self, seller: str) -> float:
         """Return the aggregated sold energy value by the passed-in seller."""
-
-        return sum(trade.traded_energy for trade in self.trades if trade.seller.name == seller)
+        return get_trade_ledger(self).sold_energy(seller)
 
     def total_spent(self, buyer: str) -> float:
         """Return the aggregated money spent by the passed-in buyer."""
-
-        return sum(trade.trade_price for trade in self.trades if trade.buyer.name == buyer)
+        return get_trade_ledger(self).total_spent(buyer)
 
     def total_earned(self, seller: str) -> float:
         """Return the aggregated money earned by the passed-in seller."""
-        return sum(trade.trade_price for trade in self.trades if trade.seller.name == seller)
+        return get_trade_ledger(self).total_earned(seller)
 
     @staticmethod
     def _calculate_closing_time(delivery_time: DateTime) -> DateTime:
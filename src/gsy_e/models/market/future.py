@@ -16,18 +16,19 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 # pylint: disable=too-many-arguments, too-many-locals, no-member
-from collections import UserDict
 from copy import deepcopy
 from logging import getLogger
-from typing import Dict, List, Optional, TYPE_CHECKING
+from typing import Dict, Iterable, List, Optional, TYPE_CHECKING
 
 from gsy_framework.constants_limits import ConstSettings, GlobalConfig, DATE_TIME_FORMAT
 from gsy_framework.data_classes import Bid, Offer, Trade, TraderDetails
 from gsy_framework.utils import is_time_slot_in_simulation_duration
 from pendulum import DateTime, duration
 
+from gsy_e.constants import FLOATING_POINT_TOLERANCE
 from gsy_e.gsy_e_core.blockchain_interface import NonBlockchainInterface
 from gsy_e.models.market import GridFee, lock_market_action, MarketSlotParams
+from gsy_e.models.market.order_book import OrderBook
 from gsy_e.models.market.two_sided import TwoSidedMarket
 
 if TYPE_CHECKING:
@@ -41,14 +42,18 @@ class FutureMarketException(Exception):
     """Exception specific to the Future markets."""
 
 
-class FutureOrders(UserDict):
+class FutureOrders(OrderBook):
     """Special mapping object to keep track of a future market's orders."""
     def __init__(self, *args, **kwargs):
         self.slot_order_mapping = {}
         super().__init__(*args, **kwargs)
 
     def __setitem__(self, order_id, order):
-        self.data[order_id] = order
+        existing_order = self.data.get(order_id, None)
+        if existing_order:
+            # The order is replaced, e.g. by its amended copy
+            self.slot_order_mapping[existing_order.time_slot].remove(existing_order)
+        super().__setitem__(order_id, order)
         if order.time_slot not in self.slot_order_mapping:
             self.slot_order_mapping[order.time_slot] = []
         self.slot_order_mapping[order.time_slot].append(order)
@@ -57,7 +62,7 @@ class FutureOrders(UserDict):
         order = self.data.get(order_id, None)
         if order:
             self.slot_order_mapping[order.time_slot].remove(order)
-        del self.data[order_id]
+        super().__delitem__(order_id)
 
 
 class FutureMarkets(TwoSidedMarket):
@@ -142,23 +147,34 @@ class FutureMarkets(TwoSidedMarket):
             "time_slots": self.market_time_slots_str,
             "type_name": self.type_name}
 
-    def orders_per_slot(self) -> Dict[str, Dict]:
-        """Return all orders in the market per time slot."""
+    def orders_per_slot(self, time_slots: Optional[Iterable[DateTime]] = None
+                        ) -> Dict[str, Dict]:
+        """Return all orders in the market per time slot (only of time_slots if provided)."""
         orders_dict = {}
-        for time_slot, bids_list in self.slot_bid_mapping.items():
-            time_slot = time_slot.format(DATE_TIME_FORMAT)
-            if time_slot not in orders_dict:
-                orders_dict[time_slot] = {"bids": [], "offers": []}
-            orders_dict[time_slot]["bids"].extend([bid.serializable_dict() for bid in bids_list])
-
-        for time_slot, offers_list in self.slot_offer_mapping.items():
-            time_slot = time_slot.format(DATE_TIME_FORMAT)
-            if time_slot not in orders_dict:
-                orders_dict[time_slot] = {"bids": [], "offers": []}
-            orders_dict[time_slot]["offers"].extend(
-                [offer.serializable_dict() for offer in offers_list])
+        if time_slots is None:
+            time_slots = {**self.slot_bid_mapping, **self.slot_offer_mapping}
+        for time_slot in time_slots:
+            bids_list = self.slot_bid_mapping.get(time_slot)
+            offers_list = self.slot_offer_mapping.get(time_slot)
+            if bids_list is None and offers_list is None:
+                continue
+            orders_dict[time_slot.format(DATE_TIME_FORMAT)] = {
+                "bids": [bid.serializable_dict() for bid in bids_list or []],
+                "offers": [offer.serializable_dict() for offer in offers_list or []]}
         return orders_dict
 
+    def has_crossing_orders(self, time_slot: Optional[DateTime] = None) -> bool:
+        """Check whether the best bid and the best offer of the time slot can be matched."""
+        if time_slot is None:
+            return any(self.has_crossing_orders(slot) for slot in self.slot_bid_mapping)
+        bids = self.slot_bid_mapping.get(time_slot)
+        offers = self.slot_offer_mapping.get(time_slot)
+        if not bids or not offers:
+            return False
+        best_bid_rate = max(bid.energy_rate for bid in bids)
+        best_offer_rate = min(offer.energy_rate for offer in offers)
+        return best_offer_rate - best_bid_rate <= FLOATING_POINT_TOLERANCE
+
     @staticmethod
     def _remove_old_orders_from_list(order_list: List, current_market_time_slot: DateTime) -> List:
         return [
@@ -1,4 +1,3 @@
-import json
 import logging
 from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid4
@@ -9,6 +8,7 @@ from gsy_framework.utils import key_in_dict_and_not_none
 from gsy_e.constants import REDIS_PUBLISH_RESPONSE_TIMEOUT, MAX_WORKER_THREADS
 from gsy_e.gsy_e_core.redis_connections.area_market import (
     ResettableCommunicator, BlockingCommunicator)
+from gsy_e.gsy_e_core.redis_connections.wire_format import decode_payload, get_internal_wire_codec
 from gsy_e.events import MarketEvent
 
 
@@ -32,7 +32,7 @@ class MarketRedisEventPublisher:
 
     def response_callback(self, payload):
         """Callback method that gets triggered on response"""
-        data = json.loads(payload["data"])
+        data = decode_payload(payload["data"])
 
         if "response" in data:
             self.event_response_uuids.append(data["transaction_uuid"])
@@ -47,7 +47,7 @@ class MarketRedisEventPublisher:
                      "transaction_uuid": str(uuid4())}
 
         self.redis.sub_to_channel(self.event_response_channel_name(), self.response_callback)
-        self.redis.publish(self.event_channel_name(), json.dumps(send_data))
+        self.redis.publish(self.event_channel_name(), get_internal_wire_codec().encode(send_data))
         self._wait_for_event_response(send_data)
 
     def _wait_for_event_response(self, send_data):
@@ -102,7 +102,7 @@ class MarketRedisEventSubscriber:
         self.redis_db.terminate_connection()
 
     def _publish(self, channel, data):
-        self.redis_db.publish(channel, json.dumps(data))
+        self.redis_db.publish(channel, get_internal_wire_codec().encode(data))
 
     @property
     def _offer_channel(self):
@@ -130,7 +130,7 @@ class MarketRedisEventSubscriber:
 
     @staticmethod
     def _parse_payload(payload):
-        data_dict = json.loads(payload["data"])
+        data_dict = decode_payload(payload["data"])
         retval = MarketRedisEventSubscriber._parse_order_objects(data_dict)
         return retval
 
@@ -15,16 +15,16 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-import json
 from typing import Tuple
 
 from gsy_framework.data_classes import Trade, BaseBidOffer
 
 from gsy_e.events import MarketEvent
+from gsy_e.gsy_e_core.redis_connections.wire_format import decode_payload
 
 
 def parse_event_and_parameters_from_json_string(payload) -> Tuple:
-    data = json.loads(payload["data"])
+    data = decode_payload(payload["data"])
     kwargs = data["kwargs"]
     for key in ["offer", "existing_offer", "new_offer"]:
         if key in kwargs:
@@ -15,10 +15,9 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-from copy import deepcopy
 from logging import getLogger
 from math import isclose
-from typing import Union, Dict, Optional, Callable, Tuple
+from typing import Union, Optional, Callable, Tuple
 
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.data_classes import Offer, Trade, TradeBidOfferInfo, TraderDetails, Bid
@@ -33,6 +32,7 @@ from gsy_e.gsy_e_core.exceptions import (
     NegativePriceOrdersException, NegativeEnergyOrderException)
 from gsy_e.gsy_e_core.util import short_offer_bid_log_str
 from gsy_e.models.market import MarketBase, lock_market_action, GridFee
+from gsy_e.models.market.order_book import OrderBookSnapshot
 
 log = getLogger(__name__)
 
@@ -86,16 +86,22 @@ class OneSidedMarket(MarketBase):
             limit_float_precision(original_price / energy)) * energy
 
     @lock_market_action
-    def get_offers(self) -> Dict:
+    def get_offers(self) -> OrderBookSnapshot:
         """
-        Retrieves a copy of all open offers of the market. The copy of the offers guarantees
-        that the return dict will remain unaffected from any mutations of the market offer list
-        that might happen concurrently (more specifically can be used in for loops without raising
-        the 'dict changed size during iteration' exception)
-        Returns: dict with open offers, offer id as keys, and Offer objects as values
+        Retrieves a snapshot of all open offers of the market. The snapshot guarantees
+        that the returned mapping will remain unaffected from any mutations of the market offer
+        list that might happen concurrently (more specifically can be used in for loops without
+        raising the 'dict changed size during iteration' exception). The snapshot is shared
+        between callers until the offers of the market change, and is read-only.
+        Returns: mapping with open offers, offer id as keys, and Offer objects as values
 
         """
-        return deepcopy(self.offers)
+        return self.offers.snapshot()
+
+    @lock_market_action
+    def has_offers_from_trader(self, trader: str, attribute: str = "uuid") -> bool:
+        """Check whether the trader (identified by its name or uuid) has open offers."""
+        return self.offers.has_orders_from_trader(trader, attribute)
 
     @lock_market_action
     def offer(  # pylint: disable=too-many-arguments, too-many-locals
@@ -140,7 +146,7 @@ class OneSidedMarket(MarketBase):
                   self.time_slot_str or offer.time_slot, offer)
         if dispatch_event is True:
             self.dispatch_market_offer_event(offer)
-        self.no_new_order = False
+        self._notify_new_order(offer)
         return offer
 
     def dispatch_market_offer_event(self, offer: Offer) -> None:
@@ -166,6 +172,55 @@ class OneSidedMarket(MarketBase):
                   self.time_slot_str or offer.time_slot, offer)
         self._notify_listeners(MarketEvent.OFFER_DELETED, offer=offer)
 
+    @lock_market_action
+    def amend_order(self, order_id: str, new_price: float,
+                    original_price: Optional[float] = None,
+                    adapt_price_with_fees: bool = True,
+                    dispatch_event: bool = True) -> Union[Offer, Bid]:
+        """Change the price of an open order in place, keeping its id.
+
+        The order is replaced in the order book by an amended copy, the order objects that are
+        shared with the strategies and the market agents are not modified. The ORDER_AMENDED
+        event is dispatched instead of deleting the order and posting a new one. The new price
+        is handled like the price of a new order, i.e. the grid fees are added to it if
+        adapt_price_with_fees is True.
+        """
+        if self.readonly:
+            raise MarketReadOnlyException()
+        offer = self.offers.get(order_id)
+        if not offer:
+            raise OfferNotFoundException()
+        if original_price is None:
+            original_price = new_price
+
+        if adapt_price_with_fees:
+            new_price = self._update_new_offer_price_with_fee(
+                new_price, original_price, offer.energy)
+
+        if new_price < 0.0:
+            raise NegativePriceOrdersException(
+                "Negative price after taxes, offer cannot be amended.")
+
+        amended_offer = Offer(offer.id, offer.creation_time, new_price, offer.energy,
+                              offer.seller, original_price,
+                              time_slot=offer.time_slot)
+        self.offers[amended_offer.id] = amended_offer
+        self.offer_history.append(amended_offer)
+
+        log.debug("%s[OFFER][AMEND][%s][%s] %s",
+                  self._debug_log_market_type_identifier, self.name,
+                  self.time_slot_str or amended_offer.time_slot, amended_offer)
+        if dispatch_event is True:
+            self.dispatch_market_order_amended_event(amended_offer, offer)
+        self._notify_new_order(amended_offer)
+        return amended_offer
+
+    def dispatch_market_order_amended_event(self, order: Union[Offer, Bid],
+                                            original_order: Union[Offer, Bid]) -> None:
+        """Dispatch the ORDER_AMENDED event to the listeners."""
+        self._notify_listeners(MarketEvent.ORDER_AMENDED, order=order,
+                               original_order=original_order)
+
     def _update_offer_fee_and_calculate_final_price(self, energy, trade_rate,
                                                     energy_portion, original_price):
         if self._is_constant_fees:
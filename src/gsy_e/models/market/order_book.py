@@ -0,0 +1,190 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from collections import UserDict
+from collections.abc import Mapping
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from gsy_framework.data_classes import Bid, Offer, TraderDetails
+from sortedcontainers import SortedList
+
+from gsy_e.constants import FLOATING_POINT_TOLERANCE
+
+# (energy_rate, insertion sequence, order id)
+OrderBookKey = Tuple[float, int, str]
+
+# TraderDetails attributes that the order book maintains a trader -> orders index for
+INDEXED_TRADER_ATTRIBUTES = ("name", "uuid", "origin_uuid")
+
+
+class OrderBookSnapshot(Mapping):
+    """Read-only {order_id: order} view of an order book at a given generation.
+
+    The snapshot is not affected by later changes of the order book, so it can be iterated
+    while orders are added to or removed from the market. The order objects are shared with the
+    market and must not be modified by the callers.
+    """
+
+    def __init__(self, orders: Dict[str, Union[Offer, Bid]], generation: int):
+        self._orders = orders
+        self.generation = generation
+
+    def __getitem__(self, order_id: str) -> Union[Offer, Bid]:
+        return self._orders[order_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._orders)
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __repr__(self) -> str:
+        return f"<OrderBookSnapshot generation: {self.generation} orders: {self._orders}>"
+
+
+class OrderBook(UserDict):
+    """Mapping of {order_id: order} that keeps its orders indexed by energy rate.
+
+    The price index is updated whenever an order is added to or removed from the mapping, so
+    the market can keep using the object as the plain dict it used to be, while best-price
+    queries no longer need to sort all open orders.
+    Orders with equal energy rate are ordered by insertion, which is the same order that a
+    stable sort over the dict values would produce.
+    The generation counter is increased on every change of the order book, and is used to reuse
+    the same snapshot for all readers until the next change happens.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._sorted_keys = SortedList()
+        self._order_keys: Dict[str, OrderBookKey] = {}
+        self._sequence = 0
+        self._trader_index: Dict[str, Dict[str, Dict[str, None]]] = {
+            attribute: {} for attribute in INDEXED_TRADER_ATTRIBUTES}
+        self.generation = 0
+        self._snapshot: Optional[OrderBookSnapshot] = None
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, order_id: str, order: Union[Offer, Bid]) -> None:
+        if order_id in self.data:
+            self._remove_from_index(order_id)
+        self.data[order_id] = order
+        self._sequence += 1
+        key = (order.energy_rate, self._sequence, order_id)
+        self._order_keys[order_id] = key
+        self._sorted_keys.add(key)
+        trader = self._get_order_trader(order)
+        for attribute, index in self._trader_index.items():
+            index.setdefault(getattr(trader, attribute), {})[order_id] = None
+        self._invalidate_snapshot()
+
+    def __delitem__(self, order_id: str) -> None:
+        order = self.data.pop(order_id)
+        self._remove_from_index(order_id, order)
+        self._invalidate_snapshot()
+
+    @staticmethod
+    def _get_order_trader(order: Union[Offer, Bid]) -> TraderDetails:
+        return order.buyer if isinstance(order, Bid) else order.seller
+
+    def _remove_from_index(self, order_id: str, order: Optional[Union[Offer, Bid]] = None
+                           ) -> None:
+        # The stored key is used instead of the order's energy_rate, because the order object
+        # might have been mutated (e.g. by update_price) while being in the order book.
+        key = self._order_keys.pop(order_id, None)
+        if key is not None:
+            self._sorted_keys.remove(key)
+        trader = self._get_order_trader(order or self.data[order_id])
+        for attribute, index in self._trader_index.items():
+            trader_orders = index.get(getattr(trader, attribute))
+            if trader_orders is None:
+                continue
+            trader_orders.pop(order_id, None)
+            if not trader_orders:
+                del index[getattr(trader, attribute)]
+
+    def _invalidate_snapshot(self) -> None:
+        self.generation += 1
+        self._snapshot = None
+
+    def snapshot(self) -> OrderBookSnapshot:
+        """Return a read-only view of the current orders.
+
+        The snapshot is created lazily once per generation and shared by all callers, therefore
+        reading the orders multiple times without a change in between does not copy them.
+        """
+        if self._snapshot is None:
+            self._snapshot = OrderBookSnapshot(dict(self.data), self.generation)
+        return self._snapshot
+
+    def orders_from_trader(self, trader: str, attribute: str = "uuid"
+                           ) -> List[Union[Offer, Bid]]:
+        """Return the orders of the trader, identified by its name, uuid or origin_uuid."""
+        return [self.data[order_id]
+                for order_id in self._trader_index[attribute].get(trader, {})]
+
+    def has_orders_from_trader(self, trader: str, attribute: str = "uuid") -> bool:
+        """Check whether the trader, identified by its name, uuid or origin_uuid, has orders."""
+        return trader in self._trader_index[attribute]
+
+    def __copy__(self) -> "OrderBook":
+        # Do not share the index containers with the copy, as copy.copy would do.
+        return self.__class__(self.data)
+
+    def clear(self) -> None:
+        self.data.clear()
+        self._order_keys.clear()
+        self._sorted_keys.clear()
+        for index in self._trader_index.values():
+            index.clear()
+        self._invalidate_snapshot()
+
+    def sorted_orders(self, reverse_order: bool = False) -> List[Union[Offer, Bid]]:
+        """Return all orders sorted by energy rate (descending if reverse_order is True)."""
+        return self.top(len(self.data), reverse_order)
+
+    def top(self, count: int, reverse_order: bool = False) -> List[Union[Offer, Bid]]:
+        """Return the <count> orders with the lowest (or highest if reverse_order) rate."""
+        keys = reversed(self._sorted_keys) if reverse_order else iter(self._sorted_keys)
+        return [self.data[key[2]] for key in islice(keys, count)]
+
+    def best(self, reverse_order: bool = False) -> Optional[Union[Offer, Bid]]:
+        """Return the order with the lowest (or highest if reverse_order) energy rate."""
+        if not self._sorted_keys:
+            return None
+        key = self._sorted_keys[-1] if reverse_order else self._sorted_keys[0]
+        return self.data[key[2]]
+
+    def best_rate(self, reverse_order: bool = False) -> Optional[float]:
+        """Return the lowest (or highest if reverse_order) energy rate of the order book."""
+        if not self._sorted_keys:
+            return None
+        return self._sorted_keys[-1][0] if reverse_order else self._sorted_keys[0][0]
+
+    def orders_at_best_rate(self, reverse_order: bool = False) -> List[Union[Offer, Bid]]:
+        """Return all orders whose energy rate is equal to the best rate of the order book."""
+        best_rate = self.best_rate(reverse_order)
+        if best_rate is None:
+            return []
+        if reverse_order:
+            keys = self._sorted_keys.irange(
+                minimum=(best_rate - FLOATING_POINT_TOLERANCE,), reverse=True)
+        else:
+            keys = self._sorted_keys.irange(
+                maximum=(best_rate + FLOATING_POINT_TOLERANCE,))
+        return [self.data[key[2]] for key in keys
+                if abs(key[0] - best_rate) < FLOATING_POINT_TOLERANCE]
@@ -0,0 +1,167 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from heapq import heappop, heappush, heappushpop
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from gsy_framework.data_classes import Trade
+from gsy_framework.utils import area_name_from_area_or_ma_name
+
+
+class StreamingRateStatistics:
+    """Min, max, average and median of a stream of rates, updated in O(log n) per rate.
+
+    The median is tracked with two heaps: a max-heap with the lower half of the rates (stored
+    negated) and a min-heap with the upper half. The lower half holds the extra rate if the count
+    is odd.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._sum = 0.
+        self._lower_half: List[float] = []
+        self._upper_half: List[float] = []
+
+    def add(self, rate: float) -> None:
+        """Add one rate to the statistics."""
+        self.count += 1
+        self._sum += rate
+        self.min = rate if self.min is None else min(self.min, rate)
+        self.max = rate if self.max is None else max(self.max, rate)
+        if self._lower_half and rate > -self._lower_half[0]:
+            rate = heappushpop(self._upper_half, rate)
+        heappush(self._lower_half, -rate)
+        if len(self._lower_half) > len(self._upper_half) + 1:
+            heappush(self._upper_half, -heappop(self._lower_half))
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Return the average of the rates, None if there are no rates."""
+        return self._sum / self.count if self.count else None
+
+    @property
+    def median(self) -> Optional[float]:
+        """Return the median of the rates, None if there are no rates."""
+        if not self.count:
+            return None
+        if len(self._lower_half) > len(self._upper_half):
+            return -self._lower_half[0]
+        return (-self._lower_half[0] + self._upper_half[0]) / 2
+
+
+class TradeLedger:
+    # pylint: disable=too-many-instance-attributes
+    """Aggregated statistics of the trades of a market, updated incrementally.
+
+    The ledger follows the trades list of the market: on every sync only the trades that were
+    appended since the previous sync are accumulated. If the list was replaced or shortened
+    (e.g. when old trades are deleted), the statistics are rebuilt from scratch.
+    """
+
+    def __init__(self):
+        self._reset(None)
+
+    def _reset(self, trades: Optional[List[Trade]]) -> None:
+        # pylint: disable=attribute-defined-outside-init
+        self._trades = trades
+        self._trade_count = 0
+        self.total_traded_energy_kWh = 0.
+        self.total_trade_price = 0.
+        self.rate_statistics = StreamingRateStatistics()
+        self._bought_energy_kWh: Dict[str, float] = {}
+        self._sold_energy_kWh: Dict[str, float] = {}
+        self._spent: Dict[str, float] = {}
+        self._earned: Dict[str, float] = {}
+        self._trades_per_trader: Dict[str, List[Trade]] = {}
+        # (seller area name, buyer area name) -> traded energy
+        self._traded_energy_per_area_pair_kWh: Dict[Tuple[str, str], float] = {}
+
+    def sync(self, trades: List[Trade]) -> "TradeLedger":
+        """Accumulate the trades that were added to the trades list since the last sync."""
+        if trades is not self._trades or len(trades) < self._trade_count:
+            self._reset(trades)
+        if len(trades) > self._trade_count:
+            for trade in trades[self._trade_count:]:
+                self._add_trade(trade)
+            self._trade_count = len(trades)
+        return self
+
+    def _add_trade(self, trade: Trade) -> None:
+        seller_name, buyer_name = trade.seller.name, trade.buyer.name
+        self.total_traded_energy_kWh += trade.traded_energy
+        self.total_trade_price += trade.trade_price
+        self.rate_statistics.add(trade.trade_rate)
+        self._bought_energy_kWh[buyer_name] = (
+            self._bought_energy_kWh.get(buyer_name, 0.) + trade.traded_energy)
+        self._sold_energy_kWh[seller_name] = (
+            self._sold_energy_kWh.get(seller_name, 0.) + trade.traded_energy)
+        self._spent[buyer_name] = self._spent.get(buyer_name, 0.) + trade.trade_price
+        self._earned[seller_name] = self._earned.get(seller_name, 0.) + trade.trade_price
+        self._trades_per_trader.setdefault(seller_name, []).append(trade)
+        if buyer_name != seller_name:
+            self._trades_per_trader.setdefault(buyer_name, []).append(trade)
+        area_pair = (area_name_from_area_or_ma_name(seller_name),
+                     area_name_from_area_or_ma_name(buyer_name))
+        self._traded_energy_per_area_pair_kWh[area_pair] = (
+            self._traded_energy_per_area_pair_kWh.get(area_pair, 0.) + trade.traded_energy)
+
+    @property
+    def trade_count(self) -> int:
+        """Return the number of trades."""
+        return self._trade_count
+
+    def bought_energy(self, buyer: str) -> float:
+        """Return the energy bought by the buyer."""
+        return self._bought_energy_kWh.get(buyer, 0)
+
+    def sold_energy(self, seller: str) -> float:
+        """Return the energy sold by the seller."""
+        return self._sold_energy_kWh.get(seller, 0)
+
+    def total_spent(self, buyer: str) -> float:
+        """Return the money spent by the buyer."""
+        return self._spent.get(buyer, 0)
+
+    def total_earned(self, seller: str) -> float:
+        """Return the money earned by the seller."""
+        return self._earned.get(seller, 0)
+
+    def get_trades_of_trader(self, trader_name: str) -> List[Trade]:
+        """Return the trades in which the trader is either the seller or the buyer."""
+        return self._trades_per_trader.get(trader_name, [])
+
+    def get_traded_energy_between_areas(
+            self, seller_area_names: Iterable[str], buyer_area_names: Iterable[str]) -> float:
+        """Return the energy that the seller areas sold to the buyer areas.
+
+        The names of the market agents are resolved to the names of their areas."""
+        buyer_area_names = list(buyer_area_names)
+        return sum(self._traded_energy_per_area_pair_kWh.get((seller, buyer), 0.)
+                   for seller in seller_area_names for buyer in buyer_area_names)
+
+
+def get_trade_ledger(market) -> TradeLedger:
+    """Return the synced trade ledger of the market.
+
+    Objects that only provide a trades list (e.g. markets that were restored from the results)
+    get a ledger that is built from their trades."""
+    trade_ledger = getattr(market, "trade_ledger", None)
+    if trade_ledger is None:
+        trade_ledger = TradeLedger()
+    return trade_ledger.sync(market.trades)
@@ -16,10 +16,11 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import uuid
+from collections import deque
 from copy import deepcopy
 from logging import getLogger
 from math import isclose
-from typing import Dict, List, Union, Tuple, Optional
+from typing import Dict, Iterable, List, Union, Tuple, Optional
 
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.data_classes import (
@@ -32,11 +33,12 @@ from pendulum import DateTime
 from gsy_e.constants import FLOATING_POINT_TOLERANCE
 from gsy_e.events.event_structures import MarketEvent
 from gsy_e.gsy_e_core.exceptions import (
-    BidNotFoundException, InvalidBidOfferPairException, InvalidTrade,
+    BidNotFoundException, InvalidBidOfferPairException, InvalidTrade, MarketReadOnlyException,
     NegativePriceOrdersException, NegativeEnergyOrderException, NegativeEnergyTradeException)
 from gsy_e.gsy_e_core.util import short_offer_bid_log_str, is_external_matching_enabled
 from gsy_e.models.market import lock_market_action
 from gsy_e.models.market.one_sided import OneSidedMarket
+from gsy_e.models.market.order_book import OrderBookSnapshot
 
 log = getLogger(__name__)
 
@@ -72,16 +74,22 @@ class TwoSidedMarket(OneSidedMarket):
                 f", V: {self.accumulated_trade_price})>")
 
     @lock_market_action
-    def get_bids(self) -> Dict:
+    def get_bids(self) -> OrderBookSnapshot:
         """
-        Retrieves a copy of all open bids of the market. The copy of the bids guarantees
-        that the return dict will remain unaffected from any mutations of the market bid list
-        that might happen concurrently (more specifically can be used in for loops without raising
-        the 'dict changed size during iteration' exception)
-        Returns: dict with open bids, bid id as keys, and Bid objects as values
+        Retrieves a snapshot of all open bids of the market. The snapshot guarantees
+        that the returned mapping will remain unaffected from any mutations of the market bid
+        list that might happen concurrently (more specifically can be used in for loops without
+        raising the 'dict changed size during iteration' exception). The snapshot is shared
+        between callers until the bids of the market change, and is read-only.
+        Returns: mapping with open bids, bid id as keys, and Bid objects as values
 
         """
-        return deepcopy(self.bids)
+        return self.bids.snapshot()
+
+    @lock_market_action
+    def has_bids_from_trader(self, trader: str, attribute: str = "uuid") -> bool:
+        """Check whether the trader (identified by its name or uuid) has open bids."""
+        return self.bids.has_orders_from_trader(trader, attribute)
 
     def _update_requirements_prices(self, bid):
         requirements = []
@@ -136,7 +144,7 @@ class TwoSidedMarket(OneSidedMarket):
             self.dispatch_market_bid_event(bid)
         log.debug("%s[BID][NEW][%s] %s", self._debug_log_market_type_identifier,
                   self.time_slot_str or bid.time_slot, bid)
-        self.no_new_order = False
+        self._notify_new_order(bid)
         return bid
 
     def dispatch_market_bid_event(self, bid: Bid) -> None:
@@ -155,6 +163,43 @@ class TwoSidedMarket(OneSidedMarket):
                   self._debug_log_market_type_identifier, self.time_slot_str or bid.time_slot, bid)
         self._notify_listeners(MarketEvent.BID_DELETED, bid=bid)
 
+    @lock_market_action
+    def amend_order(self, order_id: str, new_price: float,
+                    original_price: Optional[float] = None,
+                    adapt_price_with_fees: bool = True,
+                    dispatch_event: bool = True) -> Union[Offer, Bid]:
+        """Change the price of an open offer or bid in place, keeping its id."""
+        # pylint: disable=too-many-arguments
+        bid = self.bids.get(order_id)
+        if not bid:
+            return super().amend_order(order_id, new_price, original_price,
+                                       adapt_price_with_fees, dispatch_event)
+        if self.readonly:
+            raise MarketReadOnlyException()
+        if original_price is None:
+            original_price = new_price
+
+        if adapt_price_with_fees:
+            new_price = self.fee_class.update_incoming_bid_with_fee(
+                new_price / bid.energy, original_price / bid.energy) * bid.energy
+
+        if new_price < 0.0:
+            raise NegativePriceOrdersException(
+                "Negative price after taxes, bid cannot be amended.")
+
+        amended_bid = Bid(bid.id, bid.creation_time, new_price, bid.energy,
+                          bid.buyer, original_price,
+                          time_slot=bid.time_slot)
+        self.bids[amended_bid.id] = amended_bid
+        self.bid_history.append(amended_bid)
+
+        log.debug("%s[BID][AMEND][%s] %s", self._debug_log_market_type_identifier,
+                  self.time_slot_str or amended_bid.time_slot, amended_bid)
+        if dispatch_event is True:
+            self.dispatch_market_order_amended_event(amended_bid, bid)
+        self._notify_new_order(amended_bid)
+        return amended_bid
+
     def split_bid(self, original_bid: Bid, energy: float, orig_bid_price: float):
         """Split bid into two, one with provided energy, the other with the residual."""
 
@@ -308,8 +353,7 @@ class TwoSidedMarket(OneSidedMarket):
             return None
 
         return next(iter(
-            [offer for offer in self.offers.values()
-             if offer.seller.origin_uuid == seller_origin_id]), None)
+            self.offers.orders_from_trader(seller_origin_id, attribute="origin_uuid")), None)
 
     def _get_bid_from_buyer_origin_id(self, buyer_origin_id):
         if buyer_origin_id is None:
@@ -317,18 +361,55 @@ class TwoSidedMarket(OneSidedMarket):
             return None
 
         return next(iter(
-            [bid for bid in self.bids.values()
-             if bid.buyer.origin_uuid == buyer_origin_id]), None)
+            self.bids.orders_from_trader(buyer_origin_id, attribute="origin_uuid")), None)
+
+    @staticmethod
+    def _get_residual_order_id(order_id: str, residual_order_ids: Dict[str, str]) -> str:
+        """Follow the chain of residuals of an order that was partially traded.
+
+        The chain is compressed while following it, so that each recommendation that refers to
+        the same original order finds its latest residual in constant time.
+        """
+        residual_id = order_id
+        while residual_id in residual_order_ids:
+            residual_id = residual_order_ids[residual_id]
+        while order_id in residual_order_ids and residual_order_ids[order_id] != residual_id:
+            residual_order_ids[order_id], order_id = residual_id, residual_order_ids[order_id]
+        return residual_id
+
+    @staticmethod
+    def _adapt_matching_requirements_to_residual(
+            recommendation: BidOfferMatch, traded_energy: float) -> None:
+        """Reduce the energy of the bid requirement by the energy that the bid already traded."""
+        bid_requirement = (recommendation.matching_requirements or {}).get("bid_requirement")
+        if not traded_energy or "energy" not in (bid_requirement or {}):
+            return
+        bid_requirement = deepcopy(bid_requirement)
+        bid_requirement["energy"] -= traded_energy
+        recommendation.matching_requirements["bid_requirement"] = bid_requirement
 
     def match_recommendations(
             self, recommendations: List[BidOfferMatch.serializable_dict]) -> bool:
         """Match a list of bid/offer pairs, create trades and residual offers/bids.
+
+        Recommendations are processed in order. When a trade leaves a residual offer / bid, the
+        id of the traded order is redirected to the residual, therefore the upcoming
+        recommendations that refer to the traded order are matched against its residual.
         Returns True if trades were actually performed, False otherwise."""
+        # pylint: disable=too-many-locals
         were_trades_performed = False
-        while recommendations:
-            recommended_pair = BidOfferMatch.from_dict(recommendations.pop(0))
-
-            market_offer = self.offers.get(recommended_pair.offer["id"])
+        pending_recommendations = deque(recommendations)
+        # {traded order id: residual order id}
+        residual_offer_ids: Dict[str, str] = {}
+        residual_bid_ids: Dict[str, str] = {}
+        # {original bid id: energy that the bid and its residuals have traded}
+        bid_traded_energy: Dict[str, float] = {}
+        while pending_recommendations:
+            recommended_pair = BidOfferMatch.from_dict(pending_recommendations.popleft())
+            recommended_bid_id = recommended_pair.bid["id"]
+
+            market_offer = self.offers.get(
+                self._get_residual_order_id(recommended_pair.offer["id"], residual_offer_ids))
             # TODO: This is a temporary solution based on the fact that trading strategies do not
             # post multiple bids or offers on the same market at the moment. Will be shortly
             # replaced by a global offer / bid identifier instead of tracking the original order
@@ -340,13 +421,16 @@ class TwoSidedMarket(OneSidedMarket):
                     raise InvalidBidOfferPairException("Offer does not exist in the market")
             recommended_pair.offer = market_offer.serializable_dict()
 
-            market_bid = self.bids.get(recommended_pair.bid["id"])
+            market_bid = self.bids.get(
+                self._get_residual_order_id(recommended_bid_id, residual_bid_ids))
             if not market_bid:
                 market_bid = self._get_bid_from_buyer_origin_id(
                     recommended_pair.bid["buyer"]["origin_uuid"])
                 if market_bid is None:
                     raise InvalidBidOfferPairException("Bid does not exist in the market")
             recommended_pair.bid = market_bid.serializable_dict()
+            self._adapt_matching_requirements_to_residual(
+                recommended_pair, bid_traded_energy.get(recommended_bid_id, 0))
 
             if market_offer.seller.uuid == market_bid.buyer.uuid:
                 # Cannot clear a bid with an offer from the same direct origin.
@@ -361,33 +445,75 @@ class TwoSidedMarket(OneSidedMarket):
                     # re-raise exception to be handled by the external matcher
                     raise invalid_bop_exception
                 continue
-            original_bid_rate = recommended_pair.bid_energy_rate + (
-                    market_bid.accumulated_grid_fees / recommended_pair.bid_energy)
-            if ConstSettings.MASettings.BID_OFFER_MATCH_TYPE == \
-                    BidOfferMatchAlgoEnum.PAY_AS_BID.value:
-                trade_rate = original_bid_rate
-            else:
-                trade_rate = self.fee_class.calculate_original_trade_rate_from_clearing_rate(
-                    original_bid_rate, market_bid.energy_rate, recommended_pair.trade_rate)
-            trade_bid_info = TradeBidOfferInfo(
-                original_bid_rate=original_bid_rate,
-                propagated_bid_rate=recommended_pair.bid_energy_rate,
-                original_offer_rate=market_offer.original_energy_rate,
-                propagated_offer_rate=market_offer.energy_rate,
-                trade_rate=trade_rate,
-            )
-
-            bid_trade, offer_trade = self.accept_bid_offer_pair(
-                market_bid, market_offer, trade_rate,
-                trade_bid_info, min(recommended_pair.selected_energy,
-                                    market_offer.energy, market_bid.energy))
+            bid_trade, offer_trade = self._accept_matched_bid_offer_pair(
+                market_bid, market_offer, recommended_pair.trade_rate,
+                recommended_pair.selected_energy, recommended_pair.bid_energy_rate,
+                recommended_pair.bid_energy)
             were_trades_performed = True
-            recommendations = (
-                self._replace_offers_bids_with_residual_in_recommendations_list(
-                    recommendations, offer_trade, bid_trade)
-            )
+            if offer_trade.residual is not None:
+                residual_offer_ids[market_offer.id] = offer_trade.residual.id
+            if bid_trade.residual is not None:
+                residual_bid_ids[market_bid.id] = bid_trade.residual.id
+                bid_traded_energy[recommended_bid_id] = (
+                    bid_traded_energy.get(recommended_bid_id, 0) + bid_trade.traded_energy)
         return were_trades_performed
 
+    def match_bid_offer_pairs(
+            self, bid_offer_pairs: Iterable[Tuple[Bid, Offer, float, float]]) -> bool:
+        """Match (bid, offer, selected_energy, clearing_rate) pairs of the market's own orders.
+
+        Used by the in-process matching algorithms, which operate on the order objects directly
+        instead of on serialized recommendations. As in match_recommendations, pairs that refer
+        to an already traded order are matched against its residual.
+        Returns True if trades were actually performed, False otherwise."""
+        were_trades_performed = False
+        residual_offer_ids: Dict[str, str] = {}
+        residual_bid_ids: Dict[str, str] = {}
+        for bid, offer, selected_energy, clearing_rate in bid_offer_pairs:
+            market_offer = self.offers.get(
+                self._get_residual_order_id(offer.id, residual_offer_ids))
+            market_bid = self.bids.get(self._get_residual_order_id(bid.id, residual_bid_ids))
+            if not (market_offer and market_bid):
+                continue
+            if market_offer.seller.uuid == market_bid.buyer.uuid:
+                # Cannot clear a bid with an offer from the same direct origin.
+                continue
+            bid_trade, offer_trade = self._accept_matched_bid_offer_pair(
+                market_bid, market_offer, clearing_rate, selected_energy,
+                market_bid.energy_rate, market_bid.energy)
+            were_trades_performed = True
+            if offer_trade.residual is not None:
+                residual_offer_ids[market_offer.id] = offer_trade.residual.id
+            if bid_trade.residual is not None:
+                residual_bid_ids[market_bid.id] = bid_trade.residual.id
+        return were_trades_performed
+
+    def _accept_matched_bid_offer_pair(
+            self, market_bid: Bid, market_offer: Offer, clearing_rate: float,
+            selected_energy: float, bid_energy_rate: float,
+            bid_energy: float) -> Tuple[Trade, Trade]:
+        # pylint: disable=too-many-arguments
+        """Calculate the trade rate of a matched pair and accept it.
+
+        The bid energy rate and energy are the ones that the pair was matched with."""
+        original_bid_rate = bid_energy_rate + (market_bid.accumulated_grid_fees / bid_energy)
+        if ConstSettings.MASettings.BID_OFFER_MATCH_TYPE == \
+                BidOfferMatchAlgoEnum.PAY_AS_BID.value:
+            trade_rate = original_bid_rate
+        else:
+            trade_rate = self.fee_class.calculate_original_trade_rate_from_clearing_rate(
+                original_bid_rate, market_bid.energy_rate, clearing_rate)
+        trade_bid_info = TradeBidOfferInfo(
+            original_bid_rate=original_bid_rate,
+            propagated_bid_rate=bid_energy_rate,
+            original_offer_rate=market_offer.original_energy_rate,
+            propagated_offer_rate=market_offer.energy_rate,
+            trade_rate=trade_rate,
+        )
+        return self.accept_bid_offer_pair(
+            market_bid, market_offer, trade_rate, trade_bid_info,
+            min(selected_energy, market_offer.energy, market_bid.energy))
+
     @staticmethod
     def _validate_requirements_satisfied(
             recommendation: BidOfferMatch) -> None:
@@ -476,46 +602,3 @@ class TwoSidedMarket(OneSidedMarket):
                 raise InvalidBidOfferPairException(
                     f"Matching requirement {offer_matching_requirement} doesn't exist in the Offer"
                     f" object.")
-
-    @classmethod
-    def _replace_offers_bids_with_residual_in_recommendations_list(
-            cls, recommendations: List[Dict], offer_trade: Trade, bid_trade: Trade
-    ) -> List[BidOfferMatch.serializable_dict]:
-        """
-        If a trade resulted in a residual offer/bid, upcoming matching list with same offer/bid
-        needs to be replaced with residual offer/bid.
-        :param recommendations: Recommended list of offer/bid matches
-        :param offer_trade: Trade info of the successful offer
-        :param bid_trade: Trade info of the successful bid
-        :return: The updated matching offer/bid pair list with existing offer/bid
-        replaced with corresponding residual offer/bid
-        """
-
-        def _adapt_matching_requirements_in_residuals(recommendation):
-            if "energy" in (recommendation.get("matching_requirements") or {}).get(
-                    "bid_requirement", {}):
-                for index, requirement in enumerate(recommendation["bid"]["requirements"]):
-                    if requirement == recommendation["matching_requirements"]["bid_requirement"]:
-                        bid_requirement = deepcopy(requirement)
-                        bid_requirement["energy"] -= bid_trade.traded_energy
-                        recommendation["bid"]["requirements"][index] = bid_requirement
-                        recommendation["matching_requirements"][
-                            "bid_requirement"] = bid_requirement
-                        return recommendation
-            return recommendation
-
-        def replace_recommendations_with_residuals(recommendation: Dict):
-            if (recommendation["offer"]["id"] == offer_trade.match_details["offer"].id and
-                    offer_trade.residual is not None):
-                recommendation["offer"] = offer_trade.residual.serializable_dict()
-            if (recommendation["bid"]["id"] == bid_trade.match_details["bid"].id and
-                    bid_trade.residual is not None):
-                recommendation["bid"] = bid_trade.residual.serializable_dict()
-                recommendation = _adapt_matching_requirements_in_residuals(recommendation)
-
-            return recommendation
-
-        if offer_trade.residual or bid_trade.residual:
-            recommendations = [replace_recommendations_with_residuals(recommendation)
-                               for recommendation in recommendations]
-        return recommendations
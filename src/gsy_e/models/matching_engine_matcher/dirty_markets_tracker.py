@@ -0,0 +1,82 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Union
+
+from gsy_framework.data_classes import Bid, Offer
+from pendulum import DateTime
+
+if TYPE_CHECKING:
+    from gsy_e.models.market import MarketBase
+
+
+class DirtyMarketsTracker:
+    """Keep track of the markets (and time slots) that received new orders since their last
+    clearing.
+
+    The tracker registers itself as a new order listener of the markets, therefore the dirty
+    time slots are collected while the orders are posted, and the matcher only needs to visit
+    the markets and time slots that actually changed.
+    """
+
+    def __init__(self):
+        self._markets: Dict[str, "MarketBase"] = {}
+        # {area_uuid: [market_id]}
+        self._area_market_ids: Dict[str, List[str]] = {}
+        # {market_id: {time_slot}}
+        self._dirty_time_slots: Dict[str, Set[Optional[DateTime]]] = {}
+
+    def update_area_markets(self, area_uuid: str, markets: Iterable["MarketBase"]) -> None:
+        """Register the current markets of the area and release its markets that expired."""
+        market_ids = []
+        for market in markets:
+            if not market:
+                continue
+            market_ids.append(market.id)
+            if market.id not in self._markets:
+                self._register(market)
+        for market_id in set(self._area_market_ids.get(area_uuid, [])) - set(market_ids):
+            self._unregister(market_id)
+        self._area_market_ids[area_uuid] = market_ids
+
+    def _register(self, market: "MarketBase") -> None:
+        self._markets[market.id] = market
+        market.new_order_listeners.append(self.on_new_order)
+        if not market.no_new_order:
+            # Orders were posted before the registration, all time slots need to be cleared.
+            self._dirty_time_slots[market.id] = {None}
+
+    def _unregister(self, market_id: str) -> None:
+        market = self._markets.pop(market_id, None)
+        self._dirty_time_slots.pop(market_id, None)
+        if market is not None and self.on_new_order in market.new_order_listeners:
+            market.new_order_listeners.remove(self.on_new_order)
+
+    def on_new_order(self, market: "MarketBase", order: Union[Offer, Bid]) -> None:
+        """Flag the time slot of the order as dirty."""
+        self._dirty_time_slots.setdefault(market.id, set()).add(order.time_slot)
+
+    def is_dirty(self, market: "MarketBase") -> bool:
+        """Return True if the market received new orders since it was last cleared."""
+        return market.id in self._dirty_time_slots
+
+    def pop_dirty_time_slots(self, market: "MarketBase") -> Optional[Set[Optional[DateTime]]]:
+        """Return the dirty time slots of the market and flag it as clean.
+
+        None is returned if the market is clean. A None time slot in the returned set means that
+        all time slots of the market need to be cleared."""
+        return self._dirty_time_slots.pop(market.id, None)
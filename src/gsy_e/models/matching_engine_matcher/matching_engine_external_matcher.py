@@ -15,7 +15,6 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-import json
 import logging
 from copy import copy
 from enum import Enum
@@ -32,6 +31,8 @@ from gsy_e.gsy_e_core.exceptions import (InvalidBidOfferPairException,
 from gsy_e.gsy_e_core.market_counters import ExternalTickCounter
 from gsy_e.gsy_e_core.redis_connections.area_market import (
     matching_engine_redis_communicator_factory)
+from gsy_e.gsy_e_core.redis_connections.wire_format import (WireCodec, decode_payload,
+                                                            get_wire_codec)
 from gsy_e.models.market.two_sided import TwoSidedMarket
 from gsy_e.models.matching_engine_matcher.matching_engine_matcher_interface import (
     MatchingEngineMatcherInterface)
@@ -79,6 +80,14 @@ class MatchingEngineExternalMatcher(MatchingEngineMatcherInterface):
              channel_names.recommendations: self._populate_recommendations
              })
 
+    @staticmethod
+    def _get_response_codec(data: Dict) -> WireCodec:
+        """Return the codec of the wire format that the client requested for the response.
+
+        The events and the other responses are broadcast to all clients, therefore they are
+        always published in the default JSON format."""
+        return get_wire_codec(data.get("wire_format"))
+
     def _publish_orders(self):
         """Publish open offers and bids.
 
@@ -91,7 +100,7 @@ class MatchingEngineExternalMatcher(MatchingEngineMatcherInterface):
         self._publish_orders_message_buffer.clear()
 
         for message in publish_orders:
-            data = json.loads(message.get("data"))
+            data = decode_payload(message.get("data"))
             response_data = {"event": ExternalMatcherEventsEnum.OFFERS_BIDS_RESPONSE.value}
             filters = data.get("filters", {})
             # IDs of markets (Areas) the client is interested in
@@ -130,11 +139,12 @@ class MatchingEngineExternalMatcher(MatchingEngineMatcherInterface):
             })
 
             self.matching_engine_ext_conn.publish_json(
-                MatchingEngineChannels(self.simulation_id).response, response_data)
+                MatchingEngineChannels(self.simulation_id).response, response_data,
+                self._get_response_codec(data))
 
     def _populate_recommendations(self, message):
         """Receive trade recommendations and store them to be consumed in a later stage."""
-        data = json.loads(message.get("data"))
+        data = decode_payload(message.get("data"))
         recommendations = data.get("recommended_matches", [])
         self._recommendations.extend(recommendations)
 
@@ -15,16 +15,25 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+from typing import Dict, Iterable, List, Optional, Tuple
+
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.enums import AvailableMarketTypes, BidOfferMatchAlgoEnum
 from gsy_framework.matching_algorithms import (AttributedMatchingAlgorithm,
                                                PayAsBidMatchingAlgorithm,
                                                PayAsClearMatchingAlgorithm)
 
+from gsy_e import constants
 from gsy_e.gsy_e_core.exceptions import WrongMarketTypeException
 from gsy_e.gsy_e_core.market_counters import FutureMarketCounter
+from gsy_e.gsy_e_core.util import is_parallel_clearing_enabled
+from gsy_e.models.matching_engine_matcher.dirty_markets_tracker import DirtyMarketsTracker
 from gsy_e.models.matching_engine_matcher.matching_engine_matcher_interface import \
     MatchingEngineMatcherInterface
+from gsy_e.models.matching_engine_matcher.parallel_market_clearing import ParallelMarketClearing
+from gsy_e.models.matching_engine_matcher.vectorized_matching_algorithms import (
+    VectorizedMatchingAlgorithm, VectorizedPayAsBidMatchingAlgorithm,
+    VectorizedPayAsClearMatchingAlgorithm)
 
 
 class MatchingEngineInternalMatcher(MatchingEngineMatcherInterface):
@@ -34,10 +43,15 @@ class MatchingEngineInternalMatcher(MatchingEngineMatcherInterface):
         super().__init__()
         self.match_algorithm = None
         self._future_market_counter = None
+        self._dirty_markets = DirtyMarketsTracker()
+        self._parallel_clearing: Optional[ParallelMarketClearing] = None
 
     def activate(self):
         self.match_algorithm = self._get_matching_algorithm_spot_markets()
         self._future_market_counter = FutureMarketCounter()
+        if (is_parallel_clearing_enabled() and
+                isinstance(self.match_algorithm, VectorizedMatchingAlgorithm)):
+            self._parallel_clearing = ParallelMarketClearing(constants.PARALLEL_CLEARING_WORKERS)
 
     def _get_matches_recommendations(self, data):
         """Wrapper for matching algorithm's matches recommendations."""
@@ -50,6 +64,15 @@ class MatchingEngineInternalMatcher(MatchingEngineMatcherInterface):
         :raises:
             WrongMarketTypeException
         """
+        if constants.VECTORIZED_MATCHING_ALGORITHMS:
+            if (ConstSettings.MASettings.BID_OFFER_MATCH_TYPE ==
+                    BidOfferMatchAlgoEnum.PAY_AS_BID.value):
+                return VectorizedPayAsBidMatchingAlgorithm()
+            # Only the default aggregation of the pay as clear curves is supported in-process
+            if (ConstSettings.MASettings.BID_OFFER_MATCH_TYPE ==
+                    BidOfferMatchAlgoEnum.PAY_AS_CLEAR.value and
+                    ConstSettings.MASettings.PAY_AS_CLEAR_AGGREGATION_ALGORITHM == 1):
+                return VectorizedPayAsClearMatchingAlgorithm()
         if (ConstSettings.MASettings.BID_OFFER_MATCH_TYPE ==
                 BidOfferMatchAlgoEnum.PAY_AS_BID.value):
             return PayAsBidMatchingAlgorithm()
@@ -64,16 +87,94 @@ class MatchingEngineInternalMatcher(MatchingEngineMatcherInterface):
 
     def match_recommendations(self, **kwargs):
         """Request trade recommendations and match them in the relevant market."""
+        if self._parallel_clearing is not None:
+            self._match_areas_in_parallel()
+            return
         for area_uuid, area_data in self.area_uuid_markets_mapping.items():
-            markets = [*area_data[AvailableMarketTypes.SPOT],
-                       *area_data[AvailableMarketTypes.SETTLEMENT]]
-            if self._future_market_counter.is_time_for_clearing(
-                    area_data["current_time"]):
-                markets.append(area_data[AvailableMarketTypes.FUTURE])
-            self._match_recommendations(area_uuid, area_data, markets,
-                                        self._get_matches_recommendations)
+            markets, market_time_slots = self._get_area_markets_to_clear(area_uuid, area_data)
+            if not markets:
+                continue
+            if isinstance(self.match_algorithm, VectorizedMatchingAlgorithm):
+                self._match_markets_in_process(markets, market_time_slots)
+            else:
+                self._match_recommendations(area_uuid, area_data, markets,
+                                            self._get_matches_recommendations,
+                                            market_time_slots)
+            for market in markets:
+                # The residual orders that were posted while matching have already been cleared.
+                self._dirty_markets.pop_dirty_time_slots(market)
+        self.area_uuid_markets_mapping = {}
+
+    def _get_area_markets_to_clear(
+            self, area_uuid: str, area_data: Dict
+    ) -> Tuple[List, Dict[str, Optional[Iterable]]]:
+        """Return the markets of the area that need to be cleared and their time slots."""
+        markets = [*area_data[AvailableMarketTypes.SPOT],
+                   *area_data[AvailableMarketTypes.SETTLEMENT]]
+        self._dirty_markets.update_area_markets(
+            area_uuid, [*markets, area_data[AvailableMarketTypes.FUTURE]])
+        if self._future_market_counter.is_time_for_clearing(
+                area_data["current_time"]):
+            markets.append(area_data[AvailableMarketTypes.FUTURE])
+        market_time_slots = self._get_market_time_slots_to_clear(markets)
+        markets = [market for market in markets if market and market.id in market_time_slots]
+        return markets, market_time_slots
+
+    def _match_areas_in_parallel(self) -> None:
+        """Clear the markets of all areas that ticked at once, using the worker pool.
+
+        The areas are visited in the order of the grid tree, independently of the order of their
+        ticks, so that the trades are performed in a deterministic order."""
+        markets_time_slots = []
+        for area_uuid, area_data in sorted(self.area_uuid_markets_mapping.items(),
+                                           key=lambda item: item[1].get("tree_position", ())):
+            markets, market_time_slots = self._get_area_markets_to_clear(area_uuid, area_data)
+            markets_time_slots.extend(
+                (market, market_time_slots.get(market.id))
+                for market in markets if not market.no_new_order)
+        if markets_time_slots:
+            self._parallel_clearing.clear_markets(self.match_algorithm, markets_time_slots)
+        for market, _ in markets_time_slots:
+            market.no_new_order = True
+            self._dirty_markets.pop_dirty_time_slots(market)
         self.area_uuid_markets_mapping = {}
 
+    def _get_market_time_slots_to_clear(
+            self, markets: List) -> Dict[str, Optional[Iterable]]:
+        """Return the {market_id: time_slots} that received orders that can be matched.
+
+        Markets without new orders since their last clearing are skipped, as well as the time
+        slots whose best bid cannot be matched with their best offer. A None value means that all
+        time slots of the market have to be cleared.
+        """
+        market_time_slots = {}
+        for market in markets:
+            if not market:
+                continue
+            dirty_time_slots = self._dirty_markets.pop_dirty_time_slots(market)
+            if not dirty_time_slots:
+                continue
+            if None in dirty_time_slots:
+                if market.has_crossing_orders():
+                    market_time_slots[market.id] = None
+            else:
+                crossing_time_slots = [time_slot for time_slot in dirty_time_slots
+                                       if market.has_crossing_orders(time_slot)]
+                if crossing_time_slots:
+                    market_time_slots[market.id] = crossing_time_slots
+            if market.id not in market_time_slots:
+                market.no_new_order = True
+        return market_time_slots
+
+    def _match_markets_in_process(
+            self, markets: List, market_time_slots: Dict[str, Optional[Iterable]]) -> None:
+        """Match the orders of the markets directly, without exchanging recommendations."""
+        for market in markets:
+            if market.no_new_order:
+                continue
+            self.match_algorithm.match_market(market, market_time_slots.get(market.id))
+            market.no_new_order = True
+
     def event_tick(self, **kwargs) -> None:
         pass
 
@@ -81,4 +182,5 @@ class MatchingEngineInternalMatcher(MatchingEngineMatcherInterface):
         pass
 
     def event_finish(self, **kwargs) -> None:
-        pass
+        if self._parallel_clearing is not None:
+            self._parallel_clearing.shutdown()
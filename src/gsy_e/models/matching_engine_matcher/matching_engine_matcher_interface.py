@@ -16,7 +16,7 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 from abc import ABC, abstractmethod
-from typing import Dict, List, Callable
+from typing import Callable, Dict, Iterable, List, Optional
 
 
 class MatchingEngineMatcherInterface(ABC):
@@ -45,17 +45,25 @@ class MatchingEngineMatcherInterface(ABC):
         """Handler for the finish event."""
 
     @staticmethod
-    def _match_recommendations(area_uuid: str, area_data: Dict, markets: List,
-                               get_matches_recommendations: Callable) -> None:
-        """Request trade recommendations and match them in the relevant market."""
+    def _match_recommendations(
+            area_uuid: str, area_data: Dict, markets: List,
+            get_matches_recommendations: Callable,
+            market_time_slots: Optional[Dict[str, Optional[Iterable]]] = None) -> None:
+        """Request trade recommendations and match them in the relevant market.
+
+        If market_time_slots ({market_id: time_slots}) is provided, only the orders of these
+        time slots are sent for matching (all time slots of the market if time_slots is None).
+        """
+        # pylint: disable=too-many-arguments
         for market in markets:
             if not market:
                 continue
             if market.no_new_order:
                 continue
+            time_slots = (market_time_slots or {}).get(market.id)
             while True:
                 # Perform matching until all recommendations and their residuals are handled.
-                orders = market.orders_per_slot()
+                orders = market.orders_per_slot(time_slots)
 
                 # Format should be: {area_uuid: {time_slot: {"bids": [], "offers": [], ...}}}
                 data = {
@@ -0,0 +1,117 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import repeat
+from typing import TYPE_CHECKING, Iterable, List, Optional, Sequence, Tuple
+
+from gsy_framework.data_classes import Bid, Offer
+from pendulum import DateTime
+
+from gsy_e.models.matching_engine_matcher.vectorized_matching_algorithms import (
+    OrderArrays, VectorizedMatchingAlgorithm)
+
+if TYPE_CHECKING:
+    from gsy_e.models.market.two_sided import TwoSidedMarket
+
+# (bid_id, offer_id, selected_energy, clearing_rate)
+BidOfferPairIds = Tuple[str, str, float, float]
+# (bids, offers) of each time slot of one market
+OrdersSnapshot = List[Tuple[OrderArrays, OrderArrays]]
+
+
+def get_bid_offer_pair_ids(algorithm: VectorizedMatchingAlgorithm,
+                           orders_snapshot: OrdersSnapshot) -> List[BidOfferPairIds]:
+    """Match the snapshot of the orders of one market; executed by the worker processes.
+
+    The snapshot only contains the arrays of the orders, and only the ids of the matched orders
+    are returned, the trades are performed on the orders of the market in the main process."""
+    return [(bids.ids[bid_index], offers.ids[offer_index], selected_energy, clearing_rate)
+            for bids, offers in orders_snapshot
+            for bid_index, offer_index, selected_energy, clearing_rate
+            in algorithm.get_bid_offer_index_pairs(bids, offers)]
+
+
+class ParallelMarketClearing:
+    """Clear the markets of multiple areas concurrently in a pool of worker processes.
+
+    In each round, the order books of all markets are snapshotted to OrderArrays and matched by
+    the workers, which avoids pickling the orders themselves.
+    The matched pairs are then traded in the markets in the order in which the markets were
+    provided, therefore the results do not depend on the scheduling of the workers. Markets that
+    traded are matched again in the next round, until no more trades occur, the same way as
+    VectorizedMatchingAlgorithm.match_market does for a single market.
+    """
+
+    def __init__(self, max_workers: int):
+        self._max_workers = max_workers
+        self._executor: Optional[Executor] = None
+
+    @property
+    def executor(self) -> Executor:
+        """Return the worker pool, the worker processes are started on first use."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def clear_markets(
+            self, algorithm: VectorizedMatchingAlgorithm,
+            markets_time_slots: Sequence[
+                Tuple["TwoSidedMarket", Optional[Iterable[DateTime]]]]) -> None:
+        """Match the (market, time_slots) pairs until no more trades occur."""
+        pending = list(markets_time_slots)
+        while pending:
+            snapshots = [self._snapshot_orders(algorithm, market, time_slots)
+                         for market, time_slots in pending]
+            # Send multiple markets to each worker at once, in order to reduce the overhead of
+            # the inter process communication for areas with small order books.
+            chunksize = max(1, len(pending) // (4 * self._max_workers))
+            results = self.executor.map(
+                get_bid_offer_pair_ids, repeat(algorithm), snapshots, chunksize=chunksize)
+            next_pending = []
+            for (market, time_slots), pair_ids in zip(pending, results):
+                if pair_ids and market.match_bid_offer_pairs(
+                        self._get_bid_offer_pairs(market, pair_ids)):
+                    next_pending.append((market, time_slots))
+            pending = next_pending
+
+    @staticmethod
+    def _snapshot_orders(algorithm: VectorizedMatchingAlgorithm, market: "TwoSidedMarket",
+                         time_slots: Optional[Iterable[DateTime]]) -> OrdersSnapshot:
+        return [(OrderArrays.from_bids(bids), OrderArrays.from_offers(offers))
+                for bids, offers in algorithm.get_orders_per_slot(market, time_slots)
+                if bids and offers]
+
+    @staticmethod
+    def _get_bid_offer_pairs(market: "TwoSidedMarket", pair_ids: List[BidOfferPairIds]
+                             ) -> List[Tuple[Bid, Offer, float, float]]:
+        """Replace the order ids with the orders of the market.
+
+        Orders that were removed from the market since the snapshot (e.g. by the trades that
+        the market agents performed while the previous markets were cleared) are skipped."""
+        pairs = []
+        for bid_id, offer_id, selected_energy, clearing_rate in pair_ids:
+            bid, offer = market.bids.get(bid_id), market.offers.get(offer_id)
+            if bid is not None and offer is not None:
+                pairs.append((bid, offer, selected_energy, clearing_rate))
+        return pairs
@@ -0,0 +1,259 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from gsy_framework.data_classes import Bid, Offer
+from pendulum import DateTime
+
+from gsy_e.constants import FLOATING_POINT_TOLERANCE
+from gsy_e.models.market.future import FutureMarkets
+
+if TYPE_CHECKING:
+    from gsy_e.models.market.two_sided import TwoSidedMarket
+
+# (bid, offer, selected_energy, clearing_rate)
+BidOfferPair = Tuple[Bid, Offer, float, float]
+# (bid_index, offer_index, selected_energy, clearing_rate), the indices refer to the OrderArrays
+BidOfferIndexPair = Tuple[int, int, float, float]
+
+
+@dataclass
+class OrderArrays:
+    """Compact representation of the orders of one side of a market time slot.
+
+    Only the fields that the vectorized matching algorithms need are kept, therefore these
+    arrays are sent to the parallel clearing worker processes instead of the orders themselves.
+    """
+    ids: List[str]
+    energy_rates: np.ndarray
+    energies: np.ndarray
+    # The uuid of the buyer of the bids or of the seller of the offers
+    trader_uuids: List[str]
+
+    @classmethod
+    def from_bids(cls, bids: Sequence[Bid]) -> "OrderArrays":
+        """Create the arrays of the bids."""
+        return cls._from_orders(bids, [bid.buyer.uuid for bid in bids])
+
+    @classmethod
+    def from_offers(cls, offers: Sequence[Offer]) -> "OrderArrays":
+        """Create the arrays of the offers."""
+        return cls._from_orders(offers, [offer.seller.uuid for offer in offers])
+
+    @classmethod
+    def _from_orders(cls, orders: Sequence, trader_uuids: List[str]) -> "OrderArrays":
+        return cls(
+            ids=[order.id for order in orders],
+            energy_rates=np.fromiter(
+                (order.energy_rate for order in orders), dtype=float, count=len(orders)),
+            energies=np.fromiter(
+                (order.energy for order in orders), dtype=float, count=len(orders)),
+            trader_uuids=trader_uuids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def _sorted_order_arrays(orders: OrderArrays, descending: bool
+                         ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the indices of the orders sorted by energy rate and their rate and energy arrays.
+
+    The sort is stable, therefore orders with equal energy rate keep their insertion order, the
+    same way as the sorting of the serialized orders of the gsy_framework matching algorithms.
+    """
+    rates = orders.energy_rates
+    sort_index = np.argsort(-rates if descending else rates, kind="stable")
+    return sort_index, rates[sort_index], orders.energies[sort_index]
+
+
+class VectorizedMatchingAlgorithm(ABC):
+    """In-process matching algorithm that operates on NumPy arrays of the market's orders.
+
+    Contrary to the gsy_framework matching algorithms, the orders are neither serialized to
+    recommendations nor parsed back, the matched pairs are directly traded in the market.
+    """
+
+    @abstractmethod
+    def get_bid_offer_index_pairs(self, bids: OrderArrays, offers: OrderArrays
+                                  ) -> List[BidOfferIndexPair]:
+        """Return the indices of the matched pairs of the bids and offers of one time slot."""
+
+    def get_bid_offer_pairs(self, bids: Sequence[Bid], offers: Sequence[Offer]
+                            ) -> List[BidOfferPair]:
+        """Return the matched pairs of the bids and offers of one time slot."""
+        if not bids or not offers:
+            return []
+        return [(bids[bid_index], offers[offer_index], selected_energy, clearing_rate)
+                for bid_index, offer_index, selected_energy, clearing_rate
+                in self.get_bid_offer_index_pairs(
+                    OrderArrays.from_bids(bids), OrderArrays.from_offers(offers))]
+
+    @staticmethod
+    def get_orders_per_slot(market: "TwoSidedMarket",
+                            time_slots: Optional[Iterable[DateTime]] = None
+                            ) -> List[Tuple[Sequence[Bid], Sequence[Offer]]]:
+        """Return the (bids, offers) of each time slot of the market that should be matched."""
+        if isinstance(market, FutureMarkets):
+            if time_slots is None:
+                time_slots = {**market.slot_bid_mapping, **market.slot_offer_mapping}
+            return [(market.slot_bid_mapping.get(time_slot, []),
+                     market.slot_offer_mapping.get(time_slot, []))
+                    for time_slot in time_slots]
+        return [(list(market.bids.values()), list(market.offers.values()))]
+
+    def match_market(self, market: "TwoSidedMarket",
+                     time_slots: Optional[Iterable[DateTime]] = None) -> bool:
+        """Match the orders of the market until no more trades occur.
+
+        Only the orders of the time_slots are matched, if provided.
+        Returns True if trades were actually performed, False otherwise."""
+        were_trades_performed = False
+        while True:
+            bid_offer_pairs = [
+                pair
+                for bids, offers in self.get_orders_per_slot(market, time_slots)
+                for pair in self.get_bid_offer_pairs(bids, offers)]
+            if not bid_offer_pairs or not market.match_bid_offer_pairs(bid_offer_pairs):
+                return were_trades_performed
+            were_trades_performed = True
+
+
+class VectorizedPayAsBidMatchingAlgorithm(VectorizedMatchingAlgorithm):
+    """Pay as bid: the cheapest offers are matched with the most expensive bids one by one."""
+
+    def get_bid_offer_index_pairs(self, bids: OrderArrays, offers: OrderArrays
+                                  ) -> List[BidOfferIndexPair]:
+        if not len(bids) or not len(offers):
+            return []
+        bid_order, bid_rates, _ = _sorted_order_arrays(bids, descending=True)
+        offer_order, offer_rates, _ = _sorted_order_arrays(offers, descending=False)
+        count = min(len(bid_order), len(offer_order))
+        # Each offer selects the most expensive bid that has not been selected yet. Since the
+        # offers are sorted by ascending rate, the k-th offer selects the k-th bid until the first
+        # bid that is cheaper than its offer.
+        matchable = (offer_rates[:count] - bid_rates[:count]) <= FLOATING_POINT_TOLERANCE
+        pair_count = count if matchable.all() else int(np.argmin(matchable))
+        pairs = list(zip(bid_order[:pair_count].tolist(), offer_order[:pair_count].tolist()))
+        if any(bids.trader_uuids[bid_index] == offers.trader_uuids[offer_index]
+               for bid_index, offer_index in pairs):
+            pairs = self._select_bids_sequentially(bids, bid_order, bid_rates,
+                                                   offers, offer_order, offer_rates)
+        return [(bid_index, offer_index,
+                 float(min(bids.energies[bid_index], offers.energies[offer_index])),
+                 float(bids.energy_rates[bid_index]))
+                for bid_index, offer_index in pairs]
+
+    @staticmethod
+    def _select_bids_sequentially(bids: OrderArrays, bid_order: np.ndarray,
+                                  bid_rates: np.ndarray, offers: OrderArrays,
+                                  offer_order: np.ndarray, offer_rates: np.ndarray
+                                  ) -> List[Tuple[int, int]]:
+        """Select the bids one by one, skipping the bids of the seller of the offer."""
+        pairs = []
+        selected_bids = set()
+        for offer_position, offer_index in enumerate(offer_order.tolist()):
+            for bid_position, bid_index in enumerate(bid_order.tolist()):
+                if (offer_rates[offer_position] - bid_rates[bid_position] >
+                        FLOATING_POINT_TOLERANCE):
+                    break
+                if (bid_index in selected_bids or
+                        bids.trader_uuids[bid_index] == offers.trader_uuids[offer_index]):
+                    continue
+                selected_bids.add(bid_index)
+                pairs.append((bid_index, offer_index))
+                break
+        return pairs
+
+
+class VectorizedPayAsClearMatchingAlgorithm(VectorizedMatchingAlgorithm):
+    """Pay as clear: all orders that cross the clearing point trade at the clearing rate."""
+
+    @staticmethod
+    def get_clearing_point(bid_rates: np.ndarray, bid_energies: np.ndarray,
+                           offer_rates: np.ndarray, offer_energies: np.ndarray
+                           ) -> Optional[Tuple[float, float]]:
+        """Return the (clearing_rate, clearing_energy) of the sorted bids and offers.
+
+        For each bid rate (in descending order), the demand is the energy of all bids with at
+        least this rate, and the supply is the energy of all offers with at most this rate. The
+        same way as the gsy_framework PayAsClearMatchingAlgorithm, the clearing point is the
+        lowest bid rate whose demand is covered by the supply. If the supply covers the demand at
+        no bid rate, the whole supply of the highest bid rate is cleared at this rate.
+        """
+        if not len(bid_rates) or not len(offer_rates):
+            return None
+        cumulative_demand = np.cumsum(bid_energies)
+        cumulative_supply = np.cumsum(offer_energies)
+        # Aggregate the demand of bids with the same rate on the last bid of the group
+        is_last_of_rate = np.append(bid_rates[1:] != bid_rates[:-1], True)
+        demand_rates = bid_rates[is_last_of_rate]
+        demand = cumulative_demand[is_last_of_rate]
+        supply_index = np.searchsorted(
+            offer_rates, demand_rates + FLOATING_POINT_TOLERANCE, side="right") - 1
+        has_supply = supply_index >= 0
+        if not has_supply.any():
+            return None
+        supply = np.where(has_supply, cumulative_supply[np.maximum(supply_index, 0)], 0.)
+        is_covered = has_supply & (supply >= demand)
+        if is_covered.any():
+            # The demand increases with decreasing bid rate, therefore the last covered point
+            # is the lowest bid rate that clears the most energy
+            clearing_index = int(np.flatnonzero(is_covered)[-1])
+            return float(demand_rates[clearing_index]), float(demand[clearing_index])
+        # The supply decreases with decreasing bid rate, therefore the highest bid rate clears
+        # the most energy
+        return float(demand_rates[0]), float(supply[0])
+
+    def get_bid_offer_index_pairs(self, bids: OrderArrays, offers: OrderArrays
+                                  ) -> List[BidOfferIndexPair]:
+        if not len(bids) or not len(offers):
+            return []
+        bid_order, bid_rates, bid_energies = _sorted_order_arrays(bids, descending=True)
+        offer_order, offer_rates, offer_energies = _sorted_order_arrays(
+            offers, descending=False)
+        clearing = self.get_clearing_point(bid_rates, bid_energies, offer_rates, offer_energies)
+        if clearing is None or clearing[1] <= FLOATING_POINT_TOLERANCE:
+            return []
+        clearing_rate, clearing_energy = clearing
+        bid_count = int(np.searchsorted(
+            -bid_rates, -(clearing_rate - FLOATING_POINT_TOLERANCE), side="right"))
+        offer_count = int(np.searchsorted(
+            offer_rates, clearing_rate + FLOATING_POINT_TOLERANCE, side="right"))
+
+        # Allocate the clearing energy to the accepted bids and offers in one pass: the
+        # cumulative energy of the bids and of the offers split the clearing energy in segments,
+        # each of which is traded between one bid and one offer.
+        bid_bounds = np.minimum(np.cumsum(bid_energies[:bid_count]), clearing_energy)
+        offer_bounds = np.minimum(np.cumsum(offer_energies[:offer_count]), clearing_energy)
+        segment_ends = np.unique(np.concatenate((bid_bounds, offer_bounds)))
+        segment_starts = np.concatenate(([0.], segment_ends[:-1]))
+        segment_energies = segment_ends - segment_starts
+        is_tradeable = segment_energies > FLOATING_POINT_TOLERANCE
+        segment_starts = segment_starts[is_tradeable]
+        bid_indices = np.minimum(
+            np.searchsorted(bid_bounds, segment_starts, side="right"), bid_count - 1)
+        offer_indices = np.minimum(
+            np.searchsorted(offer_bounds, segment_starts, side="right"), offer_count - 1)
+        return [
+            (bid_index, offer_index, energy, clearing_rate)
+            for bid_index, offer_index, energy in zip(
+                bid_order[bid_indices].tolist(), offer_order[offer_indices].tolist(),
+                segment_energies[is_tradeable].tolist())]
@@ -15,7 +15,6 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-import json
 import logging
 import sys
 from abc import ABC
@@ -37,10 +36,12 @@ from gsy_e.events.event_structures import AreaEvent, MarketEvent
 from gsy_e.gsy_e_core.device_registry import DeviceRegistry
 from gsy_e.gsy_e_core.exceptions import D3ARedisException, MarketException, SimulationException
 from gsy_e.gsy_e_core.redis_connections.area_market import BlockingCommunicator
+from gsy_e.gsy_e_core.redis_connections.wire_format import decode_payload, get_internal_wire_codec
 from gsy_e.gsy_e_core.util import append_or_create_key
 from gsy_e.models.base import AreaBehaviorBase
 from gsy_e.models.config import SimulationConfig
 from gsy_e.models.market import MarketBase
+from gsy_e.models.market.trade_ledger import get_trade_ledger
 from gsy_e.models.strategy.future.strategy import FutureMarketStrategyInterface
 from gsy_e.models.strategy.settlement.strategy import SettlementMarketStrategyInterface
 
@@ -88,10 +89,7 @@ class _TradeLookerUpper:
         self.owner_name = owner_name
 
     def __getitem__(self, market: MarketBase) -> Generator[Trade, None, None]:
-        for trade in market.trades:
-            owner_name = self.owner_name
-            if owner_name in (trade.seller.name, trade.buyer.name):
-                yield trade
+        yield from get_trade_ledger(market).get_trades_of_trader(self.owner_name)
 
 
 def market_strategy_connection_adapter_factory() -> Union["MarketStrategyConnectionAdapter",
@@ -153,7 +151,7 @@ class MarketStrategyConnectionRedisAdapter:
         return trade
 
     def _redis_accept_offer_response(self, payload: dict):
-        data = json.loads(payload["data"])
+        data = decode_payload(payload["data"])
         if data["status"] == "ready":
             self._trade_buffer = Trade.from_json(data["trade"])
             self._event_response_uuids.append(data["transaction_uuid"])
@@ -178,7 +176,7 @@ class MarketStrategyConnectionRedisAdapter:
 
         data["transaction_uuid"] = str(uuid4())
         self.redis.sub_to_channel(response_channel, callback)
-        self.redis.publish(market_channel, json.dumps(data))
+        self.redis.publish(market_channel, get_internal_wire_codec().encode(data))
 
         def event_response_was_received_callback():
             return data["transaction_uuid"] in self._event_response_uuids
@@ -192,7 +190,7 @@ class MarketStrategyConnectionRedisAdapter:
             self._event_response_uuids.remove(data["transaction_uuid"])
 
     def _redis_delete_offer_response(self, payload: dict) -> None:
-        data = json.loads(payload["data"])
+        data = decode_payload(payload["data"])
         if data["status"] == "ready":
             self._event_response_uuids.append(data["transaction_uuid"])
 
@@ -202,7 +200,7 @@ class MarketStrategyConnectionRedisAdapter:
                 f"{data['exception']}:  {data['error_message']}")
 
     def _redis_offer_response(self, payload):
-        data = json.loads(payload["data"])
+        data = decode_payload(payload["data"])
         if data["status"] == "ready":
             self._offer_buffer = Offer.from_json(data["offer"])
             self._event_response_uuids.append(data["transaction_uuid"])
@@ -526,7 +524,7 @@ class BaseStrategy(EventMixin, AreaBehaviorBase, ABC):
                          initial_energy_rate: float) -> Optional[Offer]:
         """Post first and only offer for the strategy. Will fail if another offer already
          exists."""
-        if any(offer.seller.uuid == self.owner.uuid for offer in market.get_offers().values()):
+        if market.has_offers_from_trader(self.owner.uuid):
             self.owner.log.debug("There is already another offer posted on the market, therefore"
                                  " do not repost another first offer.")
             return None
@@ -675,11 +673,17 @@ class BaseStrategy(EventMixin, AreaBehaviorBase, ABC):
         if market.id not in self.offers.open.values():
             return
 
+        amend_in_place = self._should_amend_orders_in_place()
         for offer in self.get_posted_offers(market, time_slot):
             updated_price = limit_float_precision(offer.energy * updated_rate)
             if abs(offer.price - updated_price) <= FLOATING_POINT_TOLERANCE:
                 continue
             try:
+                if amend_in_place:
+                    new_offer = market.amend_order(
+                        offer.id, updated_price, original_price=updated_price)
+                    self.offers.replace(offer, new_offer, market.id)
+                    continue
                 # Delete the old offer and create a new equivalent one with an updated price
                 market.delete_offer(offer.id)
                 new_offer = market.offer(
@@ -696,6 +700,12 @@ class BaseStrategy(EventMixin, AreaBehaviorBase, ABC):
             except MarketException:
                 continue
 
+    @staticmethod
+    def _should_amend_orders_in_place() -> bool:
+        # The markets can only be called directly if the events are not dispatched via Redis
+        return (constants.AMEND_ORDERS_IN_PLACE and
+                not ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS)
+
     def event_activate_price(self):
         """Configure strategy price parameters during the activate event."""
 
@@ -767,11 +777,18 @@ class BidEnabledStrategy(BaseStrategy):
     def update_bid_rates(self, market: "TwoSidedMarket", updated_rate: float,
                          time_slot: Optional[DateTime] = None) -> None:
         """Replace the rate of all bids in the market slot with the given updated rate."""
+        amend_in_place = self._should_amend_orders_in_place()
         for bid in self.get_posted_bids(market, time_slot):
             if abs(bid.energy_rate - updated_rate) <= FLOATING_POINT_TOLERANCE:
                 continue
             assert bid.buyer.name == self.owner.name
 
+            if amend_in_place and bid.id in market.bids:
+                amended_bid = market.amend_order(bid.id, bid.energy * updated_rate)
+                self._bids[market.id] = [amended_bid if posted_bid.id == bid.id else posted_bid
+                                         for posted_bid in self._bids[market.id]]
+                continue
+
             self.remove_bid_from_pending(market.id, bid.id)
             self.post_bid(market, bid.energy * updated_rate,
                           bid.energy, replace_existing=False,
@@ -896,7 +913,7 @@ class BidEnabledStrategy(BaseStrategy):
         # should be only bid from a device to a market at all times, which will be replaced if
         # it needs to be updated. If this check is not there, the market cycle event will post
         # one bid twice, which actually happens on the very first market slot cycle.
-        if any(bid.buyer.name == self.owner.name for bid in market.get_bids().values()):
+        if market.has_bids_from_trader(self.owner.name, attribute="name"):
             self.owner.log.debug("There is already another bid posted on the market, therefore"
                                  " do not repost another first bid.")
             return None
@@ -23,8 +23,10 @@ NOTE: The intraday product should not use this approach, since it already trades
 """
 from abc import ABC, abstractmethod
 from collections import defaultdict
-from typing import Optional, TYPE_CHECKING, DefaultDict
+from functools import lru_cache
+from typing import Optional, TYPE_CHECKING, DefaultDict, Dict, Tuple
 
+import numpy as np
 import pendulum
 from gsy_framework.constants_limits import GlobalConfig
 from gsy_framework.enums import AvailableMarketTypes
@@ -39,6 +41,59 @@ if TYPE_CHECKING:
     from gsy_e.models.area import AreaBase
 
 
+class StandardTradeProfiles:
+    """
+    Trade profiles of the ForwardTradeProfileGenerator, cached as arrays.
+
+    The trade profiles are proportional to the traded energy, therefore the profile of the peak
+    energy is generated once per product type and market slot (e.g. once per year for the year
+    forward product), and the profile of each trade is obtained by scaling it.
+    """
+    def __init__(self, peak_kWh: float):
+        self._profile_generator = ForwardTradeProfileGenerator(peak_kWh=peak_kWh)
+        self._reference_energy_kWh = peak_kWh if peak_kWh > 0 else 1.
+        self._unit_profiles: Dict[
+            Tuple[AvailableMarketTypes, pendulum.DateTime],
+            Tuple[Tuple[pendulum.DateTime, ...], np.ndarray]] = {}
+
+    def get_trade_profile(
+            self, energy_kWh: float, market_slot: pendulum.DateTime,
+            product_type: AvailableMarketTypes
+    ) -> Tuple[Tuple[pendulum.DateTime, ...], np.ndarray]:
+        """Return the ascending time slots of the trade profile and their energy values."""
+        key = (product_type, market_slot)
+        if key not in self._unit_profiles:
+            reference_profile = self._profile_generator.generate_trade_profile(
+                energy_kWh=self._reference_energy_kWh, market_slot=market_slot,
+                product_type=product_type)
+            time_slots = tuple(sorted(reference_profile))
+            self._unit_profiles[key] = (
+                time_slots,
+                np.fromiter((reference_profile[time_slot] for time_slot in time_slots),
+                            dtype=float, count=len(time_slots)) / self._reference_energy_kWh)
+        time_slots, unit_energies_kWh = self._unit_profiles[key]
+        return time_slots, unit_energies_kWh * energy_kWh
+
+
+@lru_cache(maxsize=16)
+def _get_cached_standard_trade_profiles(
+        peak_kWh: float, slot_length: pendulum.Duration, start_date: pendulum.DateTime,
+        sim_duration: pendulum.Duration) -> StandardTradeProfiles:
+    # pylint: disable=unused-argument
+    # The GlobalConfig values are only part of the cache key, in order to not share the
+    # profiles between simulations with a different configuration.
+    return StandardTradeProfiles(peak_kWh)
+
+
+def get_standard_trade_profiles(peak_kWh: float) -> StandardTradeProfiles:
+    """
+    Return the trade profiles, shared by all assets with the same peak energy in simulations
+    with the same slot length, start date and duration.
+    """
+    return _get_cached_standard_trade_profiles(
+        peak_kWh, GlobalConfig.slot_length, GlobalConfig.start_date, GlobalConfig.sim_duration)
+
+
 class _BaseMarketEnergyParams(ABC):
     """
     Base class for the energy parameters of specific markets.
@@ -48,15 +103,15 @@ class _BaseMarketEnergyParams(ABC):
     def __init__(self, posted_energy_kWh: DefaultDict):
         self._posted_energy_kWh = posted_energy_kWh
         self._area: Optional["AreaBase"] = None
-        self._profile_generator: Optional["ForwardTradeProfileGenerator"] = None
+        self._trade_profiles: Optional[StandardTradeProfiles] = None
 
-    def activate(self, area: "AreaBase", profile_generator: "ForwardTradeProfileGenerator"):
+    def activate(self, area: "AreaBase", trade_profiles: StandardTradeProfiles):
         """
         Activate the energy parameters by providing extra arguments that are generated during the
         activation process.
         """
         self._area = area
-        self._profile_generator = profile_generator
+        self._trade_profiles = trade_profiles
 
     @abstractmethod
     def get_posted_energy_kWh(self, market_slot: pendulum.DateTime) -> float:
@@ -266,31 +321,29 @@ class _LongForwardEnergyParameters(_BaseMarketEnergyParams):
 
     def event_load_traded_energy(
             self, energy_kWh: float, market_slot: pendulum.DateTime, state: "LoadState"):
-        trade_profile = self._profile_generator.generate_trade_profile(
+        time_slots, energies_kWh = self._trade_profiles.get_trade_profile(
             energy_kWh=energy_kWh,
             market_slot=market_slot,
             product_type=self._product_type)
 
-        for time_slot, energy_value_kWh in trade_profile.items():
-            state.decrement_energy_requirement(
-                purchased_energy_Wh=energy_value_kWh * 1000,
-                time_slot=time_slot,
-                area_name=self._area.name)
+        state.decrement_energy_requirements(
+            purchased_energy_Wh=energies_kWh * 1000,
+            time_slots=time_slots,
+            area_name=self._area.name)
 
     def event_pv_traded_energy(
             self, energy_kWh: float, market_slot: pendulum.DateTime, state: "PVState"):
         # Create a new profile that spreads the trade energy across multiple slots. The values
         # of this new profile are obtained by scaling the values of the standard solar profile
-        trade_profile = self._profile_generator.generate_trade_profile(
+        time_slots, energies_kWh = self._trade_profiles.get_trade_profile(
             energy_kWh=energy_kWh,
             market_slot=market_slot,
             product_type=self._product_type)
 
-        for time_slot, energy_value_kWh in trade_profile.items():
-            state.decrement_available_energy(
-                sold_energy_kWh=energy_value_kWh,
-                time_slot=time_slot,
-                area_name=self._area.name)
+        state.decrement_available_energies(
+            sold_energy_kWh=energies_kWh,
+            time_slots=time_slots,
+            area_name=self._area.name)
 
 
 class ForwardEnergyParams(ABC):
@@ -309,7 +362,7 @@ class ForwardEnergyParams(ABC):
         }
 
         self._area = None
-        self._profile_generator: Optional[ForwardTradeProfileGenerator] = None
+        self._trade_profiles: Optional[StandardTradeProfiles] = None
 
     def get_posted_energy_kWh(
             self, market_slot: pendulum.DateTime, product_type: AvailableMarketTypes) -> float:
@@ -350,7 +403,7 @@ class ForwardEnergyParams(ABC):
     def event_activate_energy(self, area):
         """Initialize values that are required to compute the energy values of the asset."""
         for params in self._forward_energy_params.values():
-            params.activate(area, self._profile_generator)
+            params.activate(area, self._trade_profiles)
 
     @abstractmethod
     def event_traded_energy(
@@ -409,16 +462,14 @@ class ConsumptionStandardProfileEnergyParameters(ForwardEnergyParams):
     def event_activate_energy(self, area):
         """Initialize values that are required to compute the energy values of the asset."""
         self._area = area
-        self._profile_generator = ForwardTradeProfileGenerator(
-            peak_kWh=self.peak_energy_kWh)
+        self._trade_profiles = get_standard_trade_profiles(self.peak_energy_kWh)
 
         for i in range(FORWARD_MARKET_MAX_DURATION_YEARS + 1):
-            capacity_profile = self._profile_generator.generate_trade_profile(
+            time_slots, energies_kWh = self._trade_profiles.get_trade_profile(
                 energy_kWh=self.peak_energy_kWh,
                 market_slot=GlobalConfig.start_date.start_of("year").add(years=i),
                 product_type=AvailableMarketTypes.YEAR_FORWARD)
-            for time_slot, energy_kWh in capacity_profile.items():
-                self.state.set_desired_energy(energy_kWh * 1000, time_slot)
+            self.state.set_desired_energies(energies_kWh * 1000, time_slots)
 
         super().event_activate_energy(area)
 
@@ -435,7 +486,7 @@ class ConsumptionStandardProfileEnergyParameters(ForwardEnergyParams):
                 the entire period of time over which the trade profile will be generated.
             product_type: One of the available market types.
         """
-        assert self._profile_generator is not None
+        assert self._trade_profiles is not None
         self._forward_energy_params[product_type].event_load_traded_energy(
             energy_kWh, market_slot, self.state)
 
@@ -449,7 +500,7 @@ class ProductionStandardProfileEnergyParameters(ForwardEnergyParams):
 
         self._state = PVState()
         self._area = None
-        self._profile_generator: Optional[ForwardTradeProfileGenerator] = None
+        self._trade_profiles: Optional[StandardTradeProfiles] = None
 
     @property
     def state(self) -> PVState:
@@ -479,16 +530,14 @@ class ProductionStandardProfileEnergyParameters(ForwardEnergyParams):
     def event_activate_energy(self, area):
         """Initialize values that are required to compute the energy values of the asset."""
         self._area = area
-        self._profile_generator = ForwardTradeProfileGenerator(
-            peak_kWh=self.peak_energy_kWh)
+        self._trade_profiles = get_standard_trade_profiles(self.peak_energy_kWh)
 
         for i in range(FORWARD_MARKET_MAX_DURATION_YEARS + 1):
-            capacity_profile = self._profile_generator.generate_trade_profile(
+            time_slots, energies_kWh = self._trade_profiles.get_trade_profile(
                 energy_kWh=self.peak_energy_kWh,
                 market_slot=GlobalConfig.start_date.start_of("year").add(years=i),
                 product_type=AvailableMarketTypes.YEAR_FORWARD)
-            for time_slot, energy_kWh in capacity_profile.items():
-                self.state.set_available_energy(energy_kWh, time_slot)
+            self.state.set_available_energies(energies_kWh, time_slots)
 
         super().event_activate_energy(area)
 
@@ -507,6 +556,6 @@ class ProductionStandardProfileEnergyParameters(ForwardEnergyParams):
                 the entire period of time over which the trade profile will be generated.
             product_type: One of the available market types.
         """
-        assert self._profile_generator is not None
+        assert self._trade_profiles is not None
         self._forward_energy_params[product_type].event_pv_traded_energy(
             energy_kWh, market_slot, self.state)
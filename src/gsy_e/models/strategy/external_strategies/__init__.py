@@ -532,7 +532,7 @@ class ExternalMixin:
                                    if trade.residual is not None and trade.is_offer_trade
                                    else "None"}
 
-            global_objects.external_global_stats.update()
+            global_objects.external_global_stats.update_area(self.device.uuid)
             self.redis.aggregator.add_batch_trade_event(self.device.uuid, event_response_dict)
         elif self.connected:
             event_response_dict = {"device_info": self._device_info_dict,
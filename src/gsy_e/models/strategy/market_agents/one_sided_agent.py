@@ -15,16 +15,17 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-from typing import Optional, TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING, Union
 
 from numpy.random import random
 
+from gsy_e.gsy_e_core.tick_profiler import tick_profiler
 from gsy_e.models.market import MarketBase
 from gsy_e.models.strategy.market_agents.market_agent import MarketAgent
 from gsy_e.models.strategy.market_agents.one_sided_engine import MAEngine
 
 if TYPE_CHECKING:
-    from gsy_framework.data_classes import Offer, Trade
+    from gsy_framework.data_classes import Bid, Offer, Trade
 
 
 class OneSidedAgent(MarketAgent):
@@ -58,7 +59,8 @@ class OneSidedAgent(MarketAgent):
     def event_tick(self):
         area = self.owner
         for engine in sorted(self.engines, key=lambda _: random()):
-            engine.tick(area=area)
+            with tick_profiler.phase("engine", type(engine).__name__):
+                engine.tick(area=area)
 
     # pylint: disable=unused-argument
     def event_offer(self, *, market_id: str, offer: "Offer"):
@@ -75,6 +77,12 @@ class OneSidedAgent(MarketAgent):
         for engine in sorted(self.engines, key=lambda _: random()):
             engine.event_offer_deleted(offer=offer)
 
+    # pylint: disable=unused-argument
+    def event_order_amended(self, *, market_id: str, order: Union["Offer", "Bid"],
+                            original_order: Union["Offer", "Bid"]):
+        for engine in sorted(self.engines, key=lambda _: random()):
+            engine.event_order_amended(order=order)
+
     def event_offer_split(self, *, market_id: str,  original_offer: "Offer",
                           accepted_offer: "Offer", residual_offer: "Offer"):
         for engine in sorted(self.engines, key=lambda _: random()):
@@ -16,10 +16,10 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 from collections import namedtuple
-from typing import Dict, Optional  # noqa
+from typing import Dict, Optional, Union  # noqa
 
 from gsy_framework.constants_limits import ConstSettings
-from gsy_framework.data_classes import Offer, TraderDetails, TradeBidOfferInfo
+from gsy_framework.data_classes import Bid, Offer, TraderDetails, TradeBidOfferInfo
 from gsy_framework.enums import SpotMarketTypeEnum
 from gsy_framework.utils import limit_float_precision
 
@@ -67,13 +67,14 @@ class MAEngine:
             requirements.append(updated_requirement)
         return requirements
 
-    def _offer_in_market(self, offer):
-        updated_price = limit_float_precision(
+    def _get_forwarded_offer_price(self, offer: Offer) -> float:
+        return limit_float_precision(
             self.markets.target.fee_class.update_forwarded_offer_with_fee(
                 offer.energy_rate, offer.original_energy_rate) * offer.energy)
 
+    def _offer_in_market(self, offer):
         kwargs = {
-            "price": updated_price,
+            "price": self._get_forwarded_offer_price(offer),
             "energy": offer.energy,
             "seller": TraderDetails(
                 self.owner.name, self.owner.uuid,
@@ -298,6 +299,42 @@ class MAEngine:
                              f"{short_offer_bid_log_str(local_split_offer)} and "
                              f"{short_offer_bid_log_str(local_residual_offer)}")
 
+    def event_order_amended(self, *, order: Union[Offer, Bid]) -> None:
+        """Amend the forwarded copy of an offer whose price was amended in the source market."""
+        if not isinstance(order, Offer):
+            return
+        offer_info = self.forwarded_offers.get(order.id)
+        if not offer_info or offer_info.source_offer.id != order.id:
+            # Amendment doesn't concern us
+            return
+
+        target_offer = self.markets.target.offers.get(offer_info.target_offer.id)
+        amended_offer = None
+        if target_offer and order.price >= -FLOATING_POINT_TOLERANCE:
+            try:
+                amended_offer = self.markets.target.amend_order(
+                    target_offer.id, self._get_forwarded_offer_price(order),
+                    original_price=order.original_price, dispatch_event=False)
+            except MarketException:
+                self.owner.log.debug("Forwarded offer is not amended because grid fees of the "
+                                     "target market lead to a negative offer price.")
+        if not amended_offer:
+            # The forwarded offer cannot follow the source offer, it will be forwarded again
+            if target_offer:
+                try:
+                    self.owner.delete_offer(self.markets.target, offer_info.target_offer)
+                except MarketException:
+                    self.owner.log.exception("Error deleting MarketAgent offer")
+            self._delete_forwarded_offer_entries(offer_info.source_offer)
+            return
+
+        if offer_info.target_offer in self.owner.offers.posted:
+            self.owner.offers.replace(offer_info.target_offer, amended_offer,
+                                      self.markets.target.id)
+        self._add_to_forward_offers(order, amended_offer)
+        self.owner.log.trace(f"Amending forwarded offer {target_offer} to {amended_offer}")
+        self.markets.target.dispatch_market_order_amended_event(amended_offer, target_offer)
+
     def _add_to_forward_offers(self, source_offer, target_offer):
         offer_info = OfferInfo(Offer.copy(source_offer), Offer.copy(target_offer))
         self.forwarded_offers[source_offer.id] = offer_info
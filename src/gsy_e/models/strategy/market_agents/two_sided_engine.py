@@ -16,10 +16,10 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 from collections import namedtuple
-from typing import Dict, TYPE_CHECKING
+from typing import Dict, TYPE_CHECKING, Union
 
 from gsy_framework.constants_limits import ConstSettings
-from gsy_framework.data_classes import Bid, TraderDetails
+from gsy_framework.data_classes import Bid, Offer, TraderDetails
 from gsy_framework.enums import SpotMarketTypeEnum
 from gsy_framework.utils import limit_float_precision
 
@@ -64,6 +64,11 @@ class TwoSidedEngine(MAEngine):
             requirements.append(updated_requirement)
         return requirements
 
+    def _get_forwarded_bid_price(self, bid: Bid) -> float:
+        return limit_float_precision((
+            self.markets.source.fee_class.update_forwarded_bid_with_fee(
+                bid.energy_rate, bid.original_energy_rate)) * bid.energy)
+
     def _forward_bid(self, bid):
         if bid.buyer.name == self.markets.target.name:
             return None
@@ -72,12 +77,8 @@ class TwoSidedEngine(MAEngine):
             self.owner.log.debug("Bid is not forwarded because price < 0")
             return None
         try:
-            updated_price = limit_float_precision((
-                self.markets.source.fee_class.update_forwarded_bid_with_fee(
-                    bid.energy_rate, bid.original_energy_rate)) * bid.energy)
-
             forwarded_bid = self.markets.target.bid(
-                price=updated_price,
+                price=self._get_forwarded_bid_price(bid),
                 energy=bid.energy,
                 buyer=TraderDetails(
                     self.owner.name, self.owner.uuid, bid.buyer.origin, bid.buyer.origin_uuid),
@@ -220,6 +221,35 @@ class TwoSidedEngine(MAEngine):
         self._delete_forwarded_bid_entries(bid_info.source_bid)
         self.bid_age.pop(bid_info.source_bid.id, None)
 
+    def event_order_amended(self, *, order: Union[Offer, Bid]) -> None:
+        """Amend the forwarded copy of an order whose price was amended in the source market."""
+        if not isinstance(order, Bid):
+            super().event_order_amended(order=order)
+            return
+        bid_info = self.forwarded_bids.get(order.id)
+        if not bid_info or bid_info.source_bid.id != order.id:
+            # Amendment doesn't concern us
+            return
+
+        target_bid = self.markets.target.bids.get(bid_info.target_bid.id)
+        amended_bid = None
+        if target_bid and order.price >= -FLOATING_POINT_TOLERANCE:
+            try:
+                amended_bid = self.markets.target.amend_order(
+                    target_bid.id, self._get_forwarded_bid_price(order),
+                    original_price=order.original_price, dispatch_event=False)
+            except MarketException:
+                self.owner.log.debug("Forwarded bid is not amended because grid fees of the "
+                                     "target market lead to a negative bid price.")
+        if not amended_bid:
+            # The forwarded bid cannot follow the source bid, it will be forwarded again
+            self._delete_forwarded_bids(bid_info)
+            return
+
+        self._add_to_forward_bids(order, amended_bid)
+        self.owner.log.trace(f"Amending forwarded bid {target_bid} to {amended_bid}")
+        self.markets.target.dispatch_market_order_amended_event(amended_bid, target_bid)
+
     def event_bid_split(self, *, market_id: str, original_bid: Bid,
                         accepted_bid: Bid, residual_bid: Bid) -> None:
         """Perform actions that need to be done when BID_SPLIT event is triggered."""
@@ -0,0 +1,186 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import weakref
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import numpy as np
+from pendulum import DateTime
+
+from gsy_e.constants import FLOATING_POINT_TOLERANCE
+
+if TYPE_CHECKING:
+    from gsy_e.models.strategy.update_frequency import TemplateStrategyUpdaterBase
+
+_INITIAL_CAPACITY = 64
+
+
+class PriceScheduleEngine:
+    # pylint: disable=too-many-instance-attributes
+    """Columnar store of the price schedules of the template strategy updaters.
+
+    Every (updater, time slot) pair is a row of the arrays of the initial rate, final rate, rate
+    change per update, update interval and update counter. advance() is called once per tick,
+    before the tick is dispatched to the strategies, and decides for all rows at once whether it
+    is time for a price update, computes the updated rates and increments the update counters.
+    The updaters then only look up the result of their rows, and skip updating their orders if
+    the rate did not change since the previous price update.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.advanced_tick: Optional[int] = None
+        self._row_count = 0
+        self._free_rows: List[int] = []
+        self._row_keys: List[Optional[Tuple[weakref.ref, DateTime]]] = []
+        self._allocate(0)
+
+    def _allocate(self, capacity: int) -> None:
+        self._initial_rate = np.zeros(capacity)
+        self._final_rate = np.zeros(capacity)
+        self._rate_change = np.zeros(capacity)
+        self._update_interval_s = np.zeros(capacity)
+        self._update_counter = np.zeros(capacity, dtype=np.int64)
+        self._use_max_limit = np.zeros(capacity, dtype=bool)
+        self._active = np.zeros(capacity, dtype=bool)
+        # Results of the last advance()
+        self._changed = np.zeros(capacity, dtype=bool)
+        self._rate = np.zeros(capacity)
+        # Rate of the previous price update of the row, NaN if there was none
+        self._last_rate = np.full(capacity, np.nan)
+
+    def _grow(self) -> None:
+        capacity = max(len(self._active) * 2, _INITIAL_CAPACITY)
+        arrays = {name: getattr(self, name) for name in (
+            "_initial_rate", "_final_rate", "_rate_change", "_update_interval_s",
+            "_update_counter", "_use_max_limit", "_active", "_changed", "_rate",
+            "_last_rate")}
+        self._allocate(capacity)
+        for name, array in arrays.items():
+            getattr(self, name)[:len(array)] = array
+
+    def reset(self, enabled: bool) -> None:
+        """Remove all rows and enable or disable the engine."""
+        self.enabled = enabled
+        self.advanced_tick = None
+        self._row_count = 0
+        self._free_rows = []
+        self._row_keys = []
+        self._allocate(0)
+
+    def __len__(self) -> int:
+        return self._row_count - len(self._free_rows)
+
+    def add_row(self, updater: "TemplateStrategyUpdaterBase", time_slot: DateTime) -> int:
+        """Add a row for the time slot of the updater, with an update counter of 0."""
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._row_keys[row] = (weakref.ref(updater), time_slot)
+        else:
+            if self._row_count == len(self._active):
+                self._grow()
+            row = self._row_count
+            self._row_count += 1
+            self._row_keys.append((weakref.ref(updater), time_slot))
+        self._active[row] = True
+        self._changed[row] = False
+        self.set_update_counter(row, 0)
+        return row
+
+    def remove_row(self, row: int) -> None:
+        """Remove the row, so that it is not advanced anymore."""
+        if not self._active[row]:
+            return
+        self._active[row] = False
+        self._changed[row] = False
+        self._row_keys[row] = None
+        self._free_rows.append(row)
+
+    def set_schedule(self, row: int, initial_rate: float, final_rate: float,
+                     rate_change: float, update_interval_s: float, use_max_limit: bool) -> None:
+        """Set the price parameters of the row. The update counter is kept."""
+        # pylint: disable=too-many-arguments
+        self._initial_rate[row] = initial_rate
+        self._final_rate[row] = final_rate
+        self._rate_change[row] = rate_change
+        self._update_interval_s[row] = update_interval_s
+        self._use_max_limit[row] = use_max_limit
+
+    def set_update_interval(self, row: int, update_interval_s: float) -> None:
+        """Set the update interval of the row."""
+        self._update_interval_s[row] = update_interval_s
+
+    def get_update_counter(self, row: int) -> int:
+        """Return the number of price updates of the row."""
+        return int(self._update_counter[row])
+
+    def set_update_counter(self, row: int, update_counter: int) -> None:
+        """Set the number of price updates of the row, e.g. in order to restart the schedule."""
+        self._update_counter[row] = update_counter
+        self._last_rate[row] = np.nan
+
+    def increment_update_counter(self, row: int, elapsed_seconds_in_slot: float) -> None:
+        """Increment the update counter of one row if it is time for a price update, for the
+        calls outside of the tick, e.g. during the market cycle."""
+        if elapsed_seconds_in_slot >= self._update_interval_s[row] * self._update_counter[row]:
+            self._update_counter[row] += 1
+
+    def is_advanced(self, current_tick: int) -> bool:
+        """Return True if the rows were already advanced for the tick."""
+        return self.enabled and self.advanced_tick == current_tick
+
+    def get_changed_rate(self, row: int) -> Optional[float]:
+        """Return the updated rate of the row, if its rate changed during the last advance()."""
+        return float(self._rate[row]) if self._changed[row] else None
+
+    def advance(self, current_tick: int, elapsed_seconds_in_slot: float
+                ) -> List[Tuple["TemplateStrategyUpdaterBase", DateTime]]:
+        """Advance the price schedules of all rows for the tick.
+
+        Returns the (updater, time slot) pairs whose rate changed, in row order."""
+        row_count = self._row_count
+        update_counter = self._update_counter[:row_count]
+        due = self._active[:row_count] & (
+            elapsed_seconds_in_slot >= self._update_interval_s[:row_count] * update_counter)
+        calculated_rate = (self._initial_rate[:row_count] -
+                           self._rate_change[:row_count] * update_counter)
+        rate = np.where(self._use_max_limit[:row_count],
+                        np.maximum(calculated_rate, self._final_rate[:row_count]),
+                        np.minimum(calculated_rate, self._final_rate[:row_count]))
+        last_rate = self._last_rate[:row_count]
+        # NaN never compares as close, therefore the first price update always counts as a change
+        changed = due & ~(np.abs(rate - last_rate) <= FLOATING_POINT_TOLERANCE)
+
+        self._changed[:row_count] = changed
+        self._rate[:row_count] = rate
+        last_rate[changed] = rate[changed]
+        update_counter += due
+        self.advanced_tick = current_tick
+
+        changed_rows = []
+        for row in np.flatnonzero(changed):
+            updater_ref, time_slot = self._row_keys[row]
+            updater = updater_ref()
+            if updater is None:
+                # The updater was garbage collected, e.g. after its area was removed
+                self.remove_row(row)
+                continue
+            changed_rows.append((updater, time_slot))
+        return changed_rows
+
+
+price_schedule_engine = PriceScheduleEngine()
@@ -17,14 +17,17 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 from abc import ABC, abstractmethod
 from math import copysign
-from typing import Dict, Optional
+from typing import Dict, Optional, Sequence
 
+import numpy as np
 from gsy_framework.utils import (
     convert_pendulum_to_str_in_dict, convert_str_to_pendulum_in_dict)
 from pendulum import DateTime
 
 from gsy_e.constants import FLOATING_POINT_TOLERANCE
-from gsy_e.gsy_e_core.util import is_time_slot_in_past_markets
+from gsy_e.gsy_e_core.util import get_oldest_time_slot_not_in_past_markets
+from gsy_e.models.strategy.state.time_slot_series import (
+    TimeSlotSeries, delete_time_slots_before, get_time_slot_values, set_time_slot_values)
 
 
 class UnexpectedStateException(Exception):
@@ -93,9 +96,9 @@ class ProsumptionInterface(StateInterface, ABC):
 
     def __init__(self):
         # Actual energy consumed/produced by the device at specific market slots
-        self._energy_measurement_kWh: Dict[DateTime, float] = {}
-        self._unsettled_deviation_kWh: Dict[DateTime, float] = {}
-        self._forecast_measurement_deviation_kWh: Dict[DateTime, float] = {}
+        self._energy_measurement_kWh: Dict[DateTime, float] = TimeSlotSeries()
+        self._unsettled_deviation_kWh: Dict[DateTime, float] = TimeSlotSeries()
+        self._forecast_measurement_deviation_kWh: Dict[DateTime, float] = TimeSlotSeries()
 
     # pylint: disable=unused-argument, no-self-use
     def _calculate_unsettled_energy_kWh(
@@ -227,9 +230,9 @@ class ConsumptionState(ProsumptionInterface):
     def __init__(self):
         super().__init__()
         # Energy that the load wants to consume (given by the profile or live energy requirements)
-        self._desired_energy_Wh: Dict = {}
+        self._desired_energy_Wh: Dict = TimeSlotSeries()
         # Energy that the load needs to consume. It's reduced when new energy is bought
-        self._energy_requirement_Wh: Dict = {}
+        self._energy_requirement_Wh: Dict = TimeSlotSeries()
         self._total_energy_demanded_Wh: int = 0
 
     def get_state(self) -> Dict:
@@ -263,6 +266,19 @@ class ConsumptionState(ProsumptionInterface):
         self._energy_requirement_Wh[time_slot] = energy
         self._desired_energy_Wh[time_slot] = energy
 
+    def set_desired_energies(self, energies_Wh: np.ndarray, time_slots: Sequence[DateTime],
+                             overwrite=False) -> None:
+        """Set the energy_requirement_Wh and desired_energy_Wh of multiple ascending time_slots
+        at once."""
+        if not overwrite and not np.isnan(get_time_slot_values(
+                self._energy_requirement_Wh, time_slots, default=np.nan)).all():
+            # Some of the time slots are already tracked and should not be overwritten
+            for time_slot, energy in zip(time_slots, energies_Wh.tolist()):
+                self.set_desired_energy(energy, time_slot)
+            return
+        set_time_slot_values(self._energy_requirement_Wh, time_slots, energies_Wh)
+        set_time_slot_values(self._desired_energy_Wh, time_slots, energies_Wh)
+
     def update_total_demanded_energy(self, time_slot: DateTime) -> None:
         """Accumulate the _total_energy_demanded_Wh based on the desired energy per time_slot."""
         self._total_energy_demanded_Wh += self._desired_energy_Wh.get(time_slot, 0.)
@@ -289,16 +305,22 @@ class ConsumptionState(ProsumptionInterface):
             f"Energy requirement for device {area_name} fell below zero "
             f"({self._energy_requirement_Wh[time_slot]}).")
 
+    def decrement_energy_requirements(
+            self, purchased_energy_Wh: np.ndarray, time_slots: Sequence[DateTime],
+            area_name: str) -> None:
+        """Decrease the energy required by the device in multiple ascending market slots."""
+        energy_requirement_Wh = get_time_slot_values(
+            self._energy_requirement_Wh, time_slots) - purchased_energy_Wh
+        set_time_slot_values(self._energy_requirement_Wh, time_slots, energy_requirement_Wh)
+        assert (energy_requirement_Wh >= -FLOATING_POINT_TOLERANCE).all(), (
+            f"Energy requirement for device {area_name} fell below zero "
+            f"({energy_requirement_Wh.min()}).")
+
     def delete_past_state_values(self, current_time_slot: DateTime):
         """Delete data regarding energy consumption for past market slots."""
-        to_delete = []
-        for market_slot in self._energy_requirement_Wh:
-            if is_time_slot_in_past_markets(market_slot, current_time_slot):
-                to_delete.append(market_slot)
-
-        for market_slot in to_delete:
-            self._energy_requirement_Wh.pop(market_slot, None)
-            self._desired_energy_Wh.pop(market_slot, None)
+        oldest_time_slot = get_oldest_time_slot_not_in_past_markets(current_time_slot)
+        delete_time_slots_before(
+            self._energy_requirement_Wh, oldest_time_slot, self._desired_energy_Wh)
 
     def get_desired_energy_Wh(self, time_slot, default_value=0.0):
         """Return the expected consumed energy at a specific market slot."""
@@ -310,8 +332,8 @@ class ProductionState(ProsumptionInterface):
 
     def __init__(self):
         super().__init__()
-        self._available_energy_kWh = {}
-        self._energy_production_forecast_kWh = {}
+        self._available_energy_kWh = TimeSlotSeries()
+        self._energy_production_forecast_kWh = TimeSlotSeries()
 
     def get_state(self) -> Dict:
         """Return the current state of the device. Extends super implementation."""
@@ -349,6 +371,20 @@ class ProductionState(ProsumptionInterface):
 
         assert self._energy_production_forecast_kWh[time_slot] >= 0.0
 
+    def set_available_energies(self, energies_kWh: np.ndarray, time_slots: Sequence[DateTime],
+                               overwrite: bool = False) -> None:
+        """Set the available energy of multiple ascending time_slots at once."""
+        if not overwrite and not np.isnan(get_time_slot_values(
+                self._energy_production_forecast_kWh, time_slots, default=np.nan)).all():
+            # Some of the time slots are already tracked and should not be overwritten
+            for time_slot, energy in zip(time_slots, energies_kWh.tolist()):
+                self.set_available_energy(energy, time_slot)
+            return
+        set_time_slot_values(self._energy_production_forecast_kWh, time_slots, energies_kWh)
+        set_time_slot_values(self._available_energy_kWh, time_slots, energies_kWh)
+
+        assert (energies_kWh >= 0.0).all()
+
     def get_available_energy_kWh(self, time_slot: DateTime, default_value: float = 0.0) -> float:
         """Return the available energy in a specific time_slot."""
         available_energy = self._available_energy_kWh.get(time_slot, default_value)
@@ -364,16 +400,22 @@ class ProductionState(ProsumptionInterface):
             f"Available energy for device {area_name} fell below zero "
             f"({self._available_energy_kWh[time_slot]}).")
 
+    def decrement_available_energies(
+            self, sold_energy_kWh: np.ndarray, time_slots: Sequence[DateTime],
+            area_name: str) -> None:
+        """Decrement the available energy of multiple ascending time_slots after a trade."""
+        available_energy_kWh = get_time_slot_values(
+            self._available_energy_kWh, time_slots) - sold_energy_kWh
+        set_time_slot_values(self._available_energy_kWh, time_slots, available_energy_kWh)
+        assert (available_energy_kWh >= -FLOATING_POINT_TOLERANCE).all(), (
+            f"Available energy for device {area_name} fell below zero "
+            f"({available_energy_kWh.min()}).")
+
     def delete_past_state_values(self, current_time_slot: DateTime):
         """Delete data regarding energy production for past market slots."""
-        to_delete = []
-        for market_slot in self._available_energy_kWh:
-            if is_time_slot_in_past_markets(market_slot, current_time_slot):
-                to_delete.append(market_slot)
-
-        for market_slot in to_delete:
-            self._available_energy_kWh.pop(market_slot, None)
-            self._energy_production_forecast_kWh.pop(market_slot, None)
+        oldest_time_slot = get_oldest_time_slot_not_in_past_markets(current_time_slot)
+        delete_time_slots_before(
+            self._available_energy_kWh, oldest_time_slot, self._energy_production_forecast_kWh)
 
     def get_energy_production_forecast_kWh(self, time_slot: DateTime, default_value: float = 0.0):
         """Return the expected produced energy at a specific market slot."""
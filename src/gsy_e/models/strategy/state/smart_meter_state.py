@@ -19,9 +19,10 @@ from typing import Dict
 
 from pendulum import DateTime
 
-from gsy_e.gsy_e_core.util import is_time_slot_in_past_markets
+from gsy_e.gsy_e_core.util import get_oldest_time_slot_not_in_past_markets
 from gsy_e.models.strategy.state.base_states import (
     ConsumptionState, ProductionState, UnexpectedStateException)
+from gsy_e.models.strategy.state.time_slot_series import delete_time_slots_before
 
 
 class SmartMeterState(ConsumptionState, ProductionState):
@@ -34,16 +35,15 @@ class SmartMeterState(ConsumptionState, ProductionState):
 
     def delete_past_state_values(self, current_time_slot: DateTime):
         """Delete data regarding energy requirements and availability for past market slots."""
-        to_delete = []
-        for market_slot in self.market_slots:
-            if is_time_slot_in_past_markets(market_slot, current_time_slot):
-                to_delete.append(market_slot)
-
-        for market_slot in to_delete:
-            self._available_energy_kWh.pop(market_slot, None)
-            self._energy_production_forecast_kWh.pop(market_slot, None)
-            self._energy_requirement_Wh.pop(market_slot, None)
-            self._desired_energy_Wh.pop(market_slot, None)
+        oldest_time_slot = get_oldest_time_slot_not_in_past_markets(current_time_slot)
+        # Prune all series by the market_slots, i.e. the time slots of both the available and the
+        # required energy
+        delete_time_slots_before(
+            self._available_energy_kWh, oldest_time_slot, self._energy_production_forecast_kWh,
+            self._energy_requirement_Wh, self._desired_energy_Wh)
+        delete_time_slots_before(
+            self._energy_requirement_Wh, oldest_time_slot, self._energy_production_forecast_kWh,
+            self._desired_energy_Wh)
 
     def get_energy_at_market_slot(self, time_slot: DateTime) -> float:
         """Return the energy produced/consumed by the device at a specific market slot (in kWh).
@@ -0,0 +1,342 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from collections.abc import MutableMapping
+from datetime import datetime
+from math import ceil
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from gsy_framework.constants_limits import GlobalConfig
+from pendulum import DateTime, Duration
+
+
+class _Missing:
+    """Marker of the positions of the series that have no value."""
+    __slots__ = ()
+
+    def __reduce__(self):
+        # Keep the marker a singleton when the series is pickled or copied
+        return "_MISSING"
+
+    def __repr__(self):
+        return "_MISSING"
+
+
+_MISSING = _Missing()
+
+
+class TimeSlotSeries(MutableMapping):
+    """Dict-like container of per time slot values, backed by lists indexed by the slot number.
+
+    The time slots that are aligned to the slot length are stored at the position
+    (time_slot - first_time_slot) / slot_length of the lists, therefore reads and writes are
+    integer indexing instead of DateTime hashing, and deleting the past time slots only advances
+    the start of the lists. Time slots that are not aligned to the slot length, or that are more
+    than MAX_SLOT_GAP slots away from the stored ones, are kept in a regular dict.
+
+    Iterating over the series yields the aligned time slots in chronological order, followed by
+    the rest of the time slots in insertion order.
+    """
+
+    MAX_SLOT_GAP = 1000
+    # Minimal number of deleted positions at the start of the lists before they are compacted
+    _MIN_COMPACTION_SIZE = 64
+
+    def __init__(self, values: Optional[Mapping[DateTime, Any]] = None,
+                 slot_length: Optional[Duration] = None):
+        self._slot_length_s: Optional[int] = (
+            int(slot_length.total_seconds()) if slot_length else None)
+        # Position of the first time slot that was not deleted, and its slot number
+        self._head = 0
+        self._first_slot = 0
+        self._time_slots: List[Optional[DateTime]] = []
+        self._values: List[Any] = []
+        self._length = 0
+        self._unaligned_values: Dict[DateTime, Any] = {}
+        if values:
+            self.update(values)
+
+    def _get_slot(self, time_slot: DateTime) -> Optional[int]:
+        """Return the slot number of the time slot, None if it is not aligned to a slot."""
+        if not isinstance(time_slot, datetime):
+            return None
+        if self._slot_length_s is None:
+            self._slot_length_s = int(GlobalConfig.slot_length.total_seconds())
+        slot, remainder = divmod(time_slot.timestamp(), self._slot_length_s)
+        return int(slot) if remainder == 0 else None
+
+    def _get_position(self, slot: Optional[int]) -> Optional[int]:
+        """Return the position of the slot in the lists, None if it is out of their range."""
+        if slot is None:
+            return None
+        position = self._head + slot - self._first_slot
+        if self._head <= position < len(self._values):
+            return position
+        return None
+
+    def _reserve_position(self, slot: int) -> Optional[int]:
+        """Extend the lists so that they contain the slot and return its position.
+
+        None is returned if the slot is too far away from the slots that are already stored."""
+        if self._head == len(self._values):
+            self._clear_lists()
+            self._first_slot = slot
+            self._time_slots.append(None)
+            self._values.append(_MISSING)
+        elif slot < self._first_slot:
+            shift = self._first_slot - slot
+            if shift > self.MAX_SLOT_GAP:
+                return None
+            if shift > self._head:
+                padding = shift - self._head
+                self._time_slots[:0] = [None] * padding
+                self._values[:0] = [_MISSING] * padding
+                self._head = shift
+            self._head -= shift
+            self._first_slot = slot
+        else:
+            missing_slots = slot - self._first_slot - (len(self._values) - self._head) + 1
+            if missing_slots <= 0:
+                return self._head + slot - self._first_slot
+            if missing_slots > self.MAX_SLOT_GAP:
+                return None
+            self._time_slots.extend([None] * missing_slots)
+            self._values.extend([_MISSING] * missing_slots)
+        if self._unaligned_values:
+            self._move_unaligned_values_to_lists()
+        return self._head + slot - self._first_slot
+
+    def _reserve_range(self, first_slot: int, last_slot: int) -> Optional[int]:
+        """Extend the lists so that they contain all slots of the range and return the position
+        of the first slot.
+
+        The range is only limited by the gap between its first slot and the slots that are
+        already stored, since all of its positions are going to be filled."""
+        position = self._reserve_position(first_slot)
+        if position is None:
+            return None
+        missing_slots = position + last_slot - first_slot + 1 - len(self._values)
+        if missing_slots > 0:
+            self._time_slots.extend([None] * missing_slots)
+            self._values.extend([_MISSING] * missing_slots)
+            if self._unaligned_values:
+                self._move_unaligned_values_to_lists()
+        return position
+
+    def _get_consecutive_slots(self, time_slots: Sequence[DateTime]) -> Optional[Tuple[int, int]]:
+        """Return the first and last slot numbers of the ascending unique time_slots, if they
+        are consecutive slots."""
+        if not time_slots:
+            return None
+        first_slot = self._get_slot(time_slots[0])
+        last_slot = self._get_slot(time_slots[-1])
+        if (first_slot is None or last_slot is None or
+                last_slot - first_slot != len(time_slots) - 1):
+            return None
+        return first_slot, last_slot
+
+    def get_values(self, time_slots: Sequence[DateTime], default: float = 0.) -> np.ndarray:
+        """Return the values of the ascending unique time_slots as an array.
+
+        If the time slots are consecutive slots, the values are read from a slice of the lists
+        without looking up each time slot."""
+        slots = self._get_consecutive_slots(time_slots)
+        start = None if slots is None else self._get_position(slots[0])
+        if start is None or self._get_position(slots[1]) is None:
+            return np.array([self.get(time_slot, default) for time_slot in time_slots],
+                            dtype=float)
+        values = self._values[start:start + len(time_slots)]
+        if _MISSING in values:
+            values = [default if value is _MISSING else value for value in values]
+        return np.array(values, dtype=float)
+
+    def set_values(self, time_slots: Sequence[DateTime], values: np.ndarray) -> None:
+        """Set the values of the ascending unique time_slots from an array.
+
+        If the time slots are consecutive slots, the values are written to a slice of the lists
+        without looking up each time slot."""
+        slots = self._get_consecutive_slots(time_slots)
+        start = None if slots is None else self._reserve_range(*slots)
+        if start is None:
+            for time_slot, value in zip(time_slots, np.asarray(values).tolist()):
+                self[time_slot] = value
+            return
+        end = start + len(time_slots)
+        self._length += self._values[start:end].count(_MISSING)
+        self._time_slots[start:end] = time_slots
+        self._values[start:end] = np.asarray(values).tolist()
+
+    def _move_unaligned_values_to_lists(self) -> None:
+        """Move the values of the time slots that are now in the range of the lists."""
+        for time_slot in list(self._unaligned_values):
+            position = self._get_position(self._get_slot(time_slot))
+            if position is not None:
+                self._set_value(position, time_slot, self._unaligned_values.pop(time_slot))
+
+    def _set_value(self, position: int, time_slot: DateTime, value: Any) -> None:
+        if self._values[position] is _MISSING:
+            self._length += 1
+        self._time_slots[position] = time_slot
+        self._values[position] = value
+
+    def _clear_lists(self) -> None:
+        self._head = 0
+        self._time_slots = []
+        self._values = []
+        self._length = 0
+
+    def __getitem__(self, time_slot: DateTime) -> Any:
+        position = self._get_position(self._get_slot(time_slot))
+        if position is None:
+            return self._unaligned_values[time_slot]
+        value = self._values[position]
+        if value is _MISSING:
+            raise KeyError(time_slot)
+        return value
+
+    def __setitem__(self, time_slot: DateTime, value: Any) -> None:
+        slot = self._get_slot(time_slot)
+        position = None if slot is None else self._reserve_position(slot)
+        if position is None:
+            self._unaligned_values[time_slot] = value
+        else:
+            self._set_value(position, time_slot, value)
+
+    def __delitem__(self, time_slot: DateTime) -> None:
+        position = self._get_position(self._get_slot(time_slot))
+        if position is None:
+            del self._unaligned_values[time_slot]
+            return
+        if self._values[position] is _MISSING:
+            raise KeyError(time_slot)
+        self._time_slots[position] = None
+        self._values[position] = _MISSING
+        self._length -= 1
+        if position == self._head:
+            self._advance_head()
+
+    def __contains__(self, time_slot: Any) -> bool:
+        position = self._get_position(self._get_slot(time_slot))
+        if position is None:
+            return time_slot in self._unaligned_values
+        return self._values[position] is not _MISSING
+
+    def __iter__(self) -> Iterator[DateTime]:
+        for position in range(self._head, len(self._values)):
+            if self._values[position] is not _MISSING:
+                yield self._time_slots[position]
+        yield from self._unaligned_values
+
+    def __len__(self) -> int:
+        return self._length + len(self._unaligned_values)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self.items())})"
+
+    def clear(self) -> None:
+        self._clear_lists()
+        self._unaligned_values.clear()
+
+    def delete_time_slots_before(self, time_slot: DateTime) -> None:
+        """Delete the values of all time slots that are older than time_slot.
+
+        The start of the lists is only advanced, and they are compacted once most of their
+        positions were deleted, therefore the cost does not depend on the size of the series."""
+        if self._head < len(self._values):
+            if self._slot_length_s is None:
+                self._slot_length_s = int(GlobalConfig.slot_length.total_seconds())
+            first_kept_slot = ceil(time_slot.timestamp() / self._slot_length_s)
+            deleted_count = min(first_kept_slot - self._first_slot,
+                                len(self._values) - self._head)
+            for position in range(self._head, self._head + max(deleted_count, 0)):
+                if self._values[position] is not _MISSING:
+                    self._length -= 1
+                self._time_slots[position] = None
+                self._values[position] = _MISSING
+            self._advance_head()
+        if self._unaligned_values:
+            for unaligned_time_slot in [
+                    key for key in self._unaligned_values if key < time_slot]:
+                self._unaligned_values.pop(unaligned_time_slot)
+
+    def _advance_head(self) -> None:
+        """Move the start of the lists to the first position that has a value, and compact the
+        lists once most of their positions were deleted."""
+        while self._head < len(self._values) and self._values[self._head] is _MISSING:
+            self._head += 1
+            self._first_slot += 1
+        if (self._head >= self._MIN_COMPACTION_SIZE and
+                2 * self._head >= len(self._values)):
+            del self._time_slots[:self._head]
+            del self._values[:self._head]
+            self._head = 0
+
+    def get_time_slots_before(self, time_slot: DateTime) -> List[DateTime]:
+        """Return the time slots of the series that are older than time_slot.
+
+        The aligned time slots are stored in chronological order, therefore only the past
+        positions of the lists are visited."""
+        time_slots = []
+        for position in range(self._head, len(self._values)):
+            if self._values[position] is _MISSING:
+                continue
+            if self._time_slots[position] >= time_slot:
+                break
+            time_slots.append(self._time_slots[position])
+        time_slots.extend(key for key in self._unaligned_values if key < time_slot)
+        return time_slots
+
+
+def delete_time_slots_before(time_series: MutableMapping, time_slot: DateTime,
+                             *dependent_time_series: MutableMapping) -> None:
+    """Delete the values of all time slots of the time series that are older than time_slot.
+
+    The same time slots are deleted from the dependent_time_series, which keep the past time
+    slots that the time series does not contain. Plain dicts are supported as well, in which
+    case all their time slots are scanned."""
+    if dependent_time_series:
+        past_time_slots = (
+            time_series.get_time_slots_before(time_slot)
+            if isinstance(time_series, TimeSlotSeries)
+            else [key for key in time_series if key < time_slot])
+        for dependent_series in dependent_time_series:
+            for past_time_slot in past_time_slots:
+                dependent_series.pop(past_time_slot, None)
+    if isinstance(time_series, TimeSlotSeries):
+        time_series.delete_time_slots_before(time_slot)
+        return
+    for past_time_slot in [key for key in time_series if key < time_slot]:
+        time_series.pop(past_time_slot, None)
+
+
+def get_time_slot_values(time_series: Mapping, time_slots: Sequence[DateTime],
+                         default: float = 0.) -> np.ndarray:
+    """Return the values of the ascending unique time_slots of the time series as an array."""
+    if isinstance(time_series, TimeSlotSeries):
+        return time_series.get_values(time_slots, default)
+    return np.array([time_series.get(time_slot, default) for time_slot in time_slots],
+                    dtype=float)
+
+
+def set_time_slot_values(time_series: MutableMapping, time_slots: Sequence[DateTime],
+                         values: np.ndarray) -> None:
+    """Set the values of the ascending unique time_slots of the time series from an array."""
+    if isinstance(time_series, TimeSlotSeries):
+        time_series.set_values(time_slots, values)
+        return
+    time_series.update(zip(time_slots, np.asarray(values).tolist()))
@@ -16,7 +16,7 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import logging
-from typing import TYPE_CHECKING, Callable, List, Dict
+from typing import TYPE_CHECKING, Callable, List, Dict, Optional
 
 from gsy_framework.constants_limits import ConstSettings, GlobalConfig
 from gsy_framework.read_user_profile import InputProfileTypes
@@ -27,6 +27,7 @@ from pendulum import duration, DateTime, Duration
 import gsy_e.constants
 from gsy_e.gsy_e_core.global_objects_singleton import global_objects
 from gsy_e.gsy_e_core.util import write_default_to_dict, is_time_slot_in_past_markets
+from gsy_e.models.strategy.price_schedule import price_schedule_engine
 
 if TYPE_CHECKING:
     from gsy_e.models.area import Area
@@ -100,6 +101,10 @@ class TemplateStrategyUpdaterBase(TemplateStrategyUpdaterInterface):
         self.number_of_available_updates = 0
         self.rate_limit_object = rate_limit_object
 
+        # Rows of the time slots in the PriceScheduleEngine, if the engine is used. The engine
+        # owns the update counters of these time slots instead of self.update_counter.
+        self._price_schedule_rows: Dict[DateTime, int] = {}
+
     def serialize(self):
         """Return dict with configuration parameters."""
         return {
@@ -121,6 +126,9 @@ class TemplateStrategyUpdaterBase(TemplateStrategyUpdaterInterface):
             )
 
     def _delete_market_slot_data(self, market_time_slot: DateTime) -> None:
+        row = self._price_schedule_rows.pop(market_time_slot, None)
+        if row is not None:
+            price_schedule_engine.remove_row(row)
         self.initial_rate.pop(market_time_slot, None)
         self.final_rate.pop(market_time_slot, None)
         self.energy_rate_change_per_update.pop(market_time_slot, None)
@@ -180,11 +188,47 @@ class TemplateStrategyUpdaterBase(TemplateStrategyUpdaterInterface):
             self.final_rate[time_slot] = final_rate
 
             self._set_or_update_energy_rate_change_per_update(time_slot)
-            write_default_to_dict(self.update_counter, time_slot, 0)
+            if self._can_use_price_schedule_engine():
+                self._update_price_schedule(time_slot)
+            else:
+                write_default_to_dict(self.update_counter, time_slot, 0)
 
             # todo: homogenize the calculation of elapsed seconds for spot and future markets
             self._add_slot_to_mapping(area, time_slot)
 
+    def _can_use_price_schedule_engine(self) -> bool:
+        """Return True if the price updates of the time slots can be scheduled by the
+        PriceScheduleEngine, which supports the elapsed time and the rate limits of this class."""
+        cls = type(self)
+        return (price_schedule_engine.enabled and
+                self.rate_limit_object in (max, min) and
+                cls.time_for_price_update is TemplateStrategyUpdaterBase.time_for_price_update and
+                cls._time_slot_duration_in_seconds is
+                TemplateStrategyUpdaterBase._time_slot_duration_in_seconds)
+
+    def _update_price_schedule(self, time_slot: DateTime) -> None:
+        row = self._price_schedule_rows.get(time_slot)
+        if row is None:
+            row = price_schedule_engine.add_row(self, time_slot)
+            self._price_schedule_rows[time_slot] = row
+        price_schedule_engine.set_schedule(
+            row, self.initial_rate[time_slot], self.final_rate[time_slot],
+            self.energy_rate_change_per_update[time_slot], self.update_interval.seconds,
+            self.rate_limit_object is max)
+
+    def _get_update_counter(self, time_slot: DateTime) -> int:
+        row = self._price_schedule_rows.get(time_slot)
+        if row is None:
+            return self.update_counter[time_slot]
+        return price_schedule_engine.get_update_counter(row)
+
+    def _set_update_counter(self, time_slot: DateTime, update_counter: int) -> None:
+        row = self._price_schedule_rows.get(time_slot)
+        if row is None:
+            self.update_counter[time_slot] = update_counter
+        else:
+            price_schedule_engine.set_update_counter(row, update_counter)
+
     def _add_slot_to_mapping(self, area, time_slot):
         """keep track of the elapsed time of simulation at the addition of a new slot."""
         if time_slot not in self.market_slot_added_time_mapping:
@@ -241,7 +285,7 @@ class TemplateStrategyUpdaterBase(TemplateStrategyUpdaterInterface):
         """Compute the rate for offers/bids at a specific time slot."""
         calculated_rate = (
             self.initial_rate[time_slot] -
-            self.energy_rate_change_per_update[time_slot] * self.update_counter[time_slot])
+            self.energy_rate_change_per_update[time_slot] * self._get_update_counter(time_slot))
         updated_rate = self.rate_limit_object(calculated_rate, self.final_rate[time_slot])
         return updated_rate
 
@@ -260,18 +304,42 @@ class TemplateStrategyUpdaterBase(TemplateStrategyUpdaterInterface):
         """Update method of the class. Should be called on each tick and increments the
         update counter in order to validate whether an update in the posted energy rates
         is required."""
+        if (self._price_schedule_rows and
+                price_schedule_engine.is_advanced(strategy.area.current_tick)):
+            # The PriceScheduleEngine already incremented the counters for this tick
+            return
         for time_slot in self._get_all_time_slots(strategy.area):
             self.increment_update_counter(strategy, time_slot)
 
     def increment_update_counter(self, strategy: "BaseStrategy", time_slot) -> None:
         """Increment the counter of the number of times in which prices have been updated."""
+        row = self._price_schedule_rows.get(time_slot)
+        if row is not None:
+            if not price_schedule_engine.is_advanced(strategy.area.current_tick):
+                price_schedule_engine.increment_update_counter(
+                    row, self._elapsed_seconds_per_slot(strategy.area))
+            return
         if self.time_for_price_update(strategy, time_slot):
             self.update_counter[time_slot] += 1
 
     def time_for_price_update(self, strategy: "BaseStrategy", time_slot: DateTime) -> bool:
         """Check if the prices of bids/offers should be updated."""
         return self._elapsed_seconds_per_slot(strategy.area) >= (
-            self.update_interval.seconds * self.update_counter[time_slot])
+            self.update_interval.seconds * self._get_update_counter(time_slot))
+
+    def _get_rate_for_price_update(self, strategy: "BaseStrategy",
+                                   time_slot: DateTime) -> Optional[float]:
+        """Return the rate that the orders of the time slot should be updated to, or None if the
+        orders should not be updated.
+
+        If the PriceScheduleEngine was advanced for the current tick, the orders are only
+        updated if the rate changed since the previous price update."""
+        row = self._price_schedule_rows.get(time_slot)
+        if row is not None and price_schedule_engine.is_advanced(strategy.area.current_tick):
+            return price_schedule_engine.get_changed_rate(row)
+        if self.time_for_price_update(strategy, time_slot):
+            return self.get_updated_rate(time_slot)
+        return None
 
     def set_parameters(self, *, initial_rate: float = None, final_rate: float = None,
                        energy_rate_change_per_update: float = None, fit_to_limit: bool = None,
@@ -288,6 +356,8 @@ class TemplateStrategyUpdaterBase(TemplateStrategyUpdaterInterface):
             self.fit_to_limit = fit_to_limit
         if update_interval is not None:
             self.update_interval = update_interval
+            for row in self._price_schedule_rows.values():
+                price_schedule_engine.set_update_interval(row, update_interval.seconds)
         self._read_or_rotate_rate_profiles()
 
     def reset(self, strategy: "BaseStrategy") -> None:
@@ -304,14 +374,15 @@ class TemplateStrategyBidUpdater(TemplateStrategyUpdaterBase):
         """Reset the price of all bids to use their initial rate."""
         # decrease energy rate for each market again, except for the newly created one
         for market in self.get_all_markets(strategy.area):
-            self.update_counter[market.time_slot] = 0
+            self._set_update_counter(market.time_slot, 0)
             strategy.update_bid_rates(market, self.get_updated_rate(market.time_slot))
 
     def update(self, market: "TwoSidedMarket", strategy: "BidEnabledStrategy") -> None:
         """Update the price of existing bids to reflect the new rates."""
-        if self.time_for_price_update(strategy, market.time_slot):
+        updated_rate = self._get_rate_for_price_update(strategy, market.time_slot)
+        if updated_rate is not None:
             if strategy.are_bids_posted(market.id):
-                strategy.update_bid_rates(market, self.get_updated_rate(market.time_slot))
+                strategy.update_bid_rates(market, updated_rate)
 
     def serialize(self):
         return {
@@ -328,14 +399,15 @@ class TemplateStrategyOfferUpdater(TemplateStrategyUpdaterBase):
     def reset(self, strategy: "BaseStrategy") -> None:
         """Reset the price of all offers based to use their initial rate."""
         for market in self.get_all_markets(strategy.area):
-            self.update_counter[market.time_slot] = 0
+            self._set_update_counter(market.time_slot, 0)
             strategy.update_offer_rates(market, self.get_updated_rate(market.time_slot))
 
     def update(self, market: "OneSidedMarket", strategy: "BaseStrategy") -> None:
         """Update the price of existing offers to reflect the new rates."""
-        if self.time_for_price_update(strategy, market.time_slot):
+        updated_rate = self._get_rate_for_price_update(strategy, market.time_slot)
+        if updated_rate is not None:
             if strategy.are_offers_posted(market.id):
-                strategy.update_offer_rates(market, self.get_updated_rate(market.time_slot))
+                strategy.update_offer_rates(market, updated_rate)
 
     def serialize(self):
         return {
@@ -25,6 +25,7 @@ from pendulum import duration, today
 
 from gsy_e import constants
 from gsy_e.events.event_structures import AreaEvent, MarketEvent
+from gsy_e.gsy_e_core.area_registry import AreaRegistry
 from gsy_e.gsy_e_core.device_registry import DeviceRegistry
 from gsy_e.models.area import Area, Asset, Market, check_area_name_exists_in_parent_area
 from gsy_e.models.area.events import Events
@@ -67,6 +68,7 @@ class TestArea:
         ConstSettings.MASettings.BID_OFFER_MATCH_TYPE = BidOfferMatchAlgoEnum.PAY_AS_BID.value
         ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS = False
         constants.RETAIN_PAST_MARKET_STRATEGIES_STATE = False
+        constants.PARALLEL_CLEARING_WORKERS = 0
 
     @staticmethod
     def test_respective_area_grid_fee_is_applied(config):
@@ -206,6 +208,13 @@ class TestArea:
         area.tick()
         assert manager.mock_calls == [call.update_matcher(), call.match()]
 
+        # With parallel clearing, the markets of all areas are cleared after the tick
+        manager.reset_mock()
+        constants.PARALLEL_CLEARING_WORKERS = 2
+        area.tick()
+        assert manager.mock_calls == [call.update_matcher()]
+        constants.PARALLEL_CLEARING_WORKERS = 0
+
         # TWO Sided markets with external matching, the order should be ->
         # call matching engine clearing -> consume commands from aggregator
         # -> update matching engine cache
@@ -214,6 +223,43 @@ class TestArea:
         area.tick()
         assert manager.mock_calls == [call.match(), call.update_matcher()]
 
+    @staticmethod
+    def test_tree_position():
+        house1, house2 = Area("House 1"), Area("House 2")
+        street = Area("Street", children=[house1, house2])
+        grid = Area("Grid", children=[Area("Other Street"), street])
+        assert grid.tree_position == ()
+        assert street.tree_position == (1,)
+        assert house2.tree_position == (1, 1)
+        assert sorted([house2, street, grid, house1], key=lambda area: area.tree_position) == [
+            grid, street, house1, house2]
+
+    @staticmethod
+    def test_tree_positions_are_cached_by_the_area_registry():
+        house1, house2 = Area("House 1"), Area("House 2")
+        other_street = Area("Other Street")
+        street = Area("Street", children=[house1, house2])
+        grid = Area("Grid", children=[other_street, street])
+        area_registry = AreaRegistry()
+        with patch.object(AreaRegistry, "_calculate_tree_positions",
+                          autospec=True, side_effect=AreaRegistry._calculate_tree_positions
+                          ) as calculate_mock:
+            area_registry.build(grid)
+            calculate_mock.assert_not_called()
+            with patch.object(Area, "tree_position") as tree_position_mock:
+                assert [area_registry.get_tree_position(area)
+                        for area in (grid, street, house2)] == [(), (1,), (1, 1)]
+                assert area_registry.get_tree_position(
+                    Area("Unregistered")) is tree_position_mock
+            assert calculate_mock.call_count == 1
+            # The positions are calculated again on demand, once areas were deleted
+            grid.children = [street]
+            area_registry.unregister(other_street.uuid)
+            assert calculate_mock.call_count == 1
+            assert area_registry.get_tree_position(house2) == (0, 1)
+            assert area_registry.get_tree_position(street) == (0,)
+            assert calculate_mock.call_count == 2
+
 
 class TestEventDispatcher:
     """Test the dispatching of area events."""
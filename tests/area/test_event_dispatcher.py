@@ -21,24 +21,29 @@ from unittest.mock import MagicMock, Mock, call
 
 import pytest
 from gsy_framework.constants_limits import ConstSettings, GlobalConfig
+from gsy_framework.data_classes import Bid, TraderDetails
 from gsy_framework.enums import AvailableMarketTypes, SpotMarketTypeEnum
-from pendulum import DateTime, datetime, duration
+from pendulum import DateTime, datetime, duration, now
 
 from gsy_e.events.event_structures import AreaEvent, MarketEvent
 from gsy_e.models.area import Area
 from gsy_e.models.area.event_dispatcher import AreaDispatcher
+from gsy_e.models.area.event_subscriptions import (
+    MarketEventSubscriptions, get_strategy_market_event_subscriptions)
 from gsy_e.models.market import MarketBase
 from gsy_e.models.market.balancing import BalancingMarket
 from gsy_e.models.market.future import FutureMarkets
 from gsy_e.models.market.one_sided import OneSidedMarket
 from gsy_e.models.market.settlement import SettlementMarket
 from gsy_e.models.market.two_sided import TwoSidedMarket
+from gsy_e.models.strategy.load_hours import LoadHoursStrategy
 from gsy_e.models.strategy.market_agents.balancing_agent import BalancingAgent
 from gsy_e.models.strategy.market_agents.future_agent import FutureAgent
 from gsy_e.models.strategy.market_agents.market_agent import MarketAgent
 from gsy_e.models.strategy.market_agents.one_sided_agent import OneSidedAgent
 from gsy_e.models.strategy.market_agents.settlement_agent import SettlementAgent
 from gsy_e.models.strategy.market_agents.two_sided_agent import TwoSidedAgent
+from gsy_e.models.strategy.pv import PVStrategy
 
 # pylint: disable=W0212
 
@@ -241,8 +246,9 @@ class TestAreaDispatcher:
 
         area_dispatcher.broadcast_notification(event_type, **kwargs)
 
+        # Children without strategies do not subscribe to market events
         for child in area_dispatcher.area.children:
-            child.dispatcher.event_listener.assert_called_once()
+            child.dispatcher.event_listener.assert_not_called()
 
         if expected_market_type in [AvailableMarketTypes.BALANCING, AvailableMarketTypes.SPOT]:
             (area_dispatcher._broadcast_notification_to_area_and_child_agents.
@@ -252,3 +258,70 @@ class TestAreaDispatcher:
         else:
             (area_dispatcher._broadcast_notification_to_area_and_child_agents.
                 assert_called_once_with(expected_market_type, event_type, **kwargs))
+
+    @staticmethod
+    def test_broadcast_notification_sends_market_events_only_to_subscribed_children(
+            area_dispatcher):
+        """Test that market events are only sent to the children that handle them."""
+        load, pv = area_dispatcher.area.children
+        load.strategy = LoadHoursStrategy(avg_power_W=100)
+        pv.strategy = PVStrategy()
+        for child in area_dispatcher.area.children:
+            child.dispatcher.event_listener = Mock()
+        area_dispatcher._broadcast_notification_to_area_and_child_agents = Mock()
+        area_dispatcher.broadcast_notification(AreaEvent.TICK)
+
+        market_id = area_dispatcher.area.spot_market.id
+        own_bid = Bid("bid_id", now(), 1, 1, TraderDetails(load.name, load.uuid))
+        other_bid = Bid("bid_id2", now(), 1, 1, TraderDetails("other", "other_uuid"))
+        for child in area_dispatcher.area.children:
+            child.dispatcher.event_listener.reset_mock()
+
+        area_dispatcher.broadcast_notification(
+            MarketEvent.BID_DELETED, market_id=market_id, bid=other_bid)
+        load.dispatcher.event_listener.assert_not_called()
+        pv.dispatcher.event_listener.assert_not_called()
+
+        area_dispatcher.broadcast_notification(
+            MarketEvent.BID_DELETED, market_id=market_id, bid=own_bid)
+        load.dispatcher.event_listener.assert_called_once_with(
+            MarketEvent.BID_DELETED, market_id=market_id, bid=own_bid)
+        pv.dispatcher.event_listener.assert_not_called()
+
+
+def test_market_event_subscriptions_filter_by_market_and_trader():
+    subscriptions = MarketEventSubscriptions()
+    all_listener, market_listener, trader_listener = Mock(), Mock(), Mock()
+    subscriptions.subscribe(trader_listener, MarketEvent.BID_DELETED, trader="load")
+    subscriptions.subscribe(market_listener, MarketEvent.BID_DELETED, market_id="market")
+    subscriptions.subscribe(all_listener, MarketEvent.BID_DELETED)
+
+    bid = Bid("bid_id", now(), 1, 1, TraderDetails("load", "load_uuid"))
+    assert subscriptions.get_listeners(
+        MarketEvent.BID_DELETED, "market", {"bid": bid}) == [
+            trader_listener, market_listener, all_listener]
+    assert subscriptions.get_listeners(
+        MarketEvent.BID_DELETED, "other_market", {"bid": bid}) == [
+            trader_listener, all_listener]
+    assert subscriptions.get_listeners(MarketEvent.BID, "market", {"bid": bid}) == []
+
+    subscriptions.unsubscribe(trader_listener)
+    assert subscriptions.get_listeners(
+        MarketEvent.BID_DELETED, "other_market", {"bid": bid}) == [all_listener]
+
+
+def test_get_strategy_market_event_subscriptions():
+    subscriptions = get_strategy_market_event_subscriptions(LoadHoursStrategy(avg_power_W=100))
+    # Default handlers only react to the orders of the strategy itself
+    assert subscriptions[MarketEvent.BID_DELETED] is True
+    assert subscriptions[MarketEvent.BID_SPLIT] is True
+    # Overridden handlers receive the events of all traders
+    assert subscriptions[MarketEvent.BID_TRADED] is False
+    assert subscriptions[MarketEvent.OFFER] is False
+    # Amended orders are forwarded to the event_offer / event_bid handlers
+    assert subscriptions[MarketEvent.ORDER_AMENDED] is False
+    # No-op handlers are not subscribed
+    assert MarketEvent.BALANCING_OFFER not in subscriptions
+
+    assert get_strategy_market_event_subscriptions(Mock()) == {
+        event_type: False for event_type in MarketEvent}
@@ -0,0 +1,145 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import random
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from gsy_framework.constants_limits import ConstSettings
+from gsy_framework.enums import SpotMarketTypeEnum
+from pendulum import datetime, duration
+
+from gsy_e.gsy_e_core.area_registry import AreaRegistry
+from gsy_e.models.area import CoefficientArea
+from gsy_e.models.area.scm_manager import SCMManager
+from gsy_e.models.area.vectorized_scm_manager import VectorizedSCMManager
+from gsy_e.models.strategy.scm import SCMStrategy
+
+TIME_SLOTS = [datetime(2022, 1, 31, 23) + duration(minutes=15 * slot) for slot in range(8)]
+
+
+class TestVectorizedSCMManager:
+    # pylint: disable=attribute-defined-outside-init
+    """Test the VectorizedSCMManager class."""
+
+    def setup_method(self):
+        ConstSettings.MASettings.MARKET_TYPE = SpotMarketTypeEnum.COEFFICIENTS.value
+        self._asset_energies = {}
+        rng = random.Random(1)
+        homes = []
+        for home_index, coefficient in enumerate((0.5, 0.3, 0.2, 0.0)):
+            assets = []
+            for asset_index in range(2):
+                strategy = MagicMock(spec=SCMStrategy)
+                production = [rng.choice((0., rng.random())) for _ in TIME_SLOTS]
+                consumption = [rng.choice((0., rng.random())) for _ in TIME_SLOTS]
+                strategy.get_energy_to_sell_kWh.side_effect = (
+                    dict(zip(TIME_SLOTS, production)).get)
+                strategy.get_energy_to_buy_kWh.side_effect = (
+                    dict(zip(TIME_SLOTS, consumption)).get)
+                self._asset_energies[(home_index, asset_index)] = (production, consumption)
+                assets.append(CoefficientArea(
+                    name=f"asset {home_index} {asset_index}", strategy=strategy))
+            homes.append(CoefficientArea(
+                name=f"House {home_index}", children=assets, coefficient_percentage=coefficient,
+                grid_fee_constant=0.02 * home_index, taxes_surcharges=0.01,
+                fixed_monthly_fee=1., marketplace_monthly_fee=0.5, assistance_monthly_fee=0.2,
+                market_maker_rate=0.3, feed_in_tariff=0.05 + 0.01 * home_index))
+        self._community = CoefficientArea(name="Community", children=homes)
+
+    @staticmethod
+    def teardown_method():
+        ConstSettings.MASettings.MARKET_TYPE = SpotMarketTypeEnum.ONE_SIDED.value
+        ConstSettings.SCMSettings.INTRACOMMUNITY_BASE_RATE_EUR = None
+
+    def _calculate_scm_manager(self, time_slot):
+        scm_manager = SCMManager(self._community, time_slot)
+        # Keep the tree order of the homes, which is used by the VectorizedSCMManager
+        with patch("gsy_e.models.area.coefficient_area.random", return_value=0.):
+            self._community.calculate_home_after_meter_data(time_slot, scm_manager)
+            scm_manager.calculate_community_after_meter_data()
+            self._community.trigger_energy_trades(scm_manager)
+        scm_manager.accumulate_community_trades()
+        return scm_manager
+
+    @staticmethod
+    def _trades_summary(trades):
+        return [(trade.seller.name, trade.buyer.name, round(trade.traded_energy, 6),
+                 round(trade.trade_price, 6)) for trade in trades]
+
+    def _assert_same_results(self, scm_manager, expected_scm_manager, area_uuid):
+        results = scm_manager.get_area_results(area_uuid)
+        expected_results = expected_scm_manager.get_area_results(area_uuid)
+        assert results["bills"] == pytest.approx(expected_results["bills"])
+        for name, value in expected_results["after_meter_data"].items():
+            if isinstance(value, float):
+                assert results["after_meter_data"][name] == pytest.approx(value), name
+            elif name != "trades":
+                assert results["after_meter_data"][name] == value, name
+
+        if area_uuid == scm_manager.community_data.community_uuid:
+            trades = scm_manager.community_data.trades
+            expected_trades = expected_scm_manager.community_data.trades
+        else:
+            trades = scm_manager.get_after_meter_data(area_uuid).trades
+            expected_trades = expected_scm_manager.get_after_meter_data(area_uuid).trades
+        assert self._trades_summary(trades) == self._trades_summary(expected_trades)
+
+    @pytest.mark.parametrize("intracommunity_base_rate", (None, 0.2))
+    def test_calculate_produces_same_results_as_scm_manager(self, intracommunity_base_rate):
+        ConstSettings.SCMSettings.INTRACOMMUNITY_BASE_RATE_EUR = intracommunity_base_rate
+        vectorized_scm_manager = VectorizedSCMManager(self._community)
+        asset_keys = sorted(self._asset_energies)
+        vectorized_scm_manager.calculate(
+            TIME_SLOTS,
+            np.array([self._asset_energies[key][0] for key in asset_keys]),
+            np.array([self._asset_energies[key][1] for key in asset_keys]))
+
+        for time_slot_index, time_slot in enumerate(TIME_SLOTS):
+            scm_manager = vectorized_scm_manager.get_scm_manager(time_slot_index)
+            expected_scm_manager = self._calculate_scm_manager(time_slot)
+            for area in [self._community, *self._community.children]:
+                self._assert_same_results(scm_manager, expected_scm_manager, area.uuid)
+
+    def test_calculate_time_slot_reads_energy_of_assets_and_settings_of_homes(self):
+        vectorized_scm_manager = VectorizedSCMManager(self._community)
+        self._community.children[0].area_reconfigure_event(feed_in_tariff=0.2)
+        scm_manager = vectorized_scm_manager.calculate_time_slot(TIME_SLOTS[3])
+        home_uuid = self._community.children[0].uuid
+
+        assert scm_manager.get_after_meter_data(home_uuid).feed_in_tariff == 0.2
+        assert scm_manager.get_after_meter_data(home_uuid).production_kWh == pytest.approx(
+            self._asset_energies[(0, 0)][0][3] + self._asset_energies[(0, 1)][0][3])
+        assert (scm_manager.get_home_energy_need(home_uuid) ==
+                pytest.approx(self._calculate_scm_manager(TIME_SLOTS[3]).get_home_energy_need(
+                    home_uuid)))
+
+    def test_homes_are_indexed_again_after_the_area_registry_changed(self):
+        area_registry = AreaRegistry()
+        area_registry.build(self._community)
+        vectorized_scm_manager = VectorizedSCMManager(self._community, area_registry)
+        deleted_home = self._community.children[-1]
+        self._community.children = self._community.children[:-1]
+        area_registry.unregister(deleted_home.uuid)
+
+        scm_manager = vectorized_scm_manager.calculate_time_slot(TIME_SLOTS[3])
+        expected_scm_manager = self._calculate_scm_manager(TIME_SLOTS[3])
+        for area in [self._community, *self._community.children]:
+            self._assert_same_results(scm_manager, expected_scm_manager, area.uuid)
+        assert (scm_manager.community_data.production_kWh ==
+                pytest.approx(expected_scm_manager.community_data.production_kWh))
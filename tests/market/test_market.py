@@ -38,6 +38,7 @@ from gsy_e.gsy_e_core.exceptions import (DeviceNotInRegistryError, InvalidBalanc
                                          NegativeEnergyOrderException, InvalidTrade,
                                          MarketReadOnlyException, OfferNotFoundException)
 from gsy_e.gsy_e_core.util import add_or_create_key, subtract_or_create_key
+from gsy_e.models.market import GridFee
 from gsy_e.models.market.balancing import BalancingMarket
 from gsy_e.models.market.one_sided import OneSidedMarket
 from gsy_e.models.market.settlement import SettlementMarket
@@ -470,6 +471,50 @@ def test_market_listeners_offer_deleted(market, offer, delete_offer, add_listene
     assert called.calls[1][1] == {"offer": repr(e_offer), "market_id": repr(market.id)}
 
 
+@pytest.mark.parametrize("market, order", [
+    (OneSidedMarket(bc=MagicMock(), time_slot=now()), "offer"),
+    (TwoSidedMarket(bc=MagicMock(), time_slot=now()), "offer"),
+    (TwoSidedMarket(bc=MagicMock(), time_slot=now()), "bid"),
+])
+def test_market_listeners_order_amended(market, order, called):
+    market.add_listener(called)
+    if order == "offer":
+        e_order = market.offer(10, 2, seller_details)
+        market.offer(15, 2, seller_details)
+    else:
+        e_order = market.bid(10, 2, buyer_details)
+    amended_order = market.amend_order(e_order.id, 20)
+
+    assert amended_order.id == e_order.id
+    assert amended_order.price == 20
+    assert amended_order.energy == e_order.energy
+    assert e_order.price == 10
+    orders = market.offers if order == "offer" else market.bids
+    assert orders[e_order.id] is amended_order
+    if order == "offer":
+        assert [o.price for o in market.sorted_offers] == [15, 20]
+    assert len(called.calls) == (3 if order == "offer" else 2)
+    assert called.calls[-1][0] == (repr(MarketEvent.ORDER_AMENDED),)
+    assert called.calls[-1][1] == {"order": repr(amended_order),
+                                   "original_order": repr(e_order),
+                                   "market_id": repr(market.id)}
+
+
+def test_market_amend_order_adds_grid_fees():
+    market = TwoSidedMarket(bc=MagicMock(), time_slot=now(), grid_fee_type=1,
+                            grid_fees=GridFee(grid_fee_percentage=0, grid_fee_const=1))
+    offer = market.offer(10, 2, seller_details)
+    bid = market.bid(10, 2, buyer_details)
+    assert market.amend_order(offer.id, 20).price == 22
+    assert market.amend_order(bid.id, 20).price == 20
+    assert market.amend_order(offer.id, 20, adapt_price_with_fees=False).price == 20
+    with pytest.raises(OfferNotFoundException):
+        market.amend_order("no such order", 20)
+    market.readonly = True
+    with pytest.raises(MarketReadOnlyException):
+        market.amend_order(offer.id, 30)
+
+
 @pytest.mark.parametrize(
     ("last_offer_size", "traded_energy"),
     (
@@ -0,0 +1,73 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import logging
+from time import perf_counter
+from uuid import uuid4
+
+import pytest
+from gsy_framework.data_classes import BidOfferMatch, TraderDetails
+from pendulum import now
+
+from gsy_e.gsy_e_core.blockchain_interface import NonBlockchainInterface
+from gsy_e.models.market.two_sided import TwoSidedMarket
+
+log = logging.getLogger(__name__)
+
+
+def _match_recommendations_duration(order_count: int) -> float:
+    """Match <order_count> offers with <order_count> bids and return the matching duration.
+
+    Every pair is recommended twice with half of the energy of the orders, so that half of the
+    recommendations have to be matched against the residuals of the first trades.
+    """
+    market = TwoSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now())
+    recommendations = []
+    for index in range(order_count):
+        offer = market.offer(price=2, energy=2, seller=TraderDetails(
+            f"seller{index}", f"seller{index}", f"seller{index}", f"seller{index}"))
+        bid = market.bid(price=2, energy=2, buyer=TraderDetails(
+            f"buyer{index}", f"buyer{index}", f"buyer{index}", f"buyer{index}"))
+        recommendation = BidOfferMatch(
+            bid=bid.serializable_dict(), offer=offer.serializable_dict(),
+            trade_rate=1, selected_energy=1, market_id=market.id,
+            time_slot=market.time_slot_str).serializable_dict()
+        recommendations.extend([recommendation, dict(recommendation)])
+
+    start_time = perf_counter()
+    assert market.match_recommendations(recommendations) is True
+    duration = perf_counter() - start_time
+    assert len(market.trades) == 2 * order_count
+    assert len(market.offers) == 0
+    assert len(market.bids) == 0
+    return duration
+
+
+@pytest.mark.slow
+@pytest.mark.benchmark
+def test_match_recommendations_scales_linearly():
+    """Benchmark match_recommendations with 1k and 10k bids / offers per market."""
+    logging.disable(logging.INFO)
+    try:
+        small_duration = _match_recommendations_duration(1000)
+        large_duration = _match_recommendations_duration(10000)
+    finally:
+        logging.disable(logging.NOTSET)
+    log.warning("match_recommendations: 1k orders %.3fs, 10k orders %.3fs",
+                small_duration, large_duration)
+    # Linear scaling would result in a ratio of ~10, quadratic scaling in a ratio of ~100.
+    assert large_duration / small_duration < 30
@@ -13,6 +13,7 @@ import gsy_e.gsy_e_core.redis_connections.area_market
 import gsy_e.models.market.market_redis_connection
 from gsy_e.gsy_e_core.exceptions import (InvalidBidOfferPairException,
                                          MatchingEngineValidationException)
+from gsy_e.gsy_e_core.redis_connections.wire_format import JSON_WIRE_CODEC
 from gsy_e.models.market.two_sided import TwoSidedMarket
 from gsy_e.models.matching_engine_matcher import MatchingEngineExternalMatcher
 from gsy_e.models.matching_engine_matcher.matching_engine_external_matcher import \
@@ -129,7 +130,8 @@ class TestMatchingEngineExternalMatcher:
         self.matcher._publish_orders_message_buffer = [payload]
         self.matcher._publish_orders()
         self.matcher.matching_engine_ext_conn.publish_json.assert_called_once_with(
-            MatchingEngineChannels(gsy_e.constants.CONFIGURATION_ID).response, expected_data)
+            MatchingEngineChannels(gsy_e.constants.CONFIGURATION_ID).response, expected_data,
+            JSON_WIRE_CODEC)
         self.matcher.matching_engine_ext_conn.publish_json.reset_mock()
 
         # Apply market filter
@@ -145,7 +147,27 @@ class TestMatchingEngineExternalMatcher:
         self.matcher._publish_orders_message_buffer = [payload]
         self.matcher._publish_orders()
         self.matcher.matching_engine_ext_conn.publish_json.assert_called_once_with(
-            MatchingEngineChannels(gsy_e.constants.CONFIGURATION_ID).response, expected_data)
+            MatchingEngineChannels(gsy_e.constants.CONFIGURATION_ID).response, expected_data,
+            JSON_WIRE_CODEC)
+
+    @patch("gsy_e.models.matching_engine_matcher.matching_engine_external_matcher."
+           "MatchingEngineExternalMatcher._get_orders", MagicMock(return_value=({})))
+    def test_publish_offers_bids_in_the_requested_wire_format(self):
+        communicator = self.matcher.matching_engine_ext_conn
+        communicator.codec = JSON_WIRE_CODEC
+        self.matcher._publish_orders_message_buffer = [
+            {"data": json.dumps({"filters": {}, "wire_format": "msgpack"})},
+            {"data": json.dumps({"filters": {}})}]
+        self.matcher._publish_orders()
+        # Each response is encoded in the wire format of the client that requested it
+        assert [call.args[2].name for call in communicator.publish_json.call_args_list] == [
+            "msgpack", "json"]
+        # The wire format of the broadcast events is not changed by the clients
+        assert communicator.codec is JSON_WIRE_CODEC
+        communicator.publish_json.reset_mock()
+        self.matcher.event_finish()
+        communicator.publish_json.assert_called_once_with(
+            self.events_channel, {"event": "finish"})
 
     @patch("gsy_e.models.matching_engine_matcher.matching_engine_external_matcher."
            "MatchingEngineExternalMatcherValidator.validate_and_report")
@@ -0,0 +1,195 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import random
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+from gsy_framework.data_classes import TraderDetails
+from gsy_framework.enums import AvailableMarketTypes
+from pendulum import now
+
+from gsy_e.gsy_e_core.blockchain_interface import NonBlockchainInterface
+from gsy_e.models.market.two_sided import TwoSidedMarket
+from gsy_e.models.matching_engine_matcher.dirty_markets_tracker import DirtyMarketsTracker
+from gsy_e.models.matching_engine_matcher.matching_engine_internal_matcher import (
+    MatchingEngineInternalMatcher)
+from gsy_e.models.matching_engine_matcher.parallel_market_clearing import ParallelMarketClearing
+from gsy_e.models.matching_engine_matcher.vectorized_matching_algorithms import (
+    OrderArrays, VectorizedPayAsBidMatchingAlgorithm)
+
+seller = TraderDetails("seller", "seller_uuid")
+buyer = TraderDetails("buyer", "buyer_uuid")
+
+
+@pytest.fixture(name="market")
+def market_fixture():
+    """Fixture for two sided market."""
+    return TwoSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now())
+
+
+@pytest.fixture(name="matcher")
+def matcher_fixture():
+    """Fixture for an activated internal matcher."""
+    matcher = MatchingEngineInternalMatcher()
+    matcher.activate()
+    return matcher
+
+
+@pytest.fixture(name="parallel_clearing")
+def parallel_clearing_fixture():
+    """Fixture for a parallel market clearing with 2 worker processes."""
+    parallel_clearing = ParallelMarketClearing(max_workers=2)
+    yield parallel_clearing
+    parallel_clearing.shutdown()
+
+
+def _update_matcher(matcher: MatchingEngineInternalMatcher, market: TwoSidedMarket,
+                    area_uuid: str = "area_uuid", **area_data) -> None:
+    matcher.update_area_uuid_markets_mapping({area_uuid: {
+        "current_time": market.time_slot,
+        AvailableMarketTypes.SPOT: [market],
+        AvailableMarketTypes.SETTLEMENT: [],
+        AvailableMarketTypes.FUTURE: None,
+        **area_data}})
+
+
+def _create_market_with_random_orders(seed: int) -> TwoSidedMarket:
+    rng = random.Random(seed)
+    market = TwoSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now())
+    for index in range(20):
+        market.offer(price=rng.randint(1, 30), energy=rng.randint(1, 5),
+                     seller=TraderDetails(f"seller{index}", f"seller{index}"),
+                     offer_id=f"offer{index}")
+        market.bid(price=rng.randint(1, 30), energy=rng.randint(1, 5),
+                   buyer=TraderDetails(f"buyer{index}", f"buyer{index}"),
+                   bid_id=f"bid{index}")
+    return market
+
+
+def _trades_summary(market: TwoSidedMarket):
+    return [(trade.seller.name, trade.buyer.name, round(trade.traded_energy, 4),
+             round(trade.trade_price, 4)) for trade in market.trades]
+
+
+def test_dirty_markets_tracker_collects_time_slots_of_new_orders(market):
+    tracker = DirtyMarketsTracker()
+    tracker.update_area_markets("area_uuid", [market])
+    assert not tracker.is_dirty(market)
+
+    market.offer(1, 1, seller)
+    assert tracker.pop_dirty_time_slots(market) == {market.time_slot}
+    assert not tracker.is_dirty(market)
+
+    # Markets that expired are released
+    tracker.update_area_markets("area_uuid", [])
+    market.bid(1, 1, buyer)
+    assert not tracker.is_dirty(market)
+    assert market.new_order_listeners == []
+
+
+def test_dirty_markets_tracker_flags_markets_with_orders_posted_before_registration(market):
+    market.offer(1, 1, seller)
+    tracker = DirtyMarketsTracker()
+    tracker.update_area_markets("area_uuid", [market])
+    assert tracker.pop_dirty_time_slots(market) == {None}
+
+
+def test_market_has_crossing_orders(market):
+    assert not market.has_crossing_orders()
+    market.offer(2, 1, seller)
+    market.bid(1, 1, buyer)
+    assert not market.has_crossing_orders()
+    market.bid(2, 1, buyer)
+    assert market.has_crossing_orders()
+
+
+def test_internal_matcher_skips_markets_without_crossing_orders(market, matcher):
+    matcher._get_matches_recommendations = MagicMock(return_value=[])
+    market.offer(2, 1, seller)
+    market.bid(1, 1, buyer)
+    _update_matcher(matcher, market)
+    matcher.match_recommendations()
+    matcher._get_matches_recommendations.assert_not_called()
+    assert market.no_new_order is True
+
+
+def test_internal_matcher_only_clears_markets_with_new_orders(market, matcher):
+    market.offer(1, 1, seller)
+    market.bid(1, 1, buyer)
+    _update_matcher(matcher, market)
+    matcher.match_recommendations()
+    assert len(market.trades) == 1
+
+    matcher._get_matches_recommendations = MagicMock(return_value=[])
+    _update_matcher(matcher, market)
+    matcher.match_recommendations()
+    matcher._get_matches_recommendations.assert_not_called()
+
+    market.offer(1, 1, seller)
+    market.bid(1, 1, buyer)
+    _update_matcher(matcher, market)
+    matcher.match_recommendations()
+    matcher._get_matches_recommendations.assert_called_once()
+
+
+def test_parallel_market_clearing_produces_same_trades_as_serial_clearing(parallel_clearing):
+    algorithm = VectorizedPayAsBidMatchingAlgorithm()
+    serial_markets = [_create_market_with_random_orders(seed) for seed in range(4)]
+    for market in serial_markets:
+        algorithm.match_market(market)
+
+    parallel_markets = [_create_market_with_random_orders(seed) for seed in range(4)]
+    parallel_clearing.clear_markets(algorithm, [(market, None) for market in parallel_markets])
+
+    for serial_market, parallel_market in zip(serial_markets, parallel_markets):
+        assert serial_market.trades
+        assert _trades_summary(parallel_market) == _trades_summary(serial_market)
+
+
+def test_parallel_market_clearing_sends_order_arrays_to_the_workers():
+    market = _create_market_with_random_orders(0)
+    parallel_clearing = ParallelMarketClearing(max_workers=1)
+    parallel_clearing._executor = MagicMock()
+    parallel_clearing._executor.map.return_value = [[]]
+    parallel_clearing.clear_markets(VectorizedPayAsBidMatchingAlgorithm(), [(market, None)])
+
+    _, _, snapshots = parallel_clearing._executor.map.call_args.args
+    [(bids, offers)] = list(snapshots)[0]
+    assert isinstance(bids, OrderArrays) and isinstance(offers, OrderArrays)
+    assert bids.ids == list(market.bids)
+    assert offers.energies.tolist() == [offer.energy for offer in market.offers.values()]
+    assert offers.trader_uuids == [offer.seller.uuid for offer in market.offers.values()]
+
+
+def test_internal_matcher_clears_areas_in_parallel_in_tree_order(matcher):
+    matcher.match_algorithm = VectorizedPayAsBidMatchingAlgorithm()
+    matcher._parallel_clearing = MagicMock(spec=ParallelMarketClearing)
+    markets = []
+    for area_uuid, tree_position in (("house", (0, 1)), ("grid", ()), ("street", (0,))):
+        market = TwoSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now())
+        market.offer(1, 1, seller)
+        market.bid(1, 1, buyer)
+        _update_matcher(matcher, market, area_uuid, tree_position=tree_position)
+        markets.append(market)
+
+    matcher.match_recommendations()
+    matcher._parallel_clearing.clear_markets.assert_called_once_with(
+        matcher.match_algorithm, [(markets[1], None), (markets[2], None), (markets[0], None)])
+    assert all(market.no_new_order for market in markets)
+    assert matcher.area_uuid_markets_mapping == {}
@@ -0,0 +1,194 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from copy import copy
+from uuid import uuid4
+
+import pytest
+from gsy_framework.data_classes import Bid, Offer, TradeBidOfferInfo, TraderDetails
+from pendulum import now
+
+from gsy_e.gsy_e_core.blockchain_interface import NonBlockchainInterface
+from gsy_e.models.market.order_book import OrderBook
+from gsy_e.models.market.two_sided import TwoSidedMarket
+
+seller_details = TraderDetails("S", "", "S", "")
+buyer_details = TraderDetails("B", "", "B", "")
+
+
+def _offer(offer_id, price, energy=1):
+    return Offer(offer_id, now(), price, energy, seller_details)
+
+
+def _bid(bid_id, price, energy=1):
+    return Bid(bid_id, now(), price, energy, buyer_details)
+
+
+@pytest.fixture(name="market")
+def market_fixture():
+    """Fixture for two sided market."""
+    return TwoSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now())
+
+
+def test_order_book_keeps_orders_sorted_on_insert_and_delete():
+    book = OrderBook()
+    for offer_id, price in [("a", 5), ("b", 3), ("c", 1), ("d", 4)]:
+        book[offer_id] = _offer(offer_id, price)
+    assert [o.id for o in book.sorted_orders()] == ["c", "b", "d", "a"]
+    assert [o.id for o in book.sorted_orders(reverse_order=True)] == ["a", "d", "b", "c"]
+
+    book.pop("c")
+    del book["d"]
+    assert [o.id for o in book.sorted_orders()] == ["b", "a"]
+    assert book.best().id == "b"
+    assert book.best(reverse_order=True).id == "a"
+    assert book.best_rate() == 3
+
+
+def test_order_book_replacing_order_updates_index():
+    book = OrderBook({"a": _offer("a", 5), "b": _offer("b", 3)})
+    book["a"] = _offer("a", 1)
+    assert [o.price for o in book.sorted_orders()] == [1, 3]
+    assert len(book) == 2
+
+
+def test_order_book_ties_are_sorted_by_insertion_order():
+    book = OrderBook()
+    for offer_id in ["a", "b", "c"]:
+        book[offer_id] = _offer(offer_id, 2)
+    assert [o.id for o in book.sorted_orders()] == ["a", "b", "c"]
+    assert [o.id for o in book.sorted_orders(reverse_order=True)] == ["c", "b", "a"]
+
+
+def test_order_book_top_and_best_rate_orders():
+    book = OrderBook()
+    book["a"] = _offer("a", 10, 10)
+    book["b"] = _offer("b", 3)
+    book["c"] = _offer("c", 1)
+    book["d"] = _offer("d", 20, 20)
+    assert [o.id for o in book.top(2)] == ["a", "c"]
+    assert {o.id for o in book.orders_at_best_rate()} == {"a", "c", "d"}
+    assert [o.id for o in book.orders_at_best_rate(reverse_order=True)] == ["b"]
+    assert OrderBook().orders_at_best_rate() == []
+    assert OrderBook().best() is None
+
+
+def test_order_book_index_survives_order_mutation():
+    book = OrderBook({"a": _offer("a", 5), "b": _offer("b", 3)})
+    book["a"].update_price(1)
+    book.pop("a")
+    assert [o.id for o in book.sorted_orders()] == ["b"]
+
+
+def test_order_book_copy_does_not_share_index():
+    book = OrderBook({"a": _offer("a", 5)})
+    book_copy = copy(book)
+    book_copy["b"] = _offer("b", 1)
+    assert [o.id for o in book.sorted_orders()] == ["a"]
+    assert [o.id for o in book_copy.sorted_orders()] == ["b", "a"]
+
+
+def test_market_orders_are_indexed_in_order_book(market):
+    market.offer(5, 1, seller_details)
+    cheapest = market.offer(1, 1, seller_details)
+    market.bid(2, 1, buyer_details)
+    best_bid = market.bid(4, 1, buyer_details)
+
+    assert market.cheapest_offers(1) == [cheapest]
+    assert market.most_expensive_bids(1) == [best_bid]
+    assert [b.price for b in market.sorted_bids] == [4, 2]
+
+    market.delete_offer(cheapest)
+    assert [o.price for o in market.sorted_offers] == [5]
+
+
+def test_market_order_book_is_maintained_on_partial_trade(market):
+    offer = market.offer(10, 10, seller_details)
+    market.offer(30, 10, seller_details)
+    bid = market.bid(40, 10, buyer_details)
+
+    market.accept_offer(offer, buyer_details, energy=4)
+    residual_offer = market.sorted_offers[0]
+    assert residual_offer.id != offer.id
+    assert residual_offer.energy == 6
+
+    market.accept_bid(bid, energy=3, seller=seller_details,
+                      trade_offer_info=TradeBidOfferInfo(4, 4, 1, 1, 4))
+    assert [b.energy for b in market.sorted_bids] == [7]
+
+
+def test_market_order_setter_builds_order_book(market):
+    market.offers = {"a": _offer("a", 5), "b": _offer("b", 3)}
+    market.bids = {"c": _bid("c", 5)}
+    assert isinstance(market.offers, OrderBook)
+    assert isinstance(market.bids, OrderBook)
+    assert [o.id for o in market.sorted_offers] == ["b", "a"]
+    assert market.most_affordable_offers[0].id == "b"
+
+
+def test_order_book_snapshot_is_reused_until_the_book_changes():
+    book = OrderBook({"a": _offer("a", 5)})
+    snapshot = book.snapshot()
+    assert book.snapshot() is snapshot
+
+    book["b"] = _offer("b", 3)
+    new_snapshot = book.snapshot()
+    assert new_snapshot is not snapshot
+    assert new_snapshot.generation > snapshot.generation
+    assert set(snapshot.keys()) == {"a"}
+    assert set(new_snapshot.keys()) == {"a", "b"}
+    with pytest.raises(TypeError):
+        new_snapshot["c"] = _offer("c", 1)
+
+
+def test_order_book_snapshot_can_be_iterated_while_deleting_orders():
+    book = OrderBook({"a": _offer("a", 5), "b": _offer("b", 3)})
+    for order_id in book.snapshot():
+        del book[order_id]
+    assert len(book) == 0
+
+
+def test_order_book_trader_index():
+    book = OrderBook()
+    book["a"] = Offer("a", now(), 1, 1, TraderDetails("S1", "s1-uuid", "O1", "o1-uuid"))
+    book["b"] = Offer("b", now(), 1, 1, TraderDetails("S1", "s1-uuid"))
+    book["c"] = Bid("c", now(), 1, 1, TraderDetails("B1", "b1-uuid"))
+    assert book.has_orders_from_trader("s1-uuid")
+    assert book.has_orders_from_trader("B1", attribute="name")
+    assert [o.id for o in book.orders_from_trader("o1-uuid", attribute="origin_uuid")] == ["a"]
+    assert [o.id for o in book.orders_from_trader("s1-uuid")] == ["a", "b"]
+
+    book.pop("a")
+    book.pop("b")
+    assert not book.has_orders_from_trader("s1-uuid")
+    assert book.orders_from_trader("s1-uuid") == []
+
+
+def test_market_get_offers_and_bids_return_snapshots(market):
+    offer = market.offer(5, 1, seller_details)
+    bid = market.bid(5, 1, buyer_details)
+    offers = market.get_offers()
+    bids = market.get_bids()
+    assert offers == {offer.id: offer}
+    assert bids == {bid.id: bid}
+    assert market.get_offers() is offers
+
+    market.delete_offer(offer)
+    assert offer.id in offers
+    assert market.get_offers() == {}
+    assert market.has_bids_from_trader(buyer_details.name, attribute="name")
+    assert not market.has_offers_from_trader(seller_details.uuid)
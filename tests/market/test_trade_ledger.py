@@ -0,0 +1,94 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import random
+from statistics import mean, median
+
+import pytest
+from gsy_framework.data_classes import Trade, TraderDetails
+from pendulum import now
+
+from gsy_e.models.market.trade_ledger import (
+    StreamingRateStatistics, TradeLedger, get_trade_ledger)
+
+
+def _trade(seller: str, buyer: str, energy: float, price: float) -> Trade:
+    return Trade("id", now(), TraderDetails(seller, ""), TraderDetails(buyer, ""),
+                 energy, price)
+
+
+class TestTradeLedger:
+    """Test the TradeLedger and StreamingRateStatistics classes."""
+
+    @staticmethod
+    def test_streaming_rate_statistics_match_statistics_module():
+        rng = random.Random(1)
+        rate_statistics = StreamingRateStatistics()
+        assert rate_statistics.mean is None
+        assert rate_statistics.median is None
+        rates = []
+        for _ in range(200):
+            rate = round(rng.uniform(-10, 40), rng.choice((0, 3)))
+            rates.append(rate)
+            rate_statistics.add(rate)
+            assert rate_statistics.count == len(rates)
+            assert rate_statistics.min == min(rates)
+            assert rate_statistics.max == max(rates)
+            assert rate_statistics.mean == pytest.approx(mean(rates))
+            assert rate_statistics.median == median(rates)
+
+    @staticmethod
+    def test_sync_accumulates_only_appended_trades():
+        trades = [_trade("S", "B", 1., 10.), _trade("S", "MA House 1", 2., 30.)]
+        trade_ledger = TradeLedger().sync(trades)
+        assert trade_ledger.trade_count == 2
+        assert trade_ledger.total_traded_energy_kWh == 3.
+        assert trade_ledger.total_trade_price == 40.
+
+        trades.append(_trade("B", "S", 4., 20.))
+        trade_ledger.sync(trades)
+        assert trade_ledger.trade_count == 3
+        assert trade_ledger.bought_energy("S") == 4.
+        assert trade_ledger.sold_energy("S") == 3.
+        assert trade_ledger.total_spent("B") == 10.
+        assert trade_ledger.total_earned("S") == 40.
+        assert trade_ledger.bought_energy("unknown") == 0
+        assert trade_ledger.get_trades_of_trader("B") == [trades[0], trades[2]]
+        assert trade_ledger.rate_statistics.median == 10.
+        # Market agent names are resolved to the names of their areas
+        assert trade_ledger.get_traded_energy_between_areas(["S"], ["House 1", "B"]) == 3.
+
+    @staticmethod
+    def test_sync_rebuilds_statistics_if_trades_were_replaced_or_deleted():
+        trades = [_trade("S", "B", 1., 10.), _trade("S", "B", 2., 30.)]
+        trade_ledger = TradeLedger().sync(trades)
+        trades.pop(0)
+        assert trade_ledger.sync(trades).sold_energy("S") == 2.
+
+        trade_ledger.sync([_trade("A", "B", 5., 5.)])
+        assert trade_ledger.trade_count == 1
+        assert trade_ledger.sold_energy("S") == 0
+        assert trade_ledger.rate_statistics.max == 1.
+
+    @staticmethod
+    def test_get_trade_ledger_supports_objects_without_ledger():
+        class FakeMarket:
+            """Market that only provides its trades."""
+            def __init__(self):
+                self.trades = [_trade("S", "B", 1., 10.)]
+
+        assert get_trade_ledger(FakeMarket()).bought_energy("B") == 1.
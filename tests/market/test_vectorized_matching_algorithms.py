@@ -0,0 +1,167 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of Grid Singularity Exchange.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import random
+from unittest.mock import patch
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from gsy_framework.constants_limits import ConstSettings
+from gsy_framework.data_classes import Bid, Offer, TraderDetails
+from gsy_framework.enums import BidOfferMatchAlgoEnum
+from gsy_framework.matching_algorithms import (PayAsBidMatchingAlgorithm,
+                                               PayAsClearMatchingAlgorithm)
+from pendulum import now
+
+from gsy_e.gsy_e_core.blockchain_interface import NonBlockchainInterface
+from gsy_e.models.market.two_sided import TwoSidedMarket
+from gsy_e.models.matching_engine_matcher.vectorized_matching_algorithms import (
+    OrderArrays, VectorizedPayAsBidMatchingAlgorithm, VectorizedPayAsClearMatchingAlgorithm,
+    _sorted_order_arrays)
+
+
+@pytest.fixture(name="match_type")
+def match_type_fixture(request):
+    """Set the BID_OFFER_MATCH_TYPE for the duration of the test."""
+    original_match_type = ConstSettings.MASettings.BID_OFFER_MATCH_TYPE
+    original_aggregation = ConstSettings.MASettings.PAY_AS_CLEAR_AGGREGATION_ALGORITHM
+    ConstSettings.MASettings.BID_OFFER_MATCH_TYPE = request.param
+    ConstSettings.MASettings.PAY_AS_CLEAR_AGGREGATION_ALGORITHM = 1
+    yield request.param
+    ConstSettings.MASettings.BID_OFFER_MATCH_TYPE = original_match_type
+    ConstSettings.MASettings.PAY_AS_CLEAR_AGGREGATION_ALGORITHM = original_aggregation
+
+
+def _create_market(seed: int, order_count: int = 50) -> TwoSidedMarket:
+    """Create a market with random orders; rates are rounded in order to create ties."""
+    rng = random.Random(seed)
+    market = TwoSidedMarket(bc=NonBlockchainInterface(str(uuid4())), time_slot=now())
+    for index in range(order_count):
+        offer_energy, bid_energy = rng.randint(1, 5), rng.randint(1, 5)
+        market.offer(price=rng.randint(1, 30) * offer_energy, energy=offer_energy,
+                     seller=TraderDetails(f"seller{index}", f"seller{index}"),
+                     offer_id=f"offer{index}")
+        market.bid(price=rng.randint(1, 30) * bid_energy, energy=bid_energy,
+                   buyer=TraderDetails(f"buyer{index}", f"buyer{index}"),
+                   bid_id=f"bid{index}")
+    return market
+
+
+def _match_with_recommendations(market: TwoSidedMarket, algorithm) -> None:
+    """Match the market the same way as MatchingEngineMatcherInterface._match_recommendations."""
+    while True:
+        data = {"area": {
+            time_slot: {**orders, "current_time": market.time_slot_str}
+            for time_slot, orders in market.orders_per_slot().items()}}
+        recommendations = algorithm.get_matches_recommendations(data)
+        if not recommendations or not market.match_recommendations(recommendations):
+            break
+
+
+def _trades_summary(market: TwoSidedMarket):
+    return sorted((trade.seller.name, trade.buyer.name, round(trade.traded_energy, 4),
+                   round(trade.trade_price, 4)) for trade in market.trades)
+
+
+@pytest.mark.parametrize("offer_rates, bid_rates, clearing_rate, clearing_energy", [
+    ([1, 2, 3, 4, 5, 6, 7], [1, 2, 3, 4, 5, 6, 7], 4, 4),
+    ([1, 2, 3, 4, 5, 6, 7], [7, 6, 5, 4, 3, 2, 1], 4, 4),
+    ([8, 9, 10, 11, 12, 13, 14], [8, 9, 10, 11, 12, 13, 14], 11, 4),
+    ([2, 3, 3, 5, 6, 7, 8], [1, 2, 3, 4, 5, 6, 7], 5, 3),
+    ([10, 10, 10, 10, 10, 10, 10], [1, 2, 3, 4, 10, 10, 10], 10, 3),
+    ([1, 2, 5, 5, 5, 6, 7], [5, 5, 5, 5, 5, 5, 5], 5, 5),
+    ([1.1, 2.2, 3.3], [3.3, 2.2, 1.1], 2.2, 2),
+])
+def test_vectorized_pay_as_clear_clearing_point(
+        offer_rates, bid_rates, clearing_rate, clearing_energy):
+    bid_rates = np.array(sorted(bid_rates, reverse=True), dtype=float)
+    offer_rates = np.array(sorted(offer_rates), dtype=float)
+    assert VectorizedPayAsClearMatchingAlgorithm.get_clearing_point(
+        bid_rates, np.ones(len(bid_rates)), offer_rates, np.ones(len(offer_rates))
+    ) == (clearing_rate, clearing_energy)
+
+
+def test_vectorized_pay_as_clear_only_clears_where_supply_covers_demand():
+    # Clearing 5.5 kWh at rate 9 would trade more energy, but the supply does not cover the
+    # demand of 6 kWh at this rate
+    assert VectorizedPayAsClearMatchingAlgorithm.get_clearing_point(
+        np.array([10., 9.]), np.array([5., 1.]), np.array([1.]), np.array([5.5])) == (10., 5.)
+
+
+@patch.object(ConstSettings.MASettings, "PAY_AS_CLEAR_AGGREGATION_ALGORITHM", 1)
+@pytest.mark.parametrize("seed", range(20))
+def test_vectorized_pay_as_clear_clearing_point_is_the_same_as_framework(seed):
+    rng = random.Random(seed)
+
+    def _random_order(order_class, order_id, trader):
+        # Rates with one decimal, in order to create ties
+        energy, energy_rate = rng.randint(1, 20) / 4, rng.randint(10, 300) / 10
+        return order_class(order_id, now(), energy_rate * energy, energy,
+                           TraderDetails(trader, trader))
+
+    offers = [_random_order(Offer, f"offer{index}", f"seller{index}")
+              for index in range(rng.randint(1, 30))]
+    bids = [_random_order(Bid, f"bid{index}", f"buyer{index}")
+            for index in range(rng.randint(1, 30))]
+
+    framework_clearing = PayAsClearMatchingAlgorithm().get_clearing_point(
+        [bid.serializable_dict() for bid in bids],
+        [offer.serializable_dict() for offer in offers], now(), str(uuid4()))
+    _, bid_rates, bid_energies = _sorted_order_arrays(
+        OrderArrays.from_bids(bids), descending=True)
+    _, offer_rates, offer_energies = _sorted_order_arrays(
+        OrderArrays.from_offers(offers), descending=False)
+    vectorized_clearing = VectorizedPayAsClearMatchingAlgorithm.get_clearing_point(
+        bid_rates, bid_energies, offer_rates, offer_energies)
+
+    if framework_clearing is None:
+        assert vectorized_clearing is None
+    else:
+        assert vectorized_clearing == pytest.approx(
+            (framework_clearing.rate, framework_clearing.energy))
+
+
+def test_vectorized_pay_as_bid_skips_bids_of_the_seller():
+    seller = TraderDetails("seller", "seller")
+    offers = [Offer("offer1", now(), 1, 1, seller),
+              Offer("offer2", now(), 8, 1, TraderDetails("other", "other"))]
+    bids = [Bid("bid1", now(), 12, 1, seller),
+            Bid("bid2", now(), 9, 1, TraderDetails("buyer", "buyer"))]
+    pairs = VectorizedPayAsBidMatchingAlgorithm().get_bid_offer_pairs(bids, offers)
+    assert [(bid.id, offer.id) for bid, offer, _, _ in pairs] == [
+        ("bid2", "offer1"), ("bid1", "offer2")]
+
+
+@pytest.mark.parametrize("match_type, framework_algorithm, vectorized_algorithm", [
+    (BidOfferMatchAlgoEnum.PAY_AS_BID.value, PayAsBidMatchingAlgorithm,
+     VectorizedPayAsBidMatchingAlgorithm),
+    (BidOfferMatchAlgoEnum.PAY_AS_CLEAR.value, PayAsClearMatchingAlgorithm,
+     VectorizedPayAsClearMatchingAlgorithm),
+], indirect=["match_type"])
+@pytest.mark.parametrize("seed", range(5))
+def test_vectorized_matching_produces_same_trades_as_framework_algorithms(
+        match_type, framework_algorithm, vectorized_algorithm, seed):
+    # pylint: disable=unused-argument
+    framework_market = _create_market(seed)
+    _match_with_recommendations(framework_market, framework_algorithm())
+
+    vectorized_market = _create_market(seed)
+    vectorized_algorithm().match_market(vectorized_market)
+
+    assert framework_market.trades
+    assert _trades_summary(vectorized_market) == _trades_summary(framework_market)
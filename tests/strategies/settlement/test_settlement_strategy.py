@@ -46,6 +46,8 @@ class TestSettlementMarketStrategy:
         self.market_mock.bid = MagicMock(return_value=self.test_bid)
         self.market_mock.offer = MagicMock(return_value=self.test_offer)
         self.market_mock.bids = {self.test_bid.id: self.test_bid}
+        self.market_mock.has_bids_from_trader = MagicMock(return_value=False)
+        self.market_mock.has_offers_from_trader = MagicMock(return_value=False)
         self.area_mock = Mock()
         self.area_mock.name = "test_name"
         self.area_mock.uuid = str(uuid.uuid4())
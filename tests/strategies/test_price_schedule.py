@@ -0,0 +1,108 @@
+from unittest.mock import Mock
+
+import pytest
+from pendulum import duration, today
+
+from gsy_e.constants import TIME_ZONE
+from gsy_e.models.config import create_simulation_config_from_global_config
+from gsy_e.models.strategy.price_schedule import PriceScheduleEngine, price_schedule_engine
+from gsy_e.models.strategy.update_frequency import TemplateStrategyBidUpdater
+
+TIME = today(tz=TIME_ZONE).at(hour=10, minute=45, second=0)
+
+
+class FakeUpdater:
+    """Updaters are only referenced weakly by the engine."""
+
+
+@pytest.fixture(scope="function", autouse=True)
+def auto_fixture():
+    yield
+    price_schedule_engine.reset(enabled=False)
+
+
+class TestPriceScheduleEngine:
+    """Tests for the PriceScheduleEngine class."""
+
+    @staticmethod
+    def test_advance_updates_the_rates_of_the_due_rows():
+        engine = PriceScheduleEngine()
+        engine.reset(enabled=True)
+        offer_updater = FakeUpdater()
+        bid_updater = FakeUpdater()
+        offer_row = engine.add_row(offer_updater, TIME)
+        bid_row = engine.add_row(bid_updater, TIME)
+        engine.set_schedule(offer_row, 30, 10, 10, 60, use_max_limit=True)
+        engine.set_schedule(bid_row, 0, 15, -10, 120, use_max_limit=False)
+
+        assert engine.advance(0, 0) == [(offer_updater, TIME), (bid_updater, TIME)]
+        assert engine.get_changed_rate(offer_row) == 30
+        assert engine.get_changed_rate(bid_row) == 0
+        assert engine.is_advanced(0) and not engine.is_advanced(1)
+
+        assert engine.advance(1, 60) == [(offer_updater, TIME)]
+        assert engine.get_changed_rate(offer_row) == 20
+        assert engine.get_changed_rate(bid_row) is None
+        engine.advance(2, 120)
+        assert engine.get_changed_rate(bid_row) == 10
+        # The rates are limited by the final rate, which does not count as a change
+        assert engine.advance(3, 180) == []
+        assert engine.advance(4, 240) == [(bid_updater, TIME)]
+        assert engine.get_changed_rate(bid_row) == 15
+        assert engine.get_update_counter(offer_row) == 5
+
+        engine.set_update_counter(offer_row, 0)
+        assert engine.advance(5, 300) == [(offer_updater, TIME)]
+        assert engine.get_changed_rate(offer_row) == 30
+
+    @staticmethod
+    def test_rows_are_removed_and_reused():
+        engine = PriceScheduleEngine()
+        engine.reset(enabled=True)
+        updaters = [FakeUpdater() for _ in range(100)]
+        rows = [engine.add_row(updater, TIME) for updater in updaters]
+        for row in rows:
+            engine.set_schedule(row, 30, 10, 10, 60, use_max_limit=True)
+        engine.remove_row(rows[3])
+        assert len(engine) == 99
+        assert engine.add_row(updaters[3], TIME + duration(minutes=15)) == rows[3]
+        assert engine.get_update_counter(rows[3]) == 0
+
+        # Rows of updaters that were garbage collected are removed
+        del updaters[5:]
+        assert len(engine.advance(0, 0)) == 5
+        assert len(engine) == 5
+
+
+def _run_bid_updater_for_one_slot(vectorized):
+    price_schedule_engine.reset(enabled=vectorized)
+    updater = TemplateStrategyBidUpdater(
+        initial_rate=0, final_rate=15, fit_to_limit=False, energy_rate_change_per_update=10,
+        update_interval=duration(minutes=1), rate_limit_object=min)
+    market = Mock(time_slot=TIME, id="market_id")
+    strategy = Mock()
+    strategy.area.config = create_simulation_config_from_global_config()
+    strategy.area.spot_market = market
+    strategy.area.current_tick = 0
+    updater.update_and_populate_price_settings(strategy.area)
+    assert bool(updater._price_schedule_rows) is vectorized  # pylint: disable=protected-access
+
+    tick_length_s = strategy.area.config.tick_length.seconds
+    for tick in range(strategy.area.config.ticks_per_slot):
+        strategy.area.current_tick = tick
+        if vectorized:
+            price_schedule_engine.advance(tick, tick * tick_length_s)
+        updater.update(market, strategy)
+        updater.increment_update_counter_all_markets(strategy)
+    return ([call.args[1] for call in strategy.update_bid_rates.call_args_list],
+            updater.get_updated_rate(TIME))
+
+
+def test_vectorized_schedule_only_updates_the_changed_rates():
+    updated_rates, last_rate = _run_bid_updater_for_one_slot(vectorized=False)
+    vectorized_updated_rates, vectorized_last_rate = _run_bid_updater_for_one_slot(
+        vectorized=True)
+    assert updated_rates[:3] == [0, 10, 15]
+    assert set(updated_rates[3:]) == {15}
+    assert vectorized_updated_rates == [0, 10, 15]
+    assert vectorized_last_rate == last_rate
@@ -128,6 +128,9 @@ class FakeMarket:
     def get_bids(self):
         return deepcopy(self.bids)
 
+    def has_bids_from_trader(self, trader, attribute="uuid"):
+        return any(getattr(bid.buyer, attribute) == trader for bid in self.bids.values())
+
     def bid(self, price: float, energy: float, buyer: str, original_price=None,
             time_slot=None) -> Bid:
         bid = Bid(id="bid_id", creation_time=now(), price=price, energy=energy,
@@ -154,6 +154,9 @@ class FakeMarket:
     def get_offers(self):
         return self.offers
 
+    def has_offers_from_trader(self, trader, attribute="uuid"):
+        return any(getattr(offer.seller, attribute) == trader for offer in self.offers.values())
+
     @property
     def time_slot(self):
         return DateTime.now(tz=TIME_ZONE).start_of("day")
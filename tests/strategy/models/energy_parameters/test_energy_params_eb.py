@@ -1,12 +1,15 @@
-from unittest.mock import MagicMock, call
+from unittest.mock import MagicMock, call, patch
 
+import numpy as np
 import pendulum
 import pytest
+from gsy_framework.constants_limits import GlobalConfig
 from gsy_framework.enums import AvailableMarketTypes
 
 from gsy_e.models.area import Area
 from gsy_e.models.strategy.energy_parameters.energy_params_eb import (
-    ConsumptionStandardProfileEnergyParameters, ProductionStandardProfileEnergyParameters)
+    ConsumptionStandardProfileEnergyParameters, ProductionStandardProfileEnergyParameters,
+    StandardTradeProfiles, get_standard_trade_profiles)
 from gsy_e.models.strategy.load_hours import LoadHoursStrategy
 from gsy_e.models.strategy.pv import PVStrategy
 
@@ -61,6 +64,72 @@ class TestConsumptionStandardProfileEnergyParameters:
 
         state_mock.decrement_energy_requirement.assert_has_calls(calls)
 
+    @staticmethod
+    def test_event_traded_energy_year_forward(load):
+        energy_params = ConsumptionStandardProfileEnergyParameters(capacity_kW=200)
+        energy_params.event_activate_energy(load)
+
+        market_slot = GlobalConfig.start_date.start_of("year")
+        product_type = AvailableMarketTypes.YEAR_FORWARD
+        energy_params.event_traded_energy(
+            energy_kWh=energy_params.peak_energy_kWh / 4,
+            market_slot=market_slot,
+            product_type=product_type)
+
+        # pylint: disable=protected-access
+        time_slots, _ = energy_params._trade_profiles.get_trade_profile(
+            1, market_slot, product_type)
+        desired_energy_Wh = np.array([
+            energy_params.state.get_desired_energy_Wh(time_slot) for time_slot in time_slots])
+        energy_requirement_Wh = np.array([
+            energy_params.state.get_energy_requirement_Wh(time_slot)
+            for time_slot in time_slots])
+        assert desired_energy_Wh.max() > 0
+        assert np.allclose(energy_requirement_Wh, desired_energy_Wh * 3 / 4)
+
+
+class TestStandardTradeProfiles:
+    """Tests for the StandardTradeProfiles class."""
+
+    @staticmethod
+    @patch("gsy_e.models.strategy.energy_parameters.energy_params_eb."
+           "ForwardTradeProfileGenerator")
+    def test_get_trade_profile_scales_cached_profile(generator_mock):
+        market_slot = pendulum.datetime(2022, 1, 1)
+        time_slots = [market_slot.add(minutes=15 * slot) for slot in range(3)]
+        generator_mock.return_value.generate_trade_profile.return_value = {
+            time_slots[2]: 4., time_slots[0]: 0., time_slots[1]: 2.}
+        trade_profiles = StandardTradeProfiles(peak_kWh=4)
+
+        profile_time_slots, energies_kWh = trade_profiles.get_trade_profile(
+            2, market_slot, AvailableMarketTypes.YEAR_FORWARD)
+        assert profile_time_slots == tuple(time_slots)
+        assert energies_kWh.tolist() == [0., 1., 2.]
+
+        _, energies_kWh = trade_profiles.get_trade_profile(
+            8, market_slot, AvailableMarketTypes.YEAR_FORWARD)
+        assert energies_kWh.tolist() == [0., 2., 4.]
+        generator_mock.return_value.generate_trade_profile.assert_called_once_with(
+            energy_kWh=4, market_slot=market_slot,
+            product_type=AvailableMarketTypes.YEAR_FORWARD)
+
+    @staticmethod
+    @patch("gsy_e.models.strategy.energy_parameters.energy_params_eb."
+           "ForwardTradeProfileGenerator", MagicMock())
+    def test_get_standard_trade_profiles_is_not_shared_between_configurations():
+        trade_profiles = get_standard_trade_profiles(4)
+        assert get_standard_trade_profiles(4) is trade_profiles
+        assert get_standard_trade_profiles(2) is not trade_profiles
+
+        with patch.object(GlobalConfig, "slot_length", GlobalConfig.slot_length * 2):
+            assert get_standard_trade_profiles(4) is not trade_profiles
+        with patch.object(GlobalConfig, "start_date", GlobalConfig.start_date.add(days=1)):
+            assert get_standard_trade_profiles(4) is not trade_profiles
+        with patch.object(GlobalConfig, "sim_duration", GlobalConfig.sim_duration * 2):
+            assert get_standard_trade_profiles(4) is not trade_profiles
+
+        assert get_standard_trade_profiles(4) is trade_profiles
+
 
 @pytest.fixture(name="pv")
 def pv_fixture():
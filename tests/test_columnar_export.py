@@ -0,0 +1,86 @@
+# pylint: disable=protected-access
+import csv
+import io
+import pathlib
+
+import numpy as np
+from pendulum import datetime
+
+from gsy_e.gsy_e_core.sim_results.columnar_export import (
+    ColumnarResultsExporter, read_columnar_dataset, write_area_csv_files)
+
+TRADE_LABELS = ("slot", "seller", "buyer", "energy [kWh]", "rate [ct./kWh]")
+STATS_LABELS = ("slot", "energy traded [kWh]", "soc [%]")
+
+
+def _csv_content(labels, rows):
+    content = io.StringIO()
+    writer = csv.writer(content)
+    writer.writerow(labels)
+    writer.writerows(rows)
+    return content.getvalue()
+
+
+class TestColumnarResultsExporter:
+    """Tests for the ColumnarResultsExporter class."""
+
+    @staticmethod
+    def _trade_rows(slot):
+        time_slot = datetime(2022, 1, 1).add(minutes=15 * slot)
+        return [(time_slot, "PV", "Load", 0.5 * slot, 30.), (time_slot, "PV", None, 1., 30.5)]
+
+    def test_datasets_are_written_in_bounded_partitions(self, tmp_path):
+        exporter = ColumnarResultsExporter(tmp_path, batch_rows=4)
+        for slot in range(5):
+            exporter.append_rows("trades", "house-1", "grid/house-1-trades.csv", TRADE_LABELS,
+                                 self._trade_rows(slot))
+        assert len(list(pathlib.Path(tmp_path, "trades").glob("*.npz"))) == 2
+        exporter.flush()
+        assert len(list(pathlib.Path(tmp_path, "trades").glob("*.npz"))) == 3
+
+        table, = read_columnar_dataset(str(tmp_path), "trades")
+        assert table["area_uuid"].tolist() == ["house-1"] * 10
+        assert table["energy [kWh]"].tolist() == [
+            energy for slot in range(5) for energy in (0.5 * slot, 1.)]
+        assert table["rate [ct./kWh]"].dtype == np.float64
+        assert table["buyer"].tolist()[:2] == ["Load", ""]
+
+    @staticmethod
+    def test_integer_values_are_kept_when_partitions_have_different_kinds(tmp_path):
+        exporter = ColumnarResultsExporter(pathlib.Path(tmp_path, "columnar"), batch_rows=1)
+        rows = [(datetime(2022, 1, 1), 0, 10), (datetime(2022, 1, 1, 0, 15), 1.5, 10.5)]
+        for row in rows:
+            exporter.append_rows("device-stats", "storage", "grid/storage.csv", STATS_LABELS,
+                                 [row])
+        exporter.flush()
+
+        table, = read_columnar_dataset(str(exporter.directory), "device-stats")
+        assert [type(value) for value in table["soc [%]"].tolist()] == [int, float]
+        write_area_csv_files(str(exporter.directory), str(tmp_path))
+        with open(pathlib.Path(tmp_path, "grid/storage.csv"), encoding="utf-8",
+                  newline="") as csv_file:
+            assert csv_file.read() == _csv_content(STATS_LABELS, rows)
+
+    def test_area_csv_files_are_derived_from_datasets(self, tmp_path):
+        exporter = ColumnarResultsExporter(pathlib.Path(tmp_path, "columnar"), batch_rows=3)
+        expected_csv_files = {}
+        for area_uuid in ("house-1", "house-2"):
+            csv_path = f"grid/{area_uuid}-trades.csv"
+            rows = [row for slot in range(3) for row in self._trade_rows(slot)]
+            for slot in range(3):
+                exporter.append_rows("trades", area_uuid, csv_path, TRADE_LABELS,
+                                     self._trade_rows(slot))
+            expected_csv_files[csv_path] = _csv_content(TRADE_LABELS, rows)
+        # Devices of different types export different statistics
+        exporter.append_rows("device-stats", "storage", "grid/storage.csv", STATS_LABELS,
+                             [(datetime(2022, 1, 1), 1.5, 10)])
+        exporter.append_rows("device-stats", "load", "grid/load.csv", STATS_LABELS[:2], [])
+        expected_csv_files["grid/storage.csv"] = _csv_content(
+            STATS_LABELS, [(datetime(2022, 1, 1), 1.5, 10)])
+        expected_csv_files["grid/load.csv"] = _csv_content(STATS_LABELS[:2], [])
+        exporter.flush()
+
+        write_area_csv_files(str(exporter.directory), str(tmp_path))
+        for csv_path, expected_content in expected_csv_files.items():
+            with open(pathlib.Path(tmp_path, csv_path), encoding="utf-8", newline="") as csv_file:
+                assert csv_file.read() == expected_content
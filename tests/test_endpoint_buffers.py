@@ -524,3 +524,45 @@ class TestCoefficientEndpointBuffer(TestSimulationEndpointBuffer):
                progress_info_mock.current_slot_time)
         assert (endpoint_buffer.spot_market_time_slot_unix ==
                progress_info_mock.current_slot_time.timestamp())
+
+
+class TestSimulationEndpointBufferSerialization:
+    """Tests for the serialization of the market orders and the result report snapshots."""
+
+    @staticmethod
+    def _generate_order(order_id):
+        order = MagicMock()
+        order.serializable_dict.return_value = {"id": order_id}
+        return order
+
+    @patch("gsy_e.gsy_e_core.sim_results.endpoint_buffer.get_market_maker_rate_from_config",
+           MagicMock(return_value=30))
+    @patch("gsy_e.gsy_e_core.sim_results.endpoint_buffer.get_feed_in_tariff_rate_from_config",
+           MagicMock(return_value=0))
+    def test_read_market_stats_serializes_the_current_orders(self, general_setup):
+        area, _ = general_setup
+        endpoint_buffer = SimulationEndpointBuffer("JOB_1", 41, area, False)
+        offer = self._generate_order(0)
+        market = MagicMock(id="market", market_fee=0., const_fee_rate=None, bid_history=[],
+                           offer_history=[offer], trades=[])
+        assert endpoint_buffer._read_market_stats_to_dict(market)["offers"] == [{"id": 0}]
+
+        # Orders that are updated in place during the slot are reported with their new values
+        offer.serializable_dict.return_value = {"id": 0, "energy_rate": 20}
+        market.offer_history.append(self._generate_order(1))
+        assert endpoint_buffer._read_market_stats_to_dict(market)["offers"] == [
+            {"id": 0, "energy_rate": 20}, {"id": 1}]
+
+    def test_generate_result_report_snapshot_is_not_modified_by_updates(self, general_setup):
+        area, _ = general_setup
+        endpoint_buffer = SimulationEndpointBuffer("JOB_1", 41, area, False)
+        endpoint_buffer.flattened_area_core_stats_dict["AREA"] = {"trades": []}
+        endpoint_buffer.simulation_state["areas"]["AREA"] = {"state": 1}
+
+        snapshot = endpoint_buffer.generate_result_report_snapshot()
+        assert snapshot == endpoint_buffer.prepare_results_for_publish()
+
+        endpoint_buffer.flattened_area_core_stats_dict["CHILD"] = {"trades": []}
+        endpoint_buffer.simulation_state["areas"]["AREA"] = {"state": 2}
+        assert snapshot["simulation_raw_data"] == {"AREA": {"trades": []}}
+        assert snapshot["simulation_state"]["areas"] == {"AREA": {"state": 1}}
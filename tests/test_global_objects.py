@@ -15,13 +15,14 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from pendulum import duration, today
 from gsy_framework.constants_limits import ConstSettings
 from gsy_framework.enums import SpotMarketTypeEnum
 
 from gsy_e.constants import TIME_ZONE
+from gsy_e.gsy_e_core.area_registry import AreaRegistry
 from gsy_e.gsy_e_core.global_stats import ExternalConnectionGlobalStatistics
 from gsy_e.gsy_e_core.redis_connections.area_market import ExternalConnectionCommunicator
 from gsy_e.models.area import Area
@@ -126,3 +127,39 @@ class TestGlobalObjects:
                                   }}}}}}
 
         assert expected_area_stats_tree_dict == go.area_stats_tree_dict
+
+    @patch("gsy_e.constants.LAZY_EXTERNAL_GLOBAL_STATS", True)
+    def test_lazy_area_stats_tree_dict_only_recomputes_dirty_areas(self):
+        area_registry = AreaRegistry()
+        area_registry.build(self.grid_area)
+        go = ExternalConnectionGlobalStatistics(area_registry)
+        go(self.grid_area, self.config.ticks_per_slot)
+        self.grid_area.current_tick += 15
+        self.house_area.current_tick += 15
+        self.grid_area.cycle_markets(_trigger_event=True)
+        go.update(market_cycle=True)
+
+        eager_go = ExternalConnectionGlobalStatistics()
+        eager_go(self.grid_area, self.config.ticks_per_slot)
+        with patch("gsy_e.constants.LAZY_EXTERNAL_GLOBAL_STATS", False):
+            eager_go.update()
+            expected_area_stats_tree_dict = eager_go.area_stats_tree_dict
+        assert go.area_stats_tree_dict == expected_area_stats_tree_dict
+
+        house_dict = go.area_stats_tree_dict[self.grid_area.uuid]["children"][
+            self.house_area.uuid]
+        load_dict = house_dict["children"][self.load.uuid]
+        pv_dict = house_dict["children"][self.pv.uuid]
+        go.update_area(self.pv.uuid)
+        with patch.object(self.house_area.stats, "get_last_market_bills") as bills_mock:
+            assert go.area_stats_tree_dict == expected_area_stats_tree_dict
+            bills_mock.assert_not_called()
+        assert go.area_stats_tree_dict[self.grid_area.uuid]["children"][
+            self.house_area.uuid] is house_dict
+        assert house_dict["children"][self.load.uuid] is load_dict
+        assert house_dict["children"][self.pv.uuid] is not pv_dict
+
+        # The whole tree is rebuilt after the areas of the registry changed
+        area_registry.invalidate()
+        assert go.area_stats_tree_dict[self.grid_area.uuid]["children"][
+            self.house_area.uuid] is not house_dict
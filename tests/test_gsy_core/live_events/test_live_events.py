@@ -1,12 +1,14 @@
 from pathlib import Path
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 from gsy_framework.constants_limits import GlobalConfig, ConstSettings
 from gsy_framework.enums import SpotMarketTypeEnum
 from pendulum import duration
 
+from gsy_e.gsy_e_core.area_registry import AreaRegistry
 from gsy_e.gsy_e_core.exceptions import GSyException
+from gsy_e.gsy_e_core.global_objects_singleton import global_objects
 from gsy_e.gsy_e_core.live_events import CreateAreaEvent, UpdateAreaEvent, LiveEvents
 from gsy_e.gsy_e_core.util import gsye_root_path
 from gsy_e.models.area import Area
@@ -141,6 +143,29 @@ class TestLiveEvents:
         assert len(self.area_house1.children) == 1
         assert all(c.uuid != self.area1.uuid for c in self.area_house1.children)
 
+    def test_live_events_are_applied_to_the_areas_of_the_area_registry(self):
+        area_registry = AreaRegistry()
+        area_registry.build(self.area_grid)
+        with patch.object(global_objects, "area_registry", area_registry):
+            self.live_events.add_event({
+                "eventType": "create_area",
+                "parent_uuid": self.area_house1.uuid,
+                "area_representation": {
+                    "type": "LoadHours", "name": "new_load", "avg_power_W": 234}})
+            self.live_events.add_event({
+                "eventType": "delete_area", "area_uuid": self.area_house2.uuid})
+            self.live_events.add_event({
+                "eventType": "delete_area", "area_uuid": "unknown uuid"})
+            self.live_events.handle_all_events(self.area_grid)
+
+        new_load = [c for c in self.area_house1.children if c.name == "new_load"][0]
+        assert area_registry.get_area(new_load.uuid) is new_load
+        assert area_registry.get_parent(new_load.uuid) is self.area_house1
+        assert self.area_grid.children == [self.area_house1]
+        assert self.area3.uuid not in area_registry
+        assert list(area_registry) == [
+            self.area_grid, self.area_house1, self.area1, self.area2, new_load]
+
     def test_update_area_event(self):
         """The UpdateAreaEvent tries to update an area when the passed area is valid."""
         event_dict = {
@@ -0,0 +1,71 @@
+import json
+from unittest.mock import MagicMock
+
+from gsy_e.gsy_e_core.redis_connections.aggregator import AggregatorHandler
+
+
+def _batch_commands_payload(transaction_id, aggregator_uuid, batch_commands):
+    return {"data": json.dumps({"transaction_id": transaction_id,
+                                "aggregator_uuid": aggregator_uuid,
+                                "batch_commands": batch_commands})}
+
+
+class TestAggregatorHandler:
+    """Tests for the routing of the batch commands of the aggregators."""
+
+    @staticmethod
+    def test_batch_commands_are_only_dispatched_to_their_areas():
+        handler = AggregatorHandler(MagicMock())
+        handler.receive_batch_commands_callback(_batch_commands_payload(
+            "transaction-1", "aggregator-1",
+            {"load": [{"type": "bid"}, {"type": "list_bids"}], "pv": [{"type": "offer"}]}))
+        handler.receive_batch_commands_callback(_batch_commands_payload(
+            "transaction-2", "aggregator-2", {"load": [{"type": "delete_bid"}]}))
+        handler.pending_batch_commands["transaction-3"] = {"batch_commands": {"load": []}}
+        handler.approve_batch_commands()
+        assert handler.pending_batch_commands == {}
+        assert len(handler.command_router) == 2
+
+        strategy_method = MagicMock(side_effect=lambda command: command["type"])
+        handler.consume_all_area_commands("storage", strategy_method)
+        strategy_method.assert_not_called()
+        handler.consume_all_area_commands("load", strategy_method)
+        assert [call.args[0] for call in strategy_method.call_args_list] == [
+            {"type": "bid", "transaction_id": "transaction-1"},
+            {"type": "list_bids", "transaction_id": "transaction-1"},
+            {"type": "delete_bid", "transaction_id": "transaction-2"}]
+        # The commands of an area are only consumed once
+        handler.consume_all_area_commands("load", strategy_method)
+        assert strategy_method.call_count == 3
+
+        assert handler.responses_batch_commands == {
+            "transaction-1": {"aggregator-1": {"load": ["bid", "list_bids"]}},
+            "transaction-2": {"aggregator-2": {"load": ["delete_bid"]}}}
+
+        redis = MagicMock()
+        handler.publish_all_commands_responses(redis)
+        assert redis.publish_json.call_count == 2
+        assert handler.responses_batch_commands == {}
+        # The commands that were not consumed during the tick are discarded
+        assert len(handler.command_router) == 0
+
+    @staticmethod
+    def test_events_are_published_in_the_negotiated_wire_format():
+        handler = AggregatorHandler(MagicMock())
+        handler.aggregator_callback({"data": json.dumps({
+            "type": "CREATE", "transaction_id": "aggregator-1", "name": "binary",
+            "config_uuid": None, "wire_format": "msgpack+zlib"})})
+        handler.aggregator_callback({"data": json.dumps({
+            "type": "CREATE", "transaction_id": "aggregator-2", "name": "json",
+            "config_uuid": None})})
+        create_responses = [json.loads(call.args[1])
+                            for call in handler.redis_db.publish.call_args_list]
+        assert [response["wire_format"] for response in create_responses] == [
+            "msgpack+zlib", "json"]
+
+        handler.batch_tick_events = {"aggregator-1": {"slot_completion": "20%"},
+                                     "aggregator-2": {"slot_completion": "20%"}}
+        redis = MagicMock()
+        handler.publish_all_events(redis)
+        assert [call.args[2].name for call in redis.publish_json.call_args_list] == [
+            "msgpack+zlib", "json"]
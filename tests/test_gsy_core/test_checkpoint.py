@@ -0,0 +1,100 @@
+import json
+import logging
+import os
+from time import perf_counter
+
+import pytest
+
+from gsy_e.gsy_e_core.checkpoint import (
+    DELTA_SUFFIX, SNAPSHOT_SUFFIX, SimulationCheckpointer, read_checkpoint)
+
+log = logging.getLogger(__name__)
+
+
+def _area_states(area_count, slot_number=0, changed_area_count=0):
+    """Return the states of synthetic areas, of which the first changed_area_count changed."""
+    return {
+        f"area-{index}": {
+            "current_tick": 60 * (slot_number if index < changed_area_count else 0),
+            "available_energy_kWh": {f"2022-01-01T{hour:02d}:00": index * 0.1 + hour
+                                     for hour in range(24)},
+            "energy_production_forecast_kWh": {f"2022-01-01T{hour:02d}:00": hour * 0.5
+                                               for hour in range(24)}}
+        for index in range(area_count)}
+
+
+class TestSimulationCheckpointer:
+    """Tests for the incremental checkpoints of the simulation state."""
+
+    @staticmethod
+    def test_checkpoint_is_restored_from_snapshot_and_deltas(tmp_path):
+        directory = str(tmp_path)
+        checkpointer = SimulationCheckpointer(directory, snapshot_interval=4)
+        for slot_number in range(3):
+            area_states = _area_states(5, slot_number, changed_area_count=2)
+            checkpointer.save(slot_number, {"slot_number": slot_number}, area_states)
+
+        assert sorted(os.listdir(directory)) == [
+            f"00000000{SNAPSHOT_SUFFIX}", f"00000001{DELTA_SUFFIX}", f"00000002{DELTA_SUFFIX}"]
+        assert read_checkpoint(directory) == {"general": {"slot_number": 2},
+                                              "areas": area_states}
+
+    @staticmethod
+    def test_deltas_only_contain_the_changed_areas(tmp_path):
+        directory = str(tmp_path)
+        checkpointer = SimulationCheckpointer(directory, snapshot_interval=4)
+        snapshot_path = checkpointer.save(0, {}, _area_states(50))
+        delta_path = checkpointer.save(1, {}, _area_states(50, 1, changed_area_count=1))
+        assert os.path.getsize(delta_path) * 10 < os.path.getsize(snapshot_path)
+
+        area_states = _area_states(50, 2, changed_area_count=1)
+        del area_states["area-3"]
+        checkpointer.save(2, {}, area_states)
+        assert read_checkpoint(directory)["areas"] == area_states
+
+    @staticmethod
+    def test_snapshot_removes_older_checkpoints(tmp_path):
+        directory = str(tmp_path)
+        checkpointer = SimulationCheckpointer(directory, snapshot_interval=2)
+        for slot_number in range(3):
+            checkpointer.save(slot_number, {}, _area_states(3, slot_number, 1))
+        assert sorted(os.listdir(directory)) == [f"00000002{SNAPSHOT_SUFFIX}"]
+
+        # A new checkpointer continues the sequence of the checkpoint files of the directory
+        checkpointer = SimulationCheckpointer(directory, snapshot_interval=2)
+        assert checkpointer.save(3, {}, _area_states(3)).endswith(f"00000003{SNAPSHOT_SUFFIX}")
+        assert read_checkpoint(str(tmp_path / "missing")) is None
+
+    @staticmethod
+    @pytest.mark.slow
+    def test_checkpoint_performance(tmp_path):
+        area_count = 500
+        slot_count = 20
+        state_file = str(tmp_path / "state.json")
+        start_time = perf_counter()
+        for slot_number in range(slot_count):
+            with open(state_file, "w", encoding="utf-8") as outfile:
+                json.dump({"general": {"slot_number": slot_number},
+                           "areas": _area_states(area_count, slot_number, 10)}, outfile)
+        dict_save_duration = perf_counter() - start_time
+        start_time = perf_counter()
+        with open(state_file, encoding="utf-8") as infile:
+            dict_state = json.load(infile)
+        dict_restore_duration = perf_counter() - start_time
+
+        checkpointer = SimulationCheckpointer(str(tmp_path / "checkpoints"), slot_count)
+        start_time = perf_counter()
+        for slot_number in range(slot_count):
+            checkpointer.save(slot_number, {"slot_number": slot_number},
+                              _area_states(area_count, slot_number, 10))
+        checkpoint_save_duration = perf_counter() - start_time
+        start_time = perf_counter()
+        checkpoint_state = read_checkpoint(str(tmp_path / "checkpoints"))
+        checkpoint_restore_duration = perf_counter() - start_time
+
+        assert checkpoint_state == dict_state
+        log.warning("Saving %s slots of %s areas: dict %.3fs, checkpoints %.3fs. "
+                    "Restoring: dict %.3fs, checkpoints %.3fs.", slot_count, area_count,
+                    dict_save_duration, checkpoint_save_duration, dict_restore_duration,
+                    checkpoint_restore_duration)
+        assert checkpoint_save_duration < 3 * dict_save_duration
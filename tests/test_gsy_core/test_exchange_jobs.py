@@ -0,0 +1,45 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from gsy_e.gsy_e_core.exchange_jobs import run_pool_worker
+
+
+@pytest.fixture(autouse=True)
+def fixture_redis_connection():
+    with patch("gsy_e.gsy_e_core.exchange_jobs.Redis"), \
+            patch("gsy_e.gsy_e_core.exchange_jobs.Connection"):
+        yield
+
+
+class TestRunPoolWorker:
+    """Test the worker processes of the pool of the Launcher."""
+
+    @staticmethod
+    @patch("gsy_e.gsy_e_core.exchange_jobs.Worker")
+    @patch("gsy_e.gsy_e_core.exchange_jobs.memory_usage_percent")
+    def test_worker_executes_jobs_until_the_memory_limit_is_exceeded(
+            memory_usage_percent_mock, worker_mock):
+        memory_usage_percent_mock.side_effect = [50, 80, 91]
+        run_pool_worker(90.)
+        assert memory_usage_percent_mock.call_count == 3
+        assert worker_mock.call_count == 2
+        assert worker_mock.return_value.work.call_count == 2
+        worker_mock.return_value.work.assert_called_with(max_jobs=1, logging_level="ERROR")
+
+    @staticmethod
+    @patch("gsy_e.gsy_e_core.exchange_jobs.Worker")
+    @patch("gsy_e.gsy_e_core.exchange_jobs.memory_usage_percent", MagicMock(return_value=95))
+    def test_worker_does_not_execute_jobs_above_the_memory_limit(worker_mock):
+        run_pool_worker(90.)
+        worker_mock.assert_not_called()
+
+    @staticmethod
+    @patch("gsy_e.gsy_e_core.exchange_jobs.Worker")
+    @patch("gsy_e.gsy_e_core.exchange_jobs.memory_usage_percent", MagicMock(return_value=50))
+    def test_worker_exits_if_a_job_fails(worker_mock):
+        worker_mock.return_value.work.side_effect = RuntimeError("job failed")
+        run_pool_worker(90.)
+        worker_mock.return_value.work.assert_called_once()
+        worker_mock.return_value.kill_horse.assert_called_once()
+        worker_mock.return_value.wait_for_horse.assert_called_once()
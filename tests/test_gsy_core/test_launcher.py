@@ -0,0 +1,63 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from gsy_e.gsy_e_core import launcher
+from gsy_e.gsy_e_core.exchange_jobs import run_pool_worker
+from gsy_e.gsy_e_core.launcher import Launcher
+
+
+class StopLauncher(Exception):
+    """Raised by the mocked sleep in order to exit the endless loop of the launcher."""
+
+
+@pytest.fixture(name="worker_pool_launcher")
+def fixture_worker_pool_launcher():
+    with patch("gsy_e.gsy_e_core.launcher.Redis"), \
+            patch("gsy_e.gsy_e_core.launcher.Queue"), \
+            patch("gsy_e.gsy_e_core.launcher.preload_simulation_modules"), \
+            patch("gsy_e.gsy_e_core.launcher.multiprocessing") as multiprocessing_mock:
+        context = multiprocessing_mock.get_context.return_value
+        context.Process.side_effect = lambda **kwargs: MagicMock(**{
+            "is_alive.return_value": True})
+        yield Launcher(max_jobs=2, worker_pool=True), context
+
+
+class TestLauncherWorkerPool:
+    """Test the pool of warm workers of the Launcher."""
+
+    @staticmethod
+    @patch("gsy_e.gsy_e_core.launcher.memory_usage_percent", MagicMock(return_value=50))
+    def test_workers_are_respawned_up_to_max_jobs(worker_pool_launcher):
+        pool_launcher, context = worker_pool_launcher
+
+        def sleep(_seconds):
+            if context.Process.call_count > 2:
+                raise StopLauncher
+            # The first worker exits, e.g. because it exceeded the memory limit
+            pool_launcher.job_array[0].is_alive.return_value = False
+
+        with patch("gsy_e.gsy_e_core.launcher.sleep", side_effect=sleep):
+            with pytest.raises(StopLauncher):
+                pool_launcher.run()
+
+        launcher.multiprocessing.get_context.assert_called_once_with("fork")
+        assert context.Process.call_count == 3
+        for process_call in context.Process.call_args_list:
+            assert process_call.kwargs == {
+                "target": run_pool_worker,
+                "args": (float(launcher.MAX_LIMIT_MEMORY_USAGE_PERCENT),)}
+        assert len(pool_launcher.job_array) == 2
+        for worker in pool_launcher.job_array:
+            worker.start.assert_called_once()
+
+    @staticmethod
+    @patch("gsy_e.gsy_e_core.launcher.sleep", MagicMock(side_effect=StopLauncher))
+    def test_no_worker_is_spawned_above_the_memory_limit(worker_pool_launcher):
+        pool_launcher, context = worker_pool_launcher
+        with patch("gsy_e.gsy_e_core.launcher.memory_usage_percent",
+                   MagicMock(return_value=launcher.MAX_LIMIT_MEMORY_USAGE_PERCENT + 1)):
+            with pytest.raises(StopLauncher):
+                pool_launcher.run()
+        context.Process.assert_not_called()
+        assert pool_launcher.job_array == []
@@ -0,0 +1,99 @@
+from unittest.mock import patch
+
+import pytest
+from gsy_framework.read_user_profile import InputProfileTypes
+from pendulum import datetime, duration
+
+from gsy_e.gsy_e_core.profile_store import ProfileStore, SlotProfile
+
+START_TIME = datetime(2022, 1, 3)
+SLOT_LENGTH = duration(minutes=15)
+
+
+def _expand_profile(_profile_type, profile, current_timestamp):
+    """Expand the input profile to one day of slots, starting at the current time stamp."""
+    if isinstance(profile, dict):
+        return {current_timestamp + SLOT_LENGTH * slot: float(sum(profile.values()))
+                for slot in range(96)}
+    return {current_timestamp + SLOT_LENGTH * slot: float(profile) for slot in range(96)}
+
+
+@pytest.fixture(name="read_profile_mock")
+def read_profile_mock_fixture():
+    with patch("gsy_e.gsy_e_core.profile_store.read_arbitrary_profile",
+               side_effect=_expand_profile) as read_profile_mock:
+        yield read_profile_mock
+
+
+class TestSlotProfile:
+    """Tests for the SlotProfile class."""
+
+    @staticmethod
+    def test_slot_profile_behaves_like_the_expanded_profile():
+        expanded_profile = {START_TIME + SLOT_LENGTH * slot: slot * 0.5 for slot in range(8)}
+        profile = SlotProfile.from_profile(expanded_profile, "key")
+        assert dict(profile) == expanded_profile
+        assert list(profile.keys()) == list(expanded_profile.keys())
+        assert START_TIME + SLOT_LENGTH * 7 in profile
+        assert START_TIME + SLOT_LENGTH * 8 not in profile
+        assert START_TIME + duration(minutes=5) not in profile
+        assert START_TIME.in_timezone("Europe/Berlin") in profile
+        assert profile.get(START_TIME - SLOT_LENGTH) is None
+        with pytest.raises(KeyError):
+            _ = profile[START_TIME + SLOT_LENGTH * 8]
+        with pytest.raises(ValueError):
+            profile.values[0] = 1.
+
+    @staticmethod
+    def test_slot_profile_is_not_created_for_irregular_profiles():
+        assert SlotProfile.from_profile({}, "key") is None
+        assert SlotProfile.from_profile(
+            {START_TIME: 1., START_TIME + SLOT_LENGTH: 2., START_TIME + 3 * SLOT_LENGTH: 3.},
+            "key") is None
+        assert SlotProfile.from_profile({START_TIME: (1., 2.)}, "key") is None
+
+
+class TestProfileStore:
+    """Tests for the ProfileStore class."""
+
+    @staticmethod
+    def test_assets_with_the_same_input_share_one_profile(read_profile_mock):
+        profile_store = ProfileStore()
+        profiles = [profile_store.get_profile(InputProfileTypes.POWER_W, {0: 100., 12: 50.},
+                                              START_TIME) for _ in range(3)]
+        assert read_profile_mock.call_count == 1
+        assert profiles[0] is profiles[1] is profiles[2]
+        assert profiles[0][START_TIME] == 150.
+
+        other_profile = profile_store.get_profile(InputProfileTypes.IDENTITY, {0: 100., 12: 50.},
+                                                  START_TIME)
+        assert other_profile is not profiles[0]
+        assert profile_store.get_profile(
+            InputProfileTypes.POWER_W, {0: 100., 12: 60.}, START_TIME)[START_TIME] == 160.
+        assert read_profile_mock.call_count == 3
+
+    @staticmethod
+    def test_profiles_are_expanded_again_only_outside_of_their_window(read_profile_mock):
+        profile_store = ProfileStore()
+        profile = profile_store.get_profile(InputProfileTypes.IDENTITY, 30, START_TIME)
+        assert profile_store.get_profile(
+            InputProfileTypes.IDENTITY, 30, START_TIME + SLOT_LENGTH * 10) is profile
+        assert read_profile_mock.call_count == 1
+
+        next_day = START_TIME.add(days=1)
+        rotated_profiles = [profile_store.get_profile(InputProfileTypes.IDENTITY, profile,
+                                                      next_day) for _ in range(2)]
+        assert read_profile_mock.call_count == 2
+        assert rotated_profiles[0] is rotated_profiles[1]
+        assert rotated_profiles[0].start_time == next_day
+
+    @staticmethod
+    def test_rotated_profiles_keep_the_key_of_the_input_profile(read_profile_mock):
+        # pylint: disable=unused-argument
+        profile_store = ProfileStore()
+        profile = profile_store.get_profile(InputProfileTypes.IDENTITY, 30, START_TIME)
+        for day in range(1, 4):
+            profile = profile_store.get_profile(
+                InputProfileTypes.IDENTITY, profile, START_TIME.add(days=day))
+            assert profile.content_key == ("int", 30)
+            assert profile.start_time == START_TIME.add(days=day)
@@ -109,6 +109,20 @@ class TestRqJobHandler:
         assert config.sim_duration == config.end_date - config.start_date
         assert ConstSettings.BalancingSettings.SPOT_TRADE_RATIO == 0.99
 
+    @staticmethod
+    @patch("gsy_e.constants.VECTORIZED_SCM_MANAGER", False)
+    @patch("gsy_e.gsy_e_core.rq_job_handler.run_simulation")
+    def test_past_market_slots_are_calculated_by_the_vectorized_scm_manager(run_sim_mock: Mock):
+        vectorized_scm_manager_per_run = []
+        run_sim_mock.side_effect = lambda **kwargs: vectorized_scm_manager_per_run.append(
+            gsy_e.constants.VECTORIZED_SCM_MANAGER)
+        settings = {"type": ConfigurationType.CANARY_NETWORK.value,
+                    "start_date": date(2023, 1, 1)}
+        scenario = {"configuration_uuid": "config_uuid"}
+        launch_simulation_from_rq_job(scenario, settings, None, {}, {"scm_past_slots": True}, "id")
+        assert vectorized_scm_manager_per_run == [True, False]
+        assert gsy_e.constants.VECTORIZED_SCM_MANAGER is False
+
     @staticmethod
     @patch("gsy_e.gsy_e_core.rq_job_handler.run_simulation",
            Mock(side_effect=Exception("Fake Error")))
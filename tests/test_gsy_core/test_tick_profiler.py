@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+from gsy_e.gsy_e_core.tick_profiler import TickProfiler
+
+
+class TestTickProfiler:
+    """Tests for the TickProfiler class."""
+
+    @staticmethod
+    def test_disabled_profiler_does_not_record_phases():
+        profiler = TickProfiler()
+        with profiler.phase("tick_and_dispatch"):
+            pass
+        assert profiler.end_slot(0) is None
+        assert profiler.slot_summaries == []
+
+    @staticmethod
+    @patch("gsy_e.gsy_e_core.tick_profiler.perf_counter",
+           side_effect=[0., 0.001, 0.002, 0.003, 0.005, 0.010, 0.020, 0.022])
+    def test_nested_phases_are_aggregated_per_slot(_perf_counter_mock, tmp_path):
+        profiler = TickProfiler()
+        profiler.reset(enabled=True)
+        with profiler.phase("tick_and_dispatch"):
+            with profiler.phase("strategy", "PVStrategy"):
+                # Recursive dispatch to another strategy of the same class
+                with profiler.phase("strategy", "PVStrategy"):
+                    pass
+            with profiler.phase("engine", "MAEngine"):
+                pass
+        summary = profiler.end_slot(3)
+
+        assert summary["slot_number"] == 3
+        assert list(summary["phases"]) == [
+            "engine:MAEngine", "strategy:PVStrategy", "tick_and_dispatch"]
+        assert summary["phases"]["tick_and_dispatch"]["total_s"] == 0.022
+        assert summary["phases"]["strategy:PVStrategy"]["count"] == 1
+        assert summary["phases"]["strategy:PVStrategy"]["total_s"] == 0.004
+        assert summary["phases"]["engine:MAEngine"]["histogram_us"] == {"<16384": 1}
+        assert profiler.end_slot(4)["phases"] == {}
+        assert profiler.get_total_durations()["tick_and_dispatch"] == 0.022
+
+        folded_stacks_file = str(tmp_path / "profile.folded")
+        profiler.export_folded_stacks(folded_stacks_file)
+        with open(folded_stacks_file, encoding="utf-8") as infile:
+            assert infile.read().splitlines() == [
+                "tick_and_dispatch 8000",
+                "tick_and_dispatch;engine:MAEngine 10000",
+                "tick_and_dispatch;strategy:PVStrategy 3000",
+                "tick_and_dispatch;strategy:PVStrategy;strategy:PVStrategy 1000"]
@@ -1,19 +1,24 @@
 import uuid
-from unittest.mock import Mock, MagicMock
+from datetime import datetime, timezone
+from unittest.mock import Mock, MagicMock, patch
 
+import pendulum
 import pytest
-from pendulum import today
+from pendulum import duration, today
 from pony.orm import Database
 
 import gsy_e.constants
 import gsy_e.gsy_e_core.user_profile_handler
+from gsy_e.gsy_e_core.area_registry import AreaRegistry
 from gsy_e.gsy_e_core.user_profile_handler import (ProfilesHandler, ProfileDBConnectionHandler,
-                                                   ProfileDBConnectionException)
+                                                   ProfileDBConnectionException,
+                                                   group_profile_datapoints)
 from gsy_e.models.area import Area
 from gsy_e.models.strategy.predefined_load import DefinedLoadStrategy
 from gsy_e.models.strategy.predefined_pv import PVUserProfileStrategy
 
 CUSTOM_DATETIME = today()
+START_TIME = pendulum.datetime(2022, 1, 1)
 PV_UUID = uuid.uuid4()
 LOAD_UUID = uuid.uuid4()
 
@@ -66,3 +71,61 @@ class TestProfileDBConnectionHandler:
         self.profiles_handler.update_time_and_buffer_profiles(
             CUSTOM_DATETIME, area_tree)
         assert set(self.profiles_handler.db._profile_uuids) == {LOAD_UUID, PV_UUID}
+
+    @staticmethod
+    def test_profile_uuids_are_collected_from_the_area_registry(area_tree):
+        area_registry = AreaRegistry()
+        area_registry.build(area_tree)
+        profiles_handler = ProfilesHandler(area_registry)
+        assert profiles_handler._get_profile_uuids_from_setup(area_tree) == [LOAD_UUID, PV_UUID]
+        area_registry.unregister(area_tree.children[0].children[1].uuid)
+        assert profiles_handler._get_profile_uuids_from_setup(area_tree) == [LOAD_UUID]
+
+    def test_buffer_all_profiles_reads_all_profiles_with_one_query(self):
+        db = self.profiles_handler.db
+        db._profile_uuids = [LOAD_UUID, PV_UUID]
+        db._get_start_end_time = Mock(return_value=(CUSTOM_DATETIME, CUSTOM_DATETIME))
+        db._get_profiles_from_db = Mock(return_value=[
+            (LOAD_UUID, datetime(2022, 1, 1), 1.), (LOAD_UUID, datetime(2022, 1, 1, 1), 2.)])
+        db._get_first_weeks_from_profiles = Mock(return_value={PV_UUID: {CUSTOM_DATETIME: 3.}})
+        db._buffer_all_profiles(CUSTOM_DATETIME)
+        db._get_profiles_from_db.assert_called_once()
+        db._get_first_weeks_from_profiles.assert_called_once_with([PV_UUID], CUSTOM_DATETIME)
+        assert list(db.get_profile_from_db_buffer(str(LOAD_UUID)).values()) == [1., 2.]
+        assert db.get_profile_from_db_buffer(str(PV_UUID)) == {CUSTOM_DATETIME: 3.}
+
+    @patch("gsy_e.constants.PREFETCH_PROFILE_DB_BUFFER", True)
+    def test_buffer_all_profiles_uses_the_prefetched_profiles(self):
+        db = self.profiles_handler.db
+        db._profile_uuids = [LOAD_UUID]
+        db._get_start_end_time = Mock(
+            side_effect=lambda timestamp: (timestamp, timestamp.add(days=1)))
+        db._get_profiles_from_db = Mock(side_effect=lambda uuids, start_time, _: [
+            (LOAD_UUID, start_time, float(start_time.day))])
+        global_config = MagicMock(slot_length=duration(minutes=15), start_date=START_TIME,
+                                  sim_duration=duration(days=7))
+        global_config.is_canary_network.return_value = False
+        with patch("gsy_e.gsy_e_core.user_profile_handler.GlobalConfig", global_config):
+            db._buffer_all_profiles(START_TIME)
+            next_timestamp = START_TIME.add(days=1, minutes=15)
+            db._prefetched_profiles[2].result()
+            assert db._get_profiles_from_db.call_count == 2
+            db._buffer_all_profiles(next_timestamp)
+            db._prefetched_profiles[2].result()
+        # The second chunk was read by the prefetch, the third one is prefetched
+        assert db._get_profiles_from_db.call_count == 3
+        assert db.get_profile_from_db_buffer(str(LOAD_UUID)) == {
+            next_timestamp: float(next_timestamp.day)}
+
+
+def test_group_profile_datapoints_groups_datapoints_by_profile():
+    profiles = group_profile_datapoints([
+        (LOAD_UUID, datetime(2022, 1, 1), 1.),
+        (PV_UUID, datetime(2022, 1, 1, tzinfo=timezone.utc), 2.),
+        (LOAD_UUID, datetime(2022, 1, 1, 0, 15), 3.)])
+    assert profiles == {
+        LOAD_UUID: {START_TIME: 1., START_TIME.add(minutes=15): 3.},
+        PV_UUID: {START_TIME: 2.}}
+    # Profiles share the DateTime objects of their time stamps
+    assert next(iter(profiles[LOAD_UUID])) is next(iter(profiles[PV_UUID]))
+    assert group_profile_datapoints([]) == {}
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from gsy_e.gsy_e_core.redis_connections.wire_format import (
+    BINARY_FRAME_MARKER, JSON_WIRE_CODEC, MIN_COMPRESSED_PAYLOAD_SIZE, decode_payload,
+    get_wire_codec)
+
+PAYLOAD = {"event": "tick", "slot_completion": "20%", "num_ticks": 5.0,
+           "grid_tree": {"area-uuid": {"area_name": "House", "last_market_fee": None,
+                                       "children": {}}},
+           "trade_list": [{"trade_price": 12.5, "traded_energy": 0.1, "is_bid_trade": True}]}
+
+
+class TestWireFormat:
+    """Tests for the codecs of the wire formats of the redis channels."""
+
+    @staticmethod
+    def test_json_is_the_default_wire_format():
+        assert get_wire_codec(None) is JSON_WIRE_CODEC
+        assert get_wire_codec("avro") is JSON_WIRE_CODEC
+        encoded_payload = JSON_WIRE_CODEC.encode(PAYLOAD)
+        assert encoded_payload == json.dumps(PAYLOAD)
+        assert decode_payload(encoded_payload) == PAYLOAD
+        assert decode_payload(encoded_payload.encode("utf-8")) == PAYLOAD
+
+    @staticmethod
+    @pytest.mark.parametrize("wire_format", ["msgpack", "msgpack+zlib"])
+    def test_binary_wire_formats_are_decoded(wire_format):
+        codec = get_wire_codec(wire_format)
+        assert codec.name == wire_format
+        encoded_payload = codec.encode(PAYLOAD)
+        assert encoded_payload[0] == BINARY_FRAME_MARKER
+        assert len(encoded_payload) < len(json.dumps(PAYLOAD))
+        assert decode_payload(encoded_payload) == PAYLOAD
+
+    @staticmethod
+    def test_only_large_payloads_are_compressed():
+        codec = get_wire_codec("msgpack+zlib")
+        large_payload = {"bids_offers": [
+            {"id": f"bid-{index}", "energy_rate": 30.0, "energy": 0.1, "type": "Bid"}
+            for index in range(MIN_COMPRESSED_PAYLOAD_SIZE)]}
+        encoded_payload = codec.encode(large_payload)
+        assert encoded_payload[1] == 1
+        assert len(encoded_payload) * 10 < len(get_wire_codec("msgpack").encode(large_payload))
+        assert decode_payload(encoded_payload) == large_payload
+        assert codec.encode({"event": "finish"})[1] == 0
@@ -170,6 +170,18 @@ class FakeMarket:
 
         return offer
 
+    def amend_order(self, order_id, new_price, original_price=None, adapt_price_with_fees=True,
+                    dispatch_event=True):
+        offer = self.offers[order_id]
+        amended_offer = Offer(offer.id, offer.creation_time, new_price, offer.energy,
+                              offer.seller, original_price)
+        self.offers[order_id] = deepcopy(amended_offer)
+        self.forwarded_offer = deepcopy(amended_offer)
+        return amended_offer
+
+    def dispatch_market_order_amended_event(self, order, original_order):
+        pass
+
     def dispatch_market_offer_event(self, offer):
         pass
 
@@ -622,6 +634,23 @@ class TestMAOffer:
             market_id=market_agent_2.higher_market.id)
         assert len(market_agent_2.lower_market.calls_energy) == 1
 
+    @staticmethod
+    def test_ma_event_order_amended_amends_forwarded_offer(market_agent_2):
+        forwarded_offer = market_agent_2.higher_market.forwarded_offer
+        source_offer = market_agent_2.lower_market.offers["id"]
+        amended_offer = Offer(source_offer.id, source_offer.creation_time, 4, source_offer.energy,
+                              source_offer.seller, 4)
+        market_agent_2.lower_market.offers["id"] = amended_offer
+        market_agent_2.event_order_amended(market_id=market_agent_2.lower_market.id,
+                                           order=amended_offer, original_order=source_offer)
+
+        assert market_agent_2.higher_market.offer_call_count == 1
+        assert market_agent_2.higher_market.offers[forwarded_offer.id].price == 4
+        offer_info = market_agent_2.engines[1].forwarded_offers["id"]
+        assert offer_info.source_offer.price == 4
+        assert offer_info.target_offer.id == forwarded_offer.id
+        assert market_agent_2.engines[1].forwarded_offers[forwarded_offer.id] == offer_info
+
     @staticmethod
     def test_ma_event_trade_buys_partial_accepted_offer(market_agent_2):
         total_offer = market_agent_2.higher_market.forwarded_offer
@@ -0,0 +1,80 @@
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from gsy_e.gsy_e_core.sim_results.plot_renderer import (
+    DEFERRED_PLOTS_DIRECTORY, DEFERRED_PLOTS_MANIFEST, PlotRenderer, plot_rendering,
+    render_deferred_plots, write_figure)
+
+
+def _figure(name):
+    figure = MagicMock()
+    figure.to_json.return_value = json.dumps({"name": name})
+    return figure
+
+
+def _write_figure_json(figure_json, output_file):
+    with open(output_file, "w", encoding="utf-8") as outfile:
+        outfile.write(figure_json)
+
+
+class TestPlotRenderer:
+    """Tests for the PlotRenderer class and the deferred rendering of plots."""
+
+    @staticmethod
+    def _write_plots(plot_dir):
+        for area_dir in ("grid", os.path.join("grid", "house-1")):
+            os.makedirs(os.path.join(plot_dir, area_dir))
+            write_figure(_figure(area_dir), os.path.join(plot_dir, area_dir, "energy.html"))
+
+    @staticmethod
+    @patch("gsy_e.gsy_e_core.sim_results.plot_renderer.py")
+    def test_plots_are_rendered_inline_without_workers(plotly_mock, tmp_path):
+        plot_dir = str(tmp_path)
+        with plot_rendering(PlotRenderer(plot_dir, "grid")):
+            TestPlotRenderer._write_plots(plot_dir)
+        assert plotly_mock.offline.plot.call_count == 2
+        assert os.listdir(plot_dir) == ["house-1"]
+
+    @staticmethod
+    @patch("gsy_e.gsy_e_core.sim_results.plot_renderer.render_figure_json",
+           side_effect=_write_figure_json)
+    @patch("gsy_e.gsy_e_core.sim_results.plot_renderer.py")
+    def test_deferred_plots_are_rendered_on_demand(plotly_mock, render_mock, tmp_path):
+        plot_dir = str(tmp_path)
+        with plot_rendering(PlotRenderer(plot_dir, "grid", defer=True)):
+            TestPlotRenderer._write_plots(plot_dir)
+        plotly_mock.offline.plot.assert_not_called()
+        with open(os.path.join(plot_dir, DEFERRED_PLOTS_DIRECTORY, DEFERRED_PLOTS_MANIFEST),
+                  encoding="utf-8") as infile:
+            manifest = json.load(infile)
+        assert manifest["root_slug"] == "grid"
+        assert [plot["output_file"] for plot in manifest["plots"]] == [
+            os.path.join("grid", "energy.html"), os.path.join("grid", "house-1", "energy.html")]
+
+        assert render_deferred_plots(plot_dir) == 2
+        assert render_mock.call_count == 2
+        assert sorted(os.listdir(plot_dir)) == ["energy.html", "house-1"]
+        with open(os.path.join(plot_dir, "house-1", "energy.html"), encoding="utf-8") as infile:
+            assert json.load(infile) == {"name": os.path.join("grid", "house-1")}
+
+    @staticmethod
+    @patch("gsy_e.gsy_e_core.sim_results.plot_renderer.move_root_plot_folder")
+    @patch("gsy_e.gsy_e_core.sim_results.plot_renderer.ProcessPoolExecutor")
+    def test_pending_renders_are_cancelled_on_error(executor_mock, move_mock, tmp_path):
+        plot_dir = str(tmp_path)
+        renderer = PlotRenderer(plot_dir, "grid", workers=2)
+        with pytest.raises(ValueError):
+            with plot_rendering(renderer):
+                TestPlotRenderer._write_plots(plot_dir)
+                raise ValueError("export failed")
+        render = executor_mock.return_value.submit.return_value
+        assert render.cancel.call_count == 2
+        executor_mock.return_value.shutdown.assert_called_once()
+        move_mock.assert_not_called()
+        # The figures are rendered inline once the context is exited
+        with patch("gsy_e.gsy_e_core.sim_results.plot_renderer.py") as plotly_mock:
+            write_figure(_figure("grid"), os.path.join(plot_dir, "grid", "energy.html"))
+        plotly_mock.offline.plot.assert_called_once()
@@ -0,0 +1,61 @@
+# pylint: disable=protected-access, no-self-use
+from threading import Event
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from gsy_e.gsy_e_core.sim_results.results_publisher import ResultsPublisher
+from gsy_e.gsy_e_core.simulation.results_manager import SimulationResultsManager
+
+
+@patch("gsy_e.gsy_e_core.sim_results.results_publisher.is_results_size_valid",
+       lambda results: "too-big" not in results)
+class TestResultsPublisher:
+    """Tests for the ResultsPublisher class."""
+
+    def test_results_are_published_synchronously_without_queue(self):
+        kafka_connection = MagicMock()
+        results_publisher = ResultsPublisher(kafka_connection, queue_size=0)
+        assert results_publisher._thread is None
+
+        results_publisher.publish({"slot": 1}, "simulation-id")
+        results_publisher.publish({"too-big": True}, "simulation-id")
+        kafka_connection.publish.assert_any_call({"slot": 1}, "simulation-id")
+        kafka_connection.publish.assert_called_with({}, "simulation-id")
+
+    def test_results_are_published_in_order_from_background_thread(self):
+        published = []
+        publishing_allowed = Event()
+
+        def _publish(results, _simulation_id):
+            publishing_allowed.wait()
+            published.append(results["slot"])
+
+        kafka_connection = MagicMock()
+        kafka_connection.publish.side_effect = _publish
+        results_publisher = ResultsPublisher(kafka_connection, queue_size=2)
+        for slot in range(3):
+            results_publisher.publish({"slot": slot}, "simulation-id")
+        # The publishing of the first report is blocked, the next ones wait in the queue
+        assert published == []
+        assert results_publisher._queue.full()
+
+        publishing_allowed.set()
+        results_publisher.flush()
+        assert published == [0, 1, 2]
+
+
+@patch("gsy_e.gsy_e_core.simulation.results_manager.kafka_connection_factory", MagicMock())
+@patch("gsy_e.constants.RESULTS_PUBLISH_QUEUE_SIZE", 2)
+@pytest.mark.parametrize("simulation_status, is_flushed", [
+    ("running", False), ("paused", False),
+    ("finished", True), ("stopped", True), ("timed-out", True)])
+def test_results_publisher_is_flushed_on_terminal_statuses(simulation_status, is_flushed):
+    results_manager = SimulationResultsManager(
+        export_results_on_finish=False, export_path="", export_subdir="",
+        started_from_cli=False)
+    results_manager._endpoint_buffer = MagicMock()
+    results_manager._results_publisher = MagicMock()
+    results_manager._publish_results("simulation-id", simulation_status)
+    results_manager._results_publisher.publish.assert_called_once()
+    assert results_manager._results_publisher.flush.called is is_flushed
@@ -400,6 +400,21 @@ class TestStorageState:
             storage_state.delete_past_state_values(current_time_slot)
             assert storage_state.pledged_sell_kWh.get(past_time_slot) is None
 
+    def test_delete_past_state_values_only_deletes_market_slots_of_pledged_sell_kWh(self):
+        storage_state = StorageState()
+        past_time_slot, current_time_slot, future_time_slots = self._initialize_time_slots()
+        active_market_slot_time_list = [past_time_slot, current_time_slot, *future_time_slots]
+        storage_state.add_default_values_to_state_profiles(active_market_slot_time_list)
+        older_time_slot = past_time_slot.subtract(minutes=15)
+        storage_state.charge_history[older_time_slot] = 50
+        with patch("gsy_e.gsy_e_core.util.ConstSettings.SettlementMarketSettings."
+                   "ENABLE_SETTLEMENT_MARKETS", False):
+            storage_state.delete_past_state_values(current_time_slot)
+            assert past_time_slot not in storage_state.charge_history
+            assert past_time_slot not in storage_state.energy_to_sell_dict
+            assert storage_state.charge_history[older_time_slot] == 50
+            assert storage_state.charge_history.get(current_time_slot) is not None
+
     def test_register_energy_from_posted_bid_negative_energy_raise_error(self):
         storage_state, current_time_slot = self._setup_registration_test()
         self._assert_negative_energy_raise_error(
@@ -0,0 +1,136 @@
+# pylint: disable=protected-access
+import pickle
+import random
+from copy import deepcopy
+
+import numpy as np
+import pytest
+from pendulum import datetime, duration
+
+from gsy_e.models.strategy.state.time_slot_series import (
+    TimeSlotSeries, delete_time_slots_before)
+
+SLOT_LENGTH = duration(minutes=15)
+START_TIME_SLOT = datetime(2022, 1, 1)
+
+
+class TestTimeSlotSeries:
+    """Test the TimeSlotSeries class."""
+
+    @staticmethod
+    def _time_slot(slot: int):
+        return START_TIME_SLOT + SLOT_LENGTH * slot
+
+    def test_series_behaves_like_dict(self):
+        series = TimeSlotSeries({self._time_slot(2): 2.0}, slot_length=SLOT_LENGTH)
+        series[self._time_slot(0)] = 0.0
+        series[self._time_slot(5)] = 5.0
+        # Not aligned to the slot length
+        unaligned_time_slot = self._time_slot(1).add(minutes=1)
+        series[unaligned_time_slot] = 1.5
+
+        assert series == {self._time_slot(0): 0.0, self._time_slot(2): 2.0,
+                          self._time_slot(5): 5.0, unaligned_time_slot: 1.5}
+        assert list(series) == [self._time_slot(0), self._time_slot(2), self._time_slot(5),
+                                unaligned_time_slot]
+        assert len(series) == 4
+        assert self._time_slot(1) not in series
+        assert series.get(self._time_slot(1), 7) == 7
+        with pytest.raises(KeyError):
+            _ = series[self._time_slot(1)]
+
+        assert series.pop(self._time_slot(2)) == 2.0
+        del series[unaligned_time_slot]
+        assert dict(series.items()) == {self._time_slot(0): 0.0, self._time_slot(5): 5.0}
+
+    def test_delete_time_slots_before_advances_and_compacts_the_series(self):
+        series = TimeSlotSeries(slot_length=SLOT_LENGTH)
+        for slot in range(200):
+            series[self._time_slot(slot)] = slot
+        series.delete_time_slots_before(self._time_slot(150))
+        assert list(series.values()) == list(range(150, 200))
+        assert series._head == 0
+        assert len(series._values) == 50
+
+        series.delete_time_slots_before(self._time_slot(160))
+        assert len(series) == 40
+        assert series._head == 10
+        # Time slots before the start of the series reuse the deleted positions
+        series[self._time_slot(155)] = 155
+        assert series._head == 5
+        assert list(series)[0] == self._time_slot(155)
+
+    def test_delete_time_slots_before_prunes_dependent_series_by_the_time_series(self):
+        series = TimeSlotSeries(
+            {self._time_slot(slot): slot for slot in (1, 3, 4)}, slot_length=SLOT_LENGTH)
+        dependent_series = TimeSlotSeries(
+            {self._time_slot(slot): slot for slot in range(5)}, slot_length=SLOT_LENGTH)
+        dependent_dict = {self._time_slot(slot): slot for slot in range(5)}
+
+        delete_time_slots_before(
+            series, self._time_slot(4), dependent_series, dependent_dict)
+        assert list(series.values()) == [4]
+        # Only the time slots of the series are deleted from the dependent series
+        assert list(dependent_series.values()) == [0, 2, 4]
+        assert list(dependent_dict.values()) == [0, 2, 4]
+
+        # Deleting the first values advances the start of the lists
+        del dependent_series[self._time_slot(0)]
+        assert dependent_series._head == 2
+        assert list(dependent_series.values()) == [2, 4]
+
+    def test_series_keeps_far_time_slots_apart(self):
+        series = TimeSlotSeries(slot_length=SLOT_LENGTH)
+        series[self._time_slot(0)] = 0
+        far_time_slot = self._time_slot(TimeSlotSeries.MAX_SLOT_GAP + 10)
+        series[far_time_slot] = 1
+        assert len(series._values) == 1
+        assert series._unaligned_values == {far_time_slot: 1}
+
+        # Once the series reaches the far time slot, it is moved to the lists
+        series[self._time_slot(500)] = 2
+        assert series._unaligned_values == {far_time_slot: 1}
+        series[self._time_slot(TimeSlotSeries.MAX_SLOT_GAP + 20)] = 3
+        assert series._unaligned_values == {}
+        assert series == {self._time_slot(0): 0, self._time_slot(500): 2, far_time_slot: 1,
+                          self._time_slot(TimeSlotSeries.MAX_SLOT_GAP + 20): 3}
+
+    def test_get_and_set_values_of_consecutive_time_slots(self):
+        series = TimeSlotSeries(slot_length=SLOT_LENGTH)
+        series[self._time_slot(0)] = 10.
+        time_slots = [self._time_slot(slot) for slot in range(2 * TimeSlotSeries.MAX_SLOT_GAP)]
+        assert series.get_values(time_slots[:3], default=-1.).tolist() == [10., -1., -1.]
+
+        # The consecutive time slots are stored in the lists regardless of their count
+        series.set_values(time_slots, np.arange(len(time_slots), dtype=float))
+        assert series._unaligned_values == {}
+        assert len(series) == len(time_slots)
+        assert series[time_slots[-1]] == len(time_slots) - 1
+        assert np.array_equal(series.get_values(time_slots), np.arange(len(time_slots)))
+
+        # Time slots that are not consecutive are set one by one
+        sparse_time_slots = [self._time_slot(1), self._time_slot(5)]
+        series.set_values(sparse_time_slots, np.array([-1., -5.]))
+        assert series.get_values(sparse_time_slots).tolist() == [-1., -5.]
+
+    def test_series_produces_same_results_as_dict(self):
+        rng = random.Random(1)
+        series = TimeSlotSeries(slot_length=SLOT_LENGTH)
+        expected_dict = {}
+        for _ in range(2000):
+            time_slot = self._time_slot(rng.randint(-50, 500))
+            if rng.random() < 0.1:
+                time_slot = time_slot.add(minutes=rng.randint(1, 14))
+            operation = rng.random()
+            if operation < 0.5:
+                series[time_slot] = expected_dict[time_slot] = rng.random()
+            elif operation < 0.7:
+                assert series.pop(time_slot, None) == expected_dict.pop(time_slot, None)
+            elif operation < 0.8:
+                delete_time_slots_before(series, time_slot)
+                delete_time_slots_before(expected_dict, time_slot)
+            assert series == expected_dict
+            assert len(series) == len(expected_dict)
+
+        assert pickle.loads(pickle.dumps(series)) == expected_dict
+        assert deepcopy(series) == expected_dict
@@ -442,76 +442,31 @@ class TestTwoSidedMarket:
         assert clearing.energy == mcp_energy
 
     @staticmethod
-    def test_matching_list_gets_updated_with_residual_offers():
-        seller = TraderDetails("S", "")
-        buyer = TraderDetails("B", "")
-        matches = [
-            BidOfferMatch(
-                offer=Offer("offer_id", pendulum.now(), 1, 1, seller).serializable_dict(),
-                selected_energy=1,
-                bid=Bid("bid_id", pendulum.now(), 1, 1, buyer).serializable_dict(),
-                trade_rate=1,
-                market_id="",
-                time_slot="").serializable_dict(),
-            BidOfferMatch(
-                offer=Offer("offer_id2", pendulum.now(), 2, 2, seller).serializable_dict(),
-                selected_energy=2,
-                bid=Bid("bid_id2", pendulum.now(), 2, 2, buyer).serializable_dict(),
-                trade_rate=1,
-                market_id="",
-                time_slot="").serializable_dict()
-        ]
-        offer_trade = Trade("trade", 1, seller, buyer,
-                            offer=Offer("offer_id", pendulum.now(), 1, 1, seller),
-                            residual=Offer("residual_offer", pendulum.now(), 0.5, 0.5, seller),
-                            traded_energy=1, trade_price=1)
-        bid_trade = Trade("bid_trade", 1, seller, buyer,
-                          bid=Bid("bid_id2", pendulum.now(), 1, 1, seller),
-                          residual=Bid("residual_bid_2", pendulum.now(), 1, 1, buyer),
-                          traded_energy=1, trade_price=1)
-        matches = TwoSidedMarket._replace_offers_bids_with_residual_in_recommendations_list(
-            matches, offer_trade, bid_trade
-        )
-        assert len(matches) == 2
-        assert matches[0]["offer"]["id"] == "residual_offer"
-        assert matches[1]["bid"]["id"] == "residual_bid_2"
-
-    @staticmethod
-    @pytest.mark.skip("Attributes / requirements feature disabled.")
-    def test_matching_list_gets_updated_with_residual_orders_with_requirements():
-        seller = TraderDetails("S", "")
-        buyer = TraderDetails("B", "")
-        offer1 = Offer("offer_id", pendulum.now(), 1, 1, seller)
-        bid_requirement = {"trading_partners": [offer1.seller.uuid], "energy": 1.5}
-        bid1 = Bid("bid_id", pendulum.now(), 1, 2, buyer,
-                   requirements=[bid_requirement])
-        recommendations = [
-            BidOfferMatch(
-                offer=offer1.serializable_dict(), selected_energy=1,
-                bid=bid1.serializable_dict(), trade_rate=1, market_id="",
-                matching_requirements={
-                    "bid_requirement": bid_requirement},
-                time_slot="").serializable_dict()
-        ]
-        offer_trade = Trade("trade", pendulum.now(), seller, buyer, offer=offer1,
-                            residual=Offer("residual_offer", pendulum.now(), 0.5, 1, seller),
-                            traded_energy=1, trade_price=0.5)
-        bid_trade = Trade("bid_trade", pendulum.now(), seller, buyer, bid=bid1,
-                          residual=Bid("residual_bid", pendulum.now(), 0.5, 1, seller,
-                                       requirements=[bid_requirement]),
-                          traded_energy=1, trade_price=0.5)
-        recommendations = (
-            TwoSidedMarket._replace_offers_bids_with_residual_in_recommendations_list(
-                recommendations, offer_trade, bid_trade))
-        assert len(recommendations) == 1
-        assert recommendations[0]["offer"]["id"] == "residual_offer"
-        assert recommendations[0]["bid"]["id"] == "residual_bid"
-        # The bid traded 1 kWh so the maximum energy should become 2 - 1 = 1
-        # Furthermore, the bid was traded with the trading_partner
-        # it only bought 1 out of 1.5, so the residual bid's requirement should reflect this = 0.5
-        assert recommendations[0]["bid"]["energy"] == 1
-        assert recommendations[0]["bid"]["requirements"][0]["energy"] == 0.5
-        assert recommendations[0]["matching_requirements"]["bid_requirement"]["energy"] == 0.5
+    def test_get_residual_order_id_follows_and_compresses_residual_chain():
+        residual_order_ids = {"offer": "residual1", "residual1": "residual2"}
+        assert TwoSidedMarket._get_residual_order_id(
+            "offer", residual_order_ids) == "residual2"
+        assert residual_order_ids["offer"] == "residual2"
+        assert TwoSidedMarket._get_residual_order_id(
+            "residual2", residual_order_ids) == "residual2"
+        assert TwoSidedMarket._get_residual_order_id(
+            "other_offer", residual_order_ids) == "other_offer"
+
+    @staticmethod
+    def test_matching_requirements_get_adapted_to_residual_bid():
+        bid_requirement = {"trading_partners": ["seller"], "energy": 1.5}
+        recommendation = BidOfferMatch(
+            offer=Offer("offer_id", pendulum.now(), 1, 1, TraderDetails("S", "")
+                        ).serializable_dict(),
+            selected_energy=1,
+            bid=Bid("bid_id", pendulum.now(), 1, 2, TraderDetails("B", ""),
+                    requirements=[bid_requirement]).serializable_dict(),
+            trade_rate=1, market_id="", time_slot="",
+            matching_requirements={"bid_requirement": bid_requirement})
+        TwoSidedMarket._adapt_matching_requirements_to_residual(recommendation, 1)
+        assert recommendation.matching_requirements["bid_requirement"]["energy"] == 0.5
+        # The requirement of the original bid is not modified
+        assert bid_requirement["energy"] == 1.5
 
 
 class TestTwoSidedMarketMatchRecommendations:
@@ -539,6 +494,24 @@ class TestTwoSidedMarketMatchRecommendations:
         market.match_recommendations(recommendations)
         assert len(market.trades) == 1
 
+    @staticmethod
+    def test_match_recommendations_matches_residuals_of_traded_orders(market):
+        """Test that recommendations of partially traded orders are matched with residuals."""
+        offer = market.offer(price=4, energy=2, seller=TraderDetails("Seller", "seller_id"))
+        bid1 = market.bid(price=2, energy=1, buyer=TraderDetails("Buyer1", "buyer_id1"))
+        bid2 = market.bid(price=2, energy=1, buyer=TraderDetails("Buyer2", "buyer_id2"))
+
+        recommendations = [
+            BidOfferMatch(
+                bid=bid.serializable_dict(), offer=offer.serializable_dict(),
+                trade_rate=2, selected_energy=1, market_id=market.id,
+                time_slot=market.time_slot_str).serializable_dict()
+            for bid in [bid1, bid2]]
+        assert market.match_recommendations(recommendations) is True
+        assert len(market.trades) == 2
+        assert len(market.offers) == 0
+        assert len(market.bids) == 0
+
     @staticmethod
     def test_match_recommendations_fails_for_same_buyer_seller(market):
         bid = Bid("bid_id1", pendulum.now(),